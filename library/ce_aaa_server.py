@@ -183,6 +183,7 @@ import re
 import sys
 from ansible.module_utils.network import NetworkModule
 from ansible.module_utils.cloudengine import get_netconf
+from ansible.module_utils.ce_perf import perf_results
 
 try:
     from ncclient.operations.rpc import RPCError
@@ -2228,6 +2229,7 @@ def main():
     results['end_state'] = end_state
     results['updates'] = updates
 
+    results.update(perf_results())
     module.exit_json(**results)
 
 
@@ -297,6 +297,7 @@ import socket
 from xml.etree import ElementTree
 from ansible.module_utils.network import NetworkModule
 from ansible.module_utils.cloudengine import get_netconf
+from ansible.module_utils.ce_perf import perf_results
 
 try:
     from ncclient.operations.rpc import RPCError
@@ -2734,6 +2735,7 @@ def main():
     results['end_state'] = end_state
     results['updates'] = updates
 
+    results.update(perf_results())
     module.exit_json(**results)
 
 
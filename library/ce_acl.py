@@ -210,6 +210,7 @@ import sys
 from xml.etree import ElementTree
 from ansible.module_utils.network import NetworkModule
 from ansible.module_utils.cloudengine import get_netconf
+from ansible.module_utils.ce_perf import perf_results
 
 try:
     from ncclient.operations.rpc import RPCError
@@ -1021,6 +1022,7 @@ class BaseAcl(object):
         self.results['end_state'] = self.end_state
         self.results['updates'] = self.updates_cmd
 
+        self.results.update(perf_results())
         self.module.exit_json(**self.results)
 
 
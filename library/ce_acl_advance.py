@@ -353,9 +353,10 @@ updates:
 
 import socket
 import sys
-from xml.etree import ElementTree
 from ansible.module_utils.network import NetworkModule
 from ansible.module_utils.cloudengine import get_netconf
+from ansible.module_utils.ce_xml import iter_records
+from ansible.module_utils.ce_perf import perf_results, timed
 
 try:
     from ncclient.operations.rpc import RPCError
@@ -735,21 +736,14 @@ class AdvanceAcl(object):
                 find_flag = False
 
             else:
-                xml_str = con_obj.xml.replace('\r', '').replace('\n', '').\
-                    replace('xmlns="urn:ietf:params:xml:ns:netconf:base:1.0"', "").\
-                    replace('xmlns="http://www.huawei.com/netconf/vrp"', "")
-
-                root = ElementTree.fromstring(xml_str)
-
                 # parse acl
-                acl_info = root.findall(
-                    "data/acl/aclGroups/aclGroup")
-                if acl_info:
-                    for tmp in acl_info:
+                with timed('xml', 'parse') as timer:
+                    timer.received = len(con_obj.xml)
+                    for _, tmp in iter_records(con_obj.xml, "data/acl/aclGroups/aclGroup"):
                         tmp_dict = dict()
-                        for site in tmp:
-                            if site.tag in ["aclNumOrName", "aclType", "aclNumber", "aclStep", "aclDescription"]:
-                                tmp_dict[site.tag] = site.text
+                        for key in ["aclNumOrName", "aclType", "aclNumber", "aclStep", "aclDescription"]:
+                            if key in tmp:
+                                tmp_dict[key] = tmp[key]
 
                         self.cur_acl_cfg["acl_info"].append(tmp_dict)
 
@@ -1115,28 +1109,22 @@ class AdvanceAcl(object):
                     find_flag = False
 
                 else:
-                    xml_str = con_obj.xml.replace('\r', '').replace('\n', '').\
-                        replace('xmlns="urn:ietf:params:xml:ns:netconf:base:1.0"', "").\
-                        replace('xmlns="http://www.huawei.com/netconf/vrp"', "")
-
-                    root = ElementTree.fromstring(xml_str)
-
                     # parse advance rule
-                    adv_rule_info = root.findall(
-                        "data/acl/aclGroups/aclGroup/aclRuleAdv4s/aclRuleAdv4")
-                    if adv_rule_info:
-                        for tmp in adv_rule_info:
+                    with timed('xml', 'parse') as timer:
+                        timer.received = len(con_obj.xml)
+                        for _, tmp in iter_records(
+                                con_obj.xml, "data/acl/aclGroups/aclGroup/aclRuleAdv4s/aclRuleAdv4"):
                             tmp_dict = dict()
-                            for site in tmp:
-                                if site.tag in ["aclRuleName", "aclRuleID", "aclAction", "aclProtocol", "aclSourceIp",
-                                                "aclSrcWild", "aclSPoolName", "aclDestIp", "aclDestWild",
-                                                "aclDPoolName", "aclSrcPortOp", "aclSrcPortBegin", "aclSrcPortEnd",
-                                                "aclSPortPoolName", "aclDestPortOp", "aclDestPortB", "aclDestPortE",
-                                                "aclDPortPoolName", "aclFragType", "aclPrecedence", "aclTos",
-                                                "aclDscp", "aclIcmpName", "aclIcmpType", "aclIcmpCode", "aclTtlExpired",
-                                                "vrfName", "aclSynFlag", "aclTcpFlagMask", "aclEstablished",
-                                                "aclTimeName", "aclRuleDescription", "aclIgmpType", "aclLogFlag"]:
-                                    tmp_dict[site.tag] = site.text
+                            for key in ["aclRuleName", "aclRuleID", "aclAction", "aclProtocol", "aclSourceIp",
+                                        "aclSrcWild", "aclSPoolName", "aclDestIp", "aclDestWild",
+                                        "aclDPoolName", "aclSrcPortOp", "aclSrcPortBegin", "aclSrcPortEnd",
+                                        "aclSPortPoolName", "aclDestPortOp", "aclDestPortB", "aclDestPortE",
+                                        "aclDPortPoolName", "aclFragType", "aclPrecedence", "aclTos",
+                                        "aclDscp", "aclIcmpName", "aclIcmpType", "aclIcmpCode", "aclTtlExpired",
+                                        "vrfName", "aclSynFlag", "aclTcpFlagMask", "aclEstablished",
+                                        "aclTimeName", "aclRuleDescription", "aclIgmpType", "aclLogFlag"]:
+                                if key in tmp:
+                                    tmp_dict[key] = tmp[key]
 
                             self.cur_advance_rule_cfg[
                                 "adv_rule_info"].append(tmp_dict)
@@ -1777,6 +1765,7 @@ class AdvanceAcl(object):
         self.results['end_state'] = self.end_state
         self.results['updates'] = self.updates_cmd
 
+        self.results.update(perf_results())
         self.module.exit_json(**self.results)
 
 
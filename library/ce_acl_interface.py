@@ -115,6 +115,7 @@ updates:
 from ansible.module_utils.cloudengine import get_cli_exception
 from ansible.module_utils.network import NetworkModule
 from ansible.module_utils.network import NetworkError
+from ansible.module_utils.ce_perf import perf_results
 
 
 class AclInterface(object):
@@ -269,6 +270,7 @@ class AclInterface(object):
         self.results['end_state'] = self.end_state
         self.results['updates'] = self.updates_cmd
 
+        self.results.update(perf_results())
         self.module.exit_json(**self.results)
 
 
@@ -0,0 +1,957 @@
+#!/usr/bin/python
+#
+# This file is part of Ansible
+#
+# Ansible is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Ansible is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Ansible.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+ANSIBLE_METADATA = {'status': ['preview'],
+                    'supported_by': 'community',
+                    'version': '1.0'}
+
+DOCUMENTATION = '''
+---
+module: ce_batch
+version_added: "2.3"
+short_description: Applies many resource declarations in one transaction.
+description:
+    - Applies a list of VLAN, interface, switchport, VPN instance and raw
+      NETCONF declarations on Huawei CloudEngine switches with one get
+      and one edit-config.
+author: QijunPan (@CloudEngine-Ansible)
+extends_documentation_fragment: cloudengine
+notes:
+    - Declarations are validated before anything is sent, a single invalid
+      declaration fails the task without changing the device.
+    - Declarations of type C(xml) are always reported as changed.
+options:
+    resources:
+        description:
+            - List of resource declarations. Every declaration is a dict with a
+              C(type) key, one of C(vlan), C(interface), C(switchport), C(vrf)
+              or C(xml), an optional C(state) key, C(present) or C(absent),
+              and the options of that type.
+              C(vlan) takes I(vlan_id), I(name) and I(description).
+              C(interface) takes I(interface), I(description), I(admin_state)
+              and I(mode) (layer2 or layer3).
+              C(switchport) takes I(interface), I(mode) (access or trunk),
+              I(access_vlan), I(native_vlan) and I(trunk_vlans), the port
+              must be layer2 or be made so by an earlier C(interface)
+              declaration with I(mode) layer2.
+              C(vrf) takes I(vrf) and I(description).
+              C(xml) takes I(config), a CE_NC_* style config payload.
+        required: false
+        default: null
+    target:
+        description:
+            - Datastore the batch is written to. With C(candidate) the batch
+              is committed once after the edit-config.
+        required: false
+        default: running
+        choices: ['running', 'candidate']
+    confirm_timeout:
+        description:
+            - Seconds after which the device rolls the batch back unless the
+              commit is confirmed, makes the candidate commit a confirmed
+              commit. Requires I(persist), a confirmed commit without it is
+              rolled back as soon as the session of the module closes.
+        required: false
+        default: null
+    persist:
+        description:
+            - Token of the confirmed commit, a later task confirms the commit
+              from any session by passing it as I(persist_id). Mutually
+              exclusive with I(persist_id).
+        required: false
+        default: null
+    persist_id:
+        description:
+            - Confirms the pending confirmed commit started with this
+              I(persist) token.
+        required: false
+        default: null
+'''
+
+EXAMPLES = '''
+# Configure VLANs, ports and a VPN instance of a leaf switch in one edit-config
+- ce_batch:
+    resources:
+      - {type: vlan, vlan_id: 100, name: WEB}
+      - {type: vlan, vlan_id: 200, name: APP, description: app servers}
+      - {type: interface, interface: 10GE1/0/1, description: web01, admin_state: up}
+      - {type: switchport, interface: 10GE1/0/1, mode: access, access_vlan: 100}
+      - {type: switchport, interface: 10GE1/0/48, mode: trunk, native_vlan: 1, trunk_vlans: "100,200"}
+      - {type: vrf, vrf: tenant1, description: tenant one}
+      - {type: vlan, vlan_id: 300, state: absent}
+    host: "{{ inventory_hostname }}"
+    username: "{{ un }}"
+    password: "{{ pwd }}"
+
+# Roll out a change that the device reverts unless confirmed within 5 minutes
+- ce_batch:
+    resources:
+      - {type: vlan, vlan_id: 400, name: NEW}
+    target: candidate
+    confirm_timeout: 300
+    persist: rollout-42
+    host: "{{ inventory_hostname }}"
+    username: "{{ un }}"
+    password: "{{ pwd }}"
+
+# Confirm the rollout
+- ce_batch:
+    target: candidate
+    persist_id: rollout-42
+    host: "{{ inventory_hostname }}"
+    username: "{{ un }}"
+    password: "{{ pwd }}"
+'''
+
+RETURN = '''
+results:
+    description: per declaration change results
+    returned: always
+    type: list
+    sample: [{"type": "vlan", "name": "100", "changed": true,
+              "updates": ["vlan 100", "name WEB"]},
+             {"type": "vrf", "name": "tenant1", "changed": false,
+              "updates": []}]
+updates:
+    description: commands sent to the device
+    returned: always
+    type: list
+    sample: ["vlan 100", "name WEB"]
+changed:
+    description: check to see if a change was made on the device
+    returned: always
+    type: boolean
+    sample: true
+'''
+
+import sys
+from xml.etree import ElementTree
+from ansible.module_utils.network import NetworkModule, NetworkError
+from ansible.module_utils.cloudengine import get_netconf, ConfigBatch,\
+    build_filter_xml
+from ansible.module_utils.ce_perf import perf_results
+from ansible.module_utils.ce_vlanset import VlanSet
+
+try:
+    from ncclient.operations.rpc import RPCError
+    HAS_NCCLIENT = True
+except ImportError:
+    HAS_NCCLIENT = False
+
+
+CE_NC_GET_VLANS = """
+<filter type="subtree">
+  <vlan xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+    <vlans>
+      <vlan>
+        <vlanId/>
+        <vlanName/>
+        <vlanDesc/>
+      </vlan>
+    </vlans>
+  </vlan>
+</filter>
+"""
+
+CE_NC_GET_INTFS = """
+<filter type="subtree">
+  <ifm xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+    <interfaces>
+      <interface>
+        <ifName></ifName>
+        <ifDescr></ifDescr>
+        <ifAdminStatus></ifAdminStatus>
+        <isL2SwitchPort></isL2SwitchPort>
+      </interface>
+    </interfaces>
+  </ifm>
+</filter>
+"""
+
+CE_NC_GET_PORTS_ATTR = """
+<filter type="subtree">
+  <ethernet xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+    <ethernetIfs>
+      <ethernetIf>
+        <ifName></ifName>
+        <l2Enable></l2Enable>
+        <l2Attribute>
+          <linkType></linkType>
+          <pvid></pvid>
+          <trunkVlans></trunkVlans>
+        </l2Attribute>
+      </ethernetIf>
+    </ethernetIfs>
+  </ethernet>
+</filter>
+"""
+
+CE_NC_GET_VRF = """
+<filter type="subtree">
+  <l3vpn xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+    <l3vpncomm>
+      <l3vpnInstances>
+        <l3vpnInstance>
+          <vrfName></vrfName>
+          <vrfDescription></vrfDescription>
+        </l3vpnInstance>
+      </l3vpnInstances>
+    </l3vpncomm>
+  </l3vpn>
+</filter>
+"""
+
+CE_NC_CREATE_VLAN = """
+<vlan xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+  <vlans>
+    <vlan operation="create">
+      <vlanId>%s</vlanId>
+      <vlanName>%s</vlanName>
+      <vlanDesc>%s</vlanDesc>
+      <vlanType></vlanType>
+      <subVlans/>
+    </vlan>
+  </vlans>
+</vlan>
+"""
+
+CE_NC_MERGE_VLAN_NAME = """
+<vlan xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+  <vlans>
+    <vlan operation="merge">
+      <vlanId>%s</vlanId>
+      <vlanName>%s</vlanName>
+      <vlanType></vlanType>
+      <subVlans/>
+    </vlan>
+  </vlans>
+</vlan>
+"""
+
+CE_NC_MERGE_VLAN_DES = """
+<vlan xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+  <vlans>
+    <vlan operation="merge">
+      <vlanId>%s</vlanId>
+      <vlanDesc>%s</vlanDesc>
+      <vlanType></vlanType>
+      <subVlans/>
+    </vlan>
+  </vlans>
+</vlan>
+"""
+
+CE_NC_DELETE_VLAN = """
+<vlan xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+  <vlans>
+    <vlan operation="delete">
+      <vlanId>%s</vlanId>
+    </vlan>
+  </vlans>
+</vlan>
+"""
+
+CE_NC_XML_CREATE_INTF = """
+<ifm xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+<interfaces>
+  <interface operation="create">
+    <ifName>%s</ifName>
+    <ifDescr>%s</ifDescr>
+  </interface>
+</interfaces>
+</ifm>
+"""
+
+CE_NC_XML_DELETE_INTF = """
+<ifm xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+<interfaces>
+  <interface operation="delete">
+    <ifName>%s</ifName>
+  </interface>
+</interfaces>
+</ifm>
+"""
+
+CE_NC_XML_MERGE_INTF_DES = """
+<ifm xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+<interfaces>
+  <interface operation="merge">
+    <ifName>%s</ifName>
+    <ifDescr>%s</ifDescr>
+  </interface>
+</interfaces>
+</ifm>
+"""
+
+CE_NC_XML_MERGE_INTF_STATUS = """
+<ifm xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+<interfaces>
+  <interface operation="merge">
+    <ifName>%s</ifName>
+    <ifAdminStatus>%s</ifAdminStatus>
+  </interface>
+</interfaces>
+</ifm>
+"""
+
+CE_NC_XML_MERGE_INTF_L2ENABLE = """
+<ethernet xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+<ethernetIfs>
+  <ethernetIf operation="merge">
+    <ifName>%s</ifName>
+    <l2Enable>%s</l2Enable>
+  </ethernetIf>
+</ethernetIfs>
+</ethernet>
+"""
+
+CE_NC_SET_ACCESS_PORT = """
+<ethernet xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+<ethernetIfs>
+    <ethernetIf operation="merge">
+        <ifName>%s</ifName>
+        <l2Attribute>
+            <linkType>access</linkType>
+            <pvid>%s</pvid>
+            <trunkVlans></trunkVlans>
+            <untagVlans></untagVlans>
+        </l2Attribute>
+    </ethernetIf>
+</ethernetIfs>
+</ethernet>
+"""
+
+CE_NC_SET_TRUNK_PORT_MODE = """
+<ethernet xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+<ethernetIfs>
+    <ethernetIf operation="merge">
+        <ifName>%s</ifName>
+        <l2Attribute>
+            <linkType>trunk</linkType>
+        </l2Attribute>
+    </ethernetIf>
+</ethernetIfs>
+</ethernet>
+"""
+
+CE_NC_SET_TRUNK_PORT_PVID = """
+<ethernet xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+<ethernetIfs>
+    <ethernetIf operation="merge">
+        <ifName>%s</ifName>
+        <l2Attribute>
+            <linkType>trunk</linkType>
+            <pvid>%s</pvid>
+            <untagVlans></untagVlans>
+        </l2Attribute>
+    </ethernetIf>
+</ethernetIfs>
+</ethernet>
+"""
+
+CE_NC_SET_TRUNK_PORT_VLANS = """
+<ethernet xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+<ethernetIfs>
+    <ethernetIf operation="merge">
+        <ifName>%s</ifName>
+        <l2Attribute>
+            <linkType>trunk</linkType>
+            <trunkVlans>%s:%s</trunkVlans>
+            <untagVlans></untagVlans>
+        </l2Attribute>
+    </ethernetIf>
+</ethernetIfs>
+</ethernet>
+"""
+
+CE_NC_CREATE_VRF = """
+<l3vpn xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+  <l3vpncomm>
+    <l3vpnInstances>
+      <l3vpnInstance operation="merge">
+        <vrfName>%s</vrfName>
+        <vrfDescription>%s</vrfDescription>
+      </l3vpnInstance>
+    </l3vpnInstances>
+  </l3vpncomm>
+</l3vpn>
+"""
+
+CE_NC_DELETE_VRF = """
+<l3vpn xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+  <l3vpncomm>
+    <l3vpnInstances>
+      <l3vpnInstance operation="delete">
+        <vrfName>%s</vrfName>
+      </l3vpnInstance>
+    </l3vpnInstances>
+  </l3vpncomm>
+</l3vpn>
+"""
+
+RESOURCE_TYPE = ('vlan', 'interface', 'switchport', 'vrf', 'xml')
+
+RESOURCE_FILTER = dict(vlan=CE_NC_GET_VLANS,
+                       interface=CE_NC_GET_INTFS,
+                       switchport=CE_NC_GET_PORTS_ATTR,
+                       vrf=CE_NC_GET_VRF)
+
+ADMIN_STATE_TYPE = ('ge', '10ge', '25ge', '4x10ge', '40ge', '100ge',
+                    'vlanif', 'meth', 'eth-trunk', 'vbdif', 'tunnel',
+                    'ethernet', 'stack-port')
+
+SWITCH_PORT_TYPE = ('ge', '10ge', '25ge',
+                    '4x10ge', '40ge', '100ge', 'eth-trunk')
+
+
+def get_interface_type(interface):
+    """Gets the type of interface, such as 10GE, ETH-TRUNK, VLANIF..."""
+
+    if interface is None:
+        return None
+
+    iftype = None
+
+    if interface.upper().startswith('GE'):
+        iftype = 'ge'
+    elif interface.upper().startswith('10GE'):
+        iftype = '10ge'
+    elif interface.upper().startswith('25GE'):
+        iftype = '25ge'
+    elif interface.upper().startswith('4X10GE'):
+        iftype = '4x10ge'
+    elif interface.upper().startswith('40GE'):
+        iftype = '40ge'
+    elif interface.upper().startswith('100GE'):
+        iftype = '100ge'
+    elif interface.upper().startswith('VLANIF'):
+        iftype = 'vlanif'
+    elif interface.upper().startswith('LOOPBACK'):
+        iftype = 'loopback'
+    elif interface.upper().startswith('METH'):
+        iftype = 'meth'
+    elif interface.upper().startswith('ETH-TRUNK'):
+        iftype = 'eth-trunk'
+    elif interface.upper().startswith('VBDIF'):
+        iftype = 'vbdif'
+    elif interface.upper().startswith('NVE'):
+        iftype = 'nve'
+    elif interface.upper().startswith('TUNNEL'):
+        iftype = 'tunnel'
+    elif interface.upper().startswith('ETHERNET'):
+        iftype = 'ethernet'
+    elif interface.upper().startswith('FCOE-PORT'):
+        iftype = 'fcoe-port'
+    elif interface.upper().startswith('FABRIC-PORT'):
+        iftype = 'fabric-port'
+    elif interface.upper().startswith('STACK-PORT'):
+        iftype = 'stack-port'
+    elif interface.upper().startswith('NULL'):
+        iftype = 'null'
+    else:
+        return None
+
+    return iftype.lower()
+
+
+class Batch(object):
+    """
+    Applies a list of resource declarations in one edit-config
+    """
+
+    def __init__(self, argument_spec):
+        self.spec = argument_spec
+        self.module = None
+        self.netconf = None
+        self.init_module()
+
+        # batch info
+        self.resources = self.module.params['resources'] or list()
+        self.target = self.module.params['target']
+        self.confirm_timeout = self.module.params['confirm_timeout']
+        self.persist = self.module.params['persist']
+        self.persist_id = self.module.params['persist_id']
+
+        # host info
+        self.host = self.module.params['host']
+        self.username = self.module.params['username']
+        self.password = self.module.params['password']
+        self.port = self.module.params['port']
+
+        # state
+        self.changed = False
+        self.updates_cmd = list()
+        self.results = dict()
+        self.resource_results = list()
+        self.existing = dict()
+        self.batch = ConfigBatch()
+
+        # init netconf connect
+        self.init_netconf()
+
+    def init_module(self):
+        """ init module """
+
+        self.module = NetworkModule(
+            argument_spec=self.spec, supports_check_mode=True)
+
+    def init_netconf(self):
+        """ init netconf """
+
+        if not HAS_NCCLIENT:
+            raise Exception("the ncclient library is required")
+
+        self.netconf = get_netconf(host=self.host,
+                                   port=self.port,
+                                   username=self.username,
+                                   password=self.module.params['password'])
+        if not self.netconf:
+            self.module.fail_json(msg='Error: netconf init failed.')
+
+    def check_response(self, con_obj, xml_name):
+        """Check if response message is already succeed."""
+
+        xml_str = con_obj.xml
+        if "<ok/>" not in xml_str:
+            self.module.fail_json(msg='Error: %s failed.' % xml_name)
+
+    def get_value(self, item, key):
+        """ declaration value as string, None when unset """
+
+        value = item.get(key)
+        if value is None:
+            return None
+        if isinstance(value, bool):
+            return str(value).lower()
+        return str(value)
+
+    def check_params(self):
+        """Check all input params"""
+
+        if not self.resources and not self.persist_id:
+            self.module.fail_json(
+                msg='Error: resources or persist_id must be set.')
+
+        if self.target != 'candidate' and (self.confirm_timeout
+                                           or self.persist or self.persist_id):
+            self.module.fail_json(
+                msg='Error: Confirmed commit requires target candidate.')
+        if self.persist and not self.confirm_timeout:
+            self.module.fail_json(
+                msg='Error: persist requires confirm_timeout.')
+        if self.confirm_timeout and not self.persist:
+            self.module.fail_json(
+                msg='Error: confirm_timeout requires persist, the device '
+                    'rolls back a confirmed commit without persist when '
+                    'the session closes.')
+        if self.persist and self.persist_id:
+            self.module.fail_json(
+                msg='Error: persist and persist_id can not be set together.')
+
+        for item in self.resources:
+            if not isinstance(item, dict):
+                self.module.fail_json(
+                    msg='Error: Every resource must be a dict.')
+            rtype = item.get('type')
+            if rtype not in RESOURCE_TYPE:
+                self.module.fail_json(
+                    msg='Error: Resource type %s is not supported.' % rtype)
+            if item.get('state', 'present') not in ('present', 'absent'):
+                self.module.fail_json(
+                    msg='Error: Resource state must be present or absent.')
+            getattr(self, 'check_%s' % rtype)(item)
+
+    def check_vlan(self, item):
+        """ check vlan declaration """
+
+        vlan_id = self.get_value(item, 'vlan_id')
+        if not vlan_id or not vlan_id.isdigit():
+            self.module.fail_json(msg='Error: Vlan id is not digit.')
+        if int(vlan_id) <= 0 or int(vlan_id) > 4094:
+            self.module.fail_json(
+                msg='Error: Vlan id is not in the range from 1 to 4094.')
+        name = self.get_value(item, 'name')
+        if name and (len(name) > 31 or len(name.replace(' ', '')) < 1):
+            self.module.fail_json(
+                msg='Error: Vlan name is not in the range from 1 to 31.')
+        description = self.get_value(item, 'description')
+        if description and (len(description) > 81 or len(description.replace(' ', '')) < 1):
+            self.module.fail_json(
+                msg='Error: vlan description is not in the range from 1 to 80.')
+
+    def check_interface(self, item):
+        """ check interface declaration """
+
+        interface = self.get_value(item, 'interface')
+        if not get_interface_type(interface):
+            self.module.fail_json(
+                msg='Error: interface name of %s is error.' % interface)
+        if item.get('admin_state') not in (None, 'up', 'down'):
+            self.module.fail_json(
+                msg='Error: admin_state must be up or down.')
+        if item.get('mode') not in (None, 'layer2', 'layer3'):
+            self.module.fail_json(
+                msg='Error: interface mode must be layer2 or layer3.')
+        description = self.get_value(item, 'description')
+        if description and (len(description) > 242 or len(description.replace(' ', '')) < 1):
+            self.module.fail_json(
+                msg='Error: interface description is not in the range from 1 to 242.')
+
+    def check_switchport(self, item):
+        """ check switchport declaration """
+
+        interface = self.get_value(item, 'interface')
+        if get_interface_type(interface) not in SWITCH_PORT_TYPE:
+            self.module.fail_json(
+                msg='Error: Interface %s is not support layer 2 config.' % interface)
+        if item.get('state', 'present') == 'present' \
+                and item.get('mode') not in ('access', 'trunk'):
+            self.module.fail_json(
+                msg='Error: switchport mode must be access or trunk.')
+        for key in ('access_vlan', 'native_vlan'):
+            vlan_id = self.get_value(item, key)
+            if vlan_id and (not vlan_id.isdigit()
+                            or int(vlan_id) < 1 or int(vlan_id) > 4094):
+                self.module.fail_json(
+                    msg='Error: %s is not in the range from 1 to 4094.' % key)
+        trunk_vlans = self.get_value(item, 'trunk_vlans')
+        if trunk_vlans:
+            try:
+                VlanSet.from_range(trunk_vlans)
+            except ValueError:
+                self.module.fail_json(
+                    msg='Error: Format of trunk_vlans %s is invalid.' % trunk_vlans)
+
+    def check_vrf(self, item):
+        """ check vrf declaration """
+
+        vrf = self.get_value(item, 'vrf')
+        if not vrf or len(vrf) > 31:
+            self.module.fail_json(
+                msg='Error: The vrf name length must between 1 and 31.')
+        if vrf == '_public_':
+            self.module.fail_json(
+                msg='Error: The vrf name _public_ is reserved.')
+        description = self.get_value(item, 'description')
+        if description and len(description) > 242:
+            self.module.fail_json(
+                msg='Error: The vrf description length must between 1 and 242.')
+
+    def check_xml(self, item):
+        """ check raw xml declaration """
+
+        if not item.get('config'):
+            self.module.fail_json(
+                msg='Error: config must be set for xml resource.')
+
+    def get_existing(self):
+        """ fetch every table the batch touches with one get """
+
+        rtypes = set(item['type'] for item in self.resources)
+        filters = [RESOURCE_FILTER[rtype] for rtype in RESOURCE_TYPE
+                   if rtype in rtypes and rtype in RESOURCE_FILTER]
+        for rtype in RESOURCE_FILTER:
+            self.existing[rtype] = dict()
+        if not filters:
+            return
+
+        try:
+            con_obj = self.netconf.get_config(filter=build_filter_xml(*filters))
+        except RPCError:
+            err = sys.exc_info()[1]
+            self.module.fail_json(msg='Error: %s' % err.message.replace("\r\n", ""))
+
+        if "<data/>" in con_obj.xml:
+            return
+
+        xml_str = con_obj.xml.replace('\r', '').replace('\n', '').\
+            replace('xmlns="urn:ietf:params:xml:ns:netconf:base:1.0"', "").\
+            replace('xmlns="http://www.huawei.com/netconf/vrp"', "")
+        root = ElementTree.fromstring(xml_str)
+
+        for vlan in root.findall("data/vlan/vlans/vlan"):
+            vlan_id = vlan.findtext('vlanId')
+            self.existing['vlan'][vlan_id] = dict(
+                name=vlan.findtext('vlanName') or '',
+                description=vlan.findtext('vlanDesc') or '')
+
+        for intf in root.findall("data/ifm/interfaces/interface"):
+            ifname = intf.findtext('ifName')
+            self.existing['interface'][ifname.lower()] = dict(
+                ifName=ifname,
+                ifDescr=intf.findtext('ifDescr') or '',
+                ifAdminStatus=intf.findtext('ifAdminStatus') or '',
+                isL2SwitchPort=intf.findtext('isL2SwitchPort') or '')
+
+        for port in root.findall("data/ethernet/ethernetIfs/ethernetIf"):
+            ifname = port.findtext('ifName')
+            self.existing['switchport'][ifname.lower()] = dict(
+                ifName=ifname,
+                l2Enable=port.findtext('l2Enable') or '',
+                linkType=port.findtext('l2Attribute/linkType') or '',
+                pvid=port.findtext('l2Attribute/pvid') or '',
+                trunkVlans=port.findtext('l2Attribute/trunkVlans') or '')
+
+        for vrf in root.findall("data/l3vpn/l3vpncomm/l3vpnInstances/l3vpnInstance"):
+            self.existing['vrf'][vrf.findtext('vrfName')] = dict(
+                description=vrf.findtext('vrfDescription') or '')
+
+    def build_vlan(self, item, state):
+        """ vlan declaration to config """
+
+        vlan_id = self.get_value(item, 'vlan_id')
+        name = self.get_value(item, 'name')
+        description = self.get_value(item, 'description')
+        exist = self.existing['vlan'].get(vlan_id)
+        xmlstr = ''
+        updates = list()
+
+        if state == 'present':
+            if not exist:
+                xmlstr = CE_NC_CREATE_VLAN % (vlan_id, name or '', description or '')
+            else:
+                if name and name != exist['name']:
+                    xmlstr += CE_NC_MERGE_VLAN_NAME % (vlan_id, name)
+                if description and description != exist['description']:
+                    xmlstr += CE_NC_MERGE_VLAN_DES % (vlan_id, description)
+            if xmlstr:
+                updates.append('vlan %s' % vlan_id)
+                if name:
+                    updates.append('name %s' % name)
+                if description:
+                    updates.append('description %s' % description)
+        elif exist:
+            xmlstr = CE_NC_DELETE_VLAN % vlan_id
+            updates.append('undo vlan %s' % vlan_id)
+
+        return vlan_id, xmlstr, updates
+
+    def build_interface(self, item, state):
+        """ interface declaration to config """
+
+        interface = self.get_value(item, 'interface')
+        iftype = get_interface_type(interface)
+        description = self.get_value(item, 'description')
+        admin_state = item.get('admin_state')
+        mode = item.get('mode')
+        exist = self.existing['interface'].get(interface.lower())
+        xmlstr = ''
+        updates = list()
+
+        if state == 'absent':
+            if exist:
+                xmlstr = CE_NC_XML_DELETE_INTF % exist['ifName']
+                updates.append('undo interface %s' % exist['ifName'])
+            return interface, xmlstr, updates
+
+        if not exist:
+            xmlstr += CE_NC_XML_CREATE_INTF % (interface, description or '')
+            if description:
+                updates.append('description %s' % description)
+            exist = dict(ifName=interface, ifDescr=description or '',
+                         ifAdminStatus='', isL2SwitchPort='')
+        elif description and exist['ifDescr'] != description:
+            xmlstr += CE_NC_XML_MERGE_INTF_DES % (exist['ifName'], description)
+            updates.append('description %s' % description)
+
+        if admin_state and iftype in ADMIN_STATE_TYPE \
+                and exist['ifAdminStatus'] != admin_state:
+            xmlstr += CE_NC_XML_MERGE_INTF_STATUS % (exist['ifName'], admin_state)
+            if admin_state == 'up':
+                updates.append('undo shutdown')
+            else:
+                updates.append('shutdown')
+
+        if iftype in SWITCH_PORT_TYPE:
+            if mode == 'layer2' and exist['isL2SwitchPort'] != 'true':
+                xmlstr += CE_NC_XML_MERGE_INTF_L2ENABLE % (exist['ifName'], 'enable')
+                updates.append('portswitch')
+                # a later switchport declaration configures the new layer2
+                # port, its link type is set explicitly
+                self.existing['switchport'][interface.lower()] = dict(
+                    ifName=exist['ifName'], l2Enable='enable', linkType='',
+                    pvid='', trunkVlans='')
+            elif mode == 'layer3' and exist['isL2SwitchPort'] != 'false':
+                xmlstr += CE_NC_XML_MERGE_INTF_L2ENABLE % (exist['ifName'], 'disable')
+                updates.append('undo portswitch')
+                self.existing['switchport'].pop(interface.lower(), None)
+
+        if xmlstr:
+            updates.insert(0, 'interface %s' % exist['ifName'])
+
+        return interface, xmlstr, updates
+
+    def build_switchport(self, item, state):
+        """ switchport declaration to config """
+
+        interface = self.get_value(item, 'interface')
+        mode = item.get('mode')
+        access_vlan = self.get_value(item, 'access_vlan')
+        native_vlan = self.get_value(item, 'native_vlan')
+        trunk_vlans = self.get_value(item, 'trunk_vlans')
+        exist = self.existing['switchport'].get(interface.lower())
+        xmlstr = ''
+        updates = list()
+
+        if not exist or exist['l2Enable'] != 'enable':
+            self.module.fail_json(
+                msg='Error: Interface %s is not layer2 switch port.' % interface)
+        ifname = exist['ifName']
+
+        if state == 'absent':
+            if exist['linkType'] != 'access' or exist['pvid'] != '1':
+                xmlstr = CE_NC_SET_ACCESS_PORT % (ifname, '1')
+                updates.extend(['port link-type access', 'port default vlan 1'])
+        elif mode == 'access':
+            if exist['linkType'] != 'access':
+                updates.append('port link-type access')
+                xmlstr = CE_NC_SET_ACCESS_PORT % (ifname, access_vlan or '1')
+            elif access_vlan and exist['pvid'] != access_vlan:
+                xmlstr = CE_NC_SET_ACCESS_PORT % (ifname, access_vlan)
+            if xmlstr and access_vlan:
+                updates.append('port default vlan %s' % access_vlan)
+        else:
+            is_trunk = bool(exist['linkType'] == 'trunk')
+            if not is_trunk:
+                updates.append('port link-type trunk')
+            if native_vlan and (not is_trunk or exist['pvid'] != native_vlan):
+                xmlstr += CE_NC_SET_TRUNK_PORT_PVID % (ifname, native_vlan)
+                updates.append('port trunk pvid vlan %s' % native_vlan)
+            if trunk_vlans:
+                add_vlans = VlanSet.from_range(trunk_vlans)
+                if is_trunk:
+                    add_vlans -= VlanSet.from_bitmap(exist['trunkVlans'])
+                if add_vlans:
+                    add_map = add_vlans.to_bitmap()
+                    xmlstr += CE_NC_SET_TRUNK_PORT_VLANS % (ifname, add_map, add_map)
+                    updates.append('port trunk allow-pass vlan %s'
+                                   % trunk_vlans.replace(',', ' ').replace('-', ' to '))
+            if not is_trunk and not xmlstr:
+                xmlstr = CE_NC_SET_TRUNK_PORT_MODE % ifname
+
+        if xmlstr:
+            updates.insert(0, 'interface %s' % ifname)
+
+        return interface, xmlstr, updates
+
+    def build_vrf(self, item, state):
+        """ vrf declaration to config """
+
+        vrf = self.get_value(item, 'vrf')
+        description = self.get_value(item, 'description')
+        exist = self.existing['vrf'].get(vrf)
+        xmlstr = ''
+        updates = list()
+
+        if state == 'present':
+            if not exist or (description is not None
+                             and exist['description'] != description):
+                xmlstr = CE_NC_CREATE_VRF % (vrf, description or '')
+                updates.append('ip vpn-instance %s' % vrf)
+                if description:
+                    updates.append('description %s' % description)
+        elif exist:
+            xmlstr = CE_NC_DELETE_VRF % vrf
+            updates.append('undo ip vpn-instance %s' % vrf)
+
+        return vrf, xmlstr, updates
+
+    def build_xml(self, item, state):
+        """ raw xml declaration, always sent """
+
+        return item.get('name', 'xml'), item['config'], list()
+
+    def build_batch(self):
+        """ compute the change of every declaration """
+
+        for item in self.resources:
+            rtype = item['type']
+            state = item.get('state', 'present')
+            name, xmlstr, updates = getattr(self, 'build_%s' % rtype)(item, state)
+            self.resource_results.append(dict(type=rtype, name=name,
+                                              changed=bool(xmlstr),
+                                              updates=updates))
+            if xmlstr:
+                self.batch.add(name, xmlstr)
+                self.updates_cmd.extend(updates)
+
+    def apply_batch(self):
+        """ apply the batch in one edit-config """
+
+        if self.module.check_mode:
+            return
+
+        commit_args = dict(confirmed=bool(self.confirm_timeout),
+                           timeout=self.confirm_timeout,
+                           persist=self.persist,
+                           persist_id=self.persist_id)
+        try:
+            if self.batch:
+                con_obj = self.batch.apply(self.netconf, target=self.target,
+                                           **commit_args)
+            elif self.persist_id:
+                con_obj = self.netconf.commit(**commit_args)
+                self.updates_cmd.append('commit')
+            else:
+                return
+            self.check_response(con_obj, "APPLY_BATCH")
+        except RPCError:
+            err = sys.exc_info()[1]
+            self.module.fail_json(msg='Error: %s' % err.message.replace("\r\n", ""))
+        except NetworkError:
+            err = sys.exc_info()[1]
+            self.module.fail_json(msg='Error: %s.' % err)
+
+    def work(self):
+        """ worker """
+
+        self.check_params()
+        self.get_existing()
+        self.build_batch()
+        self.apply_batch()
+
+        self.changed = bool(self.batch) or bool(self.persist_id)
+        self.results['changed'] = self.changed
+        self.results['results'] = self.resource_results
+        if self.changed:
+            self.results['updates'] = self.updates_cmd
+        else:
+            self.results['updates'] = list()
+
+        self.results.update(perf_results())
+        self.module.exit_json(**self.results)
+
+
+def main():
+    """ module main """
+
+    argument_spec = dict(
+        resources=dict(required=False, type='list'),
+        target=dict(choices=['running', 'candidate'],
+                    default='running', required=False),
+        confirm_timeout=dict(required=False, type='int'),
+        persist=dict(required=False, type='str'),
+        persist_id=dict(required=False, type='str'),
+    )
+
+    batch = Batch(argument_spec)
+    batch.work()
+
+
+if __name__ == '__main__':
+    main()
@@ -251,10 +251,11 @@ updates:
     sample: ["bgp 100"]
 '''
 
-import re
 import sys
 from ansible.module_utils.network import NetworkModule
 from ansible.module_utils.cloudengine import get_netconf
+from ansible.module_utils.ce_bgp_reply import decode_bgp_reply
+from ansible.module_utils.ce_perf import perf_results
 
 try:
     from ncclient.operations.rpc import RPCError
@@ -559,8 +560,7 @@ class Bgp(object):
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<gracefulRestart>(.*)</gracefulRestart>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("gracefulRestart")
 
                 if re_find:
                     result["graceful_restart"] = re_find
@@ -584,8 +584,7 @@ class Bgp(object):
                     if "<data/>" in con_obj.xml:
                         need_cfg = True
                     else:
-                        re_find = re.findall(
-                            r'.*<timeWaitForRib>(.*)</timeWaitForRib>.*', con_obj.xml)
+                        re_find = decode_bgp_reply(con_obj.xml).values("timeWaitForRib")
 
                         if re_find:
                             result["time_wait_for_rib"] = re_find
@@ -597,8 +596,7 @@ class Bgp(object):
                     if "<data/>" in con_obj.xml:
                         pass
                     else:
-                        re_find = re.findall(
-                            r'.*<timeWaitForRib>(.*)</timeWaitForRib>.*', con_obj.xml)
+                        re_find = decode_bgp_reply(con_obj.xml).values("timeWaitForRib")
 
                         if re_find:
                             result["time_wait_for_rib"] = re_find
@@ -620,8 +618,7 @@ class Bgp(object):
                     if "<data/>" in con_obj.xml:
                         need_cfg = True
                     else:
-                        re_find = re.findall(
-                            r'.*<asPathLimit>(.*)</asPathLimit>.*', con_obj.xml)
+                        re_find = decode_bgp_reply(con_obj.xml).values("asPathLimit")
 
                         if re_find:
                             result["as_path_limit"] = re_find
@@ -633,8 +630,7 @@ class Bgp(object):
                     if "<data/>" in con_obj.xml:
                         pass
                     else:
-                        re_find = re.findall(
-                            r'.*<asPathLimit>(.*)</asPathLimit>.*', con_obj.xml)
+                        re_find = decode_bgp_reply(con_obj.xml).values("asPathLimit")
 
                         if re_find:
                             result["as_path_limit"] = re_find
@@ -650,8 +646,7 @@ class Bgp(object):
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<checkFirstAs>(.*)</checkFirstAs>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("checkFirstAs")
 
                 if re_find:
                     result["check_first_as"] = re_find
@@ -675,8 +670,7 @@ class Bgp(object):
                     if "<data/>" in con_obj.xml:
                         need_cfg = True
                     else:
-                        re_find = re.findall(
-                            r'.*<confedIdNumber>(.*)</confedIdNumber>.*', con_obj.xml)
+                        re_find = decode_bgp_reply(con_obj.xml).values("confedIdNumber")
 
                         if re_find:
                             result["confed_id_number"] = re_find
@@ -688,8 +682,7 @@ class Bgp(object):
                     if "<data/>" in con_obj.xml:
                         pass
                     else:
-                        re_find = re.findall(
-                            r'.*<confedIdNumber>(.*)</confedIdNumber>.*', con_obj.xml)
+                        re_find = decode_bgp_reply(con_obj.xml).values("confedIdNumber")
 
                         if re_find:
                             result["confed_id_number"] = re_find
@@ -705,8 +698,7 @@ class Bgp(object):
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<confedNonstanded>(.*)</confedNonstanded>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("confedNonstanded")
 
                 if re_find:
                     result["confed_nonstanded"] = re_find
@@ -724,8 +716,7 @@ class Bgp(object):
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<bgpRidAutoSel>(.*)</bgpRidAutoSel>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("bgpRidAutoSel")
 
                 if re_find:
                     result["bgp_rid_auto_sel"] = re_find
@@ -743,8 +734,7 @@ class Bgp(object):
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<keepAllRoutes>(.*)</keepAllRoutes>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("keepAllRoutes")
 
                 if re_find:
                     result["keep_all_routes"] = re_find
@@ -762,8 +752,7 @@ class Bgp(object):
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<memoryLimit>(.*)</memoryLimit>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("memoryLimit")
 
                 if re_find:
                     result["memory_limit"] = re_find
@@ -781,8 +770,7 @@ class Bgp(object):
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<grPeerReset>(.*)</grPeerReset>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("grPeerReset")
 
                 if re_find:
                     result["gr_peer_reset"] = re_find
@@ -800,8 +788,7 @@ class Bgp(object):
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<isShutdown>(.*)</isShutdown>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("isShutdown")
 
                 if re_find:
                     result["is_shutdown"] = re_find
@@ -832,8 +819,7 @@ class Bgp(object):
                     if "<data/>" in con_obj.xml:
                         need_cfg = True
                     else:
-                        re_find = re.findall(
-                            r'.*<suppressInterval>(.*)</suppressInterval>.*', con_obj.xml)
+                        re_find = decode_bgp_reply(con_obj.xml).values("suppressInterval")
 
                         if re_find:
                             result["suppress_interval"] = re_find
@@ -845,8 +831,7 @@ class Bgp(object):
                     if "<data/>" in con_obj.xml:
                         pass
                     else:
-                        re_find = re.findall(
-                            r'.*<suppressInterval>(.*)</suppressInterval>.*', con_obj.xml)
+                        re_find = decode_bgp_reply(con_obj.xml).values("suppressInterval")
 
                         if re_find:
                             result["suppress_interval"] = re_find
@@ -872,8 +857,7 @@ class Bgp(object):
                     if "<data/>" in con_obj.xml:
                         need_cfg = True
                     else:
-                        re_find = re.findall(
-                            r'.*<holdInterval>(.*)</holdInterval>.*', con_obj.xml)
+                        re_find = decode_bgp_reply(con_obj.xml).values("holdInterval")
 
                         if re_find:
                             result["hold_interval"] = re_find
@@ -885,8 +869,7 @@ class Bgp(object):
                     if "<data/>" in con_obj.xml:
                         pass
                     else:
-                        re_find = re.findall(
-                            r'.*<holdInterval>(.*)</holdInterval>.*', con_obj.xml)
+                        re_find = decode_bgp_reply(con_obj.xml).values("holdInterval")
 
                         if re_find:
                             result["hold_interval"] = re_find
@@ -912,8 +895,7 @@ class Bgp(object):
                     if "<data/>" in con_obj.xml:
                         need_cfg = True
                     else:
-                        re_find = re.findall(
-                            r'.*<clearInterval>(.*)</clearInterval>.*', con_obj.xml)
+                        re_find = decode_bgp_reply(con_obj.xml).values("clearInterval")
 
                         if re_find:
                             result["clear_interval"] = re_find
@@ -925,8 +907,7 @@ class Bgp(object):
                     if "<data/>" in con_obj.xml:
                         pass
                     else:
-                        re_find = re.findall(
-                            r'.*<clearInterval>(.*)</clearInterval>.*', con_obj.xml)
+                        re_find = decode_bgp_reply(con_obj.xml).values("clearInterval")
 
                         if re_find:
                             result["clear_interval"] = re_find
@@ -958,8 +939,7 @@ class Bgp(object):
                 if "<data/>" in con_obj.xml:
                     need_cfg = True
                 else:
-                    re_find = re.findall(
-                        r'.*<vrfName>(.*)</vrfName>.*', con_obj.xml)
+                    re_find = decode_bgp_reply(con_obj.xml).values("vrfName")
 
                     if re_find:
                         if check_vrf_name not in re_find:
@@ -970,8 +950,7 @@ class Bgp(object):
                 if "<data/>" in con_obj.xml:
                     pass
                 else:
-                    re_find = re.findall(
-                        r'.*<vrfName>(.*)</vrfName>.*', con_obj.xml)
+                    re_find = decode_bgp_reply(con_obj.xml).values("vrfName")
 
                     if re_find:
                         if check_vrf_name in re_find:
@@ -1008,8 +987,7 @@ class Bgp(object):
                 if "<data/>" in con_obj.xml:
                     need_cfg = True
                 else:
-                    re_find = re.findall(
-                        r'.*<routerId>(.*)</routerId>.*', con_obj.xml)
+                    re_find = decode_bgp_reply(con_obj.xml).values("routerId")
 
                     if re_find:
                         result["router_id"] = re_find
@@ -1021,8 +999,7 @@ class Bgp(object):
                 if "<data/>" in con_obj.xml:
                     pass
                 else:
-                    re_find = re.findall(
-                        r'.*<routerId>(.*)</routerId>.*', con_obj.xml)
+                    re_find = decode_bgp_reply(con_obj.xml).values("routerId")
 
                     if re_find:
                         result["router_id"] = re_find
@@ -1044,8 +1021,7 @@ class Bgp(object):
                 if "<data/>" in con_obj.xml:
                     need_cfg = True
                 else:
-                    re_find = re.findall(
-                        r'.*<vrfRidAutoSel>(.*)</vrfRidAutoSel>.*', con_obj.xml)
+                    re_find = decode_bgp_reply(con_obj.xml).values("vrfRidAutoSel")
 
                     if re_find:
                         result["vrf_rid_auto_sel"] = re_find
@@ -1075,8 +1051,7 @@ class Bgp(object):
                     if "<data/>" in con_obj.xml:
                         need_cfg = True
                     else:
-                        re_find = re.findall(
-                            r'.*<keepaliveTime>(.*)</keepaliveTime>.*', con_obj.xml)
+                        re_find = decode_bgp_reply(con_obj.xml).values("keepaliveTime")
 
                         if re_find:
                             result["keepalive_time"] = re_find
@@ -1088,8 +1063,7 @@ class Bgp(object):
                     if "<data/>" in con_obj.xml:
                         pass
                     else:
-                        re_find = re.findall(
-                            r'.*<keepaliveTime>(.*)</keepaliveTime>.*', con_obj.xml)
+                        re_find = decode_bgp_reply(con_obj.xml).values("keepaliveTime")
 
                         if re_find:
                             result["keepalive_time"] = re_find
@@ -1116,8 +1090,7 @@ class Bgp(object):
                     if "<data/>" in con_obj.xml:
                         need_cfg = True
                     else:
-                        re_find = re.findall(
-                            r'.*<holdTime>(.*)</holdTime>.*', con_obj.xml)
+                        re_find = decode_bgp_reply(con_obj.xml).values("holdTime")
 
                         if re_find:
                             result["hold_time"] = re_find
@@ -1129,8 +1102,7 @@ class Bgp(object):
                     if "<data/>" in con_obj.xml:
                         pass
                     else:
-                        re_find = re.findall(
-                            r'.*<holdTime>(.*)</holdTime>.*', con_obj.xml)
+                        re_find = decode_bgp_reply(con_obj.xml).values("holdTime")
 
                         if re_find:
                             result["hold_time"] = re_find
@@ -1157,8 +1129,7 @@ class Bgp(object):
                     if "<data/>" in con_obj.xml:
                         need_cfg = True
                     else:
-                        re_find = re.findall(
-                            r'.*<minHoldTime>(.*)</minHoldTime>.*', con_obj.xml)
+                        re_find = decode_bgp_reply(con_obj.xml).values("minHoldTime")
 
                         if re_find:
                             result["min_hold_time"] = re_find
@@ -1170,8 +1141,7 @@ class Bgp(object):
                     if "<data/>" in con_obj.xml:
                         pass
                     else:
-                        re_find = re.findall(
-                            r'.*<minHoldTime>(.*)</minHoldTime>.*', con_obj.xml)
+                        re_find = decode_bgp_reply(con_obj.xml).values("minHoldTime")
 
                         if re_find:
                             result["min_hold_time"] = re_find
@@ -1198,8 +1168,7 @@ class Bgp(object):
                     if "<data/>" in con_obj.xml:
                         need_cfg = True
                     else:
-                        re_find = re.findall(
-                            r'.*<connRetryTime>(.*)</connRetryTime>.*', con_obj.xml)
+                        re_find = decode_bgp_reply(con_obj.xml).values("connRetryTime")
 
                         if re_find:
                             result["conn_retry_time"] = re_find
@@ -1211,8 +1180,7 @@ class Bgp(object):
                     if "<data/>" in con_obj.xml:
                         pass
                     else:
-                        re_find = re.findall(
-                            r'.*<connRetryTime>(.*)</connRetryTime>.*', con_obj.xml)
+                        re_find = decode_bgp_reply(con_obj.xml).values("connRetryTime")
 
                         if re_find:
                             result["conn_retry_time"] = re_find
@@ -1236,8 +1204,7 @@ class Bgp(object):
                 if "<data/>" in con_obj.xml:
                     need_cfg = True
                 else:
-                    re_find = re.findall(
-                        r'.*<ebgpIfSensitive>(.*)</ebgpIfSensitive>.*', con_obj.xml)
+                    re_find = decode_bgp_reply(con_obj.xml).values("ebgpIfSensitive")
 
                     if re_find:
                         result["ebgp_if_sensitive"] = re_find
@@ -1249,8 +1216,7 @@ class Bgp(object):
                 if "<data/>" in con_obj.xml:
                     pass
                 else:
-                    re_find = re.findall(
-                        r'.*<ebgpIfSensitive>(.*)</ebgpIfSensitive>.*', con_obj.xml)
+                    re_find = decode_bgp_reply(con_obj.xml).values("ebgpIfSensitive")
 
                     if re_find:
                         result["ebgp_if_sensitive"] = re_find
@@ -1274,8 +1240,7 @@ class Bgp(object):
                 if "<data/>" in con_obj.xml:
                     need_cfg = True
                 else:
-                    re_find = re.findall(
-                        r'.*<defaultAfType>(.*)</defaultAfType>.*', con_obj.xml)
+                    re_find = decode_bgp_reply(con_obj.xml).values("defaultAfType")
 
                     if re_find:
                         result["default_af_type"] = re_find
@@ -1287,8 +1252,7 @@ class Bgp(object):
                 if "<data/>" in con_obj.xml:
                     pass
                 else:
-                    re_find = re.findall(
-                        r'.*<defaultAfType>(.*)</defaultAfType>.*', con_obj.xml)
+                    re_find = decode_bgp_reply(con_obj.xml).values("defaultAfType")
 
                     if re_find:
                         result["default_af_type"] = re_find
@@ -1315,8 +1279,7 @@ class Bgp(object):
         if "<data/>" in xml_str:
             return result
         else:
-            re_find = re.findall(
-                r'.*<asNumber>(.*)</asNumber>.*\s*<bgpEnable>(.*)</bgpEnable>.*', xml_str)
+            re_find = decode_bgp_reply(xml_str).pairs("asNumber", "bgpEnable")
 
             if re_find:
                 return re_find
@@ -1639,8 +1602,7 @@ class Bgp(object):
         if "<data/>" in xml_str:
             return result
         else:
-            re_find = re.findall(
-                r'.*<confedPeerAsNum>(.*)</confedPeerAsNum>.*', xml_str)
+            re_find = decode_bgp_reply(xml_str).values("confedPeerAsNum")
 
             if re_find:
                 return re_find
@@ -1717,8 +1679,7 @@ class Bgp(object):
         if "<data/>" in xml_str:
             return result
         else:
-            re_find = re.findall(
-                r'.*<vrfName>(.*)</vrfName>.*', xml_str)
+            re_find = decode_bgp_reply(xml_str).values("vrfName")
 
             if re_find:
                 return re_find
@@ -2381,6 +2342,7 @@ def main():
     results['end_state'] = end_state
     results['updates'] = updates
 
+    results.update(perf_results())
     module.exit_json(**results)
 
 
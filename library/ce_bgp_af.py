@@ -495,11 +495,12 @@ updates:
     sample: ["ipv4-family vpn-instance js"]
 '''
 
-import re
 import sys
 import socket
 from ansible.module_utils.network import NetworkModule
 from ansible.module_utils.cloudengine import get_netconf
+from ansible.module_utils.ce_bgp_reply import decode_bgp_reply
+from ansible.module_utils.ce_perf import perf_results
 
 try:
     from ncclient.operations.rpc import RPCError
@@ -908,6 +909,65 @@ def check_ip_addr(**kwargs):
     return True
 
 
+# module parameters and the leaves check_bgp_af_other_can_del compares them with
+BGP_AF_OTHER_CAN_DEL_LEAVES = [
+    ('router_id', 'routerId'),
+    ('determin_med', 'determinMed'),
+    ('ebgp_if_sensitive', 'ebgpIfSensitive'),
+    ('relay_delay_enable', 'relayDelayEnable'),
+]
+
+# module parameters and the leaves check_bgp_af_other_args compares them with
+BGP_AF_OTHER_ARGS_LEAVES = [
+    ('max_load_ibgp_num', 'maxLoadIbgpNum'),
+    ('ibgp_ecmp_nexthop_changed', 'ibgpEcmpNexthopChanged'),
+    ('max_load_ebgp_num', 'maxLoadEbgpNum'),
+    ('ebgp_ecmp_nexthop_changed', 'ebgpEcmpNexthopChanged'),
+    ('maximum_load_balance', 'maximumLoadBalance'),
+    ('ecmp_nexthop_changed', 'ecmpNexthopChanged'),
+    ('default_local_pref', 'defaultLocalPref'),
+    ('default_med', 'defaultMed'),
+    ('default_rt_import_enable', 'defaultRtImportEnable'),
+    ('router_id', 'routerId'),
+    ('vrf_rid_auto_sel', 'vrfRidAutoSel'),
+    ('nexthop_third_party', 'nexthopThirdParty'),
+    ('summary_automatic', 'summaryAutomatic'),
+    ('auto_frr_enable', 'autoFrrEnable'),
+    ('load_balancing_as_path_ignore', 'loadBalancingAsPathIgnore'),
+    ('rib_only_enable', 'ribOnlyEnable'),
+    ('rib_only_policy_name', 'ribOnlyPolicyName'),
+    ('active_route_advertise', 'activeRouteAdvertise'),
+    ('as_path_neglect', 'asPathNeglect'),
+    ('med_none_as_maximum', 'medNoneAsMaximum'),
+    ('router_id_neglect', 'routerIdNeglect'),
+    ('igp_metric_ignore', 'igpMetricIgnore'),
+    ('always_compare_med', 'alwaysCompareMed'),
+    ('determin_med', 'determinMed'),
+    ('preference_external', 'preferenceExternal'),
+    ('preference_internal', 'preferenceInternal'),
+    ('preference_local', 'preferenceLocal'),
+    ('prefrence_policy_name', 'prefrencePolicyName'),
+    ('reflect_between_client', 'reflectBetweenClient'),
+    ('reflector_cluster_id', 'reflectorClusterId'),
+    ('reflector_cluster_ipv4', 'reflectorClusterIpv4'),
+    ('rr_filter_number', 'rrFilterNumber'),
+    ('policy_vpn_target', 'policyVpnTarget'),
+    ('next_hop_sel_depend_type', 'nextHopSelDependType'),
+    ('nhp_relay_route_policy_name', 'nhpRelayRoutePolicyName'),
+    ('ebgp_if_sensitive', 'ebgpIfSensitive'),
+    ('reflect_chg_path', 'reflectChgPath'),
+    ('add_path_sel_num', 'addPathSelNum'),
+    ('route_sel_delay', 'routeSelDelay'),
+    ('allow_invalid_as', 'allowInvalidAs'),
+    ('policy_ext_comm_enable', 'policyExtCommEnable'),
+    ('supernet_uni_adv', 'supernetUniAdv'),
+    ('supernet_label_adv', 'supernetLabelAdv'),
+    ('ingress_lsp_policy_name', 'ingressLspPolicyName'),
+    ('originator_prior', 'originatorPrior'),
+    ('lowest_priority', 'lowestPriority'),
+    ('relay_delay_enable', 'relayDelayEnable'),
+]
+
 class BgpAf(object):
     """ Manages BGP Address-family configuration """
 
@@ -944,6 +1004,46 @@ class BgpAf(object):
 
         return con_obj
 
+    def get_bgp_af_leaves(self, **kwargs):
+        """ get the leaves of the requested parameters in one get """
+
+        module = kwargs["module"]
+        leaves = kwargs["leaves"]
+        vrf_name = module.params['vrf_name']
+
+        leaf_str = ""
+        for param, leaf in leaves:
+            if module.params[param]:
+                leaf_str += "<%s></%s>" % (leaf, leaf)
+        if not leaf_str:
+            return None
+
+        conf_str = CE_GET_BGP_ADDRESS_FAMILY_HEADER % vrf_name + \
+            leaf_str + CE_GET_BGP_ADDRESS_FAMILY_TAIL
+        return self.netconf_get_config(module=module, conf_str=conf_str)
+
+    def start_transaction(self, **kwargs):
+        """ stage the following edits in the candidate datastore """
+
+        module = kwargs["module"]
+
+        try:
+            self.netconf.start_transaction()
+        except RPCError:
+            err = sys.exc_info()[1]
+            module.fail_json(msg='Error: %s' % err.message.replace("\r\n", ""))
+
+    def commit_transaction(self, **kwargs):
+        """ commit the staged edits once """
+
+        module = kwargs["module"]
+
+        try:
+            self.netconf.commit_transaction()
+        except RPCError:
+            err = sys.exc_info()[1]
+            module.fail_json(msg='Error: %s' % err.message.replace("\r\n", ""))
+
     def check_bgp_af_args(self, **kwargs):
         """ check_bgp_af_args """
 
@@ -970,8 +1070,7 @@ class BgpAf(object):
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<afType>(.*)</afType>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("afType")
 
                 if re_find:
                     result["af_type"] = re_find
@@ -984,8 +1083,7 @@ class BgpAf(object):
             if "<data/>" in con_obj.xml:
                 pass
             else:
-                re_find = re.findall(
-                    r'.*<afType>(.*)</afType>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("afType")
 
                 if re_find:
                     result["af_type"] = re_find
@@ -1003,7 +1101,8 @@ class BgpAf(object):
         need_cfg = False
 
         state = module.params['state']
-        vrf_name = module.params['vrf_name']
+        con_obj = self.get_bgp_af_leaves(
+            module=module, leaves=BGP_AF_OTHER_CAN_DEL_LEAVES)
 
         router_id = module.params['router_id']
         if router_id:
@@ -1011,16 +1110,11 @@ class BgpAf(object):
                 module.fail_json(
                     msg='Error: The len of router_id %s is out of [0 - 255].' % router_id)
 
-            conf_str = CE_GET_BGP_ADDRESS_FAMILY_HEADER % vrf_name + \
-                "<routerId></routerId>" + CE_GET_BGP_ADDRESS_FAMILY_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if state == "present":
                 if "<data/>" in con_obj.xml:
                     need_cfg = True
                 else:
-                    re_find = re.findall(
-                        r'.*<routerId>(.*)</routerId>.*', con_obj.xml)
+                    re_find = decode_bgp_reply(con_obj.xml).values("routerId")
 
                     if re_find:
                         if re_find[0] != router_id:
@@ -1031,8 +1125,7 @@ class BgpAf(object):
                 if "<data/>" in con_obj.xml:
                     pass
                 else:
-                    re_find = re.findall(
-                        r'.*<routerId>(.*)</routerId>.*', con_obj.xml)
+                    re_find = decode_bgp_reply(con_obj.xml).values("routerId")
 
                     if re_find:
                         if re_find[0] == router_id:
@@ -1042,17 +1135,11 @@ class BgpAf(object):
 
         determin_med = module.params['determin_med']
         if determin_med:
-
-            conf_str = CE_GET_BGP_ADDRESS_FAMILY_HEADER % vrf_name + \
-                "<determinMed></determinMed>" + CE_GET_BGP_ADDRESS_FAMILY_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if state == "present":
                 if "<data/>" in con_obj.xml:
                     need_cfg = True
                 else:
-                    re_find = re.findall(
-                        r'.*<determinMed>(.*)</determinMed>.*', con_obj.xml)
+                    re_find = decode_bgp_reply(con_obj.xml).values("determinMed")
 
                     if re_find:
                         if re_find[0] != determin_med:
@@ -1063,8 +1150,7 @@ class BgpAf(object):
                 if "<data/>" in con_obj.xml:
                     pass
                 else:
-                    re_find = re.findall(
-                        r'.*<determinMed>(.*)</determinMed>.*', con_obj.xml)
+                    re_find = decode_bgp_reply(con_obj.xml).values("determinMed")
 
                     if re_find:
                         if re_find[0] == determin_med:
@@ -1074,17 +1160,11 @@ class BgpAf(object):
 
         ebgp_if_sensitive = module.params['ebgp_if_sensitive']
         if ebgp_if_sensitive:
-
-            conf_str = CE_GET_BGP_ADDRESS_FAMILY_HEADER % vrf_name + \
-                "<ebgpIfSensitive></ebgpIfSensitive>" + CE_GET_BGP_ADDRESS_FAMILY_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if state == "present":
                 if "<data/>" in con_obj.xml:
                     need_cfg = True
                 else:
-                    re_find = re.findall(
-                        r'.*<ebgpIfSensitive>(.*)</ebgpIfSensitive>.*', con_obj.xml)
+                    re_find = decode_bgp_reply(con_obj.xml).values("ebgpIfSensitive")
 
                     if re_find:
                         if re_find[0] != ebgp_if_sensitive:
@@ -1095,8 +1175,7 @@ class BgpAf(object):
                 if "<data/>" in con_obj.xml:
                     pass
                 else:
-                    re_find = re.findall(
-                        r'.*<ebgpIfSensitive>(.*)</ebgpIfSensitive>.*', con_obj.xml)
+                    re_find = decode_bgp_reply(con_obj.xml).values("ebgpIfSensitive")
 
                     if re_find:
                         if re_find[0] == ebgp_if_sensitive:
@@ -1106,17 +1185,11 @@ class BgpAf(object):
 
         relay_delay_enable = module.params['relay_delay_enable']
         if relay_delay_enable:
-
-            conf_str = CE_GET_BGP_ADDRESS_FAMILY_HEADER % vrf_name + \
-                "<relayDelayEnable></relayDelayEnable>" + CE_GET_BGP_ADDRESS_FAMILY_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if state == "present":
                 if "<data/>" in con_obj.xml:
                     need_cfg = True
                 else:
-                    re_find = re.findall(
-                        r'.*<relayDelayEnable>(.*)</relayDelayEnable>.*', con_obj.xml)
+                    re_find = decode_bgp_reply(con_obj.xml).values("relayDelayEnable")
 
                     if re_find:
                         if re_find[0] != relay_delay_enable:
@@ -1127,8 +1200,7 @@ class BgpAf(object):
                 if "<data/>" in con_obj.xml:
                     pass
                 else:
-                    re_find = re.findall(
-                        r'.*<relayDelayEnable>(.*)</relayDelayEnable>.*', con_obj.xml)
+                    re_find = decode_bgp_reply(con_obj.xml).values("relayDelayEnable")
 
                     if re_find:
                         if re_find[0] == relay_delay_enable:
@@ -1147,6 +1219,8 @@ class BgpAf(object):
         need_cfg = False
 
         vrf_name = module.params['vrf_name']
+        con_obj = self.get_bgp_af_leaves(
+            module=module, leaves=BGP_AF_OTHER_ARGS_LEAVES)
 
         max_load_ibgp_num = module.params['max_load_ibgp_num']
         if max_load_ibgp_num:
@@ -1154,15 +1228,10 @@ class BgpAf(object):
                 module.fail_json(
                     msg='Error: The value of max_load_ibgp_num %s is out of [1 - 65535].' % max_load_ibgp_num)
 
-            conf_str = CE_GET_BGP_ADDRESS_FAMILY_HEADER % vrf_name + \
-                "<maxLoadIbgpNum></maxLoadIbgpNum>" + CE_GET_BGP_ADDRESS_FAMILY_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<maxLoadIbgpNum>(.*)</maxLoadIbgpNum>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("maxLoadIbgpNum")
 
                 if re_find:
                     result["max_load_ibgp_num"] = re_find
@@ -1174,16 +1243,10 @@ class BgpAf(object):
 
         ibgp_ecmp_nexthop_changed = module.params['ibgp_ecmp_nexthop_changed']
         if ibgp_ecmp_nexthop_changed:
-
-            conf_str = CE_GET_BGP_ADDRESS_FAMILY_HEADER % vrf_name + \
-                "<ibgpEcmpNexthopChanged></ibgpEcmpNexthopChanged>" + CE_GET_BGP_ADDRESS_FAMILY_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<ibgpEcmpNexthopChanged>(.*)</ibgpEcmpNexthopChanged>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("ibgpEcmpNexthopChanged")
 
                 if re_find:
                     result["ibgp_ecmp_nexthop_changed"] = re_find
@@ -1199,15 +1262,10 @@ class BgpAf(object):
                 module.fail_json(
                     msg='Error: The value of max_load_ebgp_num %s is out of [1 - 65535].' % max_load_ebgp_num)
 
-            conf_str = CE_GET_BGP_ADDRESS_FAMILY_HEADER % vrf_name + \
-                "<maxLoadEbgpNum></maxLoadEbgpNum>" + CE_GET_BGP_ADDRESS_FAMILY_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<maxLoadEbgpNum>(.*)</maxLoadEbgpNum>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("maxLoadEbgpNum")
 
                 if re_find:
                     result["max_load_ebgp_num"] = re_find
@@ -1219,16 +1277,10 @@ class BgpAf(object):
 
         ebgp_ecmp_nexthop_changed = module.params['ebgp_ecmp_nexthop_changed']
         if ebgp_ecmp_nexthop_changed:
-
-            conf_str = CE_GET_BGP_ADDRESS_FAMILY_HEADER % vrf_name + \
-                "<ebgpEcmpNexthopChanged></ebgpEcmpNexthopChanged>" + CE_GET_BGP_ADDRESS_FAMILY_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<ebgpEcmpNexthopChanged>(.*)</ebgpEcmpNexthopChanged>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("ebgpEcmpNexthopChanged")
 
                 if re_find:
                     result["ebgp_ecmp_nexthop_changed"] = re_find
@@ -1244,15 +1296,10 @@ class BgpAf(object):
                 module.fail_json(
                     msg='Error: The value of maximum_load_balance %s is out of [1 - 65535].' % maximum_load_balance)
 
-            conf_str = CE_GET_BGP_ADDRESS_FAMILY_HEADER % vrf_name + \
-                "<maximumLoadBalance></maximumLoadBalance>" + CE_GET_BGP_ADDRESS_FAMILY_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<maximumLoadBalance>(.*)</maximumLoadBalance>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("maximumLoadBalance")
 
                 if re_find:
                     result["maximum_load_balance"] = re_find
@@ -1264,16 +1311,10 @@ class BgpAf(object):
 
         ecmp_nexthop_changed = module.params['ecmp_nexthop_changed']
         if ecmp_nexthop_changed:
-
-            conf_str = CE_GET_BGP_ADDRESS_FAMILY_HEADER % vrf_name + \
-                "<ecmpNexthopChanged></ecmpNexthopChanged>" + CE_GET_BGP_ADDRESS_FAMILY_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<ecmpNexthopChanged>(.*)</ecmpNexthopChanged>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("ecmpNexthopChanged")
 
                 if re_find:
                     result["ecmp_nexthop_changed"] = re_find
@@ -1289,15 +1330,10 @@ class BgpAf(object):
                 module.fail_json(
                     msg='Error: The value of default_local_pref %s is out of [0 - 4294967295].' % default_local_pref)
 
-            conf_str = CE_GET_BGP_ADDRESS_FAMILY_HEADER % vrf_name + \
-                "<defaultLocalPref></defaultLocalPref>" + CE_GET_BGP_ADDRESS_FAMILY_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<defaultLocalPref>(.*)</defaultLocalPref>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("defaultLocalPref")
 
                 if re_find:
                     result["default_local_pref"] = re_find
@@ -1313,15 +1349,10 @@ class BgpAf(object):
                 module.fail_json(
                     msg='Error: The value of default_med %s is out of [0 - 4294967295].' % default_med)
 
-            conf_str = CE_GET_BGP_ADDRESS_FAMILY_HEADER % vrf_name + \
-                "<defaultMed></defaultMed>" + CE_GET_BGP_ADDRESS_FAMILY_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<defaultMed>(.*)</defaultMed>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("defaultMed")
 
                 if re_find:
                     result["default_med"] = re_find
@@ -1333,16 +1364,10 @@ class BgpAf(object):
 
         default_rt_import_enable = module.params['default_rt_import_enable']
         if default_rt_import_enable:
-
-            conf_str = CE_GET_BGP_ADDRESS_FAMILY_HEADER % vrf_name + \
-                "<defaultRtImportEnable></defaultRtImportEnable>" + CE_GET_BGP_ADDRESS_FAMILY_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<defaultRtImportEnable>(.*)</defaultRtImportEnable>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("defaultRtImportEnable")
 
                 if re_find:
                     result["default_rt_import_enable"] = re_find
@@ -1358,15 +1383,10 @@ class BgpAf(object):
                 module.fail_json(
                     msg='Error: The len of router_id %s is out of [0 - 255].' % router_id)
 
-            conf_str = CE_GET_BGP_ADDRESS_FAMILY_HEADER % vrf_name + \
-                "<routerId></routerId>" + CE_GET_BGP_ADDRESS_FAMILY_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<routerId>(.*)</routerId>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("routerId")
 
                 if re_find:
                     result["router_id"] = re_find
@@ -1378,16 +1398,10 @@ class BgpAf(object):
 
         vrf_rid_auto_sel = module.params['vrf_rid_auto_sel']
         if vrf_rid_auto_sel:
-
-            conf_str = CE_GET_BGP_ADDRESS_FAMILY_HEADER % vrf_name + \
-                "<vrfRidAutoSel></vrfRidAutoSel>" + CE_GET_BGP_ADDRESS_FAMILY_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<vrfRidAutoSel>(.*)</vrfRidAutoSel>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("vrfRidAutoSel")
 
                 if re_find:
                     result["vrf_rid_auto_sel"] = re_find
@@ -1399,16 +1413,10 @@ class BgpAf(object):
 
         nexthop_third_party = module.params['nexthop_third_party']
         if nexthop_third_party:
-
-            conf_str = CE_GET_BGP_ADDRESS_FAMILY_HEADER % vrf_name + \
-                "<nexthopThirdParty></nexthopThirdParty>" + CE_GET_BGP_ADDRESS_FAMILY_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<nexthopThirdParty>(.*)</nexthopThirdParty>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("nexthopThirdParty")
 
                 if re_find:
                     result["nexthop_third_party"] = re_find
@@ -1420,16 +1428,10 @@ class BgpAf(object):
 
         summary_automatic = module.params['summary_automatic']
         if summary_automatic:
-
-            conf_str = CE_GET_BGP_ADDRESS_FAMILY_HEADER % vrf_name + \
-                "<summaryAutomatic></summaryAutomatic>" + CE_GET_BGP_ADDRESS_FAMILY_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<summaryAutomatic>(.*)</summaryAutomatic>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("summaryAutomatic")
 
                 if re_find:
                     result["summary_automatic"] = re_find
@@ -1441,16 +1443,10 @@ class BgpAf(object):
 
         auto_frr_enable = module.params['auto_frr_enable']
         if auto_frr_enable:
-
-            conf_str = CE_GET_BGP_ADDRESS_FAMILY_HEADER % vrf_name + \
-                "<autoFrrEnable></autoFrrEnable>" + CE_GET_BGP_ADDRESS_FAMILY_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<autoFrrEnable>(.*)</autoFrrEnable>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("autoFrrEnable")
 
                 if re_find:
                     result["auto_frr_enable"] = re_find
@@ -1463,17 +1459,10 @@ class BgpAf(object):
         load_balancing_as_path_ignore = module.params[
             'load_balancing_as_path_ignore']
         if load_balancing_as_path_ignore:
-
-            conf_str = CE_GET_BGP_ADDRESS_FAMILY_HEADER % vrf_name + \
-                "<loadBalancingAsPathIgnore></loadBalancingAsPathIgnore>" + \
-                CE_GET_BGP_ADDRESS_FAMILY_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<loadBalancingAsPathIgnore>(.*)</loadBalancingAsPathIgnore>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("loadBalancingAsPathIgnore")
 
                 if re_find:
                     result["load_balancing_as_path_ignore"] = re_find
@@ -1485,16 +1474,10 @@ class BgpAf(object):
 
         rib_only_enable = module.params['rib_only_enable']
         if rib_only_enable:
-
-            conf_str = CE_GET_BGP_ADDRESS_FAMILY_HEADER % vrf_name + \
-                "<ribOnlyEnable></ribOnlyEnable>" + CE_GET_BGP_ADDRESS_FAMILY_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<ribOnlyEnable>(.*)</ribOnlyEnable>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("ribOnlyEnable")
 
                 if re_find:
                     result["rib_only_enable"] = re_find
@@ -1510,15 +1493,10 @@ class BgpAf(object):
                 module.fail_json(
                     msg='Error: The len of rib_only_policy_name %s is out of [1 - 40].' % rib_only_policy_name)
 
-            conf_str = CE_GET_BGP_ADDRESS_FAMILY_HEADER % vrf_name + \
-                "<ribOnlyPolicyName></ribOnlyPolicyName>" + CE_GET_BGP_ADDRESS_FAMILY_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<ribOnlyPolicyName>(.*)</ribOnlyPolicyName>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("ribOnlyPolicyName")
 
                 if re_find:
                     result["rib_only_policy_name"] = re_find
@@ -1530,16 +1508,10 @@ class BgpAf(object):
 
         active_route_advertise = module.params['active_route_advertise']
         if active_route_advertise:
-
-            conf_str = CE_GET_BGP_ADDRESS_FAMILY_HEADER % vrf_name + \
-                "<activeRouteAdvertise></activeRouteAdvertise>" + CE_GET_BGP_ADDRESS_FAMILY_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<activeRouteAdvertise>(.*)</activeRouteAdvertise>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("activeRouteAdvertise")
 
                 if re_find:
                     result["active_route_advertise"] = re_find
@@ -1551,16 +1523,10 @@ class BgpAf(object):
 
         as_path_neglect = module.params['as_path_neglect']
         if as_path_neglect:
-
-            conf_str = CE_GET_BGP_ADDRESS_FAMILY_HEADER % vrf_name + \
-                "<asPathNeglect></asPathNeglect>" + CE_GET_BGP_ADDRESS_FAMILY_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<asPathNeglect>(.*)</asPathNeglect>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("asPathNeglect")
 
                 if re_find:
                     result["as_path_neglect"] = re_find
@@ -1572,16 +1538,10 @@ class BgpAf(object):
 
         med_none_as_maximum = module.params['med_none_as_maximum']
         if med_none_as_maximum:
-
-            conf_str = CE_GET_BGP_ADDRESS_FAMILY_HEADER % vrf_name + \
-                "<medNoneAsMaximum></medNoneAsMaximum>" + CE_GET_BGP_ADDRESS_FAMILY_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<medNoneAsMaximum>(.*)</medNoneAsMaximum>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("medNoneAsMaximum")
 
                 if re_find:
                     result["med_none_as_maximum"] = re_find
@@ -1593,16 +1553,10 @@ class BgpAf(object):
 
         router_id_neglect = module.params['router_id_neglect']
         if router_id_neglect:
-
-            conf_str = CE_GET_BGP_ADDRESS_FAMILY_HEADER % vrf_name + \
-                "<routerIdNeglect></routerIdNeglect>" + CE_GET_BGP_ADDRESS_FAMILY_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<routerIdNeglect>(.*)</routerIdNeglect>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("routerIdNeglect")
 
                 if re_find:
                     result["router_id_neglect"] = re_find
@@ -1614,16 +1568,10 @@ class BgpAf(object):
 
         igp_metric_ignore = module.params['igp_metric_ignore']
         if igp_metric_ignore:
-
-            conf_str = CE_GET_BGP_ADDRESS_FAMILY_HEADER % vrf_name + \
-                "<igpMetricIgnore></igpMetricIgnore>" + CE_GET_BGP_ADDRESS_FAMILY_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<igpMetricIgnore>(.*)</igpMetricIgnore>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("igpMetricIgnore")
 
                 if re_find:
                     result["igp_metric_ignore"] = re_find
@@ -1635,16 +1583,10 @@ class BgpAf(object):
 
         always_compare_med = module.params['always_compare_med']
         if always_compare_med:
-
-            conf_str = CE_GET_BGP_ADDRESS_FAMILY_HEADER % vrf_name + \
-                "<alwaysCompareMed></alwaysCompareMed>" + CE_GET_BGP_ADDRESS_FAMILY_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<alwaysCompareMed>(.*)</alwaysCompareMed>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("alwaysCompareMed")
 
                 if re_find:
                     result["always_compare_med"] = re_find
@@ -1656,16 +1598,10 @@ class BgpAf(object):
 
         determin_med = module.params['determin_med']
         if determin_med:
-
-            conf_str = CE_GET_BGP_ADDRESS_FAMILY_HEADER % vrf_name + \
-                "<determinMed></determinMed>" + CE_GET_BGP_ADDRESS_FAMILY_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<determinMed>(.*)</determinMed>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("determinMed")
 
                 if re_find:
                     result["determin_med"] = re_find
@@ -1681,15 +1617,10 @@ class BgpAf(object):
                 module.fail_json(
                     msg='Error: The value of preference_external %s is out of [1 - 255].' % preference_external)
 
-            conf_str = CE_GET_BGP_ADDRESS_FAMILY_HEADER % vrf_name + \
-                "<preferenceExternal></preferenceExternal>" + CE_GET_BGP_ADDRESS_FAMILY_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<preferenceExternal>(.*)</preferenceExternal>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("preferenceExternal")
 
                 if re_find:
                     result["preference_external"] = re_find
@@ -1705,15 +1636,10 @@ class BgpAf(object):
                 module.fail_json(
                     msg='Error: The value of preference_internal %s is out of [1 - 255].' % preference_internal)
 
-            conf_str = CE_GET_BGP_ADDRESS_FAMILY_HEADER % vrf_name + \
-                "<preferenceInternal></preferenceInternal>" + CE_GET_BGP_ADDRESS_FAMILY_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<preferenceInternal>(.*)</preferenceInternal>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("preferenceInternal")
 
                 if re_find:
                     result["preference_internal"] = re_find
@@ -1729,15 +1655,10 @@ class BgpAf(object):
                 module.fail_json(
                     msg='Error: The value of preference_local %s is out of [1 - 255].' % preference_local)
 
-            conf_str = CE_GET_BGP_ADDRESS_FAMILY_HEADER % vrf_name + \
-                "<preferenceLocal></preferenceLocal>" + CE_GET_BGP_ADDRESS_FAMILY_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<preferenceLocal>(.*)</preferenceLocal>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("preferenceLocal")
 
                 if re_find:
                     result["preference_local"] = re_find
@@ -1753,15 +1674,10 @@ class BgpAf(object):
                 module.fail_json(
                     msg='Error: The len of prefrence_policy_name %s is out of [1 - 40].' % prefrence_policy_name)
 
-            conf_str = CE_GET_BGP_ADDRESS_FAMILY_HEADER % vrf_name + \
-                "<prefrencePolicyName></prefrencePolicyName>" + CE_GET_BGP_ADDRESS_FAMILY_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<prefrencePolicyName>(.*)</prefrencePolicyName>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("prefrencePolicyName")
 
                 if re_find:
                     result["prefrence_policy_name"] = re_find
@@ -1773,16 +1689,10 @@ class BgpAf(object):
 
         reflect_between_client = module.params['reflect_between_client']
         if reflect_between_client:
-
-            conf_str = CE_GET_BGP_ADDRESS_FAMILY_HEADER % vrf_name + \
-                "<reflectBetweenClient></reflectBetweenClient>" + CE_GET_BGP_ADDRESS_FAMILY_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<reflectBetweenClient>(.*)</reflectBetweenClient>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("reflectBetweenClient")
 
                 if re_find:
                     result["reflect_between_client"] = re_find
@@ -1799,15 +1709,10 @@ class BgpAf(object):
                     msg='Error: The value of reflector_cluster_id %s is out of '
                         '[1 - 4294967295].' % reflector_cluster_id)
 
-            conf_str = CE_GET_BGP_ADDRESS_FAMILY_HEADER % vrf_name + \
-                "<reflectorClusterId></reflectorClusterId>" + CE_GET_BGP_ADDRESS_FAMILY_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<reflectorClusterId>(.*)</reflectorClusterId>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("reflectorClusterId")
 
                 if re_find:
                     result["reflector_cluster_id"] = re_find
@@ -1823,15 +1728,10 @@ class BgpAf(object):
                 module.fail_json(
                     msg='Error: The len of reflector_cluster_ipv4 %s is out of [0 - 255].' % reflector_cluster_ipv4)
 
-            conf_str = CE_GET_BGP_ADDRESS_FAMILY_HEADER % vrf_name + \
-                "<reflectorClusterIpv4></reflectorClusterIpv4>" + CE_GET_BGP_ADDRESS_FAMILY_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<reflectorClusterIpv4>(.*)</reflectorClusterIpv4>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("reflectorClusterIpv4")
 
                 if re_find:
                     result["reflector_cluster_ipv4"] = re_find
@@ -1847,15 +1747,10 @@ class BgpAf(object):
                 module.fail_json(
                     msg='Error: The len of rr_filter_number %s is out of [1 - 51].' % rr_filter_number)
 
-            conf_str = CE_GET_BGP_ADDRESS_FAMILY_HEADER % vrf_name + \
-                "<rrFilterNumber></rrFilterNumber>" + CE_GET_BGP_ADDRESS_FAMILY_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<rrFilterNumber>(.*)</rrFilterNumber>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("rrFilterNumber")
 
                 if re_find:
                     result["rr_filter_number"] = re_find
@@ -1867,16 +1762,10 @@ class BgpAf(object):
 
         policy_vpn_target = module.params['policy_vpn_target']
         if policy_vpn_target:
-
-            conf_str = CE_GET_BGP_ADDRESS_FAMILY_HEADER % vrf_name + \
-                "<policyVpnTarget></policyVpnTarget>" + CE_GET_BGP_ADDRESS_FAMILY_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<policyVpnTarget>(.*)</policyVpnTarget>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("policyVpnTarget")
 
                 if re_find:
                     result["policy_vpn_target"] = re_find
@@ -1888,16 +1777,10 @@ class BgpAf(object):
 
         next_hop_sel_depend_type = module.params['next_hop_sel_depend_type']
         if next_hop_sel_depend_type:
-
-            conf_str = CE_GET_BGP_ADDRESS_FAMILY_HEADER % vrf_name + \
-                "<nextHopSelDependType></nextHopSelDependType>" + CE_GET_BGP_ADDRESS_FAMILY_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<nextHopSelDependType>(.*)</nextHopSelDependType>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("nextHopSelDependType")
 
                 if re_find:
                     result["next_hop_sel_depend_type"] = re_find
@@ -1915,16 +1798,10 @@ class BgpAf(object):
                     msg='Error: The len of nhp_relay_route_policy_name %s is '
                         'out of [1 - 40].' % nhp_relay_route_policy_name)
 
-            conf_str = CE_GET_BGP_ADDRESS_FAMILY_HEADER % vrf_name + \
-                "<nhpRelayRoutePolicyName></nhpRelayRoutePolicyName>" + \
-                CE_GET_BGP_ADDRESS_FAMILY_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<nhpRelayRoutePolicyName>(.*)</nhpRelayRoutePolicyName>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("nhpRelayRoutePolicyName")
 
                 if re_find:
                     result["nhp_relay_route_policy_name"] = re_find
@@ -1936,16 +1813,10 @@ class BgpAf(object):
 
         ebgp_if_sensitive = module.params['ebgp_if_sensitive']
         if ebgp_if_sensitive:
-
-            conf_str = CE_GET_BGP_ADDRESS_FAMILY_HEADER % vrf_name + \
-                "<ebgpIfSensitive></ebgpIfSensitive>" + CE_GET_BGP_ADDRESS_FAMILY_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<ebgpIfSensitive>(.*)</ebgpIfSensitive>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("ebgpIfSensitive")
 
                 if re_find:
                     result["ebgp_if_sensitive"] = re_find
@@ -1957,16 +1828,10 @@ class BgpAf(object):
 
         reflect_chg_path = module.params['reflect_chg_path']
         if reflect_chg_path:
-
-            conf_str = CE_GET_BGP_ADDRESS_FAMILY_HEADER % vrf_name + \
-                "<reflectChgPath></reflectChgPath>" + CE_GET_BGP_ADDRESS_FAMILY_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<reflectChgPath>(.*)</reflectChgPath>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("reflectChgPath")
 
                 if re_find:
                     result["reflect_chg_path"] = re_find
@@ -1982,15 +1847,10 @@ class BgpAf(object):
                 module.fail_json(
                     msg='Error: The value of add_path_sel_num %s is out of [2 - 64].' % add_path_sel_num)
 
-            conf_str = CE_GET_BGP_ADDRESS_FAMILY_HEADER % vrf_name + \
-                "<addPathSelNum></addPathSelNum>" + CE_GET_BGP_ADDRESS_FAMILY_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<addPathSelNum>(.*)</addPathSelNum>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("addPathSelNum")
 
                 if re_find:
                     result["add_path_sel_num"] = re_find
@@ -2006,15 +1866,10 @@ class BgpAf(object):
                 module.fail_json(
                     msg='Error: The value of route_sel_delay %s is out of [0 - 3600].' % route_sel_delay)
 
-            conf_str = CE_GET_BGP_ADDRESS_FAMILY_HEADER % vrf_name + \
-                "<routeSelDelay></routeSelDelay>" + CE_GET_BGP_ADDRESS_FAMILY_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<routeSelDelay>(.*)</routeSelDelay>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("routeSelDelay")
 
                 if re_find:
                     result["route_sel_delay"] = re_find
@@ -2026,16 +1881,10 @@ class BgpAf(object):
 
         allow_invalid_as = module.params['allow_invalid_as']
         if allow_invalid_as:
-
-            conf_str = CE_GET_BGP_ADDRESS_FAMILY_HEADER % vrf_name + \
-                "<allowInvalidAs></allowInvalidAs>" + CE_GET_BGP_ADDRESS_FAMILY_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<allowInvalidAs>(.*)</allowInvalidAs>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("allowInvalidAs")
 
                 if re_find:
                     result["allow_invalid_as"] = re_find
@@ -2047,16 +1896,10 @@ class BgpAf(object):
 
         policy_ext_comm_enable = module.params['policy_ext_comm_enable']
         if policy_ext_comm_enable:
-
-            conf_str = CE_GET_BGP_ADDRESS_FAMILY_HEADER % vrf_name + \
-                "<policyExtCommEnable></policyExtCommEnable>" + CE_GET_BGP_ADDRESS_FAMILY_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<policyExtCommEnable>(.*)</policyExtCommEnable>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("policyExtCommEnable")
 
                 if re_find:
                     result["policy_ext_comm_enable"] = re_find
@@ -2068,16 +1911,10 @@ class BgpAf(object):
 
         supernet_uni_adv = module.params['supernet_uni_adv']
         if supernet_uni_adv:
-
-            conf_str = CE_GET_BGP_ADDRESS_FAMILY_HEADER % vrf_name + \
-                "<supernetUniAdv></supernetUniAdv>" + CE_GET_BGP_ADDRESS_FAMILY_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<supernetUniAdv>(.*)</supernetUniAdv>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("supernetUniAdv")
 
                 if re_find:
                     result["supernet_uni_adv"] = re_find
@@ -2089,16 +1926,10 @@ class BgpAf(object):
 
         supernet_label_adv = module.params['supernet_label_adv']
         if supernet_label_adv:
-
-            conf_str = CE_GET_BGP_ADDRESS_FAMILY_HEADER % vrf_name + \
-                "<supernetLabelAdv></supernetLabelAdv>" + CE_GET_BGP_ADDRESS_FAMILY_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<supernetLabelAdv>(.*)</supernetLabelAdv>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("supernetLabelAdv")
 
                 if re_find:
                     result["supernet_label_adv"] = re_find
@@ -2114,15 +1945,10 @@ class BgpAf(object):
                 module.fail_json(
                     msg='Error: The len of ingress_lsp_policy_name %s is out of [1 - 40].' % ingress_lsp_policy_name)
 
-            conf_str = CE_GET_BGP_ADDRESS_FAMILY_HEADER % vrf_name + \
-                "<ingressLspPolicyName></ingressLspPolicyName>" + CE_GET_BGP_ADDRESS_FAMILY_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<ingressLspPolicyName>(.*)</ingressLspPolicyName>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("ingressLspPolicyName")
 
                 if re_find:
                     result["ingress_lsp_policy_name"] = re_find
@@ -2134,16 +1960,10 @@ class BgpAf(object):
 
         originator_prior = module.params['originator_prior']
         if originator_prior:
-
-            conf_str = CE_GET_BGP_ADDRESS_FAMILY_HEADER % vrf_name + \
-                "<originatorPrior></originatorPrior>" + CE_GET_BGP_ADDRESS_FAMILY_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<originatorPrior>(.*)</originatorPrior>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("originatorPrior")
 
                 if re_find:
                     result["originator_prior"] = re_find
@@ -2155,16 +1975,10 @@ class BgpAf(object):
 
         lowest_priority = module.params['lowest_priority']
         if lowest_priority:
-
-            conf_str = CE_GET_BGP_ADDRESS_FAMILY_HEADER % vrf_name + \
-                "<lowestPriority></lowestPriority>" + CE_GET_BGP_ADDRESS_FAMILY_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<lowestPriority>(.*)</lowestPriority>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("lowestPriority")
 
                 if re_find:
                     result["lowest_priority"] = re_find
@@ -2176,16 +1990,10 @@ class BgpAf(object):
 
         relay_delay_enable = module.params['relay_delay_enable']
         if relay_delay_enable:
-
-            conf_str = CE_GET_BGP_ADDRESS_FAMILY_HEADER % vrf_name + \
-                "<relayDelayEnable></relayDelayEnable>" + CE_GET_BGP_ADDRESS_FAMILY_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<relayDelayEnable>(.*)</relayDelayEnable>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("relayDelayEnable")
 
                 if re_find:
                     result["relay_delay_enable"] = re_find
@@ -2258,9 +2066,7 @@ class BgpAf(object):
                 if "<data/>" in con_obj.xml:
                     import_need_cfg = True
                 else:
-                    re_find = re.findall(
-                        r'.*<importProtocol>(.*)</importProtocol>.*\s.*<importProcessId>(.*)</importProcessId>.*',
-                        con_obj.xml)
+                    re_find = decode_bgp_reply(con_obj.xml).pairs("importProtocol", "importProcessId")
 
                     if re_find:
                         result["bgp_import_route"] = re_find
@@ -2273,9 +2079,7 @@ class BgpAf(object):
                 if "<data/>" in con_obj.xml:
                     pass
                 else:
-                    re_find = re.findall(
-                        r'.*<importProtocol>(.*)</importProtocol>.*\s.*<importProcessId>(.*)</importProcessId>.*',
-                        con_obj.xml)
+                    re_find = decode_bgp_reply(con_obj.xml).pairs("importProtocol", "importProcessId")
 
                     if re_find:
                         result["bgp_import_route"] = re_find
@@ -2299,8 +2103,7 @@ class BgpAf(object):
                 if "<data/>" in con_obj.xml:
                     network_need_cfg = True
                 else:
-                    re_find = re.findall(
-                        r'.*<networkAddress>(.*)</networkAddress>.*\s.*<maskLen>(.*)</maskLen>.*', con_obj.xml)
+                    re_find = decode_bgp_reply(con_obj.xml).pairs("networkAddress", "maskLen")
 
                     if re_find:
                         result["bgp_network_route"] = re_find
@@ -2313,8 +2116,7 @@ class BgpAf(object):
                 if "<data/>" in con_obj.xml:
                     pass
                 else:
-                    re_find = re.findall(
-                        r'.*<networkAddress>(.*)</networkAddress>.*\s.*<maskLen>(.*)</maskLen>.*', con_obj.xml)
+                    re_find = decode_bgp_reply(con_obj.xml).pairs("networkAddress", "maskLen")
 
                     if re_find:
                         result["bgp_network_route"] = re_find
@@ -3307,6 +3109,17 @@ def main():
     if exist_tmp:
         existing["bgp import & network route"] = exist_tmp
 
+    # stage multi-step changes in the candidate and commit them once
+    pending = [bgp_af_rst["need_cfg"],
+               bgp_import_network_route_rst["import_need_cfg"],
+               bgp_import_network_route_rst["network_need_cfg"]]
+    if state == "present":
+        pending.append(bgp_af_other_rst["need_cfg"])
+    else:
+        pending.append(bgp_af_other_can_del_rst["need_cfg"])
+    if pending.count(True) > 1:
+        ce_bgp_af_obj.start_transaction(module=module)
+
     if state == "present":
         if bgp_af_rst["need_cfg"] and bgp_import_network_route_rst["import_need_cfg"] and \
                 bgp_import_network_route_rst["network_need_cfg"]:
@@ -3470,6 +3283,8 @@ def main():
         if bgp_af_other_rst["need_cfg"]:
             pass
 
+    ce_bgp_af_obj.commit_transaction(module=module)
+
     # state end bgp address family config
     bgp_af_rst = ce_bgp_af_obj.check_bgp_af_args(module=module)
     end_tmp = dict()
@@ -3503,6 +3318,7 @@ def main():
     results['end_state'] = end_state
     results['updates'] = updates
 
+    results.update(perf_results())
     module.exit_json(**results)
 
 
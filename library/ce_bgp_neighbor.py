@@ -279,11 +279,12 @@ updates:
     sample: ["peer 192.168.10.10 as-number 500"]
 '''
 
-import re
 import sys
 import socket
 from ansible.module_utils.network import NetworkModule
 from ansible.module_utils.cloudengine import get_netconf
+from ansible.module_utils.ce_bgp_reply import decode_bgp_reply
+from ansible.module_utils.ce_perf import perf_results
 
 try:
     from ncclient.operations.rpc import RPCError
@@ -569,8 +570,7 @@ class BgpNeighbor(object):
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<description>(.*)</description>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("description")
 
                 if re_find:
                     result["description"] = re_find
@@ -592,8 +592,7 @@ class BgpNeighbor(object):
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<fakeAs>(.*)</fakeAs>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("fakeAs")
 
                 if re_find:
                     result["fake_as"] = re_find
@@ -612,8 +611,7 @@ class BgpNeighbor(object):
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<dualAs>(.*)</dualAs>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("dualAs")
 
                 if re_find:
                     result["dual_as"] = re_find
@@ -632,8 +630,7 @@ class BgpNeighbor(object):
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<conventional>(.*)</conventional>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("conventional")
 
                 if re_find:
                     result["conventional"] = re_find
@@ -652,8 +649,7 @@ class BgpNeighbor(object):
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<routeRefresh>(.*)</routeRefresh>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("routeRefresh")
 
                 if re_find:
                     result["route_refresh"] = re_find
@@ -672,8 +668,7 @@ class BgpNeighbor(object):
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<fourByteAs>(.*)</fourByteAs>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("fourByteAs")
 
                 if re_find:
                     result["four_byte_as"] = re_find
@@ -692,8 +687,7 @@ class BgpNeighbor(object):
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<isIgnore>(.*)</isIgnore>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("isIgnore")
 
                 if re_find:
                     result["is_ignore"] = re_find
@@ -715,8 +709,7 @@ class BgpNeighbor(object):
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<localIfName>(.*)</localIfName>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("localIfName")
 
                 if re_find:
                     result["local_if_name"] = re_find
@@ -738,8 +731,7 @@ class BgpNeighbor(object):
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<ebgpMaxHop>(.*)</ebgpMaxHop>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("ebgpMaxHop")
 
                 if re_find:
                     result["ebgp_max_hop"] = re_find
@@ -761,8 +753,7 @@ class BgpNeighbor(object):
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<validTtlHops>(.*)</validTtlHops>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("validTtlHops")
 
                 if re_find:
                     result["valid_ttl_hops"] = re_find
@@ -781,8 +772,7 @@ class BgpNeighbor(object):
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<connectMode>(.*)</connectMode>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("connectMode")
 
                 if re_find:
                     result["connect_mode"] = re_find
@@ -801,8 +791,7 @@ class BgpNeighbor(object):
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<isLogChange>(.*)</isLogChange>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("isLogChange")
 
                 if re_find:
                     result["is_log_change"] = re_find
@@ -821,8 +810,7 @@ class BgpNeighbor(object):
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<pswdType>(.*)</pswdType>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("pswdType")
 
                 if re_find:
                     result["pswd_type"] = re_find
@@ -844,8 +832,7 @@ class BgpNeighbor(object):
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<pswdCipherText>(.*)</pswdCipherText>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("pswdCipherText")
 
                 if re_find:
                     result["pswd_cipher_text"] = re_find
@@ -867,8 +854,7 @@ class BgpNeighbor(object):
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<keepAliveTime>(.*)</keepAliveTime>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("keepAliveTime")
 
                 if re_find:
                     result["keep_alive_time"] = re_find
@@ -890,8 +876,7 @@ class BgpNeighbor(object):
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<holdTime>(.*)</holdTime>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("holdTime")
 
                 if re_find:
                     result["hold_time"] = re_find
@@ -913,8 +898,7 @@ class BgpNeighbor(object):
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<minHoldTime>(.*)</minHoldTime>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("minHoldTime")
 
                 if re_find:
                     result["min_hold_time"] = re_find
@@ -936,8 +920,7 @@ class BgpNeighbor(object):
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<keyChainName>(.*)</keyChainName>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("keyChainName")
 
                 if re_find:
                     result["key_chain_name"] = re_find
@@ -959,8 +942,7 @@ class BgpNeighbor(object):
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<connRetryTime>(.*)</connRetryTime>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("connRetryTime")
 
                 if re_find:
                     result["conn_retry_time"] = re_find
@@ -982,8 +964,7 @@ class BgpNeighbor(object):
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<tcpMSS>(.*)</tcpMSS>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("tcpMSS")
 
                 if re_find:
                     result["tcp_MSS"] = re_find
@@ -1002,8 +983,7 @@ class BgpNeighbor(object):
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<mplsLocalIfnetDisable>(.*)</mplsLocalIfnetDisable>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("mplsLocalIfnetDisable")
 
                 if re_find:
                     result["mpls_local_ifnet_disable"] = re_find
@@ -1022,8 +1002,7 @@ class BgpNeighbor(object):
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<prependGlobalAs>(.*)</prependGlobalAs>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("prependGlobalAs")
 
                 if re_find:
                     result["prepend_global_as"] = re_find
@@ -1042,8 +1021,7 @@ class BgpNeighbor(object):
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<prependFakeAs>(.*)</prependFakeAs>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("prependFakeAs")
 
                 if re_find:
                     result["prepend_fake_as"] = re_find
@@ -1085,8 +1063,7 @@ class BgpNeighbor(object):
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<isBfdBlock>(.*)</isBfdBlock>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("isBfdBlock")
 
                 if re_find:
                     result["is_bfd_block"] = re_find
@@ -1108,8 +1085,7 @@ class BgpNeighbor(object):
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<multiplier>(.*)</multiplier>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("multiplier")
 
                 if re_find:
                     result["multiplier"] = re_find
@@ -1128,8 +1104,7 @@ class BgpNeighbor(object):
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<isBfdEnable>(.*)</isBfdEnable>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("isBfdEnable")
 
                 if re_find:
                     result["is_bfd_enable"] = re_find
@@ -1151,8 +1126,7 @@ class BgpNeighbor(object):
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<rxInterval>(.*)</rxInterval>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("rxInterval")
 
                 if re_find:
                     result["rx_interval"] = re_find
@@ -1174,8 +1148,7 @@ class BgpNeighbor(object):
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<txInterval>(.*)</txInterval>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("txInterval")
 
                 if re_find:
                     result["tx_interval"] = re_find
@@ -1194,8 +1167,7 @@ class BgpNeighbor(object):
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<isSingleHop>(.*)</isSingleHop>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("isSingleHop")
 
                 if re_find:
                     result["is_single_hop"] = re_find
@@ -1237,8 +1209,7 @@ class BgpNeighbor(object):
             if "<data/>" in con_obj.xml:
                 pass
             else:
-                re_find = re.findall(
-                    r'.*<isBfdBlock>(.*)</isBfdBlock>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("isBfdBlock")
 
                 if re_find:
                     result["is_bfd_block"] = re_find
@@ -1258,8 +1229,7 @@ class BgpNeighbor(object):
             if "<data/>" in con_obj.xml:
                 pass
             else:
-                re_find = re.findall(
-                    r'.*<multiplier>(.*)</multiplier>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("multiplier")
 
                 if re_find:
                     result["multiplier"] = re_find
@@ -1276,8 +1246,7 @@ class BgpNeighbor(object):
             if "<data/>" in con_obj.xml:
                 pass
             else:
-                re_find = re.findall(
-                    r'.*<isBfdEnable>(.*)</isBfdEnable>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("isBfdEnable")
 
                 if re_find:
                     result["is_bfd_enable"] = re_find
@@ -1297,8 +1266,7 @@ class BgpNeighbor(object):
             if "<data/>" in con_obj.xml:
                 pass
             else:
-                re_find = re.findall(
-                    r'.*<rxInterval>(.*)</rxInterval>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("rxInterval")
 
                 if re_find:
                     result["rx_interval"] = re_find
@@ -1318,8 +1286,7 @@ class BgpNeighbor(object):
             if "<data/>" in con_obj.xml:
                 pass
             else:
-                re_find = re.findall(
-                    r'.*<txInterval>(.*)</txInterval>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("txInterval")
 
                 if re_find:
                     result["tx_interval"] = re_find
@@ -1336,8 +1303,7 @@ class BgpNeighbor(object):
             if "<data/>" in con_obj.xml:
                 pass
             else:
-                re_find = re.findall(
-                    r'.*<isSingleHop>(.*)</isSingleHop>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("isSingleHop")
 
                 if re_find:
                     result["is_single_hop"] = re_find
@@ -1369,8 +1335,7 @@ class BgpNeighbor(object):
         if "<data/>" in xml_str:
             return result
         else:
-            re_find = re.findall(
-                r'.*<peerAddr>(.*)</peerAddr>.*\s.*<remoteAs>(.*)</remoteAs>.*', xml_str)
+            re_find = decode_bgp_reply(xml_str).pairs("peerAddr", "remoteAs")
 
             if re_find:
                 return re_find
@@ -1398,8 +1363,7 @@ class BgpNeighbor(object):
         if "<data/>" in xml_str:
             return result
         else:
-            re_find = re.findall(
-                r'.*<peerAddr>(.*)</peerAddr>.*', xml_str)
+            re_find = decode_bgp_reply(xml_str).values("peerAddr")
 
             if re_find:
                 return re_find
@@ -2109,6 +2073,7 @@ def main():
     results['end_state'] = end_state
     results['updates'] = updates
 
+    results.update(perf_results())
     module.exit_json(**results)
 
 
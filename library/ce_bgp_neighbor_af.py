@@ -448,11 +448,12 @@ updates:
     sample: ["peer 192.168.10.10 next-hop-local"]
 '''
 
-import re
 import sys
 import socket
 from ansible.module_utils.network import NetworkModule
 from ansible.module_utils.cloudengine import get_netconf
+from ansible.module_utils.ce_bgp_reply import decode_bgp_reply
+from ansible.module_utils.ce_perf import perf_results
 
 try:
     from ncclient.operations.rpc import RPCError
@@ -587,6 +588,59 @@ def check_ip_addr(**kwargs):
     return True
 
 
+# module parameters and the leaves check_bgp_neighbor_af_other compares them with
+BGP_PEER_AF_OTHER_LEAVES = [
+    ('advertise_irb', 'advertiseIrb'),
+    ('advertise_arp', 'advertiseArp'),
+    ('advertise_remote_nexthop', 'advertiseRemoteNexthop'),
+    ('advertise_community', 'advertiseCommunity'),
+    ('advertise_ext_community', 'advertiseExtCommunity'),
+    ('discard_ext_community', 'discardExtCommunity'),
+    ('allow_as_loop_enable', 'allowAsLoopEnable'),
+    ('allow_as_loop_limit', 'allowAsLoopLimit'),
+    ('keep_all_routes', 'keepAllRoutes'),
+    ('nexthop_configure', 'nextHopConfigure'),
+    ('preferred_value', 'preferredValue'),
+    ('public_as_only', 'publicAsOnly'),
+    ('public_as_only_force', 'publicAsOnlyForce'),
+    ('public_as_only_limited', 'publicAsOnlyLimited'),
+    ('public_as_only_replace', 'publicAsOnlyReplace'),
+    ('public_as_only_skip_peer_as', 'publicAsOnlySkipPeerAs'),
+    ('route_limit', 'routeLimit'),
+    ('route_limit_percent', 'routeLimitPercent'),
+    ('route_limit_type', 'routeLimitType'),
+    ('route_limit_idle_timeout', 'routeLimitIdleTimeout'),
+    ('rt_updt_interval', 'rtUpdtInterval'),
+    ('redirect_ip', 'redirectIP'),
+    ('redirect_ip_vaildation', 'redirectIPVaildation'),
+    ('reflect_client', 'reflectClient'),
+    ('substitute_as_enable', 'substituteAsEnable'),
+    ('import_rt_policy_name', 'importRtPolicyName'),
+    ('export_rt_policy_name', 'exportRtPolicyName'),
+    ('import_pref_filt_name', 'importPrefFiltName'),
+    ('export_pref_filt_name', 'exportPrefFiltName'),
+    ('import_as_path_filter', 'importAsPathFilter'),
+    ('export_as_path_filter', 'exportAsPathFilter'),
+    ('import_as_path_name_or_num', 'importAsPathNameOrNum'),
+    ('export_as_path_name_or_num', 'exportAsPathNameOrNum'),
+    ('import_acl_name_or_num', 'importAclNameOrNum'),
+    ('export_acl_name_or_num', 'exportAclNameOrNum'),
+    ('ipprefix_orf_enable', 'ipprefixOrfEnable'),
+    ('is_nonstd_ipprefix_mod', 'isNonstdIpprefixMod'),
+    ('orftype', 'orftype'),
+    ('orf_mode', 'orfMode'),
+    ('soostring', 'soostring'),
+    ('default_rt_adv_enable', 'defaultRtAdvEnable'),
+    ('default_rt_adv_policy', 'defaultRtAdvPolicy'),
+    ('default_rt_match_mode', 'defaultRtMatchMode'),
+    ('add_path_mode', 'addPathMode'),
+    ('adv_add_path_num', 'advAddPathNum'),
+    ('origin_as_valid', 'originAsValid'),
+    ('vpls_enable', 'vplsEnable'),
+    ('vpls_ad_disable', 'vplsAdDisable'),
+    ('update_pkt_standard_compatible', 'updatePktStandardCompatible'),
+]
+
 class BgpNeighborAf(object):
     """ Manages BGP neighbor Address-family configuration """
 
@@ -609,6 +663,25 @@ class BgpNeighborAf(object):
 
         return con_obj
 
+    def get_bgp_peer_af_leaves(self, **kwargs):
+        """ get the leaves of the requested parameters in one get """
+
+        module = kwargs["module"]
+        leaves = kwargs["leaves"]
+        vrf_name = module.params['vrf_name']
+        af_type = module.params['af_type']
+
+        leaf_str = ""
+        for param, leaf in leaves:
+            if module.params[param]:
+                leaf_str += "<%s></%s>" % (leaf, leaf)
+        if not leaf_str:
+            return None
+
+        conf_str = CE_GET_BGP_PEER_AF_HEADER % (
+            vrf_name, af_type) + leaf_str + CE_GET_BGP_PEER_AF_TAIL
+        return self.netconf_get_config(module=module, conf_str=conf_str)
+
     def netconf_set_config(self, **kwargs):
         """ netconf_set_config """
 
@@ -652,8 +725,7 @@ class BgpNeighborAf(object):
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<remoteAddress>(.*)</remoteAddress>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("remoteAddress")
 
                 if re_find:
                     result["remote_address"] = re_find
@@ -667,8 +739,7 @@ class BgpNeighborAf(object):
             if "<data/>" in con_obj.xml:
                 pass
             else:
-                re_find = re.findall(
-                    r'.*<remoteAddress>(.*)</remoteAddress>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("remoteAddress")
 
                 if re_find:
                     result["remote_address"] = re_find
@@ -695,18 +766,15 @@ class BgpNeighborAf(object):
             result["need_cfg"] = need_cfg
             return result
 
+        con_obj = self.get_bgp_peer_af_leaves(
+            module=module, leaves=BGP_PEER_AF_OTHER_LEAVES)
+
         advertise_irb = module.params['advertise_irb']
         if advertise_irb:
-
-            conf_str = CE_GET_BGP_PEER_AF_HEADER % (
-                vrf_name, af_type) + "<advertiseIrb></advertiseIrb>" + CE_GET_BGP_PEER_AF_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<advertiseIrb>(.*)</advertiseIrb>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("advertiseIrb")
 
                 if re_find:
                     result["advertise_irb"] = re_find
@@ -719,16 +787,10 @@ class BgpNeighborAf(object):
 
         advertise_arp = module.params['advertise_arp']
         if advertise_arp:
-
-            conf_str = CE_GET_BGP_PEER_AF_HEADER % (
-                vrf_name, af_type) + "<advertiseArp></advertiseArp>" + CE_GET_BGP_PEER_AF_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<advertiseArp>(.*)</advertiseArp>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("advertiseArp")
 
                 if re_find:
                     result["advertise_arp"] = re_find
@@ -741,16 +803,10 @@ class BgpNeighborAf(object):
 
         advertise_remote_nexthop = module.params['advertise_remote_nexthop']
         if advertise_remote_nexthop:
-
-            conf_str = CE_GET_BGP_PEER_AF_HEADER % (
-                vrf_name, af_type) + "<advertiseRemoteNexthop></advertiseRemoteNexthop>" + CE_GET_BGP_PEER_AF_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<advertiseRemoteNexthop>(.*)</advertiseRemoteNexthop>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("advertiseRemoteNexthop")
 
                 if re_find:
                     result["advertise_remote_nexthop"] = re_find
@@ -763,16 +819,10 @@ class BgpNeighborAf(object):
 
         advertise_community = module.params['advertise_community']
         if advertise_community:
-
-            conf_str = CE_GET_BGP_PEER_AF_HEADER % (
-                vrf_name, af_type) + "<advertiseCommunity></advertiseCommunity>" + CE_GET_BGP_PEER_AF_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<advertiseCommunity>(.*)</advertiseCommunity>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("advertiseCommunity")
 
                 if re_find:
                     result["advertise_community"] = re_find
@@ -785,16 +835,10 @@ class BgpNeighborAf(object):
 
         advertise_ext_community = module.params['advertise_ext_community']
         if advertise_ext_community:
-
-            conf_str = CE_GET_BGP_PEER_AF_HEADER % (
-                vrf_name, af_type) + "<advertiseExtCommunity></advertiseExtCommunity>" + CE_GET_BGP_PEER_AF_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<advertiseExtCommunity>(.*)</advertiseExtCommunity>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("advertiseExtCommunity")
 
                 if re_find:
                     result["advertise_ext_community"] = re_find
@@ -807,16 +851,10 @@ class BgpNeighborAf(object):
 
         discard_ext_community = module.params['discard_ext_community']
         if discard_ext_community:
-
-            conf_str = CE_GET_BGP_PEER_AF_HEADER % (
-                vrf_name, af_type) + "<discardExtCommunity></discardExtCommunity>" + CE_GET_BGP_PEER_AF_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<discardExtCommunity>(.*)</discardExtCommunity>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("discardExtCommunity")
 
                 if re_find:
                     result["discard_ext_community"] = re_find
@@ -829,16 +867,10 @@ class BgpNeighborAf(object):
 
         allow_as_loop_enable = module.params['allow_as_loop_enable']
         if allow_as_loop_enable:
-
-            conf_str = CE_GET_BGP_PEER_AF_HEADER % (
-                vrf_name, af_type) + "<allowAsLoopEnable></allowAsLoopEnable>" + CE_GET_BGP_PEER_AF_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<allowAsLoopEnable>(.*)</allowAsLoopEnable>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("allowAsLoopEnable")
 
                 if re_find:
                     result["allow_as_loop_enable"] = re_find
@@ -855,15 +887,10 @@ class BgpNeighborAf(object):
                 module.fail_json(
                     msg='the value of allow_as_loop_limit %s is out of [1 - 10].' % allow_as_loop_limit)
 
-            conf_str = CE_GET_BGP_PEER_AF_HEADER % (
-                vrf_name, af_type) + "<allowAsLoopLimit></allowAsLoopLimit>" + CE_GET_BGP_PEER_AF_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<allowAsLoopLimit>(.*)</allowAsLoopLimit>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("allowAsLoopLimit")
 
                 if re_find:
                     result["allow_as_loop_limit"] = re_find
@@ -876,16 +903,10 @@ class BgpNeighborAf(object):
 
         keep_all_routes = module.params['keep_all_routes']
         if keep_all_routes:
-
-            conf_str = CE_GET_BGP_PEER_AF_HEADER % (
-                vrf_name, af_type) + "<keepAllRoutes></keepAllRoutes>" + CE_GET_BGP_PEER_AF_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<keepAllRoutes>(.*)</keepAllRoutes>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("keepAllRoutes")
 
                 if re_find:
                     result["keep_all_routes"] = re_find
@@ -898,16 +919,10 @@ class BgpNeighborAf(object):
 
         nexthop_configure = module.params['nexthop_configure']
         if nexthop_configure:
-
-            conf_str = CE_GET_BGP_PEER_AF_HEADER % (
-                vrf_name, af_type) + "<nextHopConfigure></nextHopConfigure>" + CE_GET_BGP_PEER_AF_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<nextHopConfigure>(.*)</nextHopConfigure>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("nextHopConfigure")
 
                 if re_find:
                     result["nexthop_configure"] = re_find
@@ -924,15 +939,10 @@ class BgpNeighborAf(object):
                 module.fail_json(
                     msg='the value of preferred_value %s is out of [0 - 65535].' % preferred_value)
 
-            conf_str = CE_GET_BGP_PEER_AF_HEADER % (
-                vrf_name, af_type) + "<preferredValue></preferredValue>" + CE_GET_BGP_PEER_AF_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<preferredValue>(.*)</preferredValue>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("preferredValue")
 
                 if re_find:
                     result["preferred_value"] = re_find
@@ -945,16 +955,10 @@ class BgpNeighborAf(object):
 
         public_as_only = module.params['public_as_only']
         if public_as_only:
-
-            conf_str = CE_GET_BGP_PEER_AF_HEADER % (
-                vrf_name, af_type) + "<publicAsOnly></publicAsOnly>" + CE_GET_BGP_PEER_AF_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<publicAsOnly>(.*)</publicAsOnly>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("publicAsOnly")
 
                 if re_find:
                     result["public_as_only"] = re_find
@@ -967,16 +971,10 @@ class BgpNeighborAf(object):
 
         public_as_only_force = module.params['public_as_only_force']
         if public_as_only_force:
-
-            conf_str = CE_GET_BGP_PEER_AF_HEADER % (
-                vrf_name, af_type) + "<publicAsOnlyForce></publicAsOnlyForce>" + CE_GET_BGP_PEER_AF_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<publicAsOnlyForce>(.*)</publicAsOnlyForce>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("publicAsOnlyForce")
 
                 if re_find:
                     result["public_as_only_force"] = re_find
@@ -989,16 +987,10 @@ class BgpNeighborAf(object):
 
         public_as_only_limited = module.params['public_as_only_limited']
         if public_as_only_limited:
-
-            conf_str = CE_GET_BGP_PEER_AF_HEADER % (
-                vrf_name, af_type) + "<publicAsOnlyLimited></publicAsOnlyLimited>" + CE_GET_BGP_PEER_AF_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<publicAsOnlyLimited>(.*)</publicAsOnlyLimited>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("publicAsOnlyLimited")
 
                 if re_find:
                     result["public_as_only_limited"] = re_find
@@ -1011,16 +1003,10 @@ class BgpNeighborAf(object):
 
         public_as_only_replace = module.params['public_as_only_replace']
         if public_as_only_replace:
-
-            conf_str = CE_GET_BGP_PEER_AF_HEADER % (
-                vrf_name, af_type) + "<publicAsOnlyReplace></publicAsOnlyReplace>" + CE_GET_BGP_PEER_AF_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<publicAsOnlyReplace>(.*)</publicAsOnlyReplace>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("publicAsOnlyReplace")
 
                 if re_find:
                     result["public_as_only_replace"] = re_find
@@ -1034,16 +1020,10 @@ class BgpNeighborAf(object):
         public_as_only_skip_peer_as = module.params[
             'public_as_only_skip_peer_as']
         if public_as_only_skip_peer_as:
-
-            conf_str = CE_GET_BGP_PEER_AF_HEADER % (
-                vrf_name, af_type) + "<publicAsOnlySkipPeerAs></publicAsOnlySkipPeerAs>" + CE_GET_BGP_PEER_AF_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<publicAsOnlySkipPeerAs>(.*)</publicAsOnlySkipPeerAs>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("publicAsOnlySkipPeerAs")
 
                 if re_find:
                     result["public_as_only_skip_peer_as"] = re_find
@@ -1056,20 +1036,14 @@ class BgpNeighborAf(object):
 
         route_limit = module.params['route_limit']
         if route_limit:
-
             if int(route_limit) < 1:
                 module.fail_json(
                     msg='the value of route_limit %s is out of [1 - 4294967295].' % route_limit)
 
-            conf_str = CE_GET_BGP_PEER_AF_HEADER % (
-                vrf_name, af_type) + "<routeLimit></routeLimit>" + CE_GET_BGP_PEER_AF_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<routeLimit>(.*)</routeLimit>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("routeLimit")
 
                 if re_find:
                     result["route_limit"] = re_find
@@ -1082,20 +1056,14 @@ class BgpNeighborAf(object):
 
         route_limit_percent = module.params['route_limit_percent']
         if route_limit_percent:
-
             if int(route_limit_percent) < 1 or int(route_limit_percent) > 100:
                 module.fail_json(
                     msg='Error: The value of route_limit_percent %s is out of [1 - 100].' % route_limit_percent)
 
-            conf_str = CE_GET_BGP_PEER_AF_HEADER % (
-                vrf_name, af_type) + "<routeLimitPercent></routeLimitPercent>" + CE_GET_BGP_PEER_AF_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<routeLimitPercent>(.*)</routeLimitPercent>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("routeLimitPercent")
 
                 if re_find:
                     result["route_limit_percent"] = re_find
@@ -1108,16 +1076,10 @@ class BgpNeighborAf(object):
 
         route_limit_type = module.params['route_limit_type']
         if route_limit_type:
-
-            conf_str = CE_GET_BGP_PEER_AF_HEADER % (
-                vrf_name, af_type) + "<routeLimitType></routeLimitType>" + CE_GET_BGP_PEER_AF_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<routeLimitType>(.*)</routeLimitType>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("routeLimitType")
 
                 if re_find:
                     result["route_limit_type"] = re_find
@@ -1130,21 +1092,15 @@ class BgpNeighborAf(object):
 
         route_limit_idle_timeout = module.params['route_limit_idle_timeout']
         if route_limit_idle_timeout:
-
             if int(route_limit_idle_timeout) < 1 or int(route_limit_idle_timeout) > 1200:
                 module.fail_json(
                     msg='Error: The value of route_limit_idle_timeout %s is out of '
                         '[1 - 1200].' % route_limit_idle_timeout)
 
-            conf_str = CE_GET_BGP_PEER_AF_HEADER % (
-                vrf_name, af_type) + "<routeLimitIdleTimeout></routeLimitPercent>" + CE_GET_BGP_PEER_AF_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<routeLimitIdleTimeout>(.*)</routeLimitIdleTimeout>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("routeLimitIdleTimeout")
 
                 if re_find:
                     result["route_limit_idle_timeout"] = re_find
@@ -1157,20 +1113,14 @@ class BgpNeighborAf(object):
 
         rt_updt_interval = module.params['rt_updt_interval']
         if rt_updt_interval:
-
             if int(rt_updt_interval) < 0 or int(rt_updt_interval) > 600:
                 module.fail_json(
                     msg='Error: The value of rt_updt_interval %s is out of [0 - 600].' % rt_updt_interval)
 
-            conf_str = CE_GET_BGP_PEER_AF_HEADER % (
-                vrf_name, af_type) + "<rtUpdtInterval></rtUpdtInterval>" + CE_GET_BGP_PEER_AF_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<rtUpdtInterval>(.*)</rtUpdtInterval>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("rtUpdtInterval")
 
                 if re_find:
                     result["rt_updt_interval"] = re_find
@@ -1183,16 +1133,10 @@ class BgpNeighborAf(object):
 
         redirect_ip = module.params['redirect_ip']
         if redirect_ip:
-
-            conf_str = CE_GET_BGP_PEER_AF_HEADER % (
-                vrf_name, af_type) + "<redirectIP></redirectIP>" + CE_GET_BGP_PEER_AF_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<redirectIP>(.*)</redirectIP>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("redirectIP")
 
                 if re_find:
                     result["redirect_ip"] = re_find
@@ -1205,16 +1149,10 @@ class BgpNeighborAf(object):
 
         redirect_ip_vaildation = module.params['redirect_ip_vaildation']
         if redirect_ip_vaildation:
-
-            conf_str = CE_GET_BGP_PEER_AF_HEADER % (
-                vrf_name, af_type) + "<redirectIPVaildation></redirectIPVaildation>" + CE_GET_BGP_PEER_AF_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<redirectIPVaildation>(.*)</redirectIPVaildation>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("redirectIPVaildation")
 
                 if re_find:
                     result["redirect_ip_vaildation"] = re_find
@@ -1227,16 +1165,10 @@ class BgpNeighborAf(object):
 
         reflect_client = module.params['reflect_client']
         if reflect_client:
-
-            conf_str = CE_GET_BGP_PEER_AF_HEADER % (
-                vrf_name, af_type) + "<reflectClient></reflectClient>" + CE_GET_BGP_PEER_AF_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<reflectClient>(.*)</reflectClient>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("reflectClient")
 
                 if re_find:
                     result["reflect_client"] = re_find
@@ -1249,16 +1181,10 @@ class BgpNeighborAf(object):
 
         substitute_as_enable = module.params['substitute_as_enable']
         if substitute_as_enable:
-
-            conf_str = CE_GET_BGP_PEER_AF_HEADER % (
-                vrf_name, af_type) + "<substituteAsEnable></substituteAsEnable>" + CE_GET_BGP_PEER_AF_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<substituteAsEnable>(.*)</substituteAsEnable>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("substituteAsEnable")
 
                 if re_find:
                     result["substitute_as_enable"] = re_find
@@ -1271,20 +1197,14 @@ class BgpNeighborAf(object):
 
         import_rt_policy_name = module.params['import_rt_policy_name']
         if import_rt_policy_name:
-
             if len(import_rt_policy_name) < 1 or len(import_rt_policy_name) > 40:
                 module.fail_json(
                     msg='Error: The len of import_rt_policy_name %s is out of [1 - 40].' % import_rt_policy_name)
 
-            conf_str = CE_GET_BGP_PEER_AF_HEADER % (
-                vrf_name, af_type) + "<importRtPolicyName></importRtPolicyName>" + CE_GET_BGP_PEER_AF_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<importRtPolicyName>(.*)</importRtPolicyName>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("importRtPolicyName")
 
                 if re_find:
                     result["import_rt_policy_name"] = re_find
@@ -1297,20 +1217,14 @@ class BgpNeighborAf(object):
 
         export_rt_policy_name = module.params['export_rt_policy_name']
         if export_rt_policy_name:
-
             if len(export_rt_policy_name) < 1 or len(export_rt_policy_name) > 40:
                 module.fail_json(
                     msg='Error: The len of export_rt_policy_name %s is out of [1 - 40].' % export_rt_policy_name)
 
-            conf_str = CE_GET_BGP_PEER_AF_HEADER % (
-                vrf_name, af_type) + "<exportRtPolicyName></exportRtPolicyName>" + CE_GET_BGP_PEER_AF_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<exportRtPolicyName>(.*)</exportRtPolicyName>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("exportRtPolicyName")
 
                 if re_find:
                     result["export_rt_policy_name"] = re_find
@@ -1323,20 +1237,14 @@ class BgpNeighborAf(object):
 
         import_pref_filt_name = module.params['import_pref_filt_name']
         if import_pref_filt_name:
-
             if len(import_pref_filt_name) < 1 or len(import_pref_filt_name) > 169:
                 module.fail_json(
                     msg='Error: The len of import_pref_filt_name %s is out of [1 - 169].' % import_pref_filt_name)
 
-            conf_str = CE_GET_BGP_PEER_AF_HEADER % (
-                vrf_name, af_type) + "<importPrefFiltName></importPrefFiltName>" + CE_GET_BGP_PEER_AF_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<importPrefFiltName>(.*)</importPrefFiltName>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("importPrefFiltName")
 
                 if re_find:
                     result["import_pref_filt_name"] = re_find
@@ -1349,20 +1257,14 @@ class BgpNeighborAf(object):
 
         export_pref_filt_name = module.params['export_pref_filt_name']
         if export_pref_filt_name:
-
             if len(export_pref_filt_name) < 1 or len(export_pref_filt_name) > 169:
                 module.fail_json(
                     msg='Error: The len of export_pref_filt_name %s is out of [1 - 169].' % export_pref_filt_name)
 
-            conf_str = CE_GET_BGP_PEER_AF_HEADER % (
-                vrf_name, af_type) + "<exportPrefFiltName></exportPrefFiltName>" + CE_GET_BGP_PEER_AF_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<exportPrefFiltName>(.*)</exportPrefFiltName>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("exportPrefFiltName")
 
                 if re_find:
                     result["export_pref_filt_name"] = re_find
@@ -1375,20 +1277,14 @@ class BgpNeighborAf(object):
 
         import_as_path_filter = module.params['import_as_path_filter']
         if import_as_path_filter:
-
             if int(import_as_path_filter) < 1 or int(import_as_path_filter) > 256:
                 module.fail_json(
                     msg='Error: The value of import_as_path_filter %s is out of [1 - 256].' % import_as_path_filter)
 
-            conf_str = CE_GET_BGP_PEER_AF_HEADER % (
-                vrf_name, af_type) + "<importAsPathFilter></importAsPathFilter>" + CE_GET_BGP_PEER_AF_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<importAsPathFilter>(.*)</importAsPathFilter>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("importAsPathFilter")
 
                 if re_find:
                     result["import_as_path_filter"] = re_find
@@ -1401,20 +1297,14 @@ class BgpNeighborAf(object):
 
         export_as_path_filter = module.params['export_as_path_filter']
         if export_as_path_filter:
-
             if int(export_as_path_filter) < 1 or int(export_as_path_filter) > 256:
                 module.fail_json(
                     msg='Error: The value of export_as_path_filter %s is out of [1 - 256].' % export_as_path_filter)
 
-            conf_str = CE_GET_BGP_PEER_AF_HEADER % (
-                vrf_name, af_type) + "<exportAsPathFilter></exportAsPathFilter>" + CE_GET_BGP_PEER_AF_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<exportAsPathFilter>(.*)</exportAsPathFilter>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("exportAsPathFilter")
 
                 if re_find:
                     result["export_as_path_filter"] = re_find
@@ -1428,21 +1318,15 @@ class BgpNeighborAf(object):
         import_as_path_name_or_num = module.params[
             'import_as_path_name_or_num']
         if import_as_path_name_or_num:
-
             if len(import_as_path_name_or_num) < 1 or len(import_as_path_name_or_num) > 51:
                 module.fail_json(
                     msg='Error: The len of import_as_path_name_or_num %s is out '
                         'of [1 - 51].' % import_as_path_name_or_num)
 
-            conf_str = CE_GET_BGP_PEER_AF_HEADER % (
-                vrf_name, af_type) + "<importAsPathNameOrNum></importAsPathNameOrNum>" + CE_GET_BGP_PEER_AF_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<importAsPathNameOrNum>(.*)</importAsPathNameOrNum>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("importAsPathNameOrNum")
 
                 if re_find:
                     result["import_as_path_name_or_num"] = re_find
@@ -1456,21 +1340,15 @@ class BgpNeighborAf(object):
         export_as_path_name_or_num = module.params[
             'export_as_path_name_or_num']
         if export_as_path_name_or_num:
-
             if len(export_as_path_name_or_num) < 1 or len(export_as_path_name_or_num) > 51:
                 module.fail_json(
                     msg='Error: The len of export_as_path_name_or_num %s is out '
                         'of [1 - 51].' % export_as_path_name_or_num)
 
-            conf_str = CE_GET_BGP_PEER_AF_HEADER % (
-                vrf_name, af_type) + "<exportAsPathNameOrNum></exportAsPathNameOrNum>" + CE_GET_BGP_PEER_AF_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<exportAsPathNameOrNum>(.*)</exportAsPathNameOrNum>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("exportAsPathNameOrNum")
 
                 if re_find:
                     result["export_as_path_name_or_num"] = re_find
@@ -1483,20 +1361,14 @@ class BgpNeighborAf(object):
 
         import_acl_name_or_num = module.params['import_acl_name_or_num']
         if import_acl_name_or_num:
-
             if len(import_acl_name_or_num) < 1 or len(import_acl_name_or_num) > 32:
                 module.fail_json(
                     msg='Error: The len of import_acl_name_or_num %s is out of [1 - 32].' % import_acl_name_or_num)
 
-            conf_str = CE_GET_BGP_PEER_AF_HEADER % (
-                vrf_name, af_type) + "<importAclNameOrNum></importAclNameOrNum>" + CE_GET_BGP_PEER_AF_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<importAclNameOrNum>(.*)</importAclNameOrNum>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("importAclNameOrNum")
 
                 if re_find:
                     result["import_acl_name_or_num"] = re_find
@@ -1509,20 +1381,14 @@ class BgpNeighborAf(object):
 
         export_acl_name_or_num = module.params['export_acl_name_or_num']
         if export_acl_name_or_num:
-
             if len(export_acl_name_or_num) < 1 or len(export_acl_name_or_num) > 32:
                 module.fail_json(
                     msg='Error: The len of export_acl_name_or_num %s is out of [1 - 32].' % export_acl_name_or_num)
 
-            conf_str = CE_GET_BGP_PEER_AF_HEADER % (
-                vrf_name, af_type) + "<exportAclNameOrNum></exportAclNameOrNum>" + CE_GET_BGP_PEER_AF_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<exportAclNameOrNum>(.*)</exportAclNameOrNum>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("exportAclNameOrNum")
 
                 if re_find:
                     result["export_acl_name_or_num"] = re_find
@@ -1535,16 +1401,10 @@ class BgpNeighborAf(object):
 
         ipprefix_orf_enable = module.params['ipprefix_orf_enable']
         if ipprefix_orf_enable:
-
-            conf_str = CE_GET_BGP_PEER_AF_HEADER % (
-                vrf_name, af_type) + "<ipprefixOrfEnable></ipprefixOrfEnable>" + CE_GET_BGP_PEER_AF_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<ipprefixOrfEnable>(.*)</ipprefixOrfEnable>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("ipprefixOrfEnable")
 
                 if re_find:
                     result["ipprefix_orf_enable"] = re_find
@@ -1557,16 +1417,10 @@ class BgpNeighborAf(object):
 
         is_nonstd_ipprefix_mod = module.params['is_nonstd_ipprefix_mod']
         if is_nonstd_ipprefix_mod:
-
-            conf_str = CE_GET_BGP_PEER_AF_HEADER % (
-                vrf_name, af_type) + "<isNonstdIpprefixMod></isNonstdIpprefixMod>" + CE_GET_BGP_PEER_AF_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<isNonstdIpprefixMod>(.*)</isNonstdIpprefixMod>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("isNonstdIpprefixMod")
 
                 if re_find:
                     result["is_nonstd_ipprefix_mod"] = re_find
@@ -1579,20 +1433,14 @@ class BgpNeighborAf(object):
 
         orftype = module.params['orftype']
         if orftype:
-
             if int(orftype) < 0 or int(orftype) > 65535:
                 module.fail_json(
                     msg='Error: The value of orftype %s is out of [0 - 65535].' % orftype)
 
-            conf_str = CE_GET_BGP_PEER_AF_HEADER % (
-                vrf_name, af_type) + "<orftype></orftype>" + CE_GET_BGP_PEER_AF_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<orftype>(.*)</orftype>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("orftype")
 
                 if re_find:
                     result["orftype"] = re_find
@@ -1605,16 +1453,10 @@ class BgpNeighborAf(object):
 
         orf_mode = module.params['orf_mode']
         if orf_mode:
-
-            conf_str = CE_GET_BGP_PEER_AF_HEADER % (
-                vrf_name, af_type) + "<orfMode></orfMode>" + CE_GET_BGP_PEER_AF_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<orfMode>(.*)</orfMode>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("orfMode")
 
                 if re_find:
                     result["orf_mode"] = re_find
@@ -1627,20 +1469,14 @@ class BgpNeighborAf(object):
 
         soostring = module.params['soostring']
         if soostring:
-
             if len(soostring) < 3 or len(soostring) > 21:
                 module.fail_json(
                     msg='Error: The len of soostring %s is out of [3 - 21].' % soostring)
 
-            conf_str = CE_GET_BGP_PEER_AF_HEADER % (
-                vrf_name, af_type) + "<soostring></soostring>" + CE_GET_BGP_PEER_AF_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<soostring>(.*)</soostring>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("soostring")
 
                 if re_find:
                     result["soostring"] = re_find
@@ -1653,16 +1489,10 @@ class BgpNeighborAf(object):
 
         default_rt_adv_enable = module.params['default_rt_adv_enable']
         if default_rt_adv_enable:
-
-            conf_str = CE_GET_BGP_PEER_AF_HEADER % (
-                vrf_name, af_type) + "<defaultRtAdvEnable></defaultRtAdvEnable>" + CE_GET_BGP_PEER_AF_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<defaultRtAdvEnable>(.*)</defaultRtAdvEnable>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("defaultRtAdvEnable")
 
                 if re_find:
                     result["default_rt_adv_enable"] = re_find
@@ -1675,20 +1505,14 @@ class BgpNeighborAf(object):
 
         default_rt_adv_policy = module.params['default_rt_adv_policy']
         if default_rt_adv_policy:
-
             if len(default_rt_adv_policy) < 1 or len(default_rt_adv_policy) > 40:
                 module.fail_json(
                     msg='Error: The len of default_rt_adv_policy %s is out of [1 - 40].' % default_rt_adv_policy)
 
-            conf_str = CE_GET_BGP_PEER_AF_HEADER % (
-                vrf_name, af_type) + "<defaultRtAdvPolicy></defaultRtAdvPolicy>" + CE_GET_BGP_PEER_AF_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<defaultRtAdvPolicy>(.*)</defaultRtAdvPolicy>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("defaultRtAdvPolicy")
 
                 if re_find:
                     result["default_rt_adv_policy"] = re_find
@@ -1701,16 +1525,10 @@ class BgpNeighborAf(object):
 
         default_rt_match_mode = module.params['default_rt_match_mode']
         if default_rt_match_mode:
-
-            conf_str = CE_GET_BGP_PEER_AF_HEADER % (
-                vrf_name, af_type) + "<defaultRtMatchMode></defaultRtMatchMode>" + CE_GET_BGP_PEER_AF_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<defaultRtMatchMode>(.*)</defaultRtMatchMode>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("defaultRtMatchMode")
 
                 if re_find:
                     result["default_rt_match_mode"] = re_find
@@ -1723,16 +1541,10 @@ class BgpNeighborAf(object):
 
         add_path_mode = module.params['add_path_mode']
         if add_path_mode:
-
-            conf_str = CE_GET_BGP_PEER_AF_HEADER % (
-                vrf_name, af_type) + "<addPathMode></addPathMode>" + CE_GET_BGP_PEER_AF_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<addPathMode>(.*)</addPathMode>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("addPathMode")
 
                 if re_find:
                     result["add_path_mode"] = re_find
@@ -1745,20 +1557,14 @@ class BgpNeighborAf(object):
 
         adv_add_path_num = module.params['adv_add_path_num']
         if adv_add_path_num:
-
             if int(orftype) < 2 or int(orftype) > 64:
                 module.fail_json(
                     msg='Error: The value of adv_add_path_num %s is out of [2 - 64].' % adv_add_path_num)
 
-            conf_str = CE_GET_BGP_PEER_AF_HEADER % (
-                vrf_name, af_type) + "<advAddPathNum></advAddPathNum>" + CE_GET_BGP_PEER_AF_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<advAddPathNum>(.*)</advAddPathNum>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("advAddPathNum")
 
                 if re_find:
                     result["adv_add_path_num"] = re_find
@@ -1771,16 +1577,10 @@ class BgpNeighborAf(object):
 
         origin_as_valid = module.params['origin_as_valid']
         if origin_as_valid:
-
-            conf_str = CE_GET_BGP_PEER_AF_HEADER % (
-                vrf_name, af_type) + "<originAsValid></originAsValid>" + CE_GET_BGP_PEER_AF_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<originAsValid>(.*)</originAsValid>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("originAsValid")
 
                 if re_find:
                     result["origin_as_valid"] = re_find
@@ -1793,16 +1593,10 @@ class BgpNeighborAf(object):
 
         vpls_enable = module.params['vpls_enable']
         if vpls_enable:
-
-            conf_str = CE_GET_BGP_PEER_AF_HEADER % (
-                vrf_name, af_type) + "<vplsEnable></vplsEnable>" + CE_GET_BGP_PEER_AF_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<vplsEnable>(.*)</vplsEnable>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("vplsEnable")
 
                 if re_find:
                     result["vpls_enable"] = re_find
@@ -1815,16 +1609,10 @@ class BgpNeighborAf(object):
 
         vpls_ad_disable = module.params['vpls_ad_disable']
         if vpls_ad_disable:
-
-            conf_str = CE_GET_BGP_PEER_AF_HEADER % (
-                vrf_name, af_type) + "<vplsAdDisable></vplsAdDisable>" + CE_GET_BGP_PEER_AF_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<vplsAdDisable>(.*)</vplsAdDisable>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("vplsAdDisable")
 
                 if re_find:
                     result["vpls_ad_disable"] = re_find
@@ -1838,17 +1626,10 @@ class BgpNeighborAf(object):
         update_pkt_standard_compatible = module.params[
             'update_pkt_standard_compatible']
         if update_pkt_standard_compatible:
-
-            conf_str = CE_GET_BGP_PEER_AF_HEADER % (
-                vrf_name, af_type) + "<updatePktStandardCompatible></updatePktStandardCompatible>" + \
-                CE_GET_BGP_PEER_AF_TAIL
-            con_obj = self.netconf_get_config(module=module, conf_str=conf_str)
-
             if "<data/>" in con_obj.xml:
                 need_cfg = True
             else:
-                re_find = re.findall(
-                    r'.*<updatePktStandardCompatible>(.*)</updatePktStandardCompatible>.*', con_obj.xml)
+                re_find = decode_bgp_reply(con_obj.xml).values("updatePktStandardCompatible")
 
                 if re_find:
                     result["update_pkt_standard_compatible"] = re_find
@@ -2689,6 +2470,7 @@ def main():
     results['end_state'] = end_state
     results['updates'] = updates
 
+    results.update(perf_results())
     module.exit_json(**results)
 
 
@@ -155,6 +155,7 @@ from ansible.module_utils.netcli import FailedConditionsError
 from ansible.module_utils.netcli import FailedConditionalError
 from ansible.module_utils.netcli import AddCommandError, AddConditionError
 from ansible.module_utils.cloudengine import get_cli_exception
+from ansible.module_utils.ce_perf import perf_results
 
 
 VALID_KEYS = ['command', 'output', 'prompt', 'response']
@@ -256,6 +257,7 @@ def main():
     result['warnings'] = warnings
     result['stdout_lines'] = list(to_lines(result['stdout']))
 
+    result.update(perf_results())
     module.exit_json(**result)
 
 
@@ -202,6 +202,7 @@ from ansible.module_utils.basic import get_exception
 from ansible.module_utils.network import NetworkModule, NetworkError
 from ansible.module_utils.netcfg import NetworkConfig, dumps
 from ansible.module_utils.basic import remove_values
+from ansible.module_utils.ce_perf import perf_results
 
 try:
     from ansible.errors import AnsibleModuleExit
@@ -213,6 +214,8 @@ except ImportError:
 def config_exit(module, **result):
     """ return from the module, without error """
 
+    result.update(perf_results())
+
     if HAS_ANSIBLE_MODULE_EXIT:
         if 'changed' not in result:
             result['changed'] = False
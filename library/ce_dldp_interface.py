@@ -147,6 +147,7 @@ import re
 from xml.etree import ElementTree
 from ansible.module_utils.network import NetworkModule
 from ansible.module_utils.cloudengine import get_netconf
+from ansible.module_utils.ce_perf import perf_results
 
 try:
     from ncclient.operations.rpc import RPCError
@@ -637,6 +638,7 @@ class DldpInterface(object):
         else:
             self.results['updates'] = list()
 
+        self.results.update(perf_results())
         self.module.exit_json(**self.results)
 
     def work(self):
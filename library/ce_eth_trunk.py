@@ -137,6 +137,7 @@ import re
 import sys
 from ansible.module_utils.network import NetworkModule
 from ansible.module_utils.cloudengine import get_netconf
+from ansible.module_utils.ce_perf import perf_results
 
 try:
     from ncclient.operations.rpc import RPCError
@@ -700,6 +701,7 @@ class EthTrunk(object):
         else:
             self.results['updates'] = list()
 
+        self.results.update(perf_results())
         self.module.exit_json(**self.results)
 
 
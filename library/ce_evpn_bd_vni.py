@@ -248,6 +248,7 @@ import copy
 from xml.etree import ElementTree
 from ansible.module_utils.network import NetworkModule
 from ansible.module_utils.cloudengine import get_netconf
+from ansible.module_utils.ce_perf import perf_results
 
 try:
     from ncclient.operations.rpc import RPCError
@@ -664,6 +665,7 @@ class EvpnBd(object):
         else:
             self.results['updates'] = list()
 
+        self.results.update(perf_results())
         self.module.exit_json(**self.results)
 
     def judge_if_vpn_target_exist(self, vpn_target_type):
@@ -148,7 +148,8 @@ end_state:
 
 import re
 from ansible.module_utils.network import NetworkModule, NetworkError
-from ansible.module_utils.cloudengine import get_cli_exception
+from ansible.module_utils.cloudengine import get_cli_exception, get_config_tree
+from ansible.module_utils.ce_perf import perf_results
 
 
 def is_config_exist(cmp_cfg, test_cfg):
@@ -245,14 +246,14 @@ class EvpnBgp(object):
 
     def get_evpn_overlay_config(self):
         """get evpn-overlay enable configuration"""
-        exp = "| ignore-case include evpn-overlay enable"
-        return self.module.config.get_config(include_defaults=False, regular=exp)
+        tree = get_config_tree(self.module)
+        return "\n".join(node.text for node in tree.search("evpn-overlay enable", re.I))
 
     def get_current_config(self):
         """get current configuration"""
 
-        exp = "| ignore-case section include bgp %s" % self.bgp_instance
-        return self.module.config.get_config(include_defaults=False, regular=exp)
+        tree = get_config_tree(self.module)
+        return tree.section_text("bgp %s" % self.bgp_instance)
 
     def cli_add_command(self, command, undo=False):
         """add command to self.update_cmd and self.commands"""
@@ -695,6 +696,7 @@ class EvpnBgp(object):
         else:
             self.results['updates'] = list()
 
+        self.results.update(perf_results())
         self.module.exit_json(**self.results)
 
 
@@ -176,6 +176,7 @@ changed:
 import re
 from ansible.module_utils.network import NetworkModule, NetworkError
 from ansible.module_utils.cloudengine import get_cli_exception
+from ansible.module_utils.ce_perf import perf_results
 
 
 def is_config_exist(cmp_cfg, test_cfg):
@@ -379,6 +380,7 @@ class EvpnBgpRr(object):
         else:
             self.results['updates'] = list()
 
+        self.results.update(perf_results())
         self.module.exit_json(**self.results)
 
     def judge_if_config_exist(self):
@@ -84,6 +84,7 @@ changed:
 
 from ansible.module_utils.network import NetworkModule, NetworkError
 from ansible.module_utils.cloudengine import get_cli_exception
+from ansible.module_utils.ce_perf import perf_results
 
 
 class EvpnGlobal(object):
@@ -176,6 +177,7 @@ class EvpnGlobal(object):
         else:
             self.results['updates'] = list()
 
+        self.results.update(perf_results())
         self.module.exit_json(**self.results)
 
     def judge_if_config_exist(self):
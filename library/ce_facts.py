@@ -29,7 +29,13 @@ short_description: Gets facts about HUAWEI CloudEngine switches
 description:
   - Collects facts from CloudEngine devices running the CloudEngine
     operating system.  Fact collection is supported over Cli
-    transport.  This module prepends all of the base network fact keys
+    and Netconf transport.  Over Netconf the subsets are read with
+    one get of the state data and the config subset with execute-cli,
+    all on one session, and return the same fact keys as over Cli.
+    With ANSIBLE_CE_FACTS_CACHE=1 the facts of each subset are cached
+    per host on the controller and only the subsets whose time to live
+    ran out are read from the device.
+    This module prepends all of the base network fact keys
     with C(ansible_net_<fact>).  The facts module will always collect a
     base set of facts from the device and can enable or disable
     collection of additional facts.
@@ -70,6 +76,11 @@ vars:
 - ce_facts:
     gather_subset:
       - "!hardware"
+
+# Collect all facts over one NETCONF session
+- ce_facts:
+    gather_subset: all
+    transport: netconf
 """
 
 RETURN = """
@@ -77,6 +88,11 @@ gather_subset:
   description: The list of fact subsets collected from the device
   returned: always
   type: list
+cached_subset:
+  description: The fact subsets served from the controller-side cache
+  returned: always
+  type: list
+  sample: ["default", "hardware"]
 
 # default
 BIOS Version:
@@ -160,11 +176,124 @@ neighbors:
 """
 
 import re
-from ansible.module_utils.cloudengine import get_cli_exception
+import sys
+import threading
+from ansible.module_utils.cloudengine import get_cli_exception, get_netconf,\
+    build_filter_xml, Netconf
 from ansible.module_utils.basic import get_exception
 from ansible.module_utils.netcli import CommandRunner, AddCommandError
 from ansible.module_utils.network import NetworkModule, NetworkError
 from ansible.module_utils.six import iteritems
+from ansible.module_utils.ce_perf import perf_results
+from ansible.module_utils.ce_facts_cache import facts_cache_enabled,\
+    get_facts_cache_path, read_facts_cache, write_facts_cache
+from ansible.module_utils.ce_lazy import has_module
+from ansible.module_utils.ce_xml import group_records, iter_events,\
+    local_name
+
+# ncclient is imported when facts are gathered over the netconf transport
+HAS_NCCLIENT = has_module('ncclient')
+
+CE_NC_GET_SYSTEM = """
+  <system xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+    <systemInfo>
+      <sysName></sysName>
+    </systemInfo>
+  </system>
+"""
+
+CE_NC_GET_DEVM = """
+  <devm xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+    <phyEntitys>
+      <phyEntity>
+        <entClass></entClass>
+        <position></position>
+        <entBoardType></entBoardType>
+        <entStatus></entStatus>
+        <entPcbVersion></entPcbVersion>
+        <entMabVersion></entMabVersion>
+        <entCpld1Version></entCpld1Version>
+        <entCpld2Version></entCpld2Version>
+        <entBiosVersion></entBiosVersion>
+      </phyEntity>
+    </phyEntitys>
+    <memoryInfos>
+      <memoryInfo>
+        <osMemoryUse></osMemoryUse>
+        <osMemoryUsage></osMemoryUsage>
+      </memoryInfo>
+    </memoryInfos>
+  </devm>
+"""
+
+CE_NC_GET_VFM = """
+  <vfm xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+    <fileSystems>
+      <fileSystem>
+        <fsName></fsName>
+        <totalSize></totalSize>
+        <freeSize></freeSize>
+      </fileSystem>
+    </fileSystems>
+  </vfm>
+"""
+
+CE_NC_GET_IFM = """
+  <ifm xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+    <interfaces>
+      <interface>
+        <ifName></ifName>
+        <isL2SwitchPort></isL2SwitchPort>
+        <ifAdminStatus></ifAdminStatus>
+        <ifDynamicInfo>
+          <ifPhyStatus></ifPhyStatus>
+        </ifDynamicInfo>
+        <ifmAm4>
+          <am4CfgAddrs>
+            <am4CfgAddr>
+              <ifIpAddr></ifIpAddr>
+              <subnetMask></subnetMask>
+              <addrType></addrType>
+            </am4CfgAddr>
+          </am4CfgAddrs>
+        </ifmAm4>
+      </interface>
+    </interfaces>
+  </ifm>
+"""
+
+CE_NC_GET_LLDP = """
+  <lldp xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+    <lldpInterfaces>
+      <lldpInterface>
+        <ifName></ifName>
+        <lldpNeighbors>
+          <lldpNeighbor>
+            <expiredTime></expiredTime>
+          </lldpNeighbor>
+        </lldpNeighbors>
+      </lldpInterface>
+    </lldpInterfaces>
+  </lldp>
+"""
+
+CE_NC_EXECUTE_CLI = """
+  <cmd>
+    <id>1</id>
+    <cmdline>%s</cmdline>
+  </cmd>
+"""
+
+# version facts of the master board, as display version names them
+BOARD_VERSION_KEYS = [('entPcbVersion', 'PCB Version'),
+                      ('entMabVersion', 'MAB Version'),
+                      ('entBoardType', 'Board Type'),
+                      ('entCpld1Version', 'CPLD1 Version'),
+                      ('entCpld2Version', 'CPLD2 Version'),
+                      ('entBiosVersion', 'BIOS Version')]
+
+# entities display device lists by card name instead of board type
+CARD_CLASSES = ('fanModule', 'powerModule')
 
 
 def add_command(runner, command, output=None):
@@ -353,6 +482,189 @@ class Interfaces(FactsBase):
                 self.facts['neighbors'] = neighbors_dict
 
 
+def as_list(value):
+    """ record value of a repeated element as a list """
+
+    if value is None:
+        return list()
+    if isinstance(value, list):
+        return value
+    return [value]
+
+
+def mask_to_len(mask):
+    """ prefix length of a dotted subnet mask """
+
+    return sum(bin(int(octet)).count('1') for octet in mask.split('.'))
+
+
+def cli_output(xml_str):
+    """ text printed by the command of an execute-cli reply """
+
+    for event, elem in iter_events(xml_str):
+        if event == 'end' and local_name(elem.tag) == 'output':
+            return elem.text or ''
+    return ''
+
+
+class NetconfFactsBase(object):
+    """ Class NetconfFactsBase, a subset read over NETCONF """
+
+    # get filters and record paths the subset needs from the state data
+    filters = ()
+    paths = ()
+    # whether the subset sends RPCs of its own besides the shared get
+    fetches = False
+
+    def __init__(self, module, netconf):
+        self.module = module
+        self.netconf = netconf
+        self.facts = dict()
+
+    def fetch(self):
+        """ Fetch method, runs concurrently with the shared get """
+
+        pass
+
+    def populate(self, records):
+        """ Populate method """
+
+        raise NotImplementedError
+
+
+class NetconfDefault(NetconfFactsBase):
+    """ Class default over NETCONF """
+
+    filters = (CE_NC_GET_SYSTEM, CE_NC_GET_DEVM)
+    paths = ("data/system/systemInfo", "data/devm/phyEntitys/phyEntity")
+
+    def populate(self, records):
+        """ Populate method """
+
+        for entity in records["data/devm/phyEntitys/phyEntity"]:
+            if entity.get("entClass") == "mpuModule":
+                self.facts.update(transform_dict(
+                    dict((key, value) for key, value in iteritems(entity)
+                         if value), BOARD_VERSION_KEYS))
+                break
+
+        for info in records["data/system/systemInfo"]:
+            if info.get("sysName"):
+                self.facts['hostname'] = info["sysName"]
+
+
+class NetconfConfig(NetconfFactsBase):
+    """ Class config over NETCONF """
+
+    fetches = True
+
+    def __init__(self, module, netconf):
+        super(NetconfConfig, self).__init__(module, netconf)
+        self.con_obj = None
+
+    def fetch(self):
+        """ Fetch method """
+
+        cmd = CE_NC_EXECUTE_CLI % \
+            'display current-configuration configuration system'
+        self.con_obj = self.netconf.execute_cli(command=cmd)
+
+    def populate(self, records):
+        """ Populate method """
+
+        data = cli_output(self.con_obj.xml)
+        if data:
+            self.facts['config'] = data.split("\n")
+
+
+class NetconfHardware(NetconfFactsBase):
+    """ Class hardware over NETCONF """
+
+    filters = (CE_NC_GET_DEVM, CE_NC_GET_VFM)
+    paths = ("data/devm/phyEntitys/phyEntity",
+             "data/devm/memoryInfos/memoryInfo",
+             "data/vfm/fileSystems/fileSystem")
+
+    def populate(self, records):
+        """ Populate method """
+
+        for fsys in records["data/vfm/fileSystems/fileSystem"]:
+            if not fsys.get("fsName") or not fsys.get("totalSize") or \
+                    not fsys.get("freeSize"):
+                continue
+            self.facts['filesystems'] = fsys["fsName"]
+            self.facts['flash_total'] = "%s KB" % fsys["totalSize"]
+            self.facts['flash_free'] = "%s KB" % fsys["freeSize"]
+            break
+
+        for memory in records["data/devm/memoryInfos/memoryInfo"]:
+            if not memory.get("osMemoryUse") or \
+                    not memory.get("osMemoryUsage"):
+                continue
+            # the same figures display memory reports
+            memory_total = int(memory["osMemoryUse"])
+            use_percent = int(memory["osMemoryUsage"])
+            memory_free = memory_total - memory_total * use_percent // 100
+            self.facts['memory_total'] = "%d Kb" % memory_total
+            self.facts['memory_free'] = "%d Kb" % memory_free
+            break
+
+        for entity in records["data/devm/phyEntitys/phyEntity"]:
+            if not entity.get("entStatus"):
+                continue
+            if entity.get("entClass") in CARD_CLASSES:
+                if entity.get("position"):
+                    self.facts[entity["position"]] = entity["entStatus"]
+            elif entity.get("entBoardType"):
+                self.facts[entity["entBoardType"]] = entity["entStatus"]
+
+
+class NetconfInterfaces(NetconfFactsBase):
+    """ Class interfaces over NETCONF """
+
+    filters = (CE_NC_GET_IFM, CE_NC_GET_LLDP)
+    paths = ("data/ifm/interfaces/interface",
+             "data/lldp/lldpInterfaces/lldpInterface")
+
+    def populate(self, records):
+        """ Populate method """
+
+        interface_dict = dict()
+        ipv4_addr_dict = dict()
+        neighbors_dict = dict()
+
+        for intf in records["data/ifm/interfaces/interface"]:
+            name = intf.get("ifName")
+            if not name:
+                continue
+            if intf.get("ifAdminStatus") == "down":
+                interface_dict[name] = "*down"
+            else:
+                info = intf.get("ifDynamicInfo") or dict()
+                interface_dict[name] = info.get("ifPhyStatus") or "down"
+
+            # display ip interface brief lists the layer 3 interfaces
+            if intf.get("isL2SwitchPort") == "true":
+                continue
+            ipv4_addr_dict[name] = "unassigned"
+            am4 = (intf.get("ifmAm4") or dict()).get("am4CfgAddrs") or dict()
+            for addr in as_list(am4.get("am4CfgAddr")):
+                if addr.get("addrType") == "main" and addr.get("ifIpAddr") \
+                        and addr.get("subnetMask"):
+                    ipv4_addr_dict[name] = "%s/%d" % (
+                        addr.get("ifIpAddr"), mask_to_len(addr.get("subnetMask")))
+
+        for intf in records["data/lldp/lldpInterfaces/lldpInterface"]:
+            neighbors = intf.get("lldpNeighbors") or dict()
+            for neighbor in as_list(neighbors.get("lldpNeighbor")):
+                if intf.get("ifName") and neighbor.get("expiredTime"):
+                    neighbors_dict[intf["ifName"]] = neighbor["expiredTime"]
+
+        self.facts['interfaces'] = interface_dict
+        self.facts['all_ipv4_addresses'] = ipv4_addr_dict
+        self.facts['neighbors'] = neighbors_dict
+
+
 FACT_SUBSETS = dict(
     default=Default,
     hardware=Hardware,
@@ -360,9 +672,111 @@ FACT_SUBSETS = dict(
     config=Config,
 )
 
+NETCONF_FACT_SUBSETS = dict(
+    default=NetconfDefault,
+    hardware=NetconfHardware,
+    interfaces=NetconfInterfaces,
+    config=NetconfConfig,
+)
+
 VALID_SUBSETS = frozenset(FACT_SUBSETS.keys())
 
 
+def gather_cli(module, subsets):
+    """ dict of subset -> facts read with CLI commands, the shell runs
+    the commands of all subsets one after the other """
+
+    runner = CommandRunner(module)
+
+    instances = dict()
+    for key in subsets:
+        instances[key] = FACT_SUBSETS[key](module, runner)
+
+    try:
+        runner.run()
+    except NetworkError:
+        exc = get_exception()
+        module.fail_json(msg=get_cli_exception(exc), **exc.kwargs)
+
+    gathered = dict()
+    for key, inst in iteritems(instances):
+        inst.populate()
+        gathered[key] = inst.facts
+    return gathered
+
+
+def run_fetch(inst, errors):
+    """ fetch of a subset, errors are raised again by the main thread """
+
+    try:
+        inst.fetch()
+    except Exception:
+        errors.append(sys.exc_info()[1])
+
+
+def gather_netconf(module, subsets):
+    """ dict of subset -> facts read with one get of the state data, the
+    subsets sending RPCs of their own run them concurrently with it """
+
+    if not HAS_NCCLIENT:
+        module.fail_json(msg='Error: The ncclient library is required.')
+    from ncclient.operations.rpc import RPCError
+
+    netconf = get_netconf(host=module.params['host'],
+                          port=module.params['port'],
+                          username=module.params['username'],
+                          password=module.params['password'])
+
+    instances = dict()
+    filters = list()
+    paths = list()
+    for key in subsets:
+        inst = NETCONF_FACT_SUBSETS[key](module, netconf)
+        instances[key] = inst
+        # subsets sharing a container ask for it once
+        filters.extend(flt for flt in inst.filters if flt not in filters)
+        paths.extend(path for path in inst.paths if path not in paths)
+
+    # a broker proxy carries one request at a time
+    concurrent = isinstance(netconf, Netconf) and netconf.concurrent()
+    errors = list()
+    workers = list()
+    for inst in instances.values():
+        if not inst.fetches:
+            continue
+        if concurrent and filters:
+            worker = threading.Thread(target=run_fetch, args=(inst, errors))
+            worker.daemon = True
+            worker.start()
+            workers.append(worker)
+        else:
+            run_fetch(inst, errors)
+
+    con_obj = None
+    if filters:
+        try:
+            con_obj = netconf.get_config(filter=build_filter_xml(*filters))
+        except Exception:
+            errors.append(sys.exc_info()[1])
+    for worker in workers:
+        worker.join()
+
+    for err in errors:
+        if isinstance(err, RPCError):
+            module.fail_json(msg='Error: %s' % err.message.replace("\r\n", ""))
+        raise err
+
+    records = dict((path, list()) for path in paths)
+    if con_obj is not None and "<data/>" not in con_obj.xml:
+        records = group_records(con_obj.xml, *paths)
+
+    gathered = dict()
+    for key, inst in iteritems(instances):
+        inst.populate(records)
+        gathered[key] = inst.facts
+    return gathered
+
+
 def main():
     """ Module main """
 
@@ -370,7 +784,9 @@ def main():
         gather_subset=dict(default=['!config'], type='list')
     )
 
-    module = NetworkModule(argument_spec=spec, supports_check_mode=True)
+    # the device is only connected to when a subset is not cached
+    module = NetworkModule(argument_spec=spec, connect_on_load=False,
+                           supports_check_mode=True)
 
     gather_subset = module.params['gather_subset']
 
@@ -407,24 +823,25 @@ def main():
     facts = dict()
     facts['gather_subset'] = list(runable_subsets)
 
-    runner = CommandRunner(module)
+    cached = dict()
+    cache_path = None
+    if facts_cache_enabled():
+        cache_path = get_facts_cache_path(module.params['host'],
+                                          module.params['port'])
+        cached = read_facts_cache(cache_path, runable_subsets)
+
+    gathered = dict()
+    expired = runable_subsets.difference(cached)
+    if expired:
+        if module.params['transport'] == 'netconf':
+            gathered = gather_netconf(module, expired)
+        else:
+            gathered = gather_cli(module, expired)
+        if cache_path:
+            write_facts_cache(cache_path, gathered)
 
-    instances = list()
     for key in runable_subsets:
-        instances.append(FACT_SUBSETS[key](module, runner))
-
-    try:
-        runner.run()
-    except NetworkError:
-        exc = get_exception()
-        module.fail_json(msg=get_cli_exception(exc), **exc.kwargs)
-
-    try:
-        for inst in instances:
-            inst.populate()
-            facts.update(inst.facts)
-    except Exception:
-        raise
+        facts.update(cached.get(key) or gathered.get(key) or dict())
 
     ansible_facts = dict()
     for key, value in iteritems(facts):
@@ -433,7 +850,8 @@ def main():
         else:
             ansible_facts[key] = value
 
-    module.exit_json(ansible_facts=ansible_facts)
+    module.exit_json(ansible_facts=ansible_facts,
+                     cached_subset=sorted(cached), **perf_results())
 
 
 if __name__ == '__main__':
@@ -94,16 +94,17 @@ import sys
 import re
 import os
 import time
-from xml.etree import ElementTree
-import paramiko
 from ansible.module_utils.shell import ShellError
 from ansible.module_utils.basic import get_exception
 from ansible.module_utils.network import NetworkModule, NetworkError
 from ansible.module_utils.netcli import FailedConditionsError, FailedConditionalError
 from ansible.module_utils.netcli import AddCommandError
 from ansible.module_utils.cloudengine import get_netconf
+from ansible.module_utils.ce_xml import find_record
 from ansible.module_utils.netcli import CommandRunner
 from ansible.module_utils.cloudengine import get_cli_exception
+from ansible.module_utils.ce_lazy import has_module
+from ansible.module_utils.ce_perf import perf_results
 
 try:
     from ncclient.operations.rpc import RPCError
@@ -111,11 +112,8 @@ try:
 except ImportError:
     HAS_NCCLIENT = False
 
-try:
-    from scp import SCPClient
-    HAS_SCP = True
-except ImportError:
-    HAS_SCP = False
+# scp and paramiko are imported when the file is transferred
+HAS_SCP = has_module('scp')
 
 CE_NC_GET_FILE_INFO = """
 <filter type="subtree">
@@ -229,19 +227,13 @@ class FileCopy(object):
         if "<data/>" in con_obj.xml:
             return False, 0
 
-        xml_str = con_obj.xml.replace('\r', '').replace('\n', '').\
-            replace('xmlns="urn:ietf:params:xml:ns:netconf:base:1.0"', "").\
-            replace('xmlns="http://www.huawei.com/netconf/vrp"', "")
-
         # get file info
-        root = ElementTree.fromstring(xml_str)
-        topo = root.find("data/vfm/dirs/dir")
+        topo = find_record(con_obj.xml, "data/vfm/dirs/dir")
         if topo is None:
             return False, 0
 
-        for eles in topo:
-            if eles.tag in ["DirSize"]:
-                return True, int(eles.text.replace(',', ''))
+        if "DirSize" in topo:
+            return True, int(topo["DirSize"].replace(',', ''))
 
         return False, 0
 
@@ -320,6 +312,9 @@ class FileCopy(object):
         password = self.module.params['password']
         port = self.module.params['port']
 
+        import paramiko
+        from scp import SCPClient
+
         ssh = paramiko.SSHClient()
         ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
         ssh.connect(hostname=hostname, username=username,
@@ -353,19 +348,13 @@ class FileCopy(object):
         if "<data/>" in con_obj.xml:
             return False
 
-        xml_str = con_obj.xml.replace('\r', '').replace('\n', '').\
-            replace('xmlns="urn:ietf:params:xml:ns:netconf:base:1.0"', "").\
-            replace('xmlns="http://www.huawei.com/netconf/vrp"', "")
-
         # get file info
-        root = ElementTree.fromstring(xml_str)
-        topo = root.find("data/sshs/sshServer")
+        topo = find_record(con_obj.xml, "data/sshs/sshServer")
         if topo is None:
             return False
 
-        for eles in topo:
-            if eles.tag in ["scpEnable"]:
-                return True, eles.text
+        if "scpEnable" in topo:
+            return True, topo["scpEnable"]
 
         return False
 
@@ -423,7 +412,8 @@ class FileCopy(object):
             transfer_result=self.transfer_result,
             local_file=self.local_file,
             remote_file=self.remote_file,
-            file_system=self.file_system)
+            file_system=self.file_system,
+            **perf_results())
 
 
 def main():
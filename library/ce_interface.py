@@ -79,6 +79,17 @@ options:
         required: true
         default: present
         choices: ['present','absent','default']
+    aggregate:
+        description:
+            - List of interface definitions, dicts with I(interface) and the
+              optional I(description), I(admin_state), I(mode), I(l2sub) and
+              I(state) keys, I(state) defaults to the module I(state). The
+              interfaces are read once and all creates, changes and deletes
+              are sent in one edit-config. Interfaces listed with
+              I(state=absent) that do not exist are left alone.
+              Can not be used with I(interface) or I(interface_type).
+        required: false
+        default: null
 '''
 
 EXAMPLES = '''
@@ -98,22 +109,34 @@ EXAMPLES = '''
     - tunnel
 # Admin up all 40GE interfaces
 - ce_interface: interface_type=40GE host=68.170.147.165 admin_state=up
+# Set distinct descriptions and states on several interfaces in one go
+- ce_interface:
+    aggregate:
+      - {interface: 40GE1/0/1, description: uplink-a, admin_state: up}
+      - {interface: 40GE1/0/2, description: uplink-b, mode: layer3}
+      - {interface: 40GE1/0/3, admin_state: down}
+      - {interface: Tunnel1, state: absent}
+    host: "{{ inventory_hostname }}"
 '''
 RETURN = '''
 proposed:
-    description: k/v pairs of parameters passed into module
+    description: k/v pairs of parameters passed into module, the interface
+                 definitions with aggregate
     returned: always
-    type: dict
+    type: dict or list
     sample: {"interface": "40GE1/0/10", "admin_state": "down"}
 existing:
-    description: k/v pairs of existing switchport
-    type: dict
+    description: k/v pairs of existing switchport, one per interface
+                 definition with aggregate, null for an interface that
+                 does not exist
+    type: dict or list
     sample:  {"admin_state": "up", "description": "None",
               "interface": "40GE1/0/10", "mode": "layer2"}
 end_state:
-    description: k/v pairs of switchport after module execution
+    description: k/v pairs of switchport after module execution, one per
+                 interface definition with aggregate
     returned: always
-    type: dict or null
+    type: dict, list or null
     sample:  {"admin_state": "down", "description": "None",
               "interface": "40GE1/0/10", "mode": "layer2"}
 updates:
@@ -129,10 +152,11 @@ changed:
 '''
 
 
-import re
 import sys
 from ansible.module_utils.network import NetworkModule
 from ansible.module_utils.cloudengine import get_netconf
+from ansible.module_utils.ce_perf import perf_results, timed
+from ansible.module_utils.ce_xml import iter_records
 
 try:
     from ncclient.operations.rpc import RPCError
@@ -159,6 +183,23 @@ CE_NC_GET_INTFS = """
 </filter>
 """
 
+CE_NC_GET_INTFS_TYPE = """
+<filter type="subtree">
+  <ifm xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+    <interfaces>
+      <interface>
+        <ifName></ifName>
+        <ifPhyType>%s</ifPhyType>
+        <ifNumber></ifNumber>
+        <ifDescr></ifDescr>
+        <ifAdminStatus></ifAdminStatus>
+        <isL2SwitchPort></isL2SwitchPort>
+        <ifMtu></ifMtu>
+      </interface>
+    </interfaces>
+  </ifm>
+</filter>
+"""
 
 CE_NC_GET_INTF = """
 <filter type="subtree">
@@ -251,6 +292,19 @@ ADMIN_STATE_TYPE = ('ge', '10ge', '25ge', '4x10ge', '40ge', '100ge',
 SWITCH_PORT_TYPE = ('ge', '10ge', '25ge',
                     '4x10ge', '40ge', '100ge', 'eth-trunk')
 
+# ifPhyType of the interface types as the device spells them
+PHY_TYPE = {'ge': 'GE', '10ge': '10GE', '25ge': '25GE', '4x10ge': '4x10GE',
+            '40ge': '40GE', '100ge': '100GE', 'vlanif': 'Vlanif',
+            'loopback': 'LoopBack', 'meth': 'MEth', 'eth-trunk': 'Eth-Trunk',
+            'vbdif': 'Vbdif', 'nve': 'Nve', 'tunnel': 'Tunnel',
+            'ethernet': 'Ethernet', 'fcoe-port': 'FCoE-Port',
+            'fabric-port': 'Fabric-Port', 'stack-port': 'Stack-Port',
+            'null': 'NULL'}
+
+INTF_LEAVES = ('ifName', 'ifPhyType', 'ifNumber', 'ifDescr',
+               'isL2SwitchPort', 'ifAdminStatus', 'ifMtu')
+
+
 def get_interface_type(interface):
     """Gets the type of interface, such as 10GE, ETH-TRUNK, VLANIF..."""
 
@@ -310,6 +364,40 @@ def is_portswitch_enalbe(iftype):
 
     return bool(iftype in SWITCH_PORT_TYPE)
 
+def index_interfaces(xml_str):
+    """interface records of a reply in one pass, by lower case type and
+    by upper case name"""
+
+    intfs_info = dict()
+    intfs_index = dict()
+    if "<data/>" in xml_str:
+        return intfs_info, intfs_index
+
+    with timed('xml', 'parse') as timer:
+        timer.received = len(xml_str)
+        for _, tmp in iter_records(xml_str, "data/ifm/interfaces/interface"):
+            intf = dict((key, tmp.get(key) or '') for key in INTF_LEAVES)
+            if not intf['ifName']:
+                continue
+            intfs_index[intf['ifName'].upper()] = intf
+            if intf['ifPhyType']:
+                intfs_info.setdefault(intf['ifPhyType'].lower(), list()).append(intf)
+
+    return intfs_info, intfs_index
+
+def get_intf_attrs(iftype, intf):
+    """interface record to module attributes"""
+
+    attrs = dict(interface=intf["ifName"], description=intf["ifDescr"])
+    if is_admin_state_enable(iftype) and intf["ifAdminStatus"]:
+        attrs["admin_state"] = intf["ifAdminStatus"]
+    if is_portswitch_enalbe(iftype) and intf["isL2SwitchPort"]:
+        if intf["isL2SwitchPort"] == "true":
+            attrs["mode"] = "layer2"
+        else:
+            attrs["mode"] = "layer3"
+    return attrs
+
 
 class Interface(object):
     """Manages physical attributes of interfaces."""
@@ -328,6 +416,7 @@ class Interface(object):
         self.mode = self.module.params['mode']
         self.l2sub = self.module.params['l2sub']
         self.state = self.module.params['state']
+        self.aggregate = self.module.params['aggregate']
 
         # host info
         self.host = self.module.params['host']
@@ -345,6 +434,7 @@ class Interface(object):
         self.intfs_info = dict()        # all type interface info
         self.intf_info = dict()         # one interface info
         self.intf_type = None           # loopback tunnel ...
+        self.intfs_conf = list()        # aggregate interface definitions
 
         # init netconf connect
         self.init_netconf()
@@ -372,70 +462,44 @@ class Interface(object):
         if "<ok/>" not in xml_str:
             self.module.fail_json(msg='Error: %s failed.' % xml_name)
 
-    def get_interfaces_dict(self):
-        """ get interfaces attributes dict."""
+    def get_interfaces(self, conf_str):
+        """ interface records selected by a filter, by type and by name """
 
-        intfs_info = dict()
-        conf_str = CE_NC_GET_INTFS
         try:
             con_obj = self.netconf.get_config(filter=conf_str)
         except RPCError:
             err = sys.exc_info()[1]
             self.module.fail_json(msg='Error: %s' % err.message.replace("\r\n", ""))
 
-        if "<data/>" in con_obj.xml:
-            return intfs_info
-
-        intf = re.findall(
-            r'.*<ifName>(.*)</ifName>.*\s*<ifPhyType>(.*)</ifPhyType>.*\s*'
-            r'<ifNumber>(.*)</ifNumber>.*\s*<ifDescr>(.*)</ifDescr>.*\s*'
-            r'<isL2SwitchPort>(.*)</isL2SwitchPort>.*\s*<ifAdminStatus>'
-            r'(.*)</ifAdminStatus>.*\s*<ifMtu>(.*)</ifMtu>.*', con_obj.xml)
+        return index_interfaces(con_obj.xml)
 
-        for tmp in intf:
-            if tmp[1]:
-                if not intfs_info.get(tmp[1].lower()):
-                    # new interface type list
-                    intfs_info[tmp[1].lower()] = list()
-                intfs_info[tmp[1].lower()].append(dict(ifName=tmp[0], ifPhyType=tmp[1], ifNumber=tmp[2],
-                                                       ifDescr=tmp[3], isL2SwitchPort=tmp[4],
-                                                       ifAdminStatus=tmp[5], ifMtu=tmp[6]))
+    def get_interfaces_dict(self, iftype=None):
+        """ get interfaces attributes dict, by type, of the interfaces of
+        iftype, the device filters them, or of every interface """
 
-        return intfs_info
+        if iftype and iftype.lower() in PHY_TYPE:
+            conf_str = CE_NC_GET_INTFS_TYPE % PHY_TYPE[iftype.lower()]
+            intfs_info = self.get_interfaces(conf_str)[0]
+            if intfs_info.get(iftype.lower()):
+                return intfs_info
+            # content match is exact, the device may spell the type otherwise
+        return self.get_interfaces(CE_NC_GET_INTFS)[0]
 
     def get_interface_dict(self, ifname):
         """ get one interface attributes dict."""
 
-        intf_info = dict()
-        conf_str = CE_NC_GET_INTF % ifname
-        try:
-            con_obj = self.netconf.get_config(filter=conf_str)
-        except RPCError:
-            err = sys.exc_info()[1]
-            self.module.fail_json(msg='Error: %s' % err.message.replace("\r\n", ""))
-
-        if "<data/>" in con_obj.xml:
-            return intf_info
-
-        intf = re.findall(
-            r'.*<ifName>(.*)</ifName>.*\s*'
-            r'<ifPhyType>(.*)</ifPhyType>.*\s*'
-            r'<ifNumber>(.*)</ifNumber>.*\s*'
-            r'<ifDescr>(.*)</ifDescr>.*\s*'
-            r'<isL2SwitchPort>(.*)</isL2SwitchPort>.*\s*'
-            r'<ifAdminStatus>(.*)</ifAdminStatus>.*\s*'
-            r'<ifMtu>(.*)</ifMtu>.*', con_obj.xml)
+        intfs_index = self.get_interfaces(CE_NC_GET_INTF % ifname)[1]
+        for intf in intfs_index.values():
+            return intf
+        return dict()
 
-        if intf:
-            intf_info = dict(ifName=intf[0][0], ifPhyType=intf[0][1],
-                             ifNumber=intf[0][2], ifDescr=intf[0][3],
-                             isL2SwitchPort=intf[0][4],
-                             ifAdminStatus=intf[0][5], ifMtu=intf[0][6])
+    def get_interfaces_index(self):
+        """ every interface record, by upper case interface name """
 
-        return intf_info
+        return self.get_interfaces(CE_NC_GET_INTFS)[1]
 
-    def create_interface(self, ifname, description, admin_state, mode, l2sub):
-        """Create interface."""
+    def build_create(self, ifname, iftype, description, admin_state, mode, l2sub):
+        """ xml creating an interface, with its commands """
 
         if l2sub == "true":
             self.updates_cmd.append("interface %s mode l2" % ifname)
@@ -451,13 +515,13 @@ class Interface(object):
             xmlstr = CE_NC_XML_CREATE_INTF_L2SUB % (ifname, description)
         else:
             xmlstr = CE_NC_XML_CREATE_INTF % (ifname, description)
-        if admin_state and is_admin_state_enable(self.intf_type):
+        if admin_state and is_admin_state_enable(iftype):
             xmlstr += CE_NC_XML_MERGE_INTF_STATUS % (ifname, admin_state)
             if admin_state == 'up':
                 self.updates_cmd.append("undo shutdown")
             else:
                 self.updates_cmd.append("shutdown")
-        if mode and is_portswitch_enalbe(self.intf_type):
+        if mode and is_portswitch_enalbe(iftype):
             if mode == "layer2":
                 xmlstr += CE_NC_XML_MERGE_INTF_L2ENABLE % (ifname, 'enable')
                 self.updates_cmd.append('portswitch')
@@ -465,6 +529,13 @@ class Interface(object):
                 xmlstr += CE_NC_XML_MERGE_INTF_L2ENABLE % (ifname, 'disable')
                 self.updates_cmd.append('undo portswitch')
 
+        return xmlstr
+
+    def create_interface(self, ifname, description, admin_state, mode, l2sub):
+        """Create interface."""
+
+        xmlstr = self.build_create(ifname, self.intf_type, description,
+                                   admin_state, mode, l2sub)
         conf_str = '<config> ' + xmlstr + ' </config>'
         try:
             con_obj = self.netconf.set_config(config=conf_str)
@@ -510,38 +581,43 @@ class Interface(object):
             err = sys.exc_info()[1]
             self.module.fail_json(msg='Error: %s' % err.message.replace("\r\n", ""))
 
-    def merge_interface(self, ifname, description, admin_state, mode):
-        """ Merge interface attributes."""
+    def build_merge(self, ifname, iftype, intf, description, admin_state, mode):
+        """ xml merging the attributes that differ from the interface record,
+        empty when there are none, the commands are added with it """
 
         xmlstr = ''
-        change = False
-        self.updates_cmd.append("interface %s" % ifname)
-        if description and self.intf_info["ifDescr"] != description:
+        cmds = list()
+        if description and intf["ifDescr"] != description:
             xmlstr += CE_NC_XML_MERGE_INTF_DES % (ifname, description)
-            self.updates_cmd.append("description %s" % description)
-            change = True
+            cmds.append("description %s" % description)
 
-        if admin_state and is_admin_state_enable(self.intf_type) \
-                and self.intf_info["ifAdminStatus"] != admin_state:
+        if admin_state and is_admin_state_enable(iftype) \
+                and intf["ifAdminStatus"] != admin_state:
             xmlstr += CE_NC_XML_MERGE_INTF_STATUS % (ifname, admin_state)
-            change = True
             if admin_state == "up":
-                self.updates_cmd.append("undo shutdown")
+                cmds.append("undo shutdown")
             else:
-                self.updates_cmd.append("shutdown")
+                cmds.append("shutdown")
 
-        if is_portswitch_enalbe(self.intf_type):
-            if mode == "layer2" and self.intf_info["isL2SwitchPort"] != "true":
+        if is_portswitch_enalbe(iftype):
+            if mode == "layer2" and intf["isL2SwitchPort"] != "true":
                 xmlstr += CE_NC_XML_MERGE_INTF_L2ENABLE % (ifname, 'enable')
-                self.updates_cmd.append("portswitch")
-                change = True
-            elif mode == "layer3" \
-                    and self.intf_info["isL2SwitchPort"] != "false":
+                cmds.append("portswitch")
+            elif mode == "layer3" and intf["isL2SwitchPort"] != "false":
                 xmlstr += CE_NC_XML_MERGE_INTF_L2ENABLE % (ifname, 'disable')
-                self.updates_cmd.append("undo portswitch")
-                change = True
+                cmds.append("undo portswitch")
+
+        if xmlstr:
+            self.updates_cmd.append("interface %s" % ifname)
+            self.updates_cmd.extend(cmds)
+        return xmlstr
+
+    def merge_interface(self, ifname, description, admin_state, mode):
+        """ Merge interface attributes."""
 
-        if not change:
+        xmlstr = self.build_merge(ifname, self.intf_type, self.intf_info,
+                                  description, admin_state, mode)
+        if not xmlstr:
             return
 
         conf_str = '<config> ' + xmlstr + ' </config>'
@@ -558,49 +634,15 @@ class Interface(object):
         """ Merge interface attributes by type."""
 
         xmlstr = ''
-        change = False
         intfs_list = self.intfs_info.get(iftype.lower())
         if not intfs_list:
             return
 
         for intf in intfs_list:
-            if_change = False
-            self.updates_cmd.append("interface %s" % intf['ifName'])
-            if description and intf["ifDescr"] != description:
-                xmlstr += CE_NC_XML_MERGE_INTF_DES % (
-                    intf['ifName'], description)
-                self.updates_cmd.append("description %s" % description)
-                if_change = True
-            if admin_state and is_admin_state_enable(self.intf_type)\
-                    and intf["ifAdminStatus"] != admin_state:
-                xmlstr += CE_NC_XML_MERGE_INTF_STATUS % (
-                    intf['ifName'], admin_state)
-                if_change = True
-                if admin_state == "up":
-                    self.updates_cmd.append("undo shutdown")
-                else:
-                    self.updates_cmd.append("shutdown")
-
-            if is_portswitch_enalbe(self.intf_type):
-                if mode == "layer2" \
-                        and intf["isL2SwitchPort"] != "true":
-                    xmlstr += CE_NC_XML_MERGE_INTF_L2ENABLE % (
-                        intf['ifName'], 'enable')
-                    self.updates_cmd.append("portswitch")
-                    if_change = True
-                elif mode == "layer3" \
-                        and intf["isL2SwitchPort"] != "false":
-                    xmlstr += CE_NC_XML_MERGE_INTF_L2ENABLE % (
-                        intf['ifName'], 'disable')
-                    self.updates_cmd.append("undo portswitch")
-                    if_change = True
-
-            if if_change:
-                change = True
-            else:
-                self.updates_cmd.pop()
+            xmlstr += self.build_merge(intf['ifName'], self.intf_type, intf,
+                                       description, admin_state, mode)
 
-        if not change:
+        if not xmlstr:
             return
 
         conf_str = '<config> ' + xmlstr + ' </config>'
@@ -613,33 +655,37 @@ class Interface(object):
             err = sys.exc_info()[1]
             self.module.fail_json(msg='Error: %s' % err.message.replace("\r\n", ""))
 
-    def default_interface(self, ifname):
-        """default_interface"""
+    def build_default(self, ifname, iftype, intf):
+        """ xml setting the interface attributes to default, empty when they
+        already are, the commands are added with it """
 
-        change = False
-        xmlstr = ""
-        self.updates_cmd.append("interface %s" % ifname)
+        xmlstr = ''
+        cmds = list()
         # set description default
-        if self.intf_info["ifDescr"]:
+        if intf["ifDescr"]:
             xmlstr += CE_NC_XML_MERGE_INTF_DES % (ifname, '')
-            self.updates_cmd.append("undo description")
-            change = True
+            cmds.append("undo description")
 
         # set admin_status default
-        if is_admin_state_enable(self.intf_type) \
-                and self.intf_info["ifAdminStatus"] != 'up':
+        if is_admin_state_enable(iftype) and intf["ifAdminStatus"] != 'up':
             xmlstr += CE_NC_XML_MERGE_INTF_STATUS % (ifname, 'up')
-            self.updates_cmd.append("undo shutdown")
-            change = True
+            cmds.append("undo shutdown")
 
         # set portswitch default
-        if is_portswitch_enalbe(self.intf_type) \
-                and self.intf_info["isL2SwitchPort"] != "true":
+        if is_portswitch_enalbe(iftype) and intf["isL2SwitchPort"] != "true":
             xmlstr += CE_NC_XML_MERGE_INTF_L2ENABLE % (ifname, 'enable')
-            self.updates_cmd.append("portswitch")
-            change = True
+            cmds.append("portswitch")
+
+        if xmlstr:
+            self.updates_cmd.append("interface %s" % ifname)
+            self.updates_cmd.extend(cmds)
+        return xmlstr
 
-        if not change:
+    def default_interface(self, ifname):
+        """default_interface"""
+
+        xmlstr = self.build_default(ifname, self.intf_type, self.intf_info)
+        if not xmlstr:
             return
 
         conf_str = '<config> ' + xmlstr + ' </config>'
@@ -654,40 +700,15 @@ class Interface(object):
     def default_interfaces(self, iftype):
         """ Set interface config to default by type."""
 
-        change = False
         xmlstr = ''
         intfs_list = self.intfs_info.get(iftype.lower())
         if not intfs_list:
             return
 
         for intf in intfs_list:
-            if_change = False
-            self.updates_cmd.append("interface %s" % intf['ifName'])
-
-            # set description default
-            if intf['ifDescr']:
-                xmlstr += CE_NC_XML_MERGE_INTF_DES % (intf['ifName'], '')
-                self.updates_cmd.append("undo description")
-                if_change = True
-
-            # set admin_status default
-            if is_admin_state_enable(self.intf_type) and intf["ifAdminStatus"] != 'up':
-                xmlstr += CE_NC_XML_MERGE_INTF_STATUS % (intf['ifName'], 'up')
-                self.updates_cmd.append("undo shutdown")
-                if_change = True
-
-            # set portswitch default
-            if is_portswitch_enalbe(self.intf_type) and intf["isL2SwitchPort"] != "true":
-                xmlstr += CE_NC_XML_MERGE_INTF_L2ENABLE % (intf['ifName'], 'enable')
-                self.updates_cmd.append("portswitch")
-                if_change = True
+            xmlstr += self.build_default(intf['ifName'], self.intf_type, intf)
 
-            if if_change:
-                change = True
-            else:
-                self.updates_cmd.pop()
-
-        if not change:
+        if not xmlstr:
             return
 
         conf_str = '<config> ' + xmlstr + ' </config>'
@@ -699,9 +720,91 @@ class Interface(object):
             err = sys.exc_info()[1]
             self.module.fail_json(msg='Error: %s' % err.message.replace("\r\n", ""))
 
+    def check_intf_attr(self, iftype, state, description, admin_state, mode):
+        """Check the attributes set for an interface type"""
+
+        # shutdown check
+        if not is_admin_state_enable(iftype) \
+                and state == "present" and admin_state == "down":
+            self.module.fail_json(
+                msg='Error: The %s interface can not'
+                    ' be shutdown.' % iftype)
+
+        # port switch mode check
+        if not is_portswitch_enalbe(iftype)\
+                and mode and state == "present":
+            self.module.fail_json(
+                msg='Error: The %s interface can not manage'
+                    ' Layer 2 or Layer 3 state.' % iftype)
+
+        # check description len
+        if description:
+            if len(description) > 242 \
+                    or len(description.replace(' ', '')) < 1:
+                self.module.fail_json(
+                    msg='Error: interface description '
+                        'is not in the range from 1 to 242.')
+
+    def check_aggregate(self):
+        """Check the aggregate interface definitions"""
+
+        if self.interface or self.interface_type or self.description \
+                or self.admin_state or self.mode or self.l2sub:
+            self.module.fail_json(
+                msg='Error: Aggregate can not be set with interface, '
+                    'interface_type, description, admin_state, mode or l2sub.')
+
+        choices = dict(admin_state=('up', 'down'),
+                       mode=('layer2', 'layer3'),
+                       l2sub=('true', 'false'),
+                       state=('present', 'absent', 'default'))
+        names = set()
+        for item in self.aggregate:
+            if not isinstance(item, dict):
+                self.module.fail_json(
+                    msg='Error: Every aggregate item must be a dict.')
+            intf = dict()
+            for key in ('interface', 'description', 'admin_state', 'mode', 'l2sub'):
+                value = item.get(key)
+                intf[key] = str(value) if value is not None else None
+            if intf['l2sub']:
+                intf['l2sub'] = intf['l2sub'].lower()
+            intf['state'] = item.get('state') or self.state
+            if not intf['interface']:
+                self.module.fail_json(
+                    msg='Error: Interface must be set in every aggregate item.')
+            for key, values in choices.items():
+                if intf[key] and intf[key] not in values:
+                    self.module.fail_json(
+                        msg='Error: %s of %s must be one of %s.'
+                            % (key, intf['interface'], ', '.join(values)))
+
+            iftype = get_interface_type(intf['interface'])
+            if not iftype:
+                self.module.fail_json(
+                    msg='Error: interface name of %s'
+                        ' is error.' % intf['interface'])
+            self.check_intf_attr(iftype, intf['state'], intf['description'],
+                                 intf['admin_state'], intf['mode'])
+            if intf['l2sub'] == "true" and intf['interface'].count(".") != 1:
+                self.module.fail_json(
+                    msg='Error: Interface name %s is invalid, it is not '
+                        'sub-interface.' % intf['interface'])
+
+            if intf['interface'].upper() in names:
+                self.module.fail_json(
+                    msg='Error: Interface %s is set more than once in '
+                        'aggregate.' % intf['interface'])
+            names.add(intf['interface'].upper())
+            self.intfs_conf.append(intf)
+
     def check_params(self):
         """Check all input params"""
 
+        if self.aggregate is not None:
+            self.check_aggregate()
+            return
+
         if not self.interface and not self.interface_type:
             self.module.fail_json(
                 msg='Error: Interface or interface_type must be set.')
@@ -729,27 +832,9 @@ class Interface(object):
             self.module.fail_json(
                 msg='Error: interface or interface type %s is error.')
 
-        # shutdown check
-        if not is_admin_state_enable(self.intf_type) \
-                and self.state == "present" and self.admin_state == "down":
-            self.module.fail_json(
-                msg='Error: The %s interface can not'
-                    ' be shutdown.' % self.intf_type)
-
-        # port switch mode check
-        if not is_portswitch_enalbe(self.intf_type)\
-                and self.mode and self.state == "present":
-            self.module.fail_json(
-                msg='Error: The %s interface can not manage'
-                    ' Layer 2 or Layer 3 state.' % self.intf_type)
+        self.check_intf_attr(self.intf_type, self.state, self.description,
+                             self.admin_state, self.mode)
 
-        # check description len
-        if self.description:
-            if len(self.description) > 242 \
-                    or len(self.description.replace(' ', '')) < 1:
-                self.module.fail_json(
-                    msg='Error: interface description '
-                        'is not in the range from 1 to 242.')
         # check l2sub flag
         if self.l2sub and self.l2sub == "true":
             if not self.interface:
@@ -788,15 +873,7 @@ class Interface(object):
         """get_existing"""
 
         if self.intf_info:
-            self.existing["interface"] = self.intf_info["ifName"]
-            if is_admin_state_enable(self.intf_type):
-                self.existing["admin_state"] = self.intf_info["ifAdminStatus"]
-            self.existing["description"] = self.intf_info["ifDescr"]
-            if is_portswitch_enalbe(self.intf_type):
-                if self.intf_info["isL2SwitchPort"] == "true":
-                    self.existing["mode"] = "layer2"
-                else:
-                    self.existing["mode"] = "layer3"
+            self.existing = get_intf_attrs(self.intf_type, self.intf_info)
 
     def get_end_state(self):
         """get_end_state"""
@@ -804,21 +881,111 @@ class Interface(object):
         if self.intf_info:
             end_info = self.get_interface_dict(self.interface)
             if end_info:
-                self.end_state["interface"] = end_info["ifName"]
-                if is_admin_state_enable(self.intf_type):
-                    self.end_state["admin_state"] = end_info["ifAdminStatus"]
-                self.end_state["description"] = end_info["ifDescr"]
-                if is_portswitch_enalbe(self.intf_type):
-                    if end_info["isL2SwitchPort"] == "true":
-                        self.end_state["mode"] = "layer2"
-                    else:
-                        self.end_state["mode"] = "layer3"
+                self.end_state = get_intf_attrs(self.intf_type, end_info)
+
+    def build_aggregate(self, intfs_index):
+        """ xml bringing the interfaces to the aggregate, the attributes of
+        every listed interface before and after it is applied """
+
+        xmlstr = ''
+        existing = list()
+        end_state = list()
+        for conf in self.intfs_conf:
+            ifname = conf['interface']
+            iftype = get_interface_type(ifname)
+            intf = intfs_index.get(ifname.upper())
+            end_intf = None
+            if intf:
+                # the name as the device spells it
+                ifname = intf['ifName']
+                existing.append(get_intf_attrs(iftype, intf))
+                end_intf = dict(intf)
+            else:
+                existing.append(None)
+
+            if conf['state'] == 'present':
+                if not intf:
+                    xmlstr += self.build_create(
+                        ifname, iftype, conf['description'],
+                        conf['admin_state'], conf['mode'], conf['l2sub'])
+                    end_intf = dict(ifName=ifname, ifDescr='',
+                                    ifAdminStatus='', isL2SwitchPort='')
+                else:
+                    xmlstr += self.build_merge(
+                        ifname, iftype, intf, conf['description'],
+                        conf['admin_state'], conf['mode'])
+                if conf['description']:
+                    end_intf['ifDescr'] = conf['description']
+                if conf['admin_state'] and is_admin_state_enable(iftype):
+                    end_intf['ifAdminStatus'] = conf['admin_state']
+                if conf['mode'] and is_portswitch_enalbe(iftype):
+                    end_intf['isL2SwitchPort'] = str(
+                        conf['mode'] == 'layer2').lower()
+
+            elif conf['state'] == 'absent':
+                if intf:
+                    xmlstr += CE_NC_XML_DELETE_INTF % ifname
+                    self.updates_cmd.append('undo interface %s' % ifname)
+                    end_intf = None
+
+            else:       # default
+                if not intf:
+                    self.module.fail_json(
+                        msg='Error: interface %s does not exists.' % ifname)
+                xmlstr += self.build_default(ifname, iftype, intf)
+                end_intf['ifDescr'] = ''
+                if is_admin_state_enable(iftype):
+                    end_intf['ifAdminStatus'] = 'up'
+                if is_portswitch_enalbe(iftype):
+                    end_intf['isL2SwitchPort'] = 'true'
+
+            if end_intf:
+                end_state.append(get_intf_attrs(iftype, end_intf))
+            else:
+                end_state.append(None)
+
+        return xmlstr, existing, end_state
+
+    def work_aggregate(self):
+        """aggregate worker, one get and one edit-config"""
+
+        intfs_index = self.get_interfaces_index()
+        xmlstr, existing, end_state = self.build_aggregate(intfs_index)
+
+        if xmlstr and not self.module.check_mode:
+            conf_str = '<config> ' + xmlstr + ' </config>'
+            try:
+                con_obj = self.netconf.set_config(config=conf_str)
+                self.check_response(con_obj, "MERGE_INTFS_AGGREGATE")
+            except RPCError:
+                err = sys.exc_info()[1]
+                self.module.fail_json(msg='Error: %s' % err.message.replace("\r\n", ""))
+        self.changed = bool(xmlstr)
+
+        # the end state follows from the edit-config, no need to read it back
+        self.results['changed'] = self.changed
+        self.results['proposed'] = self.intfs_conf
+        self.results['existing'] = existing
+        if self.changed and not self.module.check_mode:
+            self.results['end_state'] = end_state
+        else:
+            self.results['end_state'] = existing
+        if self.changed:
+            self.results['updates'] = self.updates_cmd
+        else:
+            self.results['updates'] = list()
+
+        self.results.update(perf_results())
+        self.module.exit_json(**self.results)
 
     def work(self):
         """worker"""
 
         self.check_params()
 
+        if self.aggregate is not None:
+            self.work_aggregate()
+
         # single interface config
         if self.interface:
             self.intf_info = self.get_interface_dict(self.interface)
@@ -858,7 +1025,7 @@ class Interface(object):
 
         # interface type config
         else:
-            self.intfs_info = self.get_interfaces_dict()
+            self.intfs_info = self.get_interfaces_dict(self.intf_type)
             self.get_existing()
             if self.state == 'present':
                 if self.intfs_info.get(self.intf_type.lower()):
@@ -891,6 +1058,7 @@ class Interface(object):
         else:
             self.results['updates'] = list()
 
+        self.results.update(perf_results())
         self.module.exit_json(**self.results)
 
 
@@ -906,6 +1074,7 @@ def main():
         l2sub=dict(choices=['true', 'false'], required=False),
         state=dict(choices=['absent', 'present', 'default'],
                    default='present', required=False),
+        aggregate=dict(required=False, type='list'),
     )
 
     interface = Interface(argument_spec)
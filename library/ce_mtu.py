@@ -141,12 +141,13 @@ import sys
 import re
 import copy
 from ansible.module_utils.network import NetworkModule, NetworkError
-from ansible.module_utils.cloudengine import get_cli_exception
+from ansible.module_utils.cloudengine import get_cli_exception, get_config_tree
 from ansible.module_utils.netcli import FailedConditionsError, FailedConditionalError
 from ansible.module_utils.basic import get_exception
 from ansible.module_utils.cloudengine import get_netconf
 from ansible.module_utils.netcli import CommandRunner
 from ansible.module_utils.netcli import AddCommandError
+from ansible.module_utils.ce_perf import perf_results
 
 try:
     from ncclient.operations.rpc import RPCError
@@ -340,26 +341,19 @@ class Mtu(object):
 
         return intf_info
 
-    def prase_jumboframe_para(self, config_str):
+    def prase_jumboframe_para(self, section):
         """prase_jumboframe_para"""
 
-        interface_cli = "interface %s" % self.interface
-        if config_str.find(interface_cli) == -1:
+        if section is None:
             self.module.fail_json(
                 msg='Error: Interface does not exist.')
-        npos1 = config_str.index(interface_cli)
 
-        npos2 = config_str.index('#', npos1)
-        config_str_tmp = config_str[npos1:npos2]
-        try:
-            npos3 = config_str_tmp.index('jumboframe enable')
-        except ValueError:
+        jbf_lines = section.startswith('jumboframe enable')
+        if not jbf_lines:
             # return default vale
             return [9216, 1518]
-        npos4 = config_str_tmp.index('\n', npos3)
 
-        config_str_tmp = config_str_tmp[npos3:npos4]
-        return re.findall(r'([0-9]+)', config_str_tmp)
+        return re.findall(r'([0-9]+)', jbf_lines[0].text)
 
     def excute_command(self, commands):
         """ excute_command"""
@@ -397,13 +391,9 @@ class Mtu(object):
     def get_jumboframe_config(self):
         """ get_jumboframe_config"""
 
-        commands = list()
-        cmd = {'output': None,
-               'command': 'display current-configuration interface %s' % self.interface}
-        commands.append(cmd)
-        output = self.excute_command(commands)
-        output = output.replace('*', '')
-        return self.prase_jumboframe_para(output)
+        tree = get_config_tree(self.module)
+        return self.prase_jumboframe_para(
+            tree.section("interface %s" % self.interface))
 
     def set_jumboframe(self):
         """ set_jumboframe"""
@@ -653,6 +643,7 @@ class Mtu(object):
         else:
             self.results['updates'] = list()
 
+        self.results.update(perf_results())
         self.module.exit_json(**self.results)
 
 
@@ -135,6 +135,7 @@ end_state:
 import sys
 from ansible.module_utils.network import NetworkModule
 from ansible.module_utils.cloudengine import get_netconf
+from ansible.module_utils.ce_perf import perf_results
 
 try:
     from ncclient.operations.rpc import RPCError
@@ -246,6 +247,7 @@ def main():
     results['changed'] = changed
     results['end_state'] = end_state
 
+    results.update(perf_results())
     module.exit_json(**results)
 
 
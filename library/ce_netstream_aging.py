@@ -197,6 +197,7 @@ changed:
 
 from ansible.module_utils.network import NetworkModule, NetworkError
 from ansible.module_utils.cloudengine import get_cli_exception
+from ansible.module_utils.ce_perf import perf_results
 
 
 class NetStreamAging(object):
@@ -493,6 +494,7 @@ class NetStreamAging(object):
         else:
             self.results['updates'] = list()
 
+        self.results.update(perf_results())
         self.module.exit_json(**self.results)
 
 
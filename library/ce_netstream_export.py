@@ -204,6 +204,7 @@ changed:
 import re
 from ansible.module_utils.network import NetworkModule, NetworkError
 from ansible.module_utils.cloudengine import get_cli_exception
+from ansible.module_utils.ce_perf import perf_results
 
 
 def is_ipv4_addr(ip_addr):
@@ -334,6 +335,7 @@ class NetstreamExport(object):
         else:
             self.results['updates'] = list()
 
+        self.results.update(perf_results())
         self.module.exit_json(**self.results)
 
     def cli_add_command(self, command, undo=False):
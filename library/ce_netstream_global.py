@@ -217,8 +217,10 @@ changed:
     sample: true
 '''
 
+import re
 from ansible.module_utils.network import NetworkModule, NetworkError
-from ansible.module_utils.cloudengine import get_cli_exception
+from ansible.module_utils.cloudengine import get_cli_exception, get_config_tree
+from ansible.module_utils.ce_perf import perf_results
 
 def get_interface_type(interface):
     """Gets the type of interface, such as 10GE, ETH-TRUNK..."""
@@ -327,14 +329,23 @@ class NetStreamGlobal(object):
         if command.lower() not in ["quit", "return"]:
             self.updates_cmd.append(cmd)
 
+    def get_config_lines(self, regex, interface=None):
+        """get matched lines of running config, from the section of
+        interface if it is set"""
+
+        section = get_config_tree(self.module)
+        if interface:
+            section = section.section("interface %s" % interface)
+            if section is None:
+                return ""
+        return "\n".join(node.text for node in section.search(regex, re.I))
+
     def get_exist_sampler_interval(self):
         """get exist netstream sampler interval"""
 
         sampler_tmp = dict()
         sampler_tmp1 = dict()
-        exp = " | ignore-case  include ^netstream sampler random-packets"
-        config = self.module.config.get_config(
-            include_defaults=False, regular=exp)
+        config = self.get_config_lines("^netstream sampler random-packets")
         if not config:
             sampler_tmp["sampler_interval"] = "null"
             sampler_tmp["sampler_direction"] = "null"
@@ -346,10 +357,8 @@ class NetStreamGlobal(object):
         sampler_tmp["interface"] = "all"
         self.existing["sampler"].append(sampler_tmp)
         if self.interface != "all":
-            exp = " | ignore-case  section include ^interface %s$" \
-                  " | include netstream sampler random-packets" % self.interface
-            config = self.module.config.get_config(
-                include_defaults=False, regular=exp)
+            config = self.get_config_lines(
+                "netstream sampler random-packets", self.interface)
             if not config:
                 sampler_tmp1["sampler_interval"] = "null"
                 sampler_tmp1["sampler_direction"] = "null"
@@ -379,11 +388,8 @@ class NetStreamGlobal(object):
         statistic_tmp["interface"] = self.interface
         statistic_tmp1["statistics_record"] = list()
         statistic_tmp1["interface"] = self.interface
-        exp = " | ignore-case  section include ^interface %s$" \
-              " | include netstream record"\
-              % (self.interface)
-        config = self.module.config.get_config(
-            include_defaults=False, regular=exp)
+        config = self.get_config_lines(
+            "netstream record", self.interface)
         if not config:
             statistic_tmp["type"] = "ip"
             self.existing["flexible_statistic"].append(statistic_tmp)
@@ -416,11 +422,8 @@ class NetStreamGlobal(object):
 
         statistic_tmp1 = dict()
         statistic_tmp1["statistics_direction"] = list()
-        exp = " | ignore-case  section include ^interface %s$" \
-              " | include netstream inbound|outbound"\
-              % self.interface
-        config = self.module.config.get_config(
-            include_defaults=False, regular=exp)
+        config = self.get_config_lines(
+            "netstream inbound|outbound", self.interface)
         if not config:
             statistic_tmp1["type"] = "null"
         else:
@@ -444,9 +447,7 @@ class NetStreamGlobal(object):
         index_switch_tmp["type"] = "ip"
         index_switch_tmp1["index-switch"] = "16"
         index_switch_tmp1["type"] = "vxlan"
-        exp = " | ignore-case  include index-switch"
-        config = self.module.config.get_config(
-            include_defaults=False, regular=exp)
+        config = self.get_config_lines("index-switch")
         if not config:
             self.existing["index-switch"].append(index_switch_tmp)
             self.existing["index-switch"].append(index_switch_tmp1)
@@ -467,9 +468,7 @@ class NetStreamGlobal(object):
     def get_exist_record(self):
         """get exist netstream record"""
 
-        exp = " | ignore-case include netstream record"
-        config = self.module.config.get_config(
-            include_defaults=False, regular=exp)
+        config = self.get_config_lines("netstream record")
         if config:
             config = config.lstrip()
             config_list = config.split('\n')
@@ -485,9 +484,7 @@ class NetStreamGlobal(object):
 
         sampler_tmp = dict()
         sampler_tmp1 = dict()
-        exp = " | ignore-case  include ^netstream sampler random-packets"
-        config = self.module.config.get_config(
-            include_defaults=False, regular=exp)
+        config = self.get_config_lines("^netstream sampler random-packets")
         if not config:
             sampler_tmp["sampler_interval"] = "null"
             sampler_tmp["sampler_direction"] = "null"
@@ -499,10 +496,8 @@ class NetStreamGlobal(object):
         sampler_tmp["interface"] = "all"
         self.end_state["sampler"].append(sampler_tmp)
         if self.interface != "all":
-            exp = " | ignore-case  section include ^interface %s$" \
-                  " | include netstream sampler random-packets" % self.interface
-            config = self.module.config.get_config(
-                include_defaults=False, regular=exp)
+            config = self.get_config_lines(
+                "netstream sampler random-packets", self.interface)
             if not config:
                 sampler_tmp1["sampler_interval"] = "null"
                 sampler_tmp1["sampler_direction"] = "null"
@@ -532,11 +527,8 @@ class NetStreamGlobal(object):
         statistic_tmp["interface"] = self.interface
         statistic_tmp1["statistics_record"] = list()
         statistic_tmp1["interface"] = self.interface
-        exp = " | ignore-case  section include ^interface %s$" \
-              " | include netstream record"\
-              % (self.interface)
-        config = self.module.config.get_config(
-            include_defaults=False, regular=exp)
+        config = self.get_config_lines(
+            "netstream record", self.interface)
         if not config:
             statistic_tmp["type"] = "ip"
             self.end_state["flexible_statistic"].append(statistic_tmp)
@@ -569,11 +561,8 @@ class NetStreamGlobal(object):
 
         statistic_tmp1 = dict()
         statistic_tmp1["statistics_direction"] = list()
-        exp = " | ignore-case  section include ^interface %s$" \
-              " | include netstream inbound|outbound"\
-              % self.interface
-        config = self.module.config.get_config(
-            include_defaults=False, regular=exp)
+        config = self.get_config_lines(
+            "netstream inbound|outbound", self.interface)
         if not config:
             statistic_tmp1["type"] = "null"
         else:
@@ -597,9 +586,7 @@ class NetStreamGlobal(object):
         index_switch_tmp["type"] = "ip"
         index_switch_tmp1["index-switch"] = "16"
         index_switch_tmp1["type"] = "vxlan"
-        exp = " | ignore-case  include index-switch"
-        config = self.module.config.get_config(
-            include_defaults=False, regular=exp)
+        config = self.get_config_lines("index-switch")
         if not config:
             self.end_state["index-switch"].append(index_switch_tmp)
             self.end_state["index-switch"].append(index_switch_tmp1)
@@ -870,6 +857,7 @@ class NetStreamGlobal(object):
         else:
             self.results['updates'] = list()
 
+        self.results.update(perf_results())
         self.module.exit_json(**self.results)
 
 
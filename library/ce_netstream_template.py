@@ -148,7 +148,8 @@ updates:
 
 import re
 from ansible.module_utils.network import NetworkModule, NetworkError
-from ansible.module_utils.cloudengine import get_cli_exception
+from ansible.module_utils.cloudengine import get_cli_exception, get_config_tree
+from ansible.module_utils.ce_perf import perf_results
 
 
 class NetstreamTemplate(object):
@@ -201,8 +202,7 @@ class NetstreamTemplate(object):
         else:
             cmd = "netstream record %s vxlan inner-ip" % self.record_name
 
-        regular = "| section include %s" % cmd
-        self.netstream_cfg = self.module.config.get_config(regular=regular)
+        self.netstream_cfg = get_config_tree(self.module).section_text(cmd)
 
     def check_args(self):
         """ Check module args """
@@ -452,6 +452,7 @@ class NetstreamTemplate(object):
         self.results['end_state'] = self.end_state
         self.results['updates'] = self.updates_cmd
 
+        self.results.update(perf_results())
         self.module.exit_json(**self.results)
 
 
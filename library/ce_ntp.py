@@ -122,6 +122,7 @@ import datetime
 from xml.etree import ElementTree
 from ansible.module_utils.network import NetworkModule
 from ansible.module_utils.cloudengine import get_netconf
+from ansible.module_utils.ce_perf import perf_results
 
 try:
     from ncclient.operations.rpc import RPCError
@@ -455,6 +456,7 @@ class Ntp(object):
         self.end_time = datetime.datetime.now()
         self.results['execute_time'] = str(self.end_time - self.start_time)
 
+        self.results.update(perf_results())
         self.module.exit_json(**self.results)
 
     def get_ntp_exist_config(self):
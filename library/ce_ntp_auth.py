@@ -206,6 +206,7 @@ from ansible.module_utils.basic import get_exception
 from ansible.module_utils.cloudengine import get_netconf
 from ansible.module_utils.netcli import CommandRunner, AddCommandError
 from ansible.module_utils.cloudengine import get_cli_exception
+from ansible.module_utils.ce_perf import perf_results
 
 HAS_NCCLIENT = False
 try:
@@ -622,6 +623,7 @@ class NtpAuth(object):
         self.end_time = datetime.datetime.now()
         self.results['execute_time'] = str(self.end_time - self.start_time)
 
+        self.results.update(perf_results())
         self.module.exit_json(**self.results)
 
     def work(self):
@@ -279,9 +279,10 @@ changed:
     sample: False
 '''
 import sys
-from xml.etree import ElementTree
 from ansible.module_utils.network import NetworkModule
 from ansible.module_utils.cloudengine import get_netconf
+from ansible.module_utils.ce_xml import iter_records
+from ansible.module_utils.ce_perf import perf_results
 
 HAS_NCCLIENT = False
 try:
@@ -1102,31 +1103,23 @@ class OspfVrf(object):
 
         if 'data/' in get_obj.xml:
             return
-        xml_str = get_obj.xml.replace('\r', '').replace('\n', '').\
-            replace('xmlns="urn:ietf:params:xml:ns:netconf:base:1.0"', "").\
-            replace('xmlns="http://www.huawei.com/netconf/vrp"', "")
-
-        root = ElementTree.fromstring(xml_str)
 
         # get the vpn address family and RD text
-        ospf_sites = root.findall(
-            "data/ospfv2/ospfv2comm/ospfSites/ospfSite")
-        if ospf_sites:
-            for ospf_site in ospf_sites:
-                ospf_ele_info = dict()
-                for ospf_site_ele in ospf_site:
-                    if ospf_site_ele.tag in ["processId", "routerId", "vrfName", "bandwidthReference",
-                                             "description", "lsaArrivalInterval", "lsaArrivalMaxInterval",
-                                             "lsaArrivalStartInterval", "lsaArrivalHoldInterval", "lsaArrivalFlag",
-                                             "lsaOriginateInterval", "lsaOriginateMaxInterval",
-                                             "lsaOriginateStartInterval", "lsaOriginateHoldInterval",
-                                             "lsaOriginateIntervalFlag", "spfScheduleInterval",
-                                             "spfScheduleIntervalMillisecond", "spfScheduleMaxInterval",
-                                             "spfScheduleStartInterval", "spfScheduleHoldInterval",
-                                             "spfScheduleIntervalType"]:
-                        ospf_ele_info[
-                            ospf_site_ele.tag] = ospf_site_ele.text
-                self.ospf_info["ospfsite"].append(ospf_ele_info)
+        for _, ospf_site in iter_records(
+                get_obj.xml, "data/ospfv2/ospfv2comm/ospfSites/ospfSite"):
+            ospf_ele_info = dict()
+            for key in ["processId", "routerId", "vrfName", "bandwidthReference",
+                        "description", "lsaArrivalInterval", "lsaArrivalMaxInterval",
+                        "lsaArrivalStartInterval", "lsaArrivalHoldInterval", "lsaArrivalFlag",
+                        "lsaOriginateInterval", "lsaOriginateMaxInterval",
+                        "lsaOriginateStartInterval", "lsaOriginateHoldInterval",
+                        "lsaOriginateIntervalFlag", "spfScheduleInterval",
+                        "spfScheduleIntervalMillisecond", "spfScheduleMaxInterval",
+                        "spfScheduleStartInterval", "spfScheduleHoldInterval",
+                        "spfScheduleIntervalType"]:
+                if key in ospf_site:
+                    ospf_ele_info[key] = ospf_site[key]
+            self.ospf_info["ospfsite"].append(ospf_ele_info)
 
     def get_proposed(self):
         """get proposed info"""
@@ -1642,6 +1635,7 @@ class OspfVrf(object):
         else:
             self.results['updates'] = list()
 
+        self.results.update(perf_results())
         self.module.exit_json(**self.results)
 
 
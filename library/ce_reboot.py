@@ -64,6 +64,7 @@ rebooted:
 
 from ansible.module_utils.network import NetworkModule
 from ansible.module_utils.cloudengine import get_netconf
+from ansible.module_utils.ce_perf import perf_results
 
 HAS_NCCLIENT = False
 try:
@@ -162,6 +163,7 @@ def main():
     results['changed'] = changed
     results['rebooted'] = rebooted
 
+    results.update(perf_results())
     module.network_module.exit_json(**results)
 
 
@@ -118,6 +118,7 @@ from ansible.module_utils.network import NetworkError, NetworkModule
 from ansible.module_utils.cloudengine import get_netconf, get_cli_exception
 from ansible.module_utils.netcli import CommandRunner, AddCommandError
 from ansible.module_utils.basic import get_exception
+from ansible.module_utils.ce_perf import perf_results
 
 try:
     from ncclient.operations.rpc import RPCError
@@ -558,6 +559,7 @@ class RollBack(object):
         else:
             self.results['updates'] = list()
 
+        self.results.update(perf_results())
         self.module.exit_json(**self.results)
 
 
@@ -238,9 +238,10 @@ changed:
 import sys
 import re
 import socket
-from xml.etree import ElementTree
 from ansible.module_utils.network import NetworkModule, NetworkError
 from ansible.module_utils.cloudengine import get_netconf, get_cli_exception
+from ansible.module_utils.ce_xml import group_records
+from ansible.module_utils.ce_perf import perf_results
 try:
     from ncclient.operations.rpc import RPCError
     HAS_NCCLIENT = True
@@ -600,59 +601,53 @@ class Sflow(object):
         if "<data/>" in con_obj.xml:
             return sflow_dict
 
-        xml_str = con_obj.xml.replace('\r', '').replace('\n', '').\
-            replace('xmlns="urn:ietf:params:xml:ns:netconf:base:1.0"', "").\
-            replace('xmlns="http://www.huawei.com/netconf/vrp"', "")
-        root = ElementTree.fromstring(xml_str)
+        records = group_records(con_obj.xml,
+                                "data/sflow/sources/source",
+                                "data/sflow/agents/agent",
+                                "data/sflow/collectors/collector",
+                                "data/sflow/samplings/sampling",
+                                "data/sflow/counters/counter",
+                                "data/sflow/exports/export")
 
         # get source info
-        srcs = root.findall("data/sflow/sources/source")
-        if srcs:
-            for src in srcs:
-                attrs = dict()
-                for attr in src:
-                    if attr.tag in ["family", "ipv4Addr", "ipv6Addr"]:
-                        attrs[attr.tag] = attr.text
-                sflow_dict["source"].append(attrs)
+        for src in records["data/sflow/sources/source"]:
+            attrs = dict()
+            for key in ["family", "ipv4Addr", "ipv6Addr"]:
+                if key in src:
+                    attrs[key] = src[key]
+            sflow_dict["source"].append(attrs)
 
         # get agent info
-        agent = root.find("data/sflow/agents/agent")
-        if agent:
-            for attr in agent:
-                if attr.tag in ["family", "ipv4Addr", "ipv6Addr"]:
-                    sflow_dict["agent"][attr.tag] = attr.text
+        for agent in records["data/sflow/agents/agent"][:1]:
+            for key in ["family", "ipv4Addr", "ipv6Addr"]:
+                if key in agent:
+                    sflow_dict["agent"][key] = agent[key]
 
         # get collector info
-        collectors = root.findall("data/sflow/collectors/collector")
-        if collectors:
-            for collector in collectors:
-                attrs = dict()
-                for attr in collector:
-                    if attr.tag in ["collectorID", "family", "ipv4Addr", "ipv6Addr",
-                                    "vrfName", "datagramSize", "port", "description", "meth"]:
-                        attrs[attr.tag] = attr.text
-                sflow_dict["collector"].append(attrs)
+        for collector in records["data/sflow/collectors/collector"]:
+            attrs = dict()
+            for key in ["collectorID", "family", "ipv4Addr", "ipv6Addr",
+                        "vrfName", "datagramSize", "port", "description", "meth"]:
+                if key in collector:
+                    attrs[key] = collector[key]
+            sflow_dict["collector"].append(attrs)
 
         # get sampling info
-        sample = root.find("data/sflow/samplings/sampling")
-        if sample:
-            for attr in sample:
-                if attr.tag in ["ifName", "collectorID", "direction", "length", "rate"]:
-                    sflow_dict["sampling"][attr.tag] = attr.text
+        for sample in records["data/sflow/samplings/sampling"][:1]:
+            for key in ["ifName", "collectorID", "direction", "length", "rate"]:
+                if key in sample:
+                    sflow_dict["sampling"][key] = sample[key]
 
         # get counter info
-        counter = root.find("data/sflow/counters/counter")
-        if counter:
-            for attr in counter:
-                if attr.tag in ["ifName", "collectorID", "interval"]:
-                    sflow_dict["counter"][attr.tag] = attr.text
+        for counter in records["data/sflow/counters/counter"][:1]:
+            for key in ["ifName", "collectorID", "interval"]:
+                if key in counter:
+                    sflow_dict["counter"][key] = counter[key]
 
         # get export info
-        export = root.find("data/sflow/exports/export")
-        if export:
-            for attr in export:
-                if attr.tag == "ExportRoute":
-                    sflow_dict["export"][attr.tag] = attr.text
+        for export in records["data/sflow/exports/export"][:1]:
+            if "ExportRoute" in export:
+                sflow_dict["export"]["ExportRoute"] = export["ExportRoute"]
 
         return sflow_dict
 
@@ -1346,6 +1341,7 @@ class Sflow(object):
         else:
             self.results['updates'] = list()
 
+        self.results.update(perf_results())
         self.module.exit_json(**self.results)
 
 
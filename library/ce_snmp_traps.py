@@ -130,10 +130,11 @@ updates:
 
 
 from ansible.module_utils.basic import get_exception
-from ansible.module_utils.cloudengine import get_cli_exception
+from ansible.module_utils.cloudengine import get_cli_exception, get_config_tree
 from ansible.module_utils.network import NetworkModule
 from ansible.module_utils.network import NetworkError
 from ansible.module_utils.netcli import CommandRunner, AddCommandError
+from ansible.module_utils.ce_perf import perf_results
 
 
 class SnmpTraps(object):
@@ -316,9 +317,9 @@ class SnmpTraps(object):
     def cli_get_config(self):
         """ Get configure through cli """
 
-        regular = "| include snmp | include trap"
-        tmp_cfg = self.module.config.get_config(
-            include_all=True, regular=regular)
+        tree = get_config_tree(self.module, include_all=True)
+        tmp_cfg = "\n".join(node.text for node in tree.search("snmp")
+                             if "trap" in node.text)
 
         return tmp_cfg
 
@@ -524,6 +525,7 @@ class SnmpTraps(object):
         self.results['end_state'] = self.end_state
         self.results['updates'] = self.updates_cmd
 
+        self.results.update(perf_results())
         self.module.exit_json(**self.results)
 
 
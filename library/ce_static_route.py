@@ -134,9 +134,10 @@ changed:
 
 
 import sys
-from xml.etree import ElementTree
 from ansible.module_utils.network import NetworkModule
 from ansible.module_utils.cloudengine import get_netconf
+from ansible.module_utils.ce_xml import find_records
+from ansible.module_utils.ce_perf import perf_results
 
 HAS_NCCLIENT = False
 try:
@@ -590,28 +591,22 @@ class StaticRoute(object):
 
         if 'data/' in get_obj.xml:
             return
-        xml_str = get_obj.xml.replace('\r', '').replace('\n', '').\
-            replace('xmlns="urn:ietf:params:xml:ns:netconf:base:1.0"', "").\
-            replace('xmlns="http://www.huawei.com/netconf/vrp"', "")
-        root = ElementTree.fromstring(xml_str)
-        static_routes = root.findall(
-            "data/staticrt/staticrtbase/srRoutes/srRoute")
-
-        if static_routes:
-            for static_route in static_routes:
-                static_info = dict()
-                for static_ele in static_route:
-                    if static_ele.tag in ["vrfName", "afType", "topologyName",
-                                          "prefix", "maskLength", "destVrfName",
-                                          "nexthop", "ifName", "preference", "description"]:
-                        static_info[
-                            static_ele.tag] = static_ele.text
-                    if static_ele.tag == "tag":
-                        if static_ele.text is not None:
-                            static_info["tag"] = static_ele.text
-                        else:
-                            static_info["tag"] = "None"
-                self.static_routes_info["sroute"].append(static_info)
+        static_routes = find_records(
+            get_obj.xml, "data/staticrt/staticrtbase/srRoutes/srRoute")
+
+        for static_route in static_routes:
+            static_info = dict()
+            for key in ["vrfName", "afType", "topologyName",
+                        "prefix", "maskLength", "destVrfName",
+                        "nexthop", "ifName", "preference", "description"]:
+                if key in static_route:
+                    static_info[key] = static_route[key]
+            if "tag" in static_route:
+                if static_route["tag"] is not None:
+                    static_info["tag"] = static_route["tag"]
+                else:
+                    static_info["tag"] = "None"
+            self.static_routes_info["sroute"].append(static_info)
 
     def check_params(self):
         """check all input params"""
@@ -812,6 +807,7 @@ class StaticRoute(object):
         else:
             self.results['updates'] = list()
 
+        self.results.update(perf_results())
         self.module.exit_json(**self.results)
 
 
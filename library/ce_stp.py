@@ -189,7 +189,8 @@ updates:
 
 import re
 from ansible.module_utils.network import NetworkModule, NetworkError
-from ansible.module_utils.cloudengine import get_cli_exception
+from ansible.module_utils.cloudengine import get_cli_exception, get_config_tree
+from ansible.module_utils.ce_perf import perf_results
 
 
 class Stp(object):
@@ -246,25 +247,25 @@ class Stp(object):
     def cli_get_stp_config(self):
         """ Cli get stp configuration """
 
-        regular = "| include stp"
-        self.stp_cfg = self.module.config.get_config(regular=regular)
+        tree = get_config_tree(self.module)
+        self.stp_cfg = '\n'.join(node.text for node in tree.sections('stp'))
 
     def cli_get_interface_stp_config(self):
         """ Cli get interface's stp configuration """
 
         if self.interface:
-            regular = "| ignore-case section include ^interface %s$" % self.interface
-            tmp_cfg = self.module.config.get_config(regular=regular)
+            tree = get_config_tree(self.module)
+            section = tree.section("interface %s" % self.interface)
 
-            if not tmp_cfg:
+            if section is None:
                 self.module.fail_json(
                     msg='Error: The interface %s is not exist.' % self.interface)
 
-            if "undo portswitch" in tmp_cfg:
+            if section.has("undo portswitch"):
                 self.module.fail_json(
                     msg='Error: The interface %s is not switch mode.' % self.interface)
 
-            self.interface_stp_cfg = tmp_cfg
+            self.interface_stp_cfg = section.to_text()
 
     def check_args(self):
         """ Check module args """
@@ -932,6 +933,7 @@ class Stp(object):
         self.results['end_state'] = self.end_state
         self.results['updates'] = self.updates_cmd
 
+        self.results.update(perf_results())
         self.module.exit_json(**self.results)
 
 
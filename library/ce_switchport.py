@@ -42,7 +42,8 @@ options:
     interface:
         description:
             - Full name of the interface, i.e. 40GE1/0/22.
-        required: true
+              Required unless I(aggregate) is set.
+        required: false
         default: null
     mode:
         description:
@@ -74,6 +75,16 @@ options:
         required: false
         default:  present
         choices: ['present','absent', 'unconfigured']
+    aggregate:
+        description:
+            - List of switchport definitions, dicts with I(interface) and the
+              optional I(mode), I(access_vlan), I(native_vlan), I(trunk_vlans)
+              and I(state) keys, I(state) defaults to the module I(state).
+              The Layer 2 attributes of all Ethernet ports are read once and
+              every change is sent in one edit-config.
+              Can not be used with I(interface).
+        required: false
+        default: null
 '''
 EXAMPLES = '''
 # ENSURE 40GE1/0/22 is in its default switchport state
@@ -86,23 +97,34 @@ EXAMPLES = '''
 - ce_switchport: interface=40GE1/0/22 mode=trunk native_vlan=10 trunk_vlans=2-50 host={{ inventory_hostname }}
 # Ensure these VLANs are not being tagged on the trunk
 - ce_switchport: interface=40GE1/0/22 mode=trunk trunk_vlans=51-4000 host={{ inventory_hostname }} state=absent
+# Provision the access and uplink ports of a switch in one task
+- ce_switchport:
+    aggregate:
+      - {interface: 40GE1/0/1, mode: access, access_vlan: 10}
+      - {interface: 40GE1/0/2, mode: access, access_vlan: 20}
+      - {interface: 40GE1/0/47, mode: trunk, native_vlan: 1, trunk_vlans: "10,20"}
+      - {interface: 40GE1/0/48, state: unconfigured}
+    host: "{{ inventory_hostname }}"
 '''
 
 RETURN = '''
 proposed:
-    description: k/v pairs of parameters passed into module
+    description: k/v pairs of parameters passed into module, the switchport
+                 definitions with aggregate
     returned: always
-    type: dict
+    type: dict or list
     sample: {"access_vlan": "20", "interface": "40GE1/0/22", "mode": "access"}
 existing:
-    description: k/v pairs of existing switchport
-    type: dict
+    description: k/v pairs of existing switchport, one per switchport
+                 definition with aggregate
+    type: dict or list
     sample:  {"access_vlan": "10", "interface": "40GE1/0/22",
               "mode": "access", "switchport": "enable"}
 end_state:
-    description: k/v pairs of switchport after module execution
+    description: k/v pairs of switchport after module execution, one per
+                 switchport definition with aggregate
     returned: always
-    type: dict or null
+    type: dict, list or null
     sample:  {"access_vlan": "20", "interface": "40GE1/0/22",
               "mode": "access", "switchport": "enable"}
 updates:
@@ -117,10 +139,12 @@ changed:
     sample: true
 '''
 
-import re
 import sys
 from ansible.module_utils.network import NetworkModule
 from ansible.module_utils.cloudengine import get_netconf
+from ansible.module_utils.ce_perf import perf_results, timed
+from ansible.module_utils.ce_vlanset import VlanSet
+from ansible.module_utils.ce_xml import iter_records
 
 try:
     from ncclient.operations.rpc import RPCError
@@ -159,8 +183,25 @@ CE_NC_GET_PORT_ATTR = """
 </filter>
 """
 
+CE_NC_GET_PORTS_ATTR = """
+<filter type="subtree">
+  <ethernet xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+    <ethernetIfs>
+      <ethernetIf>
+        <ifName></ifName>
+        <l2Enable></l2Enable>
+        <l2Attribute>
+          <linkType></linkType>
+          <pvid></pvid>
+          <trunkVlans></trunkVlans>
+        </l2Attribute>
+      </ethernetIf>
+    </ethernetIfs>
+  </ethernet>
+</filter>
+"""
+
 CE_NC_SET_ACCESS_PORT = """
-<config>
    <ethernet xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
     <ethernetIfs>
         <ethernetIf operation="merge">
@@ -174,7 +215,6 @@ CE_NC_SET_ACCESS_PORT = """
         </ethernetIf>
     </ethernetIfs>
   </ethernet>
-</config>
 """
 
 CE_NC_SET_TRUNK_PORT_MODE = """
@@ -221,7 +261,6 @@ CE_NC_SET_TRUNK_PORT_VLANS = """
 """
 
 CE_NC_SET_DEFAULT_PORT = """
-<config>
    <ethernet xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
     <ethernetIfs>
         <ethernetIf operation="merge">
@@ -235,7 +274,6 @@ CE_NC_SET_DEFAULT_PORT = """
         </ethernetIf>
     </ethernetIfs>
   </ethernet>
-</config>
 """
 
 
@@ -297,33 +335,36 @@ def is_portswitch_enalbe(iftype):
 
     return bool(iftype in SWITCH_PORT_TYPE)
 
-def vlan_bitmap_undo(bitmap):
-    """convert vlan bitmap to undo bitmap"""
-
-    vlan_bit = ['F'] * 1024
-
-    if not bitmap or len(bitmap) == 0:
-        return ''.join(vlan_bit)
-
-    bit_len = len(bitmap)
-    for num in range(bit_len):
-        undo = (~int(bitmap[num], 16)) & 0xF
-        vlan_bit[num] = hex(undo)[2]
-
-    return ''.join(vlan_bit)
-
-def is_vlan_bitmap_empty(bitmap):
-    """check vlan bitmap empty"""
-
-    if not bitmap or len(bitmap) == 0:
-        return True
-
-    bit_len = len(bitmap)
-    for num in range(bit_len):
-        if bitmap[num] != '0':
-            return False
-
-    return True
+def index_ports(xml_str):
+    """ethernetIf records of a reply in one pass, by upper case name"""
+
+    ports_index = dict()
+    if "<data/>" in xml_str:
+        return ports_index
+
+    with timed('xml', 'parse') as timer:
+        timer.received = len(xml_str)
+        for _, tmp in iter_records(xml_str, "data/ethernet/ethernetIfs/ethernetIf"):
+            intf = dict(ifName=tmp.get('ifName') or '',
+                        l2Enable=tmp.get('l2Enable') or '',
+                        linkType="", pvid="", trunkVlans="")
+            if not intf["ifName"]:
+                continue
+            attr = tmp.get('l2Attribute')
+            if intf["l2Enable"] == "enable" and isinstance(attr, dict):
+                intf["linkType"] = attr.get('linkType') or ''
+                intf["pvid"] = attr.get('pvid') or ''
+                intf["trunkVlans"] = attr.get('trunkVlans') or ''
+            ports_index[intf["ifName"].upper()] = intf
+
+    return ports_index
+
+def get_port_attrs(intf):
+    """ethernetIf record to module attributes"""
+
+    return dict(interface=intf["ifName"], mode=intf["linkType"],
+                switchport=intf["l2Enable"], access_vlan=intf["pvid"],
+                native_vlan=intf["pvid"], trunk_vlans=intf["trunkVlans"])
 
 class SwitchPort(object):
     """
@@ -342,6 +383,7 @@ class SwitchPort(object):
         self.access_vlan = self.module.params['access_vlan']
         self.native_vlan = self.module.params['native_vlan']
         self.trunk_vlans = self.module.params['trunk_vlans']
+        self.aggregate = self.module.params['aggregate']
 
         # host info
         self.host = self.module.params['host']
@@ -357,6 +399,8 @@ class SwitchPort(object):
         self.end_state = dict()
         self.intf_info = dict()         # interface vlan info
         self.intf_type = None           # loopback tunnel ...
+        self.ports_conf = list()        # aggregate switchport definitions
+        self.vlan_sets = dict()         # trunk vlan range -> VlanSet
 
         # init netconf connect
         self.init_netconf()
@@ -387,160 +431,177 @@ class SwitchPort(object):
         if "<ok/>" not in xml_str:
             self.module.fail_json(msg='Error: %s failed.' % xml_name)
 
-    def get_interface_dict(self, ifname):
-        """ get one interface attributes dict."""
+    def get_ports(self, conf_str):
+        """ ethernetIf records selected by a filter, by name """
 
-        intf_info = dict()
-        conf_str = CE_NC_GET_PORT_ATTR % ifname
         try:
             con_obj = self.netconf.get_config(filter=conf_str)
         except RPCError:
             err = sys.exc_info()[1]
             self.module.fail_json(msg='Error: %s' % err.message.replace("\r\n", ""))
 
-        if "<data/>" in con_obj.xml:
-            return intf_info
-
-        intf = re.findall(
-            r'.*<ifName>(.*)</ifName>.*\s*<l2Enable>(.*)</l2Enable>.*', con_obj.xml)
-        if intf:
-            intf_info = dict(ifName=intf[0][0],
-                             l2Enable=intf[0][1],
-                             linkType="",
-                             pvid="",
-                             trunkVlans="")
-            if intf_info["l2Enable"] == "enable":
-                attr = re.findall(
-                    r'.*<linkType>(.*)</linkType>.*.*\s*<pvid>(.*)'
-                    r'</pvid>.*\s*<trunkVlans>(.*)</trunkVlans>.*', con_obj.xml)
-                if attr:
-                    intf_info["linkType"] = attr[0][0]
-                    intf_info["pvid"] = attr[0][1]
-                    intf_info["trunkVlans"] = attr[0][2]
-
-        return intf_info
+        return index_ports(con_obj.xml)
+
+    def get_interface_dict(self, ifname):
+        """ get one interface attributes dict."""
+
+        for intf in self.get_ports(CE_NC_GET_PORT_ATTR % ifname).values():
+            return intf
+        return dict()
+
+    def get_ports_index(self):
+        """ Layer 2 attributes of every Ethernet port, by upper case name """
+
+        return self.get_ports(CE_NC_GET_PORTS_ATTR)
 
     def is_l2switchport(self):
         """Check layer2 switch port"""
 
         return bool(self.intf_info["l2Enable"] == "enable")
 
-    def merge_access_vlan(self, ifname, access_vlan):
-        """Merge access interface vlan"""
+    def build_access(self, ifname, intf, state, access_vlan):
+        """ xml bringing an access port to state, empty when it is there,
+        the commands are added with it """
 
-        change = False
         conf_str = ""
-        self.updates_cmd.append("interface %s" % ifname)
-        if self.state == "present":
-            if self.intf_info["linkType"] == "access":
-                if access_vlan and self.intf_info["pvid"] != access_vlan:
-                    self.updates_cmd.append(
-                        "port default vlan %s" % access_vlan)
+        cmds = list()
+        if state == "present":
+            if intf["linkType"] == "access":
+                if access_vlan and intf["pvid"] != access_vlan:
+                    cmds.append("port default vlan %s" % access_vlan)
                     conf_str = CE_NC_SET_ACCESS_PORT % (ifname, access_vlan)
-                    change = True
             else:  # not access
-                self.updates_cmd.append("port link-type access")
+                cmds.append("port link-type access")
                 if access_vlan:
-                    self.updates_cmd.append(
-                        "port default vlan %s" % access_vlan)
+                    cmds.append("port default vlan %s" % access_vlan)
                     conf_str = CE_NC_SET_ACCESS_PORT % (ifname, access_vlan)
                 else:
                     conf_str = CE_NC_SET_ACCESS_PORT % (ifname, "1")
-                change = True
-        elif self.state == "absent":
-            if self.intf_info["linkType"] == "access":
-                if access_vlan and self.intf_info["pvid"] == access_vlan and access_vlan != "1":
-                    self.updates_cmd.append(
-                        "undo port default vlan %s" % access_vlan)
+        elif state == "absent":
+            if intf["linkType"] == "access":
+                if access_vlan and intf["pvid"] == access_vlan and access_vlan != "1":
+                    cmds.append("undo port default vlan %s" % access_vlan)
                     conf_str = CE_NC_SET_ACCESS_PORT % (ifname, "1")
-                    change = True
             else:  # not access
-                self.updates_cmd.append("port link-type access")
+                cmds.append("port link-type access")
                 conf_str = CE_NC_SET_ACCESS_PORT % (ifname, "1")
-                change = True
-
-        if not change:
-            self.updates_cmd.pop()   # remove interface
-            return
 
-        try:
-            con_obj = self.netconf.set_config(config=conf_str)
-            self.check_response(con_obj, "MERGE_ACCESS_PORT")
-            self.changed = True
-        except RPCError:
-            err = sys.exc_info()[1]
-            self.module.fail_json(msg='Error: %s' % err.message.replace("\r\n", ""))
+        if conf_str:
+            self.updates_cmd.append("interface %s" % ifname)
+            self.updates_cmd.extend(cmds)
+        return conf_str
 
-    def merge_trunk_vlan(self, ifname, native_vlan, trunk_vlans):
-        """Merge trunk interface vlan"""
+    def build_trunk(self, ifname, intf, state, native_vlan, trunk_vlans):
+        """ xml bringing a trunk port to state, empty when it is there,
+        the commands are added with it """
 
         change = False
         xmlstr = ""
-        self.updates_cmd.append("interface %s" % ifname)
+        cmds = list()
         if trunk_vlans:
-            vlan_list = self.vlan_range_to_list(trunk_vlans)
-            vlan_map = self.vlan_list_to_bitmap(vlan_list)
-
-        if self.state == "present":
-            if self.intf_info["linkType"] == "trunk":
-                if native_vlan and self.intf_info["pvid"] != native_vlan:
-                    self.updates_cmd.append(
-                        "port trunk pvid vlan %s" % native_vlan)
+            vlan_set = self.vlan_range_to_set(trunk_vlans)
+            old_set = VlanSet.from_bitmap(intf["trunkVlans"])
+
+        if state == "present":
+            if intf["linkType"] == "trunk":
+                if native_vlan and intf["pvid"] != native_vlan:
+                    cmds.append("port trunk pvid vlan %s" % native_vlan)
                     xmlstr += CE_NC_SET_TRUNK_PORT_PVID % (ifname, native_vlan)
                     change = True
                 if trunk_vlans:
-                    add_vlans = self.vlan_bitmap_add(
-                        self.intf_info["trunkVlans"], vlan_map)
-                    if not is_vlan_bitmap_empty(add_vlans):
-                        self.updates_cmd.append(
+                    add_vlans = vlan_set - old_set
+                    if add_vlans:
+                        cmds.append(
                             "port trunk allow-pass %s"
                             % trunk_vlans.replace(',', ' ').replace('-', ' to '))
+                        add_map = add_vlans.to_bitmap()
                         xmlstr += CE_NC_SET_TRUNK_PORT_VLANS % (
-                            ifname, add_vlans, add_vlans)
+                            ifname, add_map, add_map)
                         change = True
             else:   # not trunk
-                self.updates_cmd.append("port link-type trunk")
+                cmds.append("port link-type trunk")
                 change = True
                 if native_vlan:
-                    self.updates_cmd.append(
-                        "port trunk pvid vlan %s" % native_vlan)
+                    cmds.append("port trunk pvid vlan %s" % native_vlan)
                     xmlstr += CE_NC_SET_TRUNK_PORT_PVID % (ifname, native_vlan)
                 if trunk_vlans:
-                    self.updates_cmd.append(
+                    cmds.append(
                         "port trunk allow-pass %s"
                         % trunk_vlans.replace(',', ' ').replace('-', ' to '))
+                    vlan_map = vlan_set.to_bitmap()
                     xmlstr += CE_NC_SET_TRUNK_PORT_VLANS % (
                         ifname, vlan_map, vlan_map)
                 if not native_vlan and not trunk_vlans:
                     xmlstr += CE_NC_SET_TRUNK_PORT_MODE % ifname
-                    self.updates_cmd.append(
-                        "undo port trunk allow-pass vlan 1")
-        elif self.state == "absent":
-            if self.intf_info["linkType"] == "trunk":
-                if native_vlan and self.intf_info["pvid"] == native_vlan and native_vlan != '1':
-                    self.updates_cmd.append(
-                        "undo port trunk pvid vlan %s" % native_vlan)
+                    cmds.append("undo port trunk allow-pass vlan 1")
+        elif state == "absent":
+            if intf["linkType"] == "trunk":
+                if native_vlan and intf["pvid"] == native_vlan and native_vlan != '1':
+                    cmds.append("undo port trunk pvid vlan %s" % native_vlan)
                     xmlstr += CE_NC_SET_TRUNK_PORT_PVID % (ifname, 1)
                     change = True
                 if trunk_vlans:
-                    del_vlans = self.vlan_bitmap_del(
-                        self.intf_info["trunkVlans"], vlan_map)
-                    if not is_vlan_bitmap_empty(del_vlans):
-                        self.updates_cmd.append(
+                    del_vlans = vlan_set & old_set
+                    if del_vlans:
+                        cmds.append(
                             "undo port trunk allow-pass %s"
                             % trunk_vlans.replace(',', ' ').replace('-', ' to '))
-                        undo_map = vlan_bitmap_undo(del_vlans)
                         xmlstr += CE_NC_SET_TRUNK_PORT_VLANS % (
-                            ifname, undo_map, del_vlans)
+                            ifname, del_vlans.complement().to_bitmap(),
+                            del_vlans.to_bitmap())
                         change = True
             else:   # not trunk
-                self.updates_cmd.append("port link-type trunk")
-                self.updates_cmd.append("undo port trunk allow-pass vlan 1")
+                cmds.append("port link-type trunk")
+                cmds.append("undo port trunk allow-pass vlan 1")
                 xmlstr += CE_NC_SET_TRUNK_PORT_MODE % ifname
                 change = True
 
         if not change:
-            self.updates_cmd.pop()
+            return ""
+
+        self.updates_cmd.append("interface %s" % ifname)
+        self.updates_cmd.extend(cmds)
+        return xmlstr
+
+    def build_default(self, ifname, intf):
+        """ xml setting a port to default, empty when it is,
+        the commands are added with it """
+
+        if intf["linkType"] != "access":
+            self.updates_cmd.append("interface %s" % ifname)
+            self.updates_cmd.append("port link-type access")
+            self.updates_cmd.append("port default vlan 1")
+        elif intf["pvid"] != "1":
+            self.updates_cmd.append("interface %s" % ifname)
+            self.updates_cmd.append("port default vlan 1")
+        else:
+            return ""
+
+        return CE_NC_SET_DEFAULT_PORT % ifname
+
+    def merge_access_vlan(self, ifname, access_vlan):
+        """Merge access interface vlan"""
+
+        xmlstr = self.build_access(ifname, self.intf_info, self.state,
+                                   access_vlan)
+        if not xmlstr:
+            return
+
+        conf_str = "<config>" + xmlstr + "</config>"
+        try:
+            con_obj = self.netconf.set_config(config=conf_str)
+            self.check_response(con_obj, "MERGE_ACCESS_PORT")
+            self.changed = True
+        except RPCError:
+            err = sys.exc_info()[1]
+            self.module.fail_json(msg='Error: %s' % err.message.replace("\r\n", ""))
+
+    def merge_trunk_vlan(self, ifname, native_vlan, trunk_vlans):
+        """Merge trunk interface vlan"""
+
+        xmlstr = self.build_trunk(ifname, self.intf_info, self.state,
+                                  native_vlan, trunk_vlans)
+        if not xmlstr:
             return
 
         conf_str = "<config>" + xmlstr + "</config>"
@@ -555,23 +616,11 @@ class SwitchPort(object):
     def default_switchport(self, ifname):
         """Set interface default or unconfigured"""
 
-        change = False
-        if self.intf_info["linkType"] != "access":
-            self.updates_cmd.append("interface %s" % ifname)
-            self.updates_cmd.append("port link-type access")
-            self.updates_cmd.append("port default vlan 1")
-            change = True
-        else:
-            if self.intf_info["pvid"] != "1":
-                self.updates_cmd.append("interface %s" % ifname)
-                self.updates_cmd.append("port default vlan 1")
-                change = True
-
-        if not change:
+        xmlstr = self.build_default(ifname, self.intf_info)
+        if not xmlstr:
             return
 
-        conf_str = CE_NC_SET_DEFAULT_PORT % ifname
-
+        conf_str = "<config>" + xmlstr + "</config>"
         try:
             con_obj = self.netconf.set_config(config=conf_str)
             self.check_response(con_obj, "DEFAULT_INTF_VLAN")
@@ -580,149 +629,109 @@ class SwitchPort(object):
             err = sys.exc_info()[1]
             self.module.fail_json(msg='Error: %s' % err.message.replace("\r\n", ""))
 
-    def vlan_series(self, vlanid_s):
-        """ convert vlan range to vlan list """
-
-        vlan_list = []
-        peerlistlen = len(vlanid_s)
-        if peerlistlen != 2:
-            self.module.fail_json(msg='Error: Format of vlanid is invalid.')
-        for num in range(peerlistlen):
-            if not vlanid_s[num].isdigit():
-                self.module.fail_json(
-                    msg='Error: Format of vlanid is invalid.')
-        if int(vlanid_s[0]) > int(vlanid_s[1]):
-            self.module.fail_json(msg='Error: Format of vlanid is invalid.')
-        elif int(vlanid_s[0]) == int(vlanid_s[1]):
-            vlan_list.append(str(vlanid_s[0]))
-            return vlan_list
-        for num in range(int(vlanid_s[0]), int(vlanid_s[1])):
-            vlan_list.append(str(num))
-        vlan_list.append(vlanid_s[1])
-
-        return vlan_list
-
-    def vlan_region(self, vlanid_list):
-        """ convert vlan range to vlan list """
-
-        vlan_list = []
-        peerlistlen = len(vlanid_list)
-        for num in range(peerlistlen):
-            if vlanid_list[num].isdigit():
-                vlan_list.append(vlanid_list[num])
-            else:
-                vlan_s = self.vlan_series(vlanid_list[num].split('-'))
-                vlan_list.extend(vlan_s)
-
-        return vlan_list
+    def vlan_range_to_set(self, vlan_range):
+        """ convert vlan range to VlanSet, each range is parsed once """
 
-    def vlan_range_to_list(self, vlan_range):
-        """ convert vlan range to vlan list """
+        if vlan_range not in self.vlan_sets:
+            try:
+                self.vlan_sets[vlan_range] = VlanSet.from_range(vlan_range)
+            except ValueError:
+                err = sys.exc_info()[1]
+                self.module.fail_json(msg='Error: %s' % err)
+        return self.vlan_sets[vlan_range]
 
-        vlan_list = self.vlan_region(vlan_range.split(','))
+    def check_port_attr(self, interface, state, mode, access_vlan, native_vlan):
+        """Check the switchport attributes set for an interface"""
 
-        return vlan_list
-
-    def vlan_list_to_bitmap(self, vlanlist):
-        """ convert vlan list to vlan bitmap """
+        # interface type check
+        intf_type = get_interface_type(interface)
+        if not intf_type:
+            self.module.fail_json(
+                msg='Error: Interface name of %s is error.' % interface)
 
-        vlan_bit = ['0'] * 1024
-        bit_int = [0] * 1024
+        if not is_portswitch_enalbe(intf_type):
+            self.module.fail_json(msg='Error: Interface %s is error.' % interface)
 
-        vlan_list_len = len(vlanlist)
-        for num in range(vlan_list_len):
-            tagged_vlans = int(vlanlist[num])
-            if tagged_vlans <= 0 or tagged_vlans > 4094:
+        # check access_vlan
+        if access_vlan:
+            if not access_vlan.isdigit():
+                self.module.fail_json(msg='Error: Access vlan id is invalid.')
+            if int(access_vlan) <= 0 or int(access_vlan) > 4094:
                 self.module.fail_json(
-                    msg='Error: Vlan id is not in the range from 1 to 4094.')
-            j = tagged_vlans / 4
-            bit_int[j] |= 0x8 >> (tagged_vlans % 4)
-            vlan_bit[j] = hex(bit_int[j])[2]
-
-        vlan_xml = ''.join(vlan_bit)
-
-        return vlan_xml
-
-    def vlan_bitmap_add(self, oldmap, newmap):
-        """vlan add bitmap"""
-
-        vlan_bit = ['0'] * 1024
-
-        if len(newmap) != 1024:
-            self.module.fail_json(msg='Error: New vlan bitmap is invalid.')
-
-        if len(oldmap) != 1024 and len(oldmap) != 0:
-            self.module.fail_json(msg='Error: old vlan bitmap is invalid.')
-
-        if len(oldmap) == 0:
-            return newmap
-
-        for num in range(1024):
-            new_tmp = int(newmap[num], 16)
-            old_tmp = int(oldmap[num], 16)
-            add = (~(new_tmp & old_tmp)) & new_tmp
-            vlan_bit[num] = hex(add)[2]
-
-        vlan_xml = ''.join(vlan_bit)
-
-        return vlan_xml
-
-    def vlan_bitmap_del(self, oldmap, delmap):
-        """vlan del bitmap"""
-
-        vlan_bit = ['0'] * 1024
+                    msg='Error: Access vlan id is not in the range from 1 to 4094.')
 
-        if not oldmap or len(oldmap) == 0:
-            return ''.join(vlan_bit)
+        # check native_vlan
+        if native_vlan:
+            if not native_vlan.isdigit():
+                self.module.fail_json(msg='Error: Native vlan id is invalid.')
+            if int(native_vlan) <= 0 or int(native_vlan) > 4094:
+                self.module.fail_json(
+                    msg='Error: Native vlan id is not in the range from 1 to 4094.')
 
-        if len(oldmap) != 1024 or len(delmap) != 1024:
-            self.module.fail_json(msg='Error: vlan bitmap is invalid.')
+        # check mode
+        if state == "present" or state == "absent":
+            if not mode:
+                self.module.fail_json(msg='Error: Interface mode must be set.')
 
-        for num in range(1024):
-            tmp = int(delmap[num], 16) & int(oldmap[num], 16)
-            vlan_bit[num] = hex(tmp)[2]
+        return intf_type
 
-        vlan_xml = ''.join(vlan_bit)
+    def check_aggregate(self):
+        """Check the aggregate switchport definitions"""
 
-        return vlan_xml
+        if self.interface or self.mode or self.access_vlan \
+                or self.native_vlan or self.trunk_vlans:
+            self.module.fail_json(
+                msg='Error: Aggregate can not be set with interface, mode, '
+                    'access_vlan, native_vlan or trunk_vlans.')
+
+        choices = dict(mode=('access', 'trunk'),
+                       state=('present', 'absent', 'unconfigured'))
+        names = set()
+        for item in self.aggregate:
+            if not isinstance(item, dict):
+                self.module.fail_json(
+                    msg='Error: Every aggregate item must be a dict.')
+            port = dict()
+            for key in ('interface', 'mode', 'access_vlan', 'native_vlan',
+                        'trunk_vlans'):
+                value = item.get(key)
+                port[key] = str(value) if value is not None else None
+            port['state'] = item.get('state') or self.state
+            if not port['interface']:
+                self.module.fail_json(
+                    msg='Error: Interface name must be set in every aggregate item.')
+            for key, values in choices.items():
+                if port[key] and port[key] not in values:
+                    self.module.fail_json(
+                        msg='Error: %s of %s must be one of %s.'
+                            % (key, port['interface'], ', '.join(values)))
+
+            self.check_port_attr(port['interface'], port['state'], port['mode'],
+                                 port['access_vlan'], port['native_vlan'])
+            if port['trunk_vlans']:
+                self.vlan_range_to_set(port['trunk_vlans'])
+
+            if port['interface'].upper() in names:
+                self.module.fail_json(
+                    msg='Error: Interface %s is set more than once in '
+                        'aggregate.' % port['interface'])
+            names.add(port['interface'].upper())
+            self.ports_conf.append(port)
 
     def check_params(self):
         """Check all input params"""
 
+        if self.aggregate is not None:
+            self.check_aggregate()
+            return
+
         if not self.interface:
             self.module.fail_json(
                 msg='Error: Interface name must be set.')
 
-        # interface type check
-        if self.interface:
-            self.intf_type = get_interface_type(self.interface)
-            if not self.intf_type:
-                self.module.fail_json(
-                    msg='Error: Interface name of %s is error.' % self.interface)
-
-        if not self.intf_type or not is_portswitch_enalbe(self.intf_type):
-            self.module.fail_json(msg='Error: Interface %s is error.')
-
-        # check access_vlan
-        if self.access_vlan:
-            if not self.access_vlan.isdigit():
-                self.module.fail_json(msg='Error: Access vlan id is invalid.')
-            if int(self.access_vlan) <= 0 or int(self.access_vlan) > 4094:
-                self.module.fail_json(
-                    msg='Error: Access vlan id is not in the range from 1 to 4094.')
-
-        # check native_vlan
-        if self.native_vlan:
-            if not self.native_vlan.isdigit():
-                self.module.fail_json(msg='Error: Native vlan id is invalid.')
-            if int(self.native_vlan) <= 0 or int(self.native_vlan) > 4094:
-                self.module.fail_json(
-                    msg='Error: Native vlan id is not in the range from 1 to 4094.')
-
-        # check mode
-        if self.state == "present" or self.state == "absent":
-            if not self.mode:
-                self.module.fail_json(msg='Error: Interface mode must be set.')
+        self.intf_type = self.check_port_attr(
+            self.interface, self.state, self.mode,
+            self.access_vlan, self.native_vlan)
 
         # get interface info
         self.intf_info = self.get_interface_dict(self.interface)
@@ -747,12 +756,7 @@ class SwitchPort(object):
         """get existing info"""
 
         if self.intf_info:
-            self.existing["interface"] = self.intf_info["ifName"]
-            self.existing["mode"] = self.intf_info["linkType"]
-            self.existing["switchport"] = self.intf_info["l2Enable"]
-            self.existing['access_vlan'] = self.intf_info["pvid"]
-            self.existing['native_vlan'] = self.intf_info["pvid"]
-            self.existing['trunk_vlans'] = self.intf_info["trunkVlans"]
+            self.existing = get_port_attrs(self.intf_info)
 
     def get_end_state(self):
         """get end state info"""
@@ -760,17 +764,75 @@ class SwitchPort(object):
         if self.intf_info:
             end_info = self.get_interface_dict(self.interface)
             if end_info:
-                self.end_state["interface"] = end_info["ifName"]
-                self.end_state["mode"] = end_info["linkType"]
-                self.end_state["switchport"] = end_info["l2Enable"]
-                self.end_state['access_vlan'] = end_info["pvid"]
-                self.end_state['native_vlan'] = end_info["pvid"]
-                self.end_state['trunk_vlans'] = end_info["trunkVlans"]
+                self.end_state = get_port_attrs(end_info)
+
+    def work_aggregate(self):
+        """aggregate worker, one get and one edit-config"""
+
+        ports_index = self.get_ports_index()
+        xmlstr = ""
+        existing = list()
+        for conf in self.ports_conf:
+            intf = ports_index.get(conf['interface'].upper())
+            if not intf:
+                self.module.fail_json(
+                    msg='Error: Interface %s does not exists.' % conf['interface'])
+            if intf["l2Enable"] != "enable":
+                self.module.fail_json(
+                    msg='Error: Interface %s is not layer2 swtich port.'
+                        % conf['interface'])
+            existing.append(get_port_attrs(intf))
+
+            ifname = intf["ifName"]
+            if conf['state'] == "unconfigured":
+                xmlstr += self.build_default(ifname, intf)
+            elif conf['mode'] == "access":
+                xmlstr += self.build_access(ifname, intf, conf['state'],
+                                            conf['access_vlan'])
+            else:
+                xmlstr += self.build_trunk(ifname, intf, conf['state'],
+                                           conf['native_vlan'],
+                                           conf['trunk_vlans'])
+
+        if xmlstr and not self.module.check_mode:
+            conf_str = "<config>" + xmlstr + "</config>"
+            try:
+                con_obj = self.netconf.set_config(config=conf_str)
+                self.check_response(con_obj, "MERGE_PORTS_AGGREGATE")
+            except RPCError:
+                err = sys.exc_info()[1]
+                self.module.fail_json(msg='Error: %s' % err.message.replace("\r\n", ""))
+        self.changed = bool(xmlstr)
+
+        self.results['changed'] = self.changed
+        self.results['proposed'] = self.ports_conf
+        self.results['existing'] = existing
+        if self.changed and not self.module.check_mode:
+            # the device resets pvid and trunk vlans when the link type
+            # changes, read the ports back in one get
+            ports_index = self.get_ports_index()
+            end_state = list()
+            for conf in self.ports_conf:
+                intf = ports_index.get(conf['interface'].upper())
+                end_state.append(get_port_attrs(intf) if intf else None)
+            self.results['end_state'] = end_state
+        else:
+            self.results['end_state'] = existing
+        if self.changed:
+            self.results['updates'] = self.updates_cmd
+        else:
+            self.results['updates'] = list()
+
+        self.results.update(perf_results())
+        self.module.exit_json(**self.results)
 
     def work(self):
         """worker"""
 
         self.check_params()
+        if self.aggregate is not None:
+            self.work_aggregate()
+
         if not self.intf_info:
             self.module.fail_json(msg='Error: interface does not exists.')
 
@@ -800,6 +862,7 @@ class SwitchPort(object):
         else:
             self.results['updates'] = list()
 
+        self.results.update(perf_results())
         self.module.exit_json(**self.results)
 
 
@@ -807,13 +870,14 @@ def main():
     """Module main"""
 
     argument_spec = dict(
-        interface=dict(required=True, type='str'),
+        interface=dict(required=False, type='str'),
         mode=dict(choices=['access', 'trunk'], required=False),
         access_vlan=dict(type='str', required=False),
         native_vlan=dict(type='str', required=False),
         trunk_vlans=dict(type='str', required=False),
         state=dict(choices=['absent', 'present', 'unconfigured'],
-                   default='present')
+                   default='present'),
+        aggregate=dict(required=False, type='list')
     )
 
     switchport = SwitchPort(argument_spec)
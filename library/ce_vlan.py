@@ -56,6 +56,22 @@ options:
         required: false
         default: present
         choices: ['present','absent']
+    aggregate:
+        description:
+            - List of VLAN definitions, dicts with I(vlan_id) and the optional
+              I(name), I(description) and I(state) keys, I(state) defaults to
+              the module I(state). The VLAN table is read once and all
+              creates, changes and deletes are sent in one edit-config.
+              Can not be used with I(vlan_id) or I(vlan_range).
+        required: false
+        default: null
+    purge:
+        description:
+            - Delete every VLAN that is not listed in I(aggregate), except
+              the default VLAN 1.
+        required: false
+        default: false
+        choices: ['true','false']
 
 '''
 EXAMPLES = '''
@@ -68,6 +84,17 @@ EXAMPLES = '''
 # Ensure VLAN is NOT on the device
 - ce_vlan: vlan_id=50 host=68.170.147.165 state=absent username=huawei password=huawei
 
+# Ensure exactly these VLANs exist, with their names and descriptions
+- ce_vlan:
+    aggregate:
+      - {vlan_id: 100, name: WEB, description: web servers}
+      - {vlan_id: 200, name: APP}
+      - {vlan_id: 300, state: absent}
+    purge: true
+    host: "{{ inventory_hostname }}"
+    username: "{{ un }}"
+    password: "{{ pwd }}"
+
 
 '''
 
@@ -90,9 +117,9 @@ end_state_vlans_list:
     sample:  ["1", "2", "3", "4", "5", "20", "100"]
 proposed:
     description: k/v pairs of parameters passed into module (does not include
-                 vlan_id or vlan_range)
+                 vlan_id or vlan_range), the VLAN definitions with aggregate
     returned: always
-    type: dict or null
+    type: dict, list or null
     sample: {"vlan_id":"20", "name": "VLAN_APP", "description": "vlan for app" }
 existing:
     description: k/v pairs of existing vlan or null when using vlan_range
@@ -117,10 +144,12 @@ changed:
     sample: true
 '''
 
-import re
 import sys
 from ansible.module_utils.network import NetworkModule
 from ansible.module_utils.cloudengine import get_netconf
+from ansible.module_utils.ce_perf import perf_results, timed
+from ansible.module_utils.ce_vlanset import VlanSet
+from ansible.module_utils.ce_xml import iter_records
 
 try:
     from ncclient.operations.rpc import RPCError
@@ -204,33 +233,50 @@ CE_NC_MERGE_VLAN = """
 </config>
 """
 
-CE_NC_GET_VLAN = """
+CE_NC_GET_VLANS_ATTR = """
 <filter type="subtree">
   <vlan xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
     <vlans>
       <vlan>
-        <vlanId>%s</vlanId>
-        <vlanDesc/>
+        <vlanId/>
         <vlanName/>
+        <vlanDesc/>
       </vlan>
     </vlans>
   </vlan>
 </filter>
 """
 
-CE_NC_GET_VLANS = """
-<filter type="subtree">
+CE_NC_MERGE_VLANS = """
+<config>
   <vlan xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
-    <vlans>
-      <vlan>
-        <vlanId/>
-        <vlanName/>
-      </vlan>
+    <vlans>%s
     </vlans>
   </vlan>
-</filter>
+</config>
 """
 
+CE_NC_VLAN_ITEM_CREATE = """
+      <vlan operation="create">
+        <vlanId>%s</vlanId>
+        <vlanName>%s</vlanName>
+        <vlanDesc>%s</vlanDesc>
+        <vlanType></vlanType>
+        <subVlans/>
+      </vlan>"""
+
+CE_NC_VLAN_ITEM_MERGE = """
+      <vlan operation="merge">
+        <vlanId>%s</vlanId>%s
+        <vlanType></vlanType>
+        <subVlans/>
+      </vlan>"""
+
+CE_NC_VLAN_ITEM_DELETE = """
+      <vlan operation="delete">
+        <vlanId>%s</vlanId>
+      </vlan>"""
+
 CE_NC_CREATE_VLAN_BATCH = """
 <action>
   <vlan xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
@@ -269,6 +315,8 @@ class Vlan(object):
         self.name = self.module.params['name']
         self.description = self.module.params['description']
         self.state = self.module.params['state']
+        self.aggregate = self.module.params['aggregate']
+        self.purge = self.module.params['purge']
 
         # host info
         self.host = self.module.params['host']
@@ -282,9 +330,12 @@ class Vlan(object):
         self.vlan_attr_exist = None
         self.vlans_list_exist = list()
         self.vlans_list_change = list()
+        self.vlans_list_end = list()
         self.updates_cmd = list()
         self.results = dict()
         self.vlan_attr_end = dict()
+        self.vlans_attr_exist = dict()
+        self.vlans_conf = list()
 
         # init netconf connect
         self.init_netconf()
@@ -365,7 +416,7 @@ class Vlan(object):
         if not vlan_list:
             return
 
-        vlan_bitmap = self.vlan_list_to_bitmap(vlan_list)
+        vlan_bitmap = VlanSet(vlan_list).to_bitmap()
         xmlstr = CE_NC_CREATE_VLAN_BATCH % (vlan_bitmap, vlan_bitmap)
 
         try:
@@ -384,7 +435,7 @@ class Vlan(object):
         if not vlan_list:
             return
 
-        vlan_bitmap = self.vlan_list_to_bitmap(vlan_list)
+        vlan_bitmap = VlanSet(vlan_list).to_bitmap()
         xmlstr = CE_NC_DELETE_VLAN_BATCH % (vlan_bitmap, vlan_bitmap)
 
         try:
@@ -410,132 +461,103 @@ class Vlan(object):
             err = sys.exc_info()[1]
             self.module.fail_json(msg='Error: %s' % err.message.replace("\r\n", ""))
 
-    def get_vlan_attr(self, vlan_id):
-        """ get vlan attributes."""
+    def get_vlans_attr(self):
+        """ name and description of every vlan, by vlan id,
+        sample: { "20": {"name": "VLAN_NAME_20", "description": ""} }"""
 
-        conf_str = CE_NC_GET_VLAN % vlan_id
         try:
-            con_obj = self.netconf.get_config(filter=conf_str)
+            con_obj = self.netconf.get_config(filter=CE_NC_GET_VLANS_ATTR)
         except RPCError:
             err = sys.exc_info()[1]
             self.module.fail_json(msg='Error: %s' % err.message.replace("\r\n", ""))
-        xml_str = con_obj.xml
-        attr = dict()
-        if "<data/>" in xml_str:
-            return attr
-        else:
-            re_find = re.findall(r'.*<vlanId>(.*)</vlanId>.*\s*'
-                                 r'<vlanName>(.*)</vlanName>.*\s*'
-                                 r'<vlanDesc>(.*)</vlanDesc>.*', xml_str)
-            if re_find:
-                attr = dict(vlan_id=re_find[0][0], name=re_find[0][1],
-                            description=re_find[0][2])
-
-            return attr
+        vlans = dict()
+        if "<data/>" in con_obj.xml:
+            return vlans
+        # index the records as they are parsed, one vlan held at a time
+        with timed('xml', 'parse') as timer:
+            timer.received = len(con_obj.xml)
+            for _, vlan in iter_records(con_obj.xml, "data/vlan/vlans/vlan"):
+                vlans[vlan.get('vlanId')] = dict(
+                    name=vlan.get('vlanName') or '',
+                    description=vlan.get('vlanDesc') or '')
+        return vlans
+
+    def vlan_range_to_set(self, vlan_range):
+        """ convert vlan range to VlanSet """
 
-    def get_vlans_name(self):
-        """ get all vlan vid and its name  list,
-        sample: [ ("20", "VLAN_NAME_20"), ("30", "VLAN_NAME_30") ]"""
-
-        conf_str = CE_NC_GET_VLANS
         try:
-            con_obj = self.netconf.get_config(filter=conf_str)
-        except RPCError:
+            return VlanSet.from_range(vlan_range)
+        except ValueError:
             err = sys.exc_info()[1]
-            self.module.fail_json(msg='Error: %s' % err.message.replace("\r\n", ""))
-        xml_str = con_obj.xml
-        vlan_list = list()
-        if "<data/>" in xml_str:
-            return vlan_list
-        else:
-            vlan_list = re.findall(
-                r'.*<vlanId>(.*)</vlanId>.*\s*<vlanName>(.*)</vlanName>.*', xml_str)
-            return vlan_list
+            self.module.fail_json(msg='Error: %s' % err)
 
-    def get_vlans_list(self):
-        """ get all vlan vid list, sample: [ "20", "30", "31" ]"""
+    def check_vlan_attr(self, vlan_id, name, description):
+        """Check vlan id, name and description"""
 
-        conf_str = CE_NC_GET_VLANS
-        try:
-            con_obj = self.netconf.get_config(filter=conf_str)
-        except RPCError:
-            err = sys.exc_info()[1]
-            self.module.fail_json(msg='Error: %s' % err.message.replace("\r\n", ""))
-        xml_str = con_obj.xml
-        vlan_list = list()
-        if "<data/>" in xml_str:
-            return vlan_list
-        else:
-            vlan_list = re.findall(
-                r'.*<vlanId>(.*)</vlanId>.*', xml_str)
-            return vlan_list
-
-    def vlan_series(self, vlanid_s):
-        """ convert vlan range to list """
-
-        vlan_list = []
-        peerlistlen = len(vlanid_s)
-        if peerlistlen != 2:
-            self.module.fail_json(msg='Error: Format of vlanid is invalid.')
-        for num in range(peerlistlen):
-            if not vlanid_s[num].isdigit():
+        # check vlan id
+        if vlan_id:
+            if not vlan_id.isdigit():
                 self.module.fail_json(
-                    msg='Error: Format of vlanid is invalid.')
-        if int(vlanid_s[0]) > int(vlanid_s[1]):
-            self.module.fail_json(msg='Error: Format of vlanid is invalid.')
-        elif int(vlanid_s[0]) == int(vlanid_s[1]):
-            vlan_list.append(str(vlanid_s[0]))
-            return vlan_list
-        for num in range(int(vlanid_s[0]), int(vlanid_s[1])):
-            vlan_list.append(str(num))
-        vlan_list.append(vlanid_s[1])
-
-        return vlan_list
-
-    def vlan_region(self, vlanid_list):
-        """ convert vlan range to vlan list """
-
-        vlan_list = []
-        peerlistlen = len(vlanid_list)
-        for num in range(peerlistlen):
-            if vlanid_list[num].isdigit():
-                vlan_list.append(vlanid_list[num])
-            else:
-                vlan_s = self.vlan_series(vlanid_list[num].split('-'))
-                vlan_list.extend(vlan_s)
-
-        return vlan_list
-
-    def vlan_range_to_list(self, vlan_range):
-        """ convert vlan range to vlan list """
+                    msg='Error: Vlan id is not digit.')
+            if int(vlan_id) <= 0 or int(vlan_id) > 4094:
+                self.module.fail_json(
+                    msg='Error: Vlan id is not in the range from 1 to 4094.')
 
-        vlan_list = self.vlan_region(vlan_range.split(','))
+        # check vlan description
+        if description:
+            if len(description) > 81 or len(description.replace(' ', '')) < 1:
+                self.module.fail_json(
+                    msg='Error: vlan description is not in the range from 1 to 80.')
 
-        return vlan_list
+        # check vlan name
+        if name:
+            if len(name) > 31 or len(name.replace(' ', '')) < 1:
+                self.module.fail_json(
+                    msg='Error: Vlan name is not in the range from 1 to 31.')
 
-    def vlan_list_to_bitmap(self, vlanlist):
-        """ convert vlan list to vlan bitmap """
+    def check_aggregate(self):
+        """Check the aggregate vlan definitions"""
 
-        vlan_bit = ['0'] * 1024
-        bit_int = [0] * 1024
+        if self.vlan_id or self.vlan_range or self.name or self.description:
+            self.module.fail_json(
+                msg='Error: Aggregate can not be set with vlan_id, vlan_range, '
+                    'name or description.')
 
-        vlan_list_len = len(vlanlist)
-        for num in range(vlan_list_len):
-            tagged_vlans = int(vlanlist[num])
-            if tagged_vlans <= 0 or tagged_vlans > 4094:
+        vlans = dict()
+        for item in self.aggregate:
+            if not isinstance(item, dict):
                 self.module.fail_json(
-                    msg='Error: Vlan id is not in the range from 1 to 4094.')
-            j = tagged_vlans / 4
-            bit_int[j] |= 0x8 >> (tagged_vlans % 4)
-            vlan_bit[j] = hex(bit_int[j])[2]
-
-        vlan_xml = ''.join(vlan_bit)
-
-        return vlan_xml
+                    msg='Error: Every aggregate item must be a dict.')
+            vlan = dict()
+            for key in ('vlan_id', 'name', 'description'):
+                value = item.get(key)
+                vlan[key] = str(value) if value is not None else None
+            vlan['state'] = item.get('state') or self.state
+            if not vlan['vlan_id']:
+                self.module.fail_json(
+                    msg='Error: Vlan_id must be set in every aggregate item.')
+            if vlan['state'] not in ('present', 'absent'):
+                self.module.fail_json(
+                    msg='Error: Vlan state must be present or absent.')
+            self.check_vlan_attr(vlan['vlan_id'], vlan['name'],
+                                 vlan['description'])
+            vlan['vlan_id'] = str(int(vlan['vlan_id']))
+            if vlan['vlan_id'] in vlans:
+                self.module.fail_json(
+                    msg='Error: Vlan %s is set more than once in aggregate.'
+                        % vlan['vlan_id'])
+            vlans[vlan['vlan_id']] = vlan
+            self.vlans_conf.append(vlan)
 
     def check_params(self):
         """Check all input params"""
 
+        if self.aggregate is not None:
+            self.check_aggregate()
+            return
+        if self.purge:
+            self.module.fail_json(msg='Error: Purge requires aggregate.')
+
         # is params invalid
         if not self.vlan_id and not self.vlan_range:
             self.module.fail_json(
@@ -552,26 +574,7 @@ class Vlan(object):
             self.module.fail_json(
                 msg='Error: Vlan name could be set only at one vlan.')
 
-        # check vlan id
-        if self.vlan_id:
-            if not self.vlan_id.isdigit():
-                self.module.fail_json(
-                    msg='Error: Vlan id is not digit.')
-            if int(self.vlan_id) <= 0 or int(self.vlan_id) > 4094:
-                self.module.fail_json(
-                    msg='Error: Vlan id is not in the range from 1 to 4094.')
-
-        # check vlan description
-        if self.description:
-            if len(self.description) > 81 or len(self.description.replace(' ', '')) < 1:
-                self.module.fail_json(
-                    msg='Error: vlan description is not in the range from 1 to 80.')
-
-        # check vlan name
-        if self.name:
-            if len(self.name) > 31 or len(self.name.replace(' ', '')) < 1:
-                self.module.fail_json(
-                    msg='Error: Vlan name is not in the range from 1 to 31.')
+        self.check_vlan_attr(self.vlan_id, self.name, self.description)
 
     def get_proposed(self):
         """
@@ -579,15 +582,12 @@ class Vlan(object):
         """
 
         if self.vlans_list_change:
+            proposed_vlans = VlanSet(self.vlans_list_exist)
             if self.state == 'present':
-                proposed_vlans_tmp = list(self.vlans_list_change)
-                proposed_vlans_tmp.extend(self.vlans_list_exist)
-                self.results['proposed_vlans_list'] = list(
-                    set(proposed_vlans_tmp))
+                proposed_vlans |= VlanSet(self.vlans_list_change)
             else:
-                self.results['proposed_vlans_list'] = list(
-                    set(self.vlans_list_exist) - set(self.vlans_list_change))
-            self.results['proposed_vlans_list'].sort()
+                proposed_vlans -= VlanSet(self.vlans_list_change)
+            self.results['proposed_vlans_list'] = proposed_vlans.to_list()
         else:
             self.results['proposed_vlans_list'] = self.vlans_list_exist
 
@@ -627,7 +627,7 @@ class Vlan(object):
         get end state config.
         """
 
-        self.results['end_state_vlans_list'] = self.get_vlans_list()
+        self.results['end_state_vlans_list'] = self.vlans_list_end
 
         if self.vlan_id:
             if self.vlan_attr_end:
@@ -642,6 +642,127 @@ class Vlan(object):
         else:
             self.results['end_state'] = None
 
+    def get_vlans_end(self, vlans_exist):
+        """ vlan list and vlan attributes after the changes were applied """
+
+        vlans_end = vlans_exist
+        if self.changed:
+            if self.state == 'present':
+                vlans_end |= VlanSet(self.vlans_list_change)
+            else:
+                # vlan 1 is the default vlan and can not be deleted
+                vlans_end -= VlanSet(self.vlans_list_change) - VlanSet(['1'])
+        self.vlans_list_end = vlans_end.to_list()
+
+        if not self.vlan_id:
+            return
+        if not self.changed:
+            self.vlan_attr_end = self.vlan_attr_exist
+        elif self.state == 'present':
+            self.vlan_attr_end = dict(self.vlan_attr_exist or dict(
+                vlan_id=self.vlan_id, name='', description=''))
+            if self.name:
+                self.vlan_attr_end['name'] = self.name
+            if self.description:
+                self.vlan_attr_end['description'] = self.description
+        else:
+            self.vlan_attr_end = None
+
+    def build_aggregate(self):
+        """ vlan entries and commands that bring the table to the aggregate """
+
+        items = list()
+        listed = set()
+        for vlan in self.vlans_conf:
+            vlan_id = vlan['vlan_id']
+            listed.add(vlan_id)
+            exist = self.vlans_attr_exist.get(vlan_id)
+            if vlan['state'] == 'absent':
+                # vlan 1 is the default vlan and can not be deleted
+                if exist and vlan_id != '1':
+                    items.append(CE_NC_VLAN_ITEM_DELETE % vlan_id)
+                    self.updates_cmd.append('undo vlan %s' % vlan_id)
+                continue
+
+            name = vlan['name']
+            description = vlan['description']
+            if not exist:
+                items.append(CE_NC_VLAN_ITEM_CREATE
+                             % (vlan_id, name or '', description or ''))
+            else:
+                leaves = ''
+                if name and name != exist['name']:
+                    leaves += '\n        <vlanName>%s</vlanName>' % name
+                if description and description != exist['description']:
+                    leaves += '\n        <vlanDesc>%s</vlanDesc>' % description
+                if not leaves:
+                    continue
+                items.append(CE_NC_VLAN_ITEM_MERGE % (vlan_id, leaves))
+            self.updates_cmd.append('vlan %s' % vlan_id)
+            if name:
+                self.updates_cmd.append('name %s' % name)
+            if description:
+                self.updates_cmd.append('description %s' % description)
+
+        if self.purge:
+            # vlan 1 is the default vlan and can not be deleted
+            for vlan_id in sorted(self.vlans_attr_exist, key=int):
+                if vlan_id not in listed and vlan_id != '1':
+                    items.append(CE_NC_VLAN_ITEM_DELETE % vlan_id)
+                    self.updates_cmd.append('undo vlan %s' % vlan_id)
+
+        return items
+
+    def work_aggregate(self):
+        """
+        aggregate worker, one get and one edit-config.
+        """
+
+        self.vlans_attr_exist = self.get_vlans_attr()
+        self.vlans_list_exist = sorted(self.vlans_attr_exist, key=int)
+
+        items = self.build_aggregate()
+        vlans_end = VlanSet(self.vlans_list_exist)
+        for vlan in self.vlans_conf:
+            if vlan['state'] == 'present':
+                vlans_end.add(vlan['vlan_id'])
+            elif vlan['vlan_id'] != '1':
+                vlans_end.discard(vlan['vlan_id'])
+        if self.purge:
+            listed = VlanSet(vlan['vlan_id'] for vlan in self.vlans_conf)
+            vlans_end = vlans_end & (listed | VlanSet(['1']))
+        vlans_end = vlans_end.to_list()
+
+        if items and not self.module.check_mode:
+            try:
+                con_obj = self.netconf.set_config(
+                    config=CE_NC_MERGE_VLANS % ''.join(items))
+                self.check_response(con_obj, "MERGE_VLANS")
+            except RPCError:
+                err = sys.exc_info()[1]
+                self.module.fail_json(msg='Error: %s' % err.message.replace("\r\n", ""))
+        self.changed = bool(items)
+
+        # the end state follows from the edit-config, no need to read it back
+        self.results['existing_vlans_list'] = self.vlans_list_exist
+        self.results['proposed_vlans_list'] = vlans_end
+        if self.changed and not self.module.check_mode:
+            self.results['end_state_vlans_list'] = vlans_end
+        else:
+            self.results['end_state_vlans_list'] = self.vlans_list_exist
+        self.results['proposed'] = self.vlans_conf
+        self.results['existing'] = None
+        self.results['end_state'] = None
+
+        self.results['changed'] = self.changed
+        if self.changed:
+            self.results['updates'] = self.updates_cmd
+        else:
+            self.results['updates'] = list()
+
+        self.results.update(perf_results())
+        self.module.exit_json(**self.results)
+
     def work(self):
         """
         worker.
@@ -650,24 +771,29 @@ class Vlan(object):
         # check param
         self.check_params()
 
-        # get all vlan info
-        self.vlans_list_exist = self.get_vlans_list()
+        if self.aggregate is not None:
+            self.work_aggregate()
+
+        # get all vlan info, one get indexed by vlan id
+        self.vlans_attr_exist = self.get_vlans_attr()
+        vlans_exist = VlanSet(self.vlans_attr_exist)
+        self.vlans_list_exist = vlans_exist.to_list()
 
         # get vlan attributes
         if self.vlan_id:
             self.vlans_list_change.append(self.vlan_id)
-            self.vlan_attr_exist = self.get_vlan_attr(self.vlan_id)
-            if self.vlan_attr_exist:
+            exist = self.vlans_attr_exist.get(self.vlan_id)
+            if exist:
                 self.vlan_exist = True
+                self.vlan_attr_exist = dict(vlan_id=self.vlan_id, **exist)
 
         if self.vlan_range:
-            new_vlans_tmp = self.vlan_range_to_list(self.vlan_range)
+            new_vlans = self.vlan_range_to_set(self.vlan_range)
             if self.state == 'present':
-                self.vlans_list_change = list(
-                    set(new_vlans_tmp) - set(self.vlans_list_exist))
+                vlans_change = new_vlans - vlans_exist
             else:
-                self.vlans_list_change = [
-                    val for val in new_vlans_tmp if val in self.vlans_list_exist]
+                vlans_change = new_vlans & vlans_exist
+            self.vlans_list_change = vlans_change.to_list()
 
         if self.state == 'present':
             if self.vlan_id:
@@ -699,9 +825,8 @@ class Vlan(object):
             elif self.vlan_range and self.vlans_list_change:
                 self.delete_vlan_batch(self.vlans_list_change)
 
-        # result
-        if self.vlan_id:
-            self.vlan_attr_end = self.get_vlan_attr(self.vlan_id)
+        # result, the end state follows from the edit-config
+        self.get_vlans_end(vlans_exist)
 
         self.get_existing()
         self.get_proposed()
@@ -713,6 +838,7 @@ class Vlan(object):
         else:
             self.results['updates'] = list()
 
+        self.results.update(perf_results())
         self.module.exit_json(**self.results)
 
 
@@ -726,6 +852,8 @@ def main():
         description=dict(required=False, type='str'),
         state=dict(choices=['absent', 'present'],
                    default='present', required=False),
+        aggregate=dict(required=False, type='list'),
+        purge=dict(required=False, type='bool', default=False),
     )
 
     vlancfg = Vlan(argument_spec)
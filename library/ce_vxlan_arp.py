@@ -169,6 +169,7 @@ changed:
 import re
 from ansible.module_utils.network import NetworkModule, NetworkError
 from ansible.module_utils.cloudengine import get_cli_exception
+from ansible.module_utils.ce_perf import perf_results
 
 
 def is_config_exist(cmp_cfg, test_cfg):
@@ -654,6 +655,7 @@ class VxlanArp(object):
         else:
             self.results['updates'] = list()
 
+        self.results.update(perf_results())
         self.module.exit_json(**self.results)
 
 
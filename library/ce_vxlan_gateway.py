@@ -197,7 +197,8 @@ changed:
 
 import re
 from ansible.module_utils.network import NetworkModule, NetworkError
-from ansible.module_utils.cloudengine import get_cli_exception
+from ansible.module_utils.cloudengine import get_cli_exception, get_config_tree
+from ansible.module_utils.ce_perf import perf_results
 
 def is_config_exist(cmp_cfg, test_cfg):
     """is configuration exist?"""
@@ -402,13 +403,14 @@ class VxlanGateway(object):
     def get_current_config(self):
         """get current configuration"""
 
-        exp = " | ignore-case section include dfs-group"
+        tree = get_config_tree(self.module)
+        sections = list(tree.sections("dfs-group"))
         if self.vpn_instance:
-            exp += "|^ip vpn-instance %s$" % self.vpn_instance
+            sections.append(tree.section("ip vpn-instance %s" % self.vpn_instance))
         if self.vbdif_name:
-            exp += "|^interface %s$" % self.vbdif_name
+            sections.append(tree.section("interface %s" % self.vbdif_name))
 
-        return self.module.config.get_config(include_defaults=False, regular=exp)
+        return "\n".join(node.to_text() for node in sections if node is not None)
 
     def cli_add_command(self, command, undo=False):
         """add command to self.update_cmd and self.commands"""
@@ -903,6 +905,7 @@ class VxlanGateway(object):
         else:
             self.results['updates'] = list()
 
+        self.results.update(perf_results())
         self.module.exit_json(**self.results)
 
 
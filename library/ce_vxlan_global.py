@@ -133,6 +133,7 @@ import sys
 from xml.etree import ElementTree
 from ansible.module_utils.network import NetworkModule, NetworkError
 from ansible.module_utils.cloudengine import get_netconf, get_cli_exception
+from ansible.module_utils.ce_perf import perf_results
 
 HAS_NCCLIENT = False
 try:
@@ -558,6 +559,7 @@ class VxlanGlobal(object):
         else:
             self.results['updates'] = list()
 
+        self.results.update(perf_results())
         self.module.exit_json(**self.results)
 
 
@@ -121,9 +121,10 @@ end_state:
 '''
 
 import sys
-from xml.etree import ElementTree
 from ansible.module_utils.network import NetworkModule
 from ansible.module_utils.cloudengine import get_netconf
+from ansible.module_utils.ce_xml import iter_records, group_records
+from ansible.module_utils.ce_perf import perf_results
 
 try:
     from ncclient.operations.rpc import RPCError
@@ -445,21 +446,14 @@ class VxlanTunnel(object):
         con_obj = self.netconf_get_config(conf_str)
         if "<data/>" in con_obj.xml:
             return vni2bd_info
-        xml_str = con_obj.xml.replace('\r', '').replace('\n', '').\
-            replace('xmlns="urn:ietf:params:xml:ns:netconf:base:1.0"', "").\
-            replace('xmlns="http://www.huawei.com/netconf/vrp"', "")
         # get vni to bridge domain id info
-        root = ElementTree.fromstring(xml_str)
         vni2bd_info["vni2BdInfos"] = list()
-        vni2bds = root.findall("data/nvo3/nvo3Vni2Bds/nvo3Vni2Bd")
-
-        if vni2bds:
-            for vni2bd in vni2bds:
-                vni_dict = dict()
-                for ele in vni2bd:
-                    if ele.tag in ["vniId", "bdId"]:
-                        vni_dict[ele.tag] = ele.text
-                vni2bd_info["vni2BdInfos"].append(vni_dict)
+        for _, vni2bd in iter_records(con_obj.xml, "data/nvo3/nvo3Vni2Bds/nvo3Vni2Bd"):
+            vni_dict = dict()
+            for key in ["vniId", "bdId"]:
+                if key in vni2bd:
+                    vni_dict[key] = vni2bd[key]
+            vni2bd_info["vni2BdInfos"].append(vni_dict)
 
         return vni2bd_info
 
@@ -482,42 +476,34 @@ class VxlanTunnel(object):
         con_obj = self.netconf_get_config(conf_str)
         if "<data/>" in con_obj.xml:
             return nve_info
-        xml_str = con_obj.xml.replace('\r', '').replace('\n', '').\
-            replace('xmlns="urn:ietf:params:xml:ns:netconf:base:1.0"', "").\
-            replace('xmlns="http://www.huawei.com/netconf/vrp"', "")
+        nve_path = "data/nvo3/nvo3Nves/nvo3Nve"
+        member_path = nve_path + "/vniMembers/vniMember"
+        peer_path = member_path + "/nvo3VniPeers/nvo3VniPeer"
+        records = group_records(con_obj.xml, nve_path, member_path, peer_path)
 
         # get nve info
-        root = ElementTree.fromstring(xml_str)
-        nvo3 = root.find("data/nvo3/nvo3Nves/nvo3Nve")
-        if nvo3:
-            for nve in nvo3:
-                if nve.tag in ["srcAddr", "ifName", "nveType"]:
-                    nve_info[nve.tag] = nve.text
+        for nve in records[nve_path][:1]:
+            for key in ["srcAddr", "ifName", "nveType"]:
+                if key in nve:
+                    nve_info[key] = nve[key]
 
         # get nve vni info
         nve_info["vni_peer_protocols"] = list()
-
-        vni_members = root.findall(
-            "data/nvo3/nvo3Nves/nvo3Nve/vniMembers/vniMember")
-        if vni_members:
-            for member in vni_members:
-                vni_dict = dict()
-                for ele in member:
-                    if ele.tag in ["vniId", "protocol"]:
-                        vni_dict[ele.tag] = ele.text
-                nve_info["vni_peer_protocols"].append(vni_dict)
+        for member in records[member_path]:
+            vni_dict = dict()
+            for key in ["vniId", "protocol"]:
+                if key in member:
+                    vni_dict[key] = member[key]
+            nve_info["vni_peer_protocols"].append(vni_dict)
 
         # get vni peer address ip info
         nve_info["vni_peer_ips"] = list()
-        vni_peers = root.findall(
-            "data/nvo3/nvo3Nves/nvo3Nve/vniMembers/vniMember/nvo3VniPeers/nvo3VniPeer")
-        if vni_peers:
-            for peer_address in vni_peers:
-                vni_peer_dict = dict()
-                for ele in peer_address:
-                    if ele.tag in ["vniId", "peerAddr"]:
-                        vni_peer_dict[ele.tag] = ele.text
-                nve_info["vni_peer_ips"].append(vni_peer_dict)
+        for peer_address in records[peer_path]:
+            vni_peer_dict = dict()
+            for key in ["vniId", "peerAddr"]:
+                if key in peer_address:
+                    vni_peer_dict[key] = peer_address[key]
+            nve_info["vni_peer_ips"].append(vni_peer_dict)
 
         return nve_info
 
@@ -942,6 +928,7 @@ class VxlanTunnel(object):
         else:
             self.results['updates'] = list()
 
+        self.results.update(perf_results())
         self.module.exit_json(**self.results)
 
 
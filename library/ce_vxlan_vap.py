@@ -139,6 +139,8 @@ import sys
 from xml.etree import ElementTree
 from ansible.module_utils.network import NetworkModule
 from ansible.module_utils.cloudengine import get_netconf
+from ansible.module_utils.ce_perf import perf_results
+from ansible.module_utils.ce_vlanset import VlanSet
 
 try:
     from ncclient.operations.rpc import RPCError
@@ -299,71 +301,6 @@ CE_NC_SET_ENCAP_QINQ = """
 """
 
 
-def vlan_vid_to_bitmap(vid):
-    """convert vlan list to vlan bitmap"""
-
-    vlan_bit = ['0'] * 1024
-    int_vid = int(vid)
-    j = int_vid / 4
-    bit_int = 0x8 >> (int_vid % 4)
-    vlan_bit[j] = str(hex(bit_int))[2]
-
-    return ''.join(vlan_bit)
-
-
-def bitmap_to_vlan_list(bitmap):
-    """convert vlan bitmap to vlan list"""
-
-    tmp = list()
-    if not bitmap:
-        return tmp
-
-    bit_len = len(bitmap)
-    for i in range(bit_len):
-        if bitmap[i] == "0":
-            continue
-        bit = int(bitmap[i])
-        if bit & 0x8:
-            tmp.append(str(i * 4))
-        if bit & 0x4:
-            tmp.append(str(i * 4 + 1))
-        if bit & 0x2:
-            tmp.append(str(i * 4 + 2))
-        if bit & 0x1:
-            tmp.append(str(i * 4 + 3))
-
-    return tmp
-
-
-def is_vlan_bitmap_empty(bitmap):
-    """check vlan bitmap empty"""
-
-    if not bitmap or len(bitmap) == 0:
-        return True
-
-    for bit in bitmap:
-        if bit != '0':
-            return False
-
-    return True
-
-
-def is_vlan_in_bitmap(vid, bitmap):
-    """check is vlan id in bitmap"""
-
-    if is_vlan_bitmap_empty(bitmap):
-        return False
-
-    i = int(vid) / 4
-    if i > len(bitmap):
-        return False
-
-    if int(bitmap[i]) & (0x8 >> (int(vid) % 4)):
-        return True
-
-    return False
-
-
 def get_interface_type(interface):
     """Gets the type of interface, such as 10GE, ETH-TRUNK, VLANIF..."""
 
@@ -606,7 +543,7 @@ class VxlanVap(object):
         if self.state == "present":
             if self.encapsulation != self.l2sub_info.get("flowType"):
                 if self.ce_vid:
-                    vlan_bitmap = vlan_vid_to_bitmap(self.ce_vid)
+                    vlan_bitmap = VlanSet([self.ce_vid]).to_bitmap()
                     xml_str = CE_NC_SET_ENCAP_DOT1Q % (
                         self.l2_sub_interface, vlan_bitmap, vlan_bitmap)
                     self.updates_cmd.append("encapsulation %s vid %s" % (
@@ -617,9 +554,9 @@ class VxlanVap(object):
                     self.updates_cmd.append(
                         "encapsulation %s" % self.encapsulation)
             else:
-                if self.ce_vid and not is_vlan_in_bitmap(
-                        self.ce_vid, self.l2sub_info.get("dot1qVids")):
-                    vlan_bitmap = vlan_vid_to_bitmap(self.ce_vid)
+                if self.ce_vid and self.ce_vid not in VlanSet.from_bitmap(
+                        self.l2sub_info.get("dot1qVids")):
+                    vlan_bitmap = VlanSet([self.ce_vid]).to_bitmap()
                     xml_str = CE_NC_SET_ENCAP_DOT1Q % (
                         self.l2_sub_interface, vlan_bitmap, vlan_bitmap)
                     self.updates_cmd.append("encapsulation %s vid %s" % (
@@ -627,7 +564,7 @@ class VxlanVap(object):
         else:
             if self.encapsulation == self.l2sub_info.get("flowType"):
                 if self.ce_vid:
-                    if is_vlan_in_bitmap(self.ce_vid, self.l2sub_info.get("dot1qVids")):
+                    if self.ce_vid in VlanSet.from_bitmap(self.l2sub_info.get("dot1qVids")):
                         xml_str = CE_NC_UNSET_ENCAP % self.l2_sub_interface
                         self.updates_cmd.append("undo encapsulation %s vid %s" % (
                             self.encapsulation, self.ce_vid))
@@ -651,7 +588,7 @@ class VxlanVap(object):
         if self.state == "present":
             if self.encapsulation != self.l2sub_info.get("flowType"):
                 if self.ce_vid:
-                    vlan_bitmap = vlan_vid_to_bitmap(self.ce_vid)
+                    vlan_bitmap = VlanSet([self.ce_vid]).to_bitmap()
                     xml_str = CE_NC_SET_ENCAP_QINQ % (self.l2_sub_interface,
                                                       self.pe_vid,
                                                       vlan_bitmap,
@@ -667,9 +604,9 @@ class VxlanVap(object):
                         "encapsulation %s" % self.encapsulation)
             else:
                 if self.ce_vid:
-                    if not is_vlan_in_bitmap(self.ce_vid, self.l2sub_info.get("ceVids")) \
+                    if self.ce_vid not in VlanSet.from_bitmap(self.l2sub_info.get("ceVids")) \
                             or self.pe_vid != self.l2sub_info.get("peVlanId"):
-                        vlan_bitmap = vlan_vid_to_bitmap(self.ce_vid)
+                        vlan_bitmap = VlanSet([self.ce_vid]).to_bitmap()
                         xml_str = CE_NC_SET_ENCAP_QINQ % (self.l2_sub_interface,
                                                           self.pe_vid,
                                                           vlan_bitmap,
@@ -681,7 +618,7 @@ class VxlanVap(object):
         else:
             if self.encapsulation == self.l2sub_info.get("flowType"):
                 if self.ce_vid:
-                    if is_vlan_in_bitmap(self.ce_vid, self.l2sub_info.get("ceVids")) \
+                    if self.ce_vid in VlanSet.from_bitmap(self.l2sub_info.get("ceVids")) \
                             and self.pe_vid == self.l2sub_info.get("peVlanId"):
                         xml_str = CE_NC_UNSET_ENCAP % self.l2_sub_interface
                         self.updates_cmd.append(
@@ -785,21 +722,21 @@ class VxlanVap(object):
 
         xml_str = ""
         if self.state == "present":
-            if not is_vlan_in_bitmap(self.bind_vlan_id, self.vap_info["vlanList"]):
+            if self.bind_vlan_id not in VlanSet.from_bitmap(self.vap_info["vlanList"]):
                 self.updates_cmd.append("bridge-domain %s" %
                                         self.bridge_domain_id)
                 self.updates_cmd.append(
                     "l2 binding vlan %s" % self.bind_vlan_id)
-                vlan_bitmap = vlan_vid_to_bitmap(self.bind_vlan_id)
+                vlan_bitmap = VlanSet([self.bind_vlan_id]).to_bitmap()
                 xml_str = CE_NC_MERGE_BD_VLAN % (
                     self.bridge_domain_id, vlan_bitmap, vlan_bitmap)
         else:
-            if is_vlan_in_bitmap(self.bind_vlan_id, self.vap_info["vlanList"]):
+            if self.bind_vlan_id in VlanSet.from_bitmap(self.vap_info["vlanList"]):
                 self.updates_cmd.append("bridge-domain %s" %
                                         self.bridge_domain_id)
                 self.updates_cmd.append(
                     "undo l2 binding vlan %s" % self.bind_vlan_id)
-                vlan_bitmap = vlan_vid_to_bitmap(self.bind_vlan_id)
+                vlan_bitmap = VlanSet([self.bind_vlan_id]).to_bitmap()
                 xml_str = CE_NC_MERGE_BD_VLAN % (
                     self.bridge_domain_id, "0" * 1024, vlan_bitmap)
 
@@ -905,19 +842,19 @@ class VxlanVap(object):
         if self.bridge_domain_id:
             if self.bind_vlan_id or self.l2_sub_interface:
                 self.existing["bridge_domain_id"] = self.bridge_domain_id
-                self.existing["bind_vlan_list"] = bitmap_to_vlan_list(
-                    self.vap_info.get("vlanList"))
+                self.existing["bind_vlan_list"] = VlanSet.from_bitmap(
+                    self.vap_info.get("vlanList")).to_list()
                 self.existing["bind_intf_list"] = self.vap_info.get("intfList")
 
         if self.encapsulation and self.l2_sub_interface:
             self.existing["l2_sub_interface"] = self.l2_sub_interface
             self.existing["encapsulation"] = self.l2sub_info.get("flowType")
             if self.existing["encapsulation"] == "dot1q":
-                self.existing["ce_vid"] = bitmap_to_vlan_list(
-                    self.l2sub_info.get("dot1qVids"))
+                self.existing["ce_vid"] = VlanSet.from_bitmap(
+                    self.l2sub_info.get("dot1qVids")).to_list()
             if self.existing["encapsulation"] == "qinq":
-                self.existing["ce_vid"] = bitmap_to_vlan_list(
-                    self.l2sub_info.get("ceVids"))
+                self.existing["ce_vid"] = VlanSet.from_bitmap(
+                    self.l2sub_info.get("ceVids")).to_list()
                 self.existing["pe_vid"] = self.l2sub_info.get("peVlanId")
 
     def get_end_state(self):
@@ -927,8 +864,8 @@ class VxlanVap(object):
             if self.bind_vlan_id or self.l2_sub_interface:
                 vap_info = self.get_bd_vap_dict()
                 self.end_state["bridge_domain_id"] = self.bridge_domain_id
-                self.end_state["bind_vlan_list"] = bitmap_to_vlan_list(
-                    vap_info.get("vlanList"))
+                self.end_state["bind_vlan_list"] = VlanSet.from_bitmap(
+                    vap_info.get("vlanList")).to_list()
                 self.end_state["bind_intf_list"] = vap_info.get("intfList")
 
         if self.encapsulation and self.l2_sub_interface:
@@ -936,11 +873,11 @@ class VxlanVap(object):
             self.end_state["l2_sub_interface"] = self.l2_sub_interface
             self.end_state["encapsulation"] = l2sub_info.get("flowType")
             if self.end_state["encapsulation"] == "dot1q":
-                self.end_state["ce_vid"] = bitmap_to_vlan_list(
-                    l2sub_info.get("dot1qVids"))
+                self.end_state["ce_vid"] = VlanSet.from_bitmap(
+                    l2sub_info.get("dot1qVids")).to_list()
             if self.end_state["encapsulation"] == "qinq":
-                self.end_state["ce_vid"] = bitmap_to_vlan_list(
-                    l2sub_info.get("ceVids"))
+                self.end_state["ce_vid"] = VlanSet.from_bitmap(
+                    l2sub_info.get("ceVids")).to_list()
                 self.end_state["pe_vid"] = l2sub_info.get("peVlanId")
 
     def data_init(self):
@@ -984,6 +921,7 @@ class VxlanVap(object):
             self.results['updates'] = self.updates_cmd
         else:
             self.results['updates'] = list()
+        self.results.update(perf_results())
         self.module.exit_json(**self.results)
 
 
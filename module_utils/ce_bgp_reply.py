@@ -0,0 +1,164 @@
+# This code is part of Ansible, but is an independent component.
+# This particular file snippet, and this file snippet only, is BSD licensed.
+# Modules you write using this snippet, which is embedded dynamically by Ansible
+# still belong to the author of the module, and may assign their own license
+# to the complete work.
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#    * Redistributions of source code must retain the above copyright
+#      notice, this list of conditions and the following disclaimer.
+#    * Redistributions in binary form must reproduce the above copyright notice,
+#      this list of conditions and the following disclaimer in the documentation
+#      and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE
+# USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+
+"""
+Decoder for replies of gets on the CloudEngine BGP subtree.
+
+The BGP modules used to run one re.findall over the raw reply for every
+field they compare.  decode_bgp_reply parses a reply once into records
+(bgpSite, bgpVrf, bgpPeer, bgpVrfAF, peerAF, importRoute, ...) keyed by
+the schema below, and remembers the last reply so every later lookup on
+the same reply is served from the decoded form.
+"""
+
+from ansible.module_utils.ce_perf import timed
+from ansible.module_utils.ce_xml import iter_events, local_name
+
+# record element -> (record kind, key leaves inherited by nested records)
+BGP_SCHEMA = {
+    'bgpSite': ('site', ()),
+    'bgpConfedPeerAs': ('confed_peer_as', ()),
+    'bgpVrf': ('vrf', ('vrfName',)),
+    'bgpPeer': ('peer', ('peerAddr',)),
+    'peerBfd': ('peer_bfd', ()),
+    'bgpVrfAF': ('vrf_af', ('afType',)),
+    'peerAF': ('peer_af', ('remoteAddress',)),
+    'importRoute': ('import_route', ()),
+    'networkRoute': ('network_route', ()),
+}
+
+
+class BgpRecord(dict):
+    """ leaves of one schema element, context holds the key leaves of
+        the enclosing records (vrfName, afType, peerAddr, ...) """
+
+    def __init__(self, tag, context):
+        super(BgpRecord, self).__init__()
+        self.tag = tag
+        self.kind = BGP_SCHEMA[tag][0]
+        self.context = context
+
+
+class BgpReply(object):
+    """ BGP reply decoded in one pass """
+
+    def __init__(self, xmlstr):
+        self.empty = '<data/>' in xmlstr
+        self.records = list()
+        self.leaves = dict()
+        if not self.empty:
+            self.decode(xmlstr)
+
+    def decode(self, xmlstr):
+        """ decode """
+
+        elems = list()
+        # whether the element on the stack has child elements, children
+        # are dropped once parsed so len() can not tell
+        parents = list()
+        records = list()
+        for event, elem in iter_events(xmlstr):
+            name = local_name(elem.tag)
+            if event == 'start':
+                if parents:
+                    parents[-1] = True
+                elems.append(elem)
+                parents.append(False)
+                if name in BGP_SCHEMA:
+                    context = dict()
+                    if records:
+                        parent = records[-1]
+                        context.update(parent.context)
+                        for key in BGP_SCHEMA[parent.tag][1]:
+                            if key in parent:
+                                context[key] = parent[key]
+                    records.append(BgpRecord(name, context))
+                continue
+
+            elems.pop()
+            is_parent = parents.pop()
+            if name in BGP_SCHEMA:
+                self.records.append(records.pop())
+            elif not is_parent:
+                value = elem.text or ''
+                self.leaves.setdefault(name, list()).append(value)
+                if records:
+                    records[-1].setdefault(name, value)
+
+            elem.clear()
+            if elems:
+                elems[-1].remove(elem)
+
+    def values(self, name):
+        """ every value of a leaf in document order """
+
+        return list(self.leaves.get(name, list()))
+
+    def value(self, name, default=None):
+        """ first value of a leaf """
+
+        values = self.leaves.get(name)
+        if values:
+            return values[0]
+        return default
+
+    def pairs(self, first, second):
+        """ (first, second) tuples of records holding both leaves """
+
+        return [(record[first], record[second]) for record in self.records
+                if first in record and second in record]
+
+    def find(self, kind, **context):
+        """ records of a kind, optionally limited by key leaves """
+
+        result = list()
+        for record in self.records:
+            if record.kind != kind:
+                continue
+            for key, value in context.items():
+                if record.get(key, record.context.get(key)) != value:
+                    break
+            else:
+                result.append(record)
+        return result
+
+
+_LAST_REPLY = [(None, None)]
+
+
+def decode_bgp_reply(xmlstr):
+    """ decoded form of a reply, the last reply is decoded only once """
+
+    # the memo is swapped as one tuple so that threads running modules in
+    # the same process never pair one reply with another's decoded form
+    last, reply = _LAST_REPLY[0]
+    if last is not xmlstr:
+        with timed('xml', 'bgp-decode') as timer:
+            timer.received = len(xmlstr)
+            reply = BgpReply(xmlstr)
+        _LAST_REPLY[0] = (xmlstr, reply)
+    return reply
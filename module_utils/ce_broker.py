@@ -0,0 +1,564 @@
+# This code is part of Ansible, but is an independent component.
+# This particular file snippet, and this file snippet only, is BSD licensed.
+# Modules you write using this snippet, which is embedded dynamically by Ansible
+# still belong to the author of the module, and may assign their own license
+# to the complete work.
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#    * Redistributions of source code must retain the above copyright
+#      notice, this list of conditions and the following disclaimer.
+#    * Redistributions in binary form must reproduce the above copyright notice,
+#      this list of conditions and the following disclaimer in the documentation
+#      and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE
+# USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+"""
+Persistent NETCONF session broker for CloudEngine modules.
+
+The first module that talks to a host forks a small daemon which owns the
+NETCONF sessions to that host and listens on a Unix socket.  Later modules
+attach to the socket instead of doing their own SSH and NETCONF hello
+handshake, much like ssh ControlPersist.  The daemon evicts sessions that
+stay idle longer than the persist timeout, never opens more than the
+configured number of sessions per device, checks idle sessions with a
+cheap get and exits once it has nothing left to serve.
+
+The broker is enabled by exporting ANSIBLE_CE_PERSIST_TIMEOUT (seconds).
+"""
+
+import errno
+import fcntl
+import hashlib
+import json
+import os
+import socket
+import struct
+import threading
+import time
+
+from ansible.module_utils.basic import get_exception
+from ansible.module_utils.ce_lazy import has_module
+from ansible.module_utils.ce_perf import payload_size, recorder, timed
+
+HAS_NCCLIENT = has_module('ncclient')
+
+
+PERSIST_TIMEOUT = int(os.environ.get('ANSIBLE_CE_PERSIST_TIMEOUT', 0))
+PERSIST_MAX_SESSIONS = int(os.environ.get('ANSIBLE_CE_PERSIST_MAX_SESSIONS', 2))
+PERSIST_HEALTH_INTERVAL = int(
+    os.environ.get('ANSIBLE_CE_PERSIST_HEALTH_INTERVAL', 30))
+PERSIST_DIR = os.path.expanduser(
+    os.environ.get('ANSIBLE_CE_PERSIST_DIR', '~/.ansible/cp/ce'))
+
+# how long a client waits for the daemon socket and for a free session
+CONNECT_TIMEOUT = 30
+
+CE_NC_HEALTH_CHECK = """
+<filter type="subtree">
+  <system xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+    <systemInfo>
+      <sysName></sysName>
+    </systemInfo>
+  </system>
+</filter>
+"""
+
+CE_NC_RPC_ERROR = """<rpc-error xmlns="urn:ietf:params:xml:ns:netconf:base:1.0">
+  <error-type>application</error-type>
+  <error-tag>operation-failed</error-tag>
+  <error-severity>error</error-severity>
+  <error-message>%s</error-message>
+</rpc-error>"""
+
+_HEADER = struct.Struct('!I')
+
+MAXFD = 1024
+
+
+class BrokerError(Exception):
+    """ BrokerError """
+    pass
+
+
+def broker_enabled():
+    """ broker_enabled """
+
+    return PERSIST_TIMEOUT > 0 and hasattr(socket, 'AF_UNIX')
+
+
+def get_socket_path(host, port, username, password):
+    """ one broker per device and credentials """
+
+    key = '%s:%s:%s:%s' % (host, port, username, password)
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+    return os.path.join(PERSIST_DIR, 'nc-%s.sock' % digest[:16])
+
+
+def send_msg(sock, data):
+    """ send a length prefixed json message """
+
+    payload = json.dumps(data).encode('utf-8')
+    sock.sendall(_HEADER.pack(len(payload)) + payload)
+
+
+def _recv_exact(sock, size):
+    """ _recv_exact """
+
+    chunks = list()
+    while size > 0:
+        chunk = sock.recv(min(size, 65536))
+        if not chunk:
+            raise BrokerError('broker connection closed')
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+def recv_msg(sock):
+    """ receive a length prefixed json message """
+
+    size = _HEADER.unpack(_recv_exact(sock, _HEADER.size))[0]
+    return json.loads(_recv_exact(sock, size).decode('utf-8'))
+
+
+class NetconfReply(object):
+    """ reply returned to modules, mirrors the ncclient reply attributes they use """
+
+    def __init__(self, xml):
+        self.xml = xml
+
+
+def rpc_error_xml(exc):
+    """ serialize the rpc-error of an RPCError """
+
+    raw = getattr(exc, '_raw', None)
+    if raw is None or not HAS_NCCLIENT:
+        return None
+    from ncclient.xml_ import to_xml
+    if isinstance(raw, list):
+        raw = raw[0]
+    try:
+        return to_xml(raw)
+    except Exception:
+        return None
+
+
+class BrokerSession(object):
+    """ a NETCONF session owned by the broker """
+
+    def __init__(self, netconf):
+        self.netconf = netconf
+        self.last_used = time.time()
+        self.last_check = self.last_used
+
+    def alive(self):
+        """ alive """
+
+        mc = getattr(self.netconf, 'mc', None)
+        return bool(mc is not None and mc.connected)
+
+    def health_check(self):
+        """ health_check """
+
+        self.last_check = time.time()
+        if not self.alive():
+            return False
+        try:
+            self.netconf.get_config(filter=CE_NC_HEALTH_CHECK)
+        except Exception:
+            return False
+        return True
+
+    def close(self):
+        """ close """
+
+        try:
+            self.netconf.close()
+        except Exception:
+            pass
+        self.netconf.mc = None
+
+
+class NetconfBroker(object):
+    """ daemon side of the broker, serves one device """
+
+    def __init__(self, path, factory, connect_args, idle_timeout,
+                 max_sessions, health_interval):
+
+        self.path = path
+        self.factory = factory
+        self.connect_args = connect_args
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max(1, max_sessions)
+        self.health_interval = health_interval
+
+        self.cond = threading.Condition()
+        self.idle = list()
+        self.opened = 0
+        self.clients = 0
+        self.last_activity = time.time()
+
+    def checkout(self):
+        """ take a warm session, open a new one or wait for a free one """
+
+        deadline = time.time() + CONNECT_TIMEOUT
+        self.cond.acquire()
+        try:
+            while True:
+                while self.idle:
+                    session = self.idle.pop()
+                    if session.alive():
+                        return session
+                    self.opened -= 1
+                    session.close()
+                if self.opened < self.max_sessions:
+                    self.opened += 1
+                    break
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    raise BrokerError('no free NETCONF session to %s, %s sessions in use'
+                                      % (self.connect_args['host'], self.max_sessions))
+                self.cond.wait(remaining)
+        finally:
+            self.cond.release()
+
+        try:
+            return BrokerSession(self.factory(**self.connect_args))
+        except Exception:
+            self.cond.acquire()
+            self.opened -= 1
+            self.cond.notify()
+            self.cond.release()
+            raise
+
+    def checkin(self, session, broken=False):
+        """ return a session to the pool """
+
+        if not broken and getattr(session.netconf, 'target', 'running') != 'running':
+            # never hand a locked candidate to the next module
+            try:
+                session.netconf.abort_transaction()
+            except Exception:
+                broken = True
+
+        self.cond.acquire()
+        try:
+            session.last_used = time.time()
+            if broken or not session.alive():
+                self.opened -= 1
+                session.close()
+            else:
+                self.idle.append(session)
+            self.cond.notify()
+        finally:
+            self.cond.release()
+
+    def housekeeping(self):
+        """ evict idle sessions and health check the warm ones """
+
+        now = time.time()
+        self.cond.acquire()
+        try:
+            for session in list(self.idle):
+                if now - session.last_used > self.idle_timeout:
+                    evict = True
+                elif now - session.last_check > self.health_interval:
+                    evict = not session.health_check()
+                else:
+                    evict = False
+                if evict:
+                    self.idle.remove(session)
+                    self.opened -= 1
+                    session.close()
+            if self.clients or self.opened:
+                self.last_activity = now
+            return now - self.last_activity > self.idle_timeout
+        finally:
+            self.cond.release()
+
+    def dispatch(self, session, request):
+        """ run one request against a session """
+
+        method = request['method']
+        if method.startswith('_') or not hasattr(session.netconf, method):
+            raise BrokerError('unsupported broker method %s' % method)
+        result = getattr(session.netconf, method)(**request.get('kwargs', {}))
+        session.last_used = time.time()
+        if hasattr(result, 'xml'):
+            return dict(xml=result.xml)
+        return dict(value=result)
+
+    def handle(self, conn):
+        """ serve one module run, the session is held until it disconnects """
+
+        session = None
+        broken = False
+        try:
+            while True:
+                try:
+                    request = recv_msg(conn)
+                except (BrokerError, socket.error, ValueError):
+                    break
+
+                try:
+                    if session is None:
+                        session = self.checkout()
+                    response = self.dispatch(session, request)
+                except Exception:
+                    exc = get_exception()
+                    response = dict(error=exc.__class__.__name__,
+                                    message=str(exc),
+                                    error_xml=rpc_error_xml(exc))
+                    if session is not None and not session.alive():
+                        broken = True
+                try:
+                    send_msg(conn, response)
+                except socket.error:
+                    broken = True
+                    break
+        finally:
+            conn.close()
+            if session is not None:
+                self.checkin(session, broken)
+            self.cond.acquire()
+            self.clients -= 1
+            self.cond.release()
+
+    def serve(self, server):
+        """ accept loop """
+
+        server.settimeout(1)
+        while True:
+            if self.housekeeping():
+                break
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                continue
+            except socket.error:
+                exc = get_exception()
+                if exc.errno == errno.EINTR:
+                    continue
+                raise
+            conn.settimeout(None)
+            self.cond.acquire()
+            self.clients += 1
+            self.cond.release()
+            thread = threading.Thread(target=self.handle, args=(conn,))
+            thread.daemon = True
+            thread.start()
+
+        self.cond.acquire()
+        for session in self.idle:
+            session.close()
+        self.idle = list()
+        self.cond.release()
+
+
+def _run_broker(server, path, factory, connect_args):
+    """ detach from the module process and serve, never returns """
+
+    try:
+        os.setsid()
+        if os.fork():
+            os._exit(0)
+
+        devnull = os.open(os.devnull, os.O_RDWR)
+        for fd in (0, 1, 2):
+            os.dup2(devnull, fd)
+        os.close(devnull)
+
+        # drop inherited descriptors such as the module's CLI ssh socket,
+        # otherwise the device session outlives the module
+        os.closerange(3, server.fileno())
+        os.closerange(server.fileno() + 1, MAXFD)
+
+        # the daemon outlives many modules and never writes a perf log
+        recorder.enabled = False
+
+        broker = NetconfBroker(path, factory, connect_args, PERSIST_TIMEOUT,
+                               PERSIST_MAX_SESSIONS, PERSIST_HEALTH_INTERVAL)
+        broker.serve(server)
+    finally:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+        os._exit(0)
+
+
+def start_broker(path, factory, connect_args):
+    """ fork a broker daemon for the device unless one is already listening """
+
+    if not os.path.isdir(PERSIST_DIR):
+        try:
+            os.makedirs(PERSIST_DIR, 0o700)
+        except OSError:
+            if not os.path.isdir(PERSIST_DIR):
+                raise
+
+    lock = open(path + '.lock', 'w')
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(path)
+            return
+        except socket.error:
+            pass
+        finally:
+            probe.close()
+
+        if os.path.exists(path):
+            os.unlink(path)
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(path)
+        os.chmod(path, 0o600)
+        server.listen(16)
+
+        pid = os.fork()
+        if not pid:
+            _run_broker(server, path, factory, connect_args)
+        server.close()
+        os.waitpid(pid, 0)
+    finally:
+        lock.close()
+
+
+class BrokerNetconf(object):
+    """ client side of the broker, a drop in for the Netconf class """
+
+    def __init__(self, path):
+
+        self.path = path
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        with timed('broker', 'connect'):
+            self.sock.connect(path)
+
+    def __del__(self):
+
+        try:
+            self.sock.close()
+        except Exception:
+            pass
+
+    def _call(self, method, **kwargs):
+        """ forward a request to the broker and rebuild the reply """
+
+        try:
+            with timed('broker', method) as timer:
+                send_msg(self.sock, dict(method=method, kwargs=kwargs))
+                response = recv_msg(self.sock)
+                timer.sent = payload_size(kwargs)
+                timer.received = payload_size(response.get('xml'))
+        except socket.error:
+            exc = get_exception()
+            raise BrokerError('lost connection to NETCONF broker: %s' % exc)
+
+        if 'xml' in response:
+            return NetconfReply(response['xml'])
+        if 'error' not in response:
+            return response.get('value')
+
+        if response['error'] == 'RPCError' and HAS_NCCLIENT:
+            from ncclient.operations.rpc import RPCError
+            from ncclient.xml_ import to_ele
+            xml = response.get('error_xml') or CE_NC_RPC_ERROR % response['message']
+            raise RPCError(to_ele(xml))
+        raise BrokerError(response['message'])
+
+    def set_config(self, **kwargs):
+        """ set_config """
+
+        return self._call('set_config', **kwargs)
+
+    def get_config(self, **kwargs):
+        """ get_config """
+
+        return self._call('get_config', **kwargs)
+
+    def lock(self, **kwargs):
+        """ lock """
+
+        return self._call('lock', **kwargs)
+
+    def unlock(self, **kwargs):
+        """ unlock """
+
+        return self._call('unlock', **kwargs)
+
+    def validate(self, **kwargs):
+        """ validate """
+
+        return self._call('validate', **kwargs)
+
+    def commit(self, **kwargs):
+        """ commit """
+
+        return self._call('commit', **kwargs)
+
+    def discard_changes(self, **kwargs):
+        """ discard_changes """
+
+        return self._call('discard_changes', **kwargs)
+
+    def start_transaction(self, **kwargs):
+        """ start_transaction """
+
+        return self._call('start_transaction', **kwargs)
+
+    def commit_transaction(self, **kwargs):
+        """ commit_transaction """
+
+        return self._call('commit_transaction', **kwargs)
+
+    def abort_transaction(self, **kwargs):
+        """ abort_transaction """
+
+        return self._call('abort_transaction', **kwargs)
+
+    def execute_action(self, **kwargs):
+        """huawei execute-action"""
+
+        return self._call('execute_action', **kwargs)
+
+    def execute_cli(self, **kwargs):
+        """huawei execute-cli"""
+
+        return self._call('execute_cli', **kwargs)
+
+
+def get_broker_netconf(factory, **kwargs):
+    """ attach to the device broker, starting it when needed """
+
+    path = get_socket_path(kwargs['host'], kwargs['port'],
+                           kwargs['username'], kwargs['password'])
+
+    try:
+        return BrokerNetconf(path)
+    except socket.error:
+        pass
+
+    start_broker(path, factory, kwargs)
+
+    deadline = time.time() + CONNECT_TIMEOUT
+    while True:
+        try:
+            return BrokerNetconf(path)
+        except socket.error:
+            if time.time() > deadline:
+                raise BrokerError('NETCONF broker for %s did not start'
+                                  % kwargs['host'])
+            time.sleep(0.1)
@@ -0,0 +1,193 @@
+# This code is part of Ansible, but is an independent component.
+# This particular file snippet, and this file snippet only, is BSD licensed.
+# Modules you write using this snippet, which is embedded dynamically by Ansible
+# still belong to the author of the module, and may assign their own license
+# to the complete work.
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#    * Redistributions of source code must retain the above copyright
+#      notice, this list of conditions and the following disclaimer.
+#    * Redistributions in binary form must reproduce the above copyright notice,
+#      this list of conditions and the following disclaimer in the documentation
+#      and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE
+# USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+
+"""
+Running-configuration cache for CloudEngine CLI modules.
+
+The output of display current-configuration is stored per host and keyed
+by the id of the latest configuration commit, which is cheap to query.
+Modules read the running configuration several times per task with
+different display filters; the full text is fetched once per commit and
+the include, exclude and section include filters are evaluated locally.
+
+The cache is off by default, export ANSIBLE_CE_CONFIG_CACHE=1 to turn it
+on.  The files hold the whole running configuration, secrets included,
+ANSIBLE_CE_CONFIG_CACHE_DIR sets where they are stored.
+"""
+
+import hashlib
+import json
+import os
+import re
+
+CONFIG_CACHE = os.environ.get('ANSIBLE_CE_CONFIG_CACHE', '0') not in \
+    ('0', 'false', 'no', 'off')
+CONFIG_CACHE_DIR = os.path.expanduser(
+    os.environ.get('ANSIBLE_CE_CONFIG_CACHE_DIR', '~/.ansible/cp/ce'))
+
+# a pipe starts a new display filter only when a filter keyword follows,
+# otherwise it is an alternation inside the regular expression
+FILTER_SPLIT_RE = re.compile(
+    r'\|\s*(?=(?:ignore-case\s+)?(?:section\s+)?'
+    r'(?:include|exclude|begin|inc|exc)\b)')
+FILTER_RE = re.compile(
+    r'^(ignore-case\s+)?(section\s+)?(include|exclude|begin|inc|exc)\s*(.*)$',
+    re.S)
+COMMIT_ID_RE = re.compile(r'^\s*\d+\s+(\d{10})\s', re.M)
+
+
+def cache_enabled():
+    """ cache_enabled """
+
+    return CONFIG_CACHE
+
+
+def get_cache_path(host, port, variant):
+    """ one cache file per host and display variant """
+
+    key = '%s:%s' % (host, port)
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+    return os.path.join(CONFIG_CACHE_DIR,
+                        'cfg-%s-%s.json' % (digest[:16], variant))
+
+
+def parse_commit_id(text):
+    """ latest commit id from display configuration commit list 1 """
+
+    match = COMMIT_ID_RE.search(text or '')
+    if match is None:
+        return None
+    return match.group(1)
+
+
+def read_cache(path, commit_id):
+    """ cached configuration text or None if stale or missing """
+
+    try:
+        with open(path) as cache_file:
+            entry = json.load(cache_file)
+    except (IOError, OSError, ValueError):
+        return None
+    if entry.get('commit_id') != commit_id:
+        return None
+    return entry.get('config')
+
+
+def write_cache(path, commit_id, config):
+    """ write_cache """
+
+    tmp = '%s.%d' % (path, os.getpid())
+    try:
+        if not os.path.isdir(CONFIG_CACHE_DIR):
+            os.makedirs(CONFIG_CACHE_DIR, 0o700)
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as cache_file:
+            json.dump(dict(commit_id=commit_id, config=config), cache_file)
+        os.rename(tmp, path)
+    except (IOError, OSError):
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+
+
+def parse_filters(regular):
+    """ split a display filter string into (section, mode, regex) tuples,
+        None if the string uses a filter that is not evaluated locally """
+
+    filters = list()
+    if not regular or not regular.strip():
+        return filters
+
+    text = regular.strip()
+    if not text.startswith('|'):
+        return None
+    for part in FILTER_SPLIT_RE.split(text[1:]):
+        match = FILTER_RE.match(part.strip())
+        if match is None:
+            return None
+        flags = re.I if match.group(1) else 0
+        mode = match.group(3)
+        if mode == 'inc':
+            mode = 'include'
+        elif mode == 'exc':
+            mode = 'exclude'
+        try:
+            regex = re.compile(match.group(4).strip(), flags)
+        except re.error:
+            return None
+        filters.append((bool(match.group(2)), mode, regex))
+    return filters
+
+
+def _indent(line):
+    return len(line) - len(line.lstrip(' '))
+
+
+def _filter_sections(lines, regex, exclude):
+    """ keep (or drop) matching lines together with their child lines """
+
+    result = list()
+    index = 0
+    while index < len(lines):
+        line = lines[index]
+        end = index + 1
+        if line.strip():
+            level = _indent(line)
+            while end < len(lines) and lines[end].strip() and \
+                    _indent(lines[end]) > level:
+                end += 1
+        matched = bool(line.strip()) and regex.search(line) is not None
+        if matched != exclude:
+            result.extend(lines[index:end])
+            index = end
+        elif exclude:
+            index = end
+        else:
+            index += 1
+    return result
+
+
+def filter_config(config, filters):
+    """ evaluate display filters against configuration text """
+
+    lines = config.splitlines()
+    for section, mode, regex in filters:
+        if section and mode in ('include', 'exclude'):
+            lines = _filter_sections(lines, regex, mode == 'exclude')
+        elif mode == 'include':
+            lines = [line for line in lines if regex.search(line)]
+        elif mode == 'exclude':
+            lines = [line for line in lines if not regex.search(line)]
+        elif mode == 'begin':
+            for index, line in enumerate(lines):
+                if regex.search(line):
+                    lines = lines[index:]
+                    break
+            else:
+                lines = list()
+    return '\n'.join(lines)
@@ -0,0 +1,161 @@
+# This code is part of Ansible, but is an independent component.
+# This particular file snippet, and this file snippet only, is BSD licensed.
+# Modules you write using this snippet, which is embedded dynamically by Ansible
+# still belong to the author of the module, and may assign their own license
+# to the complete work.
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#    * Redistributions of source code must retain the above copyright
+#      notice, this list of conditions and the following disclaimer.
+#    * Redistributions in binary form must reproduce the above copyright notice,
+#      this list of conditions and the following disclaimer in the documentation
+#      and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE
+# USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+
+"""
+Indexed model of the CloudEngine running configuration.
+
+display current-configuration is parsed once into a tree of lines, the
+top-level sections (interface, ip vpn-instance, bgp, dfs-group, ...) are
+indexed by their header so a module looks up the section it manages
+instead of scanning the whole text or sending one display filter per
+attribute.
+"""
+
+import re
+
+
+class ConfigNode(object):
+    """ one configuration line and the lines nested below it """
+
+    __slots__ = ('text', 'parent', 'children', 'index')
+
+    def __init__(self, text, parent=None):
+        self.text = text
+        self.parent = parent
+        self.children = list()
+        self.index = dict()
+
+    def add(self, text):
+        """ append a child line """
+
+        node = ConfigNode(text, self)
+        self.children.append(node)
+        self.index.setdefault(normalize(text), node)
+        return node
+
+    def child(self, text):
+        """ child line by its exact text, case insensitive """
+
+        return self.index.get(normalize(text))
+
+    def has(self, text):
+        """ has a child line with exactly this text """
+
+        return normalize(text) in self.index
+
+    def startswith(self, prefix):
+        """ child lines starting with prefix """
+
+        prefix = normalize(prefix)
+        return [node for node in self.children
+                if normalize(node.text).startswith(prefix)]
+
+    def search(self, regex, flags=0):
+        """ child lines matching a regular expression """
+
+        pattern = re.compile(regex, flags)
+        return [node for node in self.children if pattern.search(node.text)]
+
+    def lines(self, depth=0):
+        """ the line and its children as indented text lines """
+
+        result = list()
+        if self.text is not None:
+            result.append(' ' * depth + self.text)
+            depth += 1
+        for node in self.children:
+            result.extend(node.lines(depth))
+        return result
+
+    def to_text(self):
+        """ to_text """
+
+        return '\n'.join(self.lines())
+
+    def __str__(self):
+        return self.to_text()
+
+
+class ConfigTree(ConfigNode):
+    """ parsed running configuration """
+
+    __slots__ = ('keywords',)
+
+    def __init__(self, config=None):
+        super(ConfigTree, self).__init__(None)
+        self.keywords = dict()
+        if config:
+            self.parse(config)
+
+    def parse(self, config):
+        """ build the tree from display current-configuration output """
+
+        stack = [(-1, self)]
+        for line in config.splitlines():
+            text = line.strip()
+            if not text or text == '#' or text.startswith('!') \
+                    or text == 'return':
+                continue
+            level = len(line) - len(line.lstrip(' '))
+            while stack[-1][0] >= level:
+                stack.pop()
+            parent = stack[-1][1]
+            node = parent.add(text)
+            if parent is self:
+                keyword = normalize(text).split(' ')[0]
+                self.keywords.setdefault(keyword, list()).append(node)
+            stack.append((level, node))
+
+    def section(self, header):
+        """ top-level section by its header line, None if absent """
+
+        return self.child(header)
+
+    def sections(self, keyword):
+        """ top-level lines by their first word """
+
+        return self.keywords.get(keyword.lower(), list())
+
+    def section_text(self, header):
+        """ section as text, empty string if absent """
+
+        node = self.section(header)
+        if node is None:
+            return ''
+        return node.to_text()
+
+    def include(self, regex, flags=0):
+        """ all lines matching a regular expression, like | include """
+
+        pattern = re.compile(regex, flags)
+        return [line for line in self.lines() if pattern.search(line)]
+
+
+def normalize(text):
+    """ normalize a configuration line for lookups """
+
+    return ' '.join(text.lower().split())
@@ -0,0 +1,137 @@
+# This code is part of Ansible, but is an independent component.
+# This particular file snippet, and this file snippet only, is BSD licensed.
+# Modules you write using this snippet, which is embedded dynamically by Ansible
+# still belong to the author of the module, and may assign their own license
+# to the complete work.
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#    * Redistributions of source code must retain the above copyright
+#      notice, this list of conditions and the following disclaimer.
+#    * Redistributions in binary form must reproduce the above copyright notice,
+#      this list of conditions and the following disclaimer in the documentation
+#      and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE
+# USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+"""
+Controller-side cache of the ce_facts subsets.
+
+Version and hardware facts only change with an upgrade, yet every play
+gathers them again.  With ANSIBLE_CE_FACTS_CACHE=1 ce_facts stores the
+facts of each subset per host and serves a subset from the cache until its
+time to live runs out, only the expired subsets are read from the device.
+
+ANSIBLE_CE_FACTS_TTL overrides the time to live in seconds of subsets, as
+in hardware=86400,interfaces=60, a subset with a time to live of 0 is never
+cached.  ANSIBLE_CE_FACTS_CACHE_DIR sets where the files are stored.
+"""
+
+import hashlib
+import json
+import os
+import time
+
+FACTS_CACHE = os.environ.get('ANSIBLE_CE_FACTS_CACHE', '0') not in \
+    ('0', 'false', 'no', 'off', '')
+FACTS_CACHE_DIR = os.path.expanduser(
+    os.environ.get('ANSIBLE_CE_FACTS_CACHE_DIR', '~/.ansible/cp/ce'))
+
+# seconds a subset is served from the cache, the running configuration
+# changes too often to be cached at all
+DEFAULT_TTLS = dict(default=86400, hardware=86400, interfaces=60, config=0)
+
+
+def parse_ttls(text):
+    """ dict of subset -> seconds from subset=seconds pairs """
+
+    ttls = dict()
+    for pair in (text or '').split(','):
+        if not pair.strip():
+            continue
+        subset, _, seconds = pair.partition('=')
+        ttls[subset.strip()] = int(seconds)
+    return ttls
+
+
+SUBSET_TTLS = dict(DEFAULT_TTLS)
+SUBSET_TTLS.update(parse_ttls(os.environ.get('ANSIBLE_CE_FACTS_TTL')))
+
+
+def facts_cache_enabled():
+    """ facts_cache_enabled """
+
+    return FACTS_CACHE
+
+
+def get_facts_cache_path(host, port):
+    """ one cache file per host """
+
+    key = '%s:%s' % (host, port)
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+    return os.path.join(FACTS_CACHE_DIR, 'facts-%s.json' % digest[:16])
+
+
+def _load(path):
+    """ cache entries of a host, empty if the file is missing or broken """
+
+    try:
+        with open(path) as cache_file:
+            entries = json.load(cache_file)
+    except (IOError, OSError, ValueError):
+        return dict()
+    if not isinstance(entries, dict):
+        return dict()
+    return entries
+
+
+def read_facts_cache(path, subsets, now=None):
+    """ dict of subset -> facts of the subsets still fresh in the cache """
+
+    now = time.time() if now is None else now
+    entries = _load(path)
+    fresh = dict()
+    for subset in subsets:
+        entry = entries.get(subset)
+        ttl = SUBSET_TTLS.get(subset, 0)
+        if not entry or ttl <= 0:
+            continue
+        if 0 <= now - entry.get('time', 0) < ttl:
+            fresh[subset] = entry.get('facts')
+    return fresh
+
+
+def write_facts_cache(path, gathered, now=None):
+    """ store the facts of the subsets just gathered, keep the others """
+
+    now = time.time() if now is None else now
+    entries = _load(path)
+    for subset, facts in gathered.items():
+        if SUBSET_TTLS.get(subset, 0) > 0:
+            entries[subset] = dict(time=now, facts=facts)
+        else:
+            entries.pop(subset, None)
+
+    tmp = '%s.%d' % (path, os.getpid())
+    try:
+        if not os.path.isdir(FACTS_CACHE_DIR):
+            os.makedirs(FACTS_CACHE_DIR, 0o700)
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as cache_file:
+            json.dump(entries, cache_file)
+        os.rename(tmp, path)
+    except (IOError, OSError):
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
@@ -0,0 +1,281 @@
+# This code is part of Ansible, but is an independent component.
+# This particular file snippet, and this file snippet only, is BSD licensed.
+# Modules you write using this snippet, which is embedded dynamically by Ansible
+# still belong to the author of the module, and may assign their own license
+# to the complete work.
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#    * Redistributions of source code must retain the above copyright
+#      notice, this list of conditions and the following disclaimer.
+#    * Redistributions in binary form must reproduce the above copyright notice,
+#      this list of conditions and the following disclaimer in the documentation
+#      and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE
+# USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+"""
+Per-device concurrency governor for CloudEngine modules.
+
+A CloudEngine accepts a limited number of NETCONF sessions and refuses an
+edit-config or a lock while another session holds the datastore.  Modules
+running in parallel against one device queue for one of the session slots
+of the device before they connect.  The slots are flock()ed files shared
+by every process on the control host and are freed by the kernel when a
+process dies.  Connects the device refuses or resets, as it does once all
+of its sessions are taken, and RPCs failing on lock contention, a
+lock-denied error or the lock-held message of CE, are retried with
+jittered exponential backoff.  Timeouts, unreachable hosts and names
+that do not resolve fail at once.  The time spent
+queuing and backing off is recorded as governor.queue and governor.backoff
+in the perf block.
+
+ANSIBLE_CE_SESSION_LIMIT sets the number of slots per device, slots are off
+unless it is set, ANSIBLE_CE_SESSION_WAIT the seconds a module queues for
+one (default 300).  ANSIBLE_CE_RETRIES (default 5, 0 turns retrying off) and
+ANSIBLE_CE_RETRY_DELAY (first backoff in seconds, default 0.5) tune the
+retries.
+"""
+
+import errno
+import fcntl
+import functools
+import hashlib
+import os
+import random
+import re
+import socket
+import threading
+import time
+
+from ansible.module_utils.basic import get_exception
+from ansible.module_utils.ce_lazy import loaded
+from ansible.module_utils.ce_perf import timed
+
+
+SESSION_LIMIT = int(os.environ.get('ANSIBLE_CE_SESSION_LIMIT', 0))
+SESSION_WAIT = int(os.environ.get('ANSIBLE_CE_SESSION_WAIT', 300))
+SESSION_DIR = os.path.expanduser(
+    os.environ.get('ANSIBLE_CE_SESSION_DIR', '~/.ansible/cp/ce'))
+RETRIES = int(os.environ.get('ANSIBLE_CE_RETRIES', 5))
+RETRY_DELAY = float(os.environ.get('ANSIBLE_CE_RETRY_DELAY', 0.5))
+RETRY_MAX_DELAY = 30.0
+
+# rpc-error tag of a datastore held by another session, and the messages CE
+# reports it with under other tags, config errors mentioning locks are not
+CONTENTION_TAG = 'lock-denied'
+CONTENTION_RE = re.compile(r'^(Lock failed, lock is already held|'
+                           r'The configuration is locked by other user)')
+
+# socket errors of a device turning a session away
+REFUSED_ERRNOS = (errno.ECONNREFUSED, errno.ECONNRESET)
+# SSH errors of a device closing a session it has no room for
+REFUSED_RE = re.compile(r'refused|reset by peer|session close|'
+                        r'protocol banner(?!.*timed out)', re.I)
+# ncclient hides why it could not open the socket
+OPEN_SOCKET_RE = re.compile(r'could not open socket', re.I)
+PROBE_TIMEOUT = 5
+
+# slots held by the current thread, by device
+_HELD = threading.local()
+
+
+class GovernorError(Exception):
+    """ no session slot of the device became free in time """
+
+    pass
+
+
+def backoff_delay(attempt):
+    """ seconds to sleep before retry number attempt, half of it random """
+
+    delay = min(RETRY_DELAY * (2 ** attempt), RETRY_MAX_DELAY)
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def is_contention(exc):
+    """ whether an RPCError reports a datastore held by another session """
+
+    rpc = loaded('ncclient.operations.rpc')
+    if rpc is None or not isinstance(exc, rpc.RPCError):
+        return False
+    if getattr(exc, 'tag', None) == CONTENTION_TAG:
+        return True
+    message = str(getattr(exc, 'message', '') or exc).strip()
+    return bool(CONTENTION_RE.match(message))
+
+
+def probe_errno(host, port):
+    """ errno of a plain TCP connect to the device, 0 when it connects """
+
+    try:
+        sock = socket.create_connection((host, port), PROBE_TIMEOUT)
+    except socket.timeout:
+        return errno.ETIMEDOUT
+    except socket.gaierror:
+        return errno.EHOSTUNREACH
+    except socket.error:
+        return get_exception().errno or errno.EHOSTUNREACH
+    sock.close()
+    return 0
+
+
+def is_refused(exc, host=None, port=None):
+    """ whether a connect failed because the device is busy, a timeout or
+    an unreachable device is not worth retrying """
+
+    if isinstance(exc, (socket.timeout, socket.gaierror)):
+        return False
+    if isinstance(exc, socket.error) and exc.errno is not None:
+        return exc.errno in REFUSED_ERRNOS
+
+    errors = loaded('ncclient.transport.errors')
+    if errors is not None and isinstance(exc, errors.AuthenticationError):
+        return False
+    if errors is not None and isinstance(exc, errors.SessionCloseError):
+        return True
+    message = str(getattr(exc, 'message', '') or exc)
+    if OPEN_SOCKET_RE.search(message) and host is not None:
+        return probe_errno(host, port) in REFUSED_ERRNOS + (0,)
+    return bool(REFUSED_RE.search(message))
+
+
+def slot_path(host, port, index):
+    """ lock file of one session slot of a device """
+
+    digest = hashlib.sha1(('%s:%s' % (host, port)).encode('utf-8')).hexdigest()
+    return os.path.join(SESSION_DIR, '%s.slot%d' % (digest[:16], index))
+
+
+class SessionSlot(object):
+    """ a session slot of a device, held until released """
+
+    def __init__(self, key, fhandle):
+
+        self.key = key
+        self.fhandle = fhandle
+        self.refs = 1
+
+    def release(self):
+        """ give the slot back once every user released it """
+
+        self.refs -= 1
+        if self.refs > 0 or self.fhandle is None:
+            return
+        held = getattr(_HELD, 'slots', None)
+        if held is not None and held.get(self.key) is self:
+            del held[self.key]
+        try:
+            fcntl.flock(self.fhandle.fileno(), fcntl.LOCK_UN)
+        finally:
+            self.fhandle.close()
+            self.fhandle = None
+
+
+def _try_slots(host, port):
+    """ lock the first free slot of a device, None when all are taken """
+
+    indexes = list(range(SESSION_LIMIT))
+    # spread the waiters over the slots
+    random.shuffle(indexes)
+    for index in indexes:
+        fhandle = open(slot_path(host, port, index), 'a')
+        try:
+            fcntl.flock(fhandle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except (IOError, OSError):
+            exc = get_exception()
+            fhandle.close()
+            if exc.errno not in (errno.EAGAIN, errno.EACCES):
+                raise
+            continue
+        return fhandle
+    return None
+
+
+def acquire_slot(host, port):
+    """ wait for a session slot of a device, None when slots are off
+
+    A thread asking again for a device it holds a slot of gets that slot
+    back, so a module opening several sessions never waits on itself.
+    """
+
+    if SESSION_LIMIT <= 0:
+        return None
+
+    key = (host, port)
+    held = getattr(_HELD, 'slots', None)
+    if held is None:
+        held = _HELD.slots = dict()
+    slot = held.get(key)
+    # a slot released by the garbage collector in another thread is gone
+    if slot is not None and slot.fhandle is not None:
+        slot.refs += 1
+        return slot
+
+    if not os.path.isdir(SESSION_DIR):
+        try:
+            os.makedirs(SESSION_DIR, 0o700)
+        except OSError:
+            pass
+
+    deadline = time.time() + SESSION_WAIT
+    with timed('governor', 'queue', host):
+        fhandle = _try_slots(host, port)
+        while fhandle is None:
+            if time.time() > deadline:
+                raise GovernorError('timed out after %ds waiting for one of '
+                                    'the %d NETCONF session slots of %s'
+                                    % (SESSION_WAIT, SESSION_LIMIT, host))
+            time.sleep(random.uniform(0.05, 0.25))
+            fhandle = _try_slots(host, port)
+
+    held[key] = SessionSlot(key, fhandle)
+    return held[key]
+
+
+def retry_connect(connect, host=None, port=None):
+    """ call connect, retrying when the device refuses the session """
+
+    attempt = 0
+    while True:
+        try:
+            return connect()
+        except Exception:
+            exc = get_exception()
+            if attempt >= RETRIES or not is_refused(exc, host, port):
+                raise
+        with timed('governor', 'backoff', host):
+            time.sleep(backoff_delay(attempt))
+        attempt += 1
+
+
+def retry_contention(func):
+    """ decorator retrying a Netconf method failing on lock contention,
+    retry=False makes a single attempt """
+
+    @functools.wraps(func)
+    def wrapper(self, **kwargs):
+        retries = RETRIES if kwargs.pop('retry', True) else 0
+        attempt = 0
+        while True:
+            try:
+                return func(self, **kwargs)
+            except Exception:
+                exc = get_exception()
+                if attempt >= retries or not is_contention(exc):
+                    raise
+            with timed('governor', 'backoff', getattr(self, 'host', None)):
+                time.sleep(backoff_delay(attempt))
+            attempt += 1
+
+    return wrapper
@@ -0,0 +1,68 @@
+# This code is part of Ansible, but is an independent component.
+# This particular file snippet, and this file snippet only, is BSD licensed.
+# Modules you write using this snippet, which is embedded dynamically by Ansible
+# still belong to the author of the module, and may assign their own license
+# to the complete work.
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#    * Redistributions of source code must retain the above copyright
+#      notice, this list of conditions and the following disclaimer.
+#    * Redistributions in binary form must reproduce the above copyright notice,
+#      this list of conditions and the following disclaimer in the documentation
+#      and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE
+# USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+"""
+Deferred imports of the transport libraries.
+
+ncclient pulls in lxml and its transports, scp its own SSH helpers, and
+AnsiballZ runs every module in a fresh interpreter, so whatever a module
+imports is paid for on every task.  The CloudEngine module_utils import
+these libraries when a session is opened instead of when they are loaded,
+and a CLI module never imports ncclient.  has_module() answers whether a
+library is installed without importing it.
+"""
+
+import sys
+
+try:
+    from importlib.util import find_spec
+except ImportError:
+    find_spec = None
+    import imp
+
+
+def has_module(name):
+    """ whether the top level module name can be imported """
+
+    if name in sys.modules:
+        return sys.modules[name] is not None
+    try:
+        if find_spec is not None:
+            return find_spec(name) is not None
+        imp.find_module(name)
+    except ImportError:
+        return False
+    return True
+
+
+def loaded(name):
+    """ module name when something imported it already, else None
+
+    An exception can only be an instance of a class of a module that was
+    imported, checks against it are skipped when the module is not loaded.
+    """
+
+    return sys.modules.get(name)
@@ -0,0 +1,245 @@
+# This code is part of Ansible, but is an independent component.
+# This particular file snippet, and this file snippet only, is BSD licensed.
+# Modules you write using this snippet, which is embedded dynamically by Ansible
+# still belong to the author of the module, and may assign their own license
+# to the complete work.
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#    * Redistributions of source code must retain the above copyright
+#      notice, this list of conditions and the following disclaimer.
+#    * Redistributions in binary form must reproduce the above copyright notice,
+#      this list of conditions and the following disclaimer in the documentation
+#      and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE
+# USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+"""
+Transport instrumentation for CloudEngine modules.
+
+The Netconf and Cli transports record every connect and every RPC or
+command batch with its duration, request and reply size in bytes, the
+summary also carries the CPU time the module used.  Export
+ANSIBLE_CE_PERF=1 to have modules return the summary as a perf block in
+their results, and ANSIBLE_CE_PERF_LOG to append one JSON line per call
+and one summary line per module run to that file, which is what the
+fleet wide latency histograms are built from.
+"""
+
+import atexit
+import functools
+import json
+import os
+import sys
+import threading
+import time
+
+PERF_RESULTS = os.environ.get('ANSIBLE_CE_PERF', '0') not in \
+    ('0', 'false', 'no', 'off', '')
+PERF_LOG = os.environ.get('ANSIBLE_CE_PERF_LOG')
+
+# upper bounds in milliseconds of the latency histogram buckets
+PERF_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+def perf_enabled():
+    """ whether calls are recorded at all """
+
+    return bool(PERF_RESULTS or PERF_LOG)
+
+
+def payload_size(value):
+    """ size in bytes of a request argument or of a reply """
+
+    if value is None:
+        return 0
+    if hasattr(value, 'xml'):
+        value = value.xml
+    if isinstance(value, (list, tuple)):
+        return sum(payload_size(item) for item in value)
+    if isinstance(value, dict):
+        return sum(payload_size(item) for item in value.values())
+    if isinstance(value, bytes):
+        return len(value)
+    try:
+        return len(value.encode('utf-8'))
+    except (AttributeError, UnicodeError):
+        return len(str(value))
+
+
+def bucket_of(duration):
+    """ histogram bucket label of a duration in seconds """
+
+    msec = duration * 1000
+    for bound in PERF_BUCKETS:
+        if msec <= bound:
+            return '<=%dms' % bound
+    return '>%dms' % PERF_BUCKETS[-1]
+
+
+class PerfRecorder(object):
+    """ collects the calls made by the transports of one module run, the
+    transports may record from several threads """
+
+    def __init__(self):
+
+        self.lock = threading.Lock()
+        self.calls = list()
+        self.start = time.time()
+        self.start_cpu = sum(os.times()[:2])
+        self.written = 0
+        self.enabled = True
+
+    def record(self, transport, op, duration, sent=0, received=0,
+               host=None, ok=True):
+        """ record one connect, RPC or command batch """
+
+        if not self.enabled or not perf_enabled():
+            return
+        call = dict(transport=transport, op=op, time=round(duration, 6),
+                    sent=sent, received=received, host=host, ok=ok,
+                    ts=round(time.time(), 6))
+        with self.lock:
+            self.calls.append(call)
+
+    def summary(self):
+        """ counts, totals and latency histogram per transport and op """
+
+        with self.lock:
+            calls = list(self.calls)
+        ops = dict()
+        handshake = 0.0
+        for call in calls:
+            key = '%s.%s' % (call['transport'], call['op'])
+            stat = ops.setdefault(key, dict(count=0, errors=0, time=0.0,
+                                            max=0.0, sent=0, received=0,
+                                            histogram=dict()))
+            stat['count'] += 1
+            stat['errors'] += 0 if call['ok'] else 1
+            stat['time'] += call['time']
+            stat['max'] = max(stat['max'], call['time'])
+            stat['sent'] += call['sent']
+            stat['received'] += call['received']
+            bucket = bucket_of(call['time'])
+            stat['histogram'][bucket] = stat['histogram'].get(bucket, 0) + 1
+            if call['op'] == 'connect':
+                handshake += call['time']
+
+        rpc_time = sum(stat['time'] for key, stat in ops.items()
+                       if not key.endswith('.connect') and
+                       not key.startswith('xml.') and
+                       not key.startswith('governor.'))
+        parse_time = sum(stat['time'] for key, stat in ops.items()
+                         if key.startswith('xml.'))
+        queue_wait = sum(stat['time'] for key, stat in ops.items()
+                         if key.startswith('governor.'))
+        for stat in ops.values():
+            stat['time'] = round(stat['time'], 6)
+
+        return dict(calls=len(calls),
+                    elapsed=round(time.time() - self.start, 6),
+                    cpu=round(sum(os.times()[:2]) - self.start_cpu, 6),
+                    handshake=round(handshake, 6),
+                    rpc_time=round(rpc_time, 6),
+                    parse_time=round(parse_time, 6),
+                    queue_wait=round(queue_wait, 6),
+                    sent=sum(call['sent'] for call in calls),
+                    received=sum(call['received'] for call in calls),
+                    ops=ops)
+
+    def flush(self, path=None):
+        """ append the calls not yet written and a summary line """
+
+        path = path or PERF_LOG
+        with self.lock:
+            calls = list(self.calls)
+        if not path or len(calls) == self.written:
+            return
+
+        module = os.path.basename(sys.argv[0])
+        lines = [dict(call, type='call', pid=os.getpid(), module=module)
+                 for call in calls[self.written:]]
+        lines.append(dict(self.summary(), type='summary', pid=os.getpid(),
+                          module=module))
+        try:
+            with open(path, 'a') as fhandle:
+                fhandle.write(''.join(json.dumps(line, sort_keys=True) + '\n'
+                                      for line in lines))
+        except (IOError, OSError):
+            # instrumentation must never fail the task
+            return
+        self.written = len(calls)
+
+
+recorder = PerfRecorder()
+
+if PERF_LOG:
+    atexit.register(recorder.flush)
+
+
+def timed(transport, op, host=None):
+    """ record a call made inside the with block """
+
+    return _Timer(transport, op, host)
+
+
+class _Timer(object):
+
+    def __init__(self, transport, op, host):
+
+        self.transport = transport
+        self.op = op
+        self.host = host
+        self.sent = 0
+        self.received = 0
+        self.begin = None
+
+    def __enter__(self):
+
+        self.begin = time.time()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+
+        recorder.record(self.transport, self.op, time.time() - self.begin,
+                        sent=self.sent, received=self.received,
+                        host=self.host, ok=exc_type is None)
+        return False
+
+
+def perf_rpc(op, transport='netconf'):
+    """ decorator recording a transport method taking keyword arguments """
+
+    def decorator(func):
+
+        @functools.wraps(func)
+        def wrapper(self, **kwargs):
+            if not perf_enabled():
+                return func(self, **kwargs)
+            with timed(transport, op, getattr(self, 'host', None)) as timer:
+                timer.sent = payload_size(kwargs)
+                reply = func(self, **kwargs)
+                timer.received = payload_size(reply)
+            return reply
+
+        return wrapper
+
+    return decorator
+
+
+def perf_results():
+    """ perf block for the module results, empty unless enabled """
+
+    if not PERF_RESULTS or not recorder.calls:
+        return dict()
+    return dict(perf=recorder.summary())
@@ -0,0 +1,302 @@
+# This code is part of Ansible, but is an independent component.
+# This particular file snippet, and this file snippet only, is BSD licensed.
+# Modules you write using this snippet, which is embedded dynamically by Ansible
+# still belong to the author of the module, and may assign their own license
+# to the complete work.
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#    * Redistributions of source code must retain the above copyright
+#      notice, this list of conditions and the following disclaimer.
+#    * Redistributions in binary form must reproduce the above copyright notice,
+#      this list of conditions and the following disclaimer in the documentation
+#      and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE
+# USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+"""
+Record and replay of device conversations for regression tests.
+
+ANSIBLE_CE_RECORD names a fixture file; every NETCONF RPC and every CLI
+command batch of a module run is appended to it as one JSON line holding
+the request and the reply or error.  ANSIBLE_CE_REPLAY names a fixture
+that is served instead of a device: no SSH session is opened and each
+request gets the reply recorded for the same request, in recorded order
+when the same request was made several times.  ANSIBLE_CE_REPLAY_LATENCY
+adds a delay in milliseconds to every replayed call.
+
+The commit label of a CLI config batch carries the time of the run, it is
+matched as any label and the replayed reply names the label requested.
+
+The running configuration cache and the NETCONF broker are bypassed in
+both modes so that a fixture holds the complete conversation.
+"""
+
+import fcntl
+import json
+import os
+import re
+import sys
+import time
+
+from ansible.module_utils.shell import ShellError, to_list
+from ansible.module_utils.ce_broker import CE_NC_RPC_ERROR, NetconfReply,\
+    rpc_error_xml
+
+
+RECORD_PATH = os.environ.get('ANSIBLE_CE_RECORD')
+REPLAY_PATH = os.environ.get('ANSIBLE_CE_REPLAY')
+REPLAY_LATENCY = float(os.environ.get('ANSIBLE_CE_REPLAY_LATENCY', 0))
+
+# manager methods carrying RPCs, everything else is passed through
+NETCONF_RPCS = ('get', 'get_config', 'edit_config', 'lock', 'unlock',
+                'validate', 'commit', 'discard_changes', 'action', 'cli')
+
+# checkpoint label of load_config, changes with every run
+CHECKPOINT_RE = re.compile(r'^commit label ansible_\d+$')
+CHECKPOINT_KEY = 'commit label ansible_<time>'
+
+
+class ReplayError(Exception):
+    """ the fixture holds no reply for a request """
+
+
+def record_enabled():
+    """ record_enabled """
+
+    return bool(RECORD_PATH) and not REPLAY_PATH
+
+
+def replay_enabled():
+    """ replay_enabled """
+
+    return bool(REPLAY_PATH)
+
+
+def fixture_active():
+    """ whether the device conversation is recorded or replayed """
+
+    return bool(RECORD_PATH or REPLAY_PATH)
+
+
+def request_key(transport, op, request):
+    """ key a reply is looked up by """
+
+    if transport == 'cli':
+        request = [CHECKPOINT_KEY if CHECKPOINT_RE.match(cmd) else cmd
+                   for cmd in request]
+    return json.dumps([transport, op, request], sort_keys=True)
+
+
+def checkpoint_label(commands):
+    """ checkpoint label a CLI batch commits with, or None """
+
+    for cmd in commands:
+        if CHECKPOINT_RE.match(cmd):
+            return cmd.split()[-1]
+    return None
+
+
+def write_entry(entry, path=None):
+    """ append one request/reply pair to the fixture """
+
+    with open(path or RECORD_PATH, 'a') as fhandle:
+        # modules of several hosts append to the same fixture
+        fcntl.flock(fhandle, fcntl.LOCK_EX)
+        fhandle.write(json.dumps(entry, sort_keys=True) + '\n')
+
+
+class Capabilities(list):
+    """ recorded capability URIs, understands the ncclient :shorthand """
+
+    def __contains__(self, key):
+
+        for uri in self:
+            if uri == key:
+                return True
+            if key.startswith(':') and 'capability%s:' % key in uri:
+                return True
+        return False
+
+
+class Fixture(object):
+    """ recorded request/reply pairs """
+
+    def __init__(self, path):
+
+        self.replies = dict()
+        self.served = dict()
+        self.capabilities = Capabilities()
+
+        with open(path) as fhandle:
+            for line in fhandle:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if entry['op'] == 'hello':
+                    if not self.capabilities:
+                        self.capabilities.extend(entry['reply'])
+                    continue
+                key = request_key(entry['transport'], entry['op'],
+                                  entry['request'])
+                self.replies.setdefault(key, list()).append(entry)
+
+    def reply(self, transport, op, request):
+        """ next recorded entry for a request, the last one repeats """
+
+        key = request_key(transport, op, request)
+        entries = self.replies.get(key)
+        if not entries:
+            raise ReplayError('no recorded reply for %s %s: %s'
+                              % (transport, op, json.dumps(request)))
+
+        index = self.served.get(key, 0)
+        self.served[key] = index + 1
+        if REPLAY_LATENCY:
+            time.sleep(REPLAY_LATENCY / 1000.0)
+        return entries[min(index, len(entries) - 1)]
+
+
+_FIXTURE = list()
+
+
+def get_fixture():
+    """ the replay fixture, loaded once per module run """
+
+    if not _FIXTURE:
+        _FIXTURE.append(Fixture(REPLAY_PATH))
+    return _FIXTURE[0]
+
+
+class RecordingManager(object):
+    """ wraps an ncclient manager and records the RPCs it carries """
+
+    def __init__(self, mc, host=None):
+
+        self.mc = mc
+        self.host = host
+        write_entry(dict(transport='netconf', op='hello', request=None,
+                         reply=list(mc.server_capabilities), host=host))
+
+    def __getattr__(self, name):
+
+        attr = getattr(self.mc, name)
+        if name not in NETCONF_RPCS:
+            return attr
+
+        from ncclient.operations.rpc import RPCError
+
+        def call(**kwargs):
+            entry = dict(transport='netconf', op=name, request=kwargs,
+                         host=self.host)
+            try:
+                reply = attr(**kwargs)
+            except RPCError:
+                exc = sys.exc_info()[1]
+                entry['error'] = rpc_error_xml(exc) or \
+                    CE_NC_RPC_ERROR % exc.message
+                write_entry(entry)
+                raise
+            entry['reply'] = reply.xml
+            write_entry(entry)
+            return reply
+
+        return call
+
+
+class ReplayManager(object):
+    """ stands in for an ncclient manager, replies come from the fixture """
+
+    def __init__(self, fixture):
+
+        self.fixture = fixture
+        self.server_capabilities = fixture.capabilities
+
+    def __getattr__(self, name):
+
+        if name not in NETCONF_RPCS:
+            raise AttributeError(name)
+
+        def call(**kwargs):
+            entry = self.fixture.reply('netconf', name, kwargs)
+            if entry.get('error'):
+                from ncclient.operations.rpc import RPCError
+                from ncclient.xml_ import to_ele
+                raise RPCError(to_ele(entry['error']))
+            return NetconfReply(entry.get('reply'))
+
+        return call
+
+    def close_session(self):
+        """ nothing to close """
+
+        return None
+
+
+class RecordingShell(object):
+    """ wraps a Shell and records the command batches it sends """
+
+    def __init__(self, shell, host=None):
+
+        self.shell = shell
+        self.host = host
+
+    def __getattr__(self, name):
+
+        return getattr(self.shell, name)
+
+    def send(self, commands):
+        """ send """
+
+        entry = dict(transport='cli', op='send', host=self.host,
+                     request=[str(cmd) for cmd in to_list(commands)])
+        try:
+            responses = self.shell.send(commands)
+        except ShellError:
+            exc = sys.exc_info()[1]
+            entry['error'] = str(exc)
+            if exc.command is not None:
+                entry['command'] = str(exc.command)
+            write_entry(entry)
+            raise
+        entry['reply'] = responses
+        write_entry(entry)
+        return responses
+
+
+class ReplayShell(object):
+    """ stands in for a Shell, responses come from the fixture """
+
+    def __init__(self, fixture):
+
+        self.fixture = fixture
+
+    def send(self, commands):
+        """ send """
+
+        commands = [str(cmd) for cmd in to_list(commands)]
+        entry = self.fixture.reply('cli', 'send', commands)
+        if 'error' in entry:
+            raise ShellError(entry['error'], command=entry.get('command'))
+
+        recorded = checkpoint_label(entry['request'])
+        label = checkpoint_label(commands)
+        if recorded == label:
+            return list(entry['reply'])
+        return [reply.replace(recorded, label) if reply else reply
+                for reply in entry['reply']]
+
+    def close(self):
+        """ nothing to close """
+
+        return None
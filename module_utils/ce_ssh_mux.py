@@ -0,0 +1,206 @@
+# This code is part of Ansible, but is an independent component.
+# This particular file snippet, and this file snippet only, is BSD licensed.
+# Modules you write using this snippet, which is embedded dynamically by Ansible
+# still belong to the author of the module, and may assign their own license
+# to the complete work.
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#    * Redistributions of source code must retain the above copyright
+#      notice, this list of conditions and the following disclaimer.
+#    * Redistributions in binary form must reproduce the above copyright notice,
+#      this list of conditions and the following disclaimer in the documentation
+#      and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE
+# USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+"""
+One SSH connection for the NETCONF and the CLI session of a module.
+
+Most modules talk NETCONF through get_netconf() and also open a CLI shell,
+which costs two SSH handshakes and two authentications per task.  With
+ANSIBLE_CE_SSH_MUX=1 the first of the two sessions opens an authenticated
+SSH connection to the device and both run on their own channel of it, the
+netconf subsystem and an interactive shell.  The connection is closed with
+the last session using it.
+
+Both sessions must reach the device on the same port, so the module port
+argument has to be set, NETCONF defaults to 830 and the CLI to 22.
+"""
+
+import os
+import threading
+
+from ansible.module_utils.ce_lazy import has_module
+from ansible.module_utils.ce_perf import timed
+
+# paramiko and ncclient are imported when the first connection is opened
+HAS_PARAMIKO = has_module('paramiko')
+
+
+SSH_MUX = os.environ.get('ANSIBLE_CE_SSH_MUX', '0') not in \
+    ('0', 'false', 'no', 'off', '')
+
+# seconds to wait for the device to end a NETCONF channel
+CLOSE_TIMEOUT = 10
+
+# connections of the current thread, by device and user
+_SHARED = threading.local()
+
+# SharedSSHSession, defined on first use
+_SESSION_CLASS = list()
+
+
+def mux_enabled():
+    """ mux_enabled """
+
+    return SSH_MUX and HAS_PARAMIKO
+
+
+class SharedTransport(object):
+    """ an authenticated SSH connection the sessions open channels on """
+
+    def __init__(self, key, client):
+
+        self.key = key
+        self.client = client
+        self.transport = client.get_transport()
+        self.refs = 0
+
+    def alive(self):
+        """ alive """
+
+        return self.transport is not None and self.transport.is_active()
+
+    def open_channel(self):
+        """ a new session channel """
+
+        return self.transport.open_session()
+
+    def release(self):
+        """ close the connection once the last session is gone """
+
+        self.refs -= 1
+        if self.refs > 0 or self.transport is None:
+            return
+        shared = getattr(_SHARED, 'transports', None)
+        if shared is not None and shared.get(self.key) is self:
+            del shared[self.key]
+        self.transport = None
+        self.client.close()
+
+
+def get_shared_transport(host, port, username, password=None,
+                         key_filename=None, timeout=30):
+    """ the connection to a device, opened on first use """
+
+    key = (host, port, username)
+    shared = getattr(_SHARED, 'transports', None)
+    if shared is None:
+        shared = _SHARED.transports = dict()
+
+    entry = shared.get(key)
+    if entry is None or not entry.alive():
+        import paramiko
+        with timed('ssh', 'connect', host):
+            client = paramiko.SSHClient()
+            client.load_system_host_keys()
+            client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+            client.connect(host, port=port, username=username,
+                           password=password, key_filename=key_filename,
+                           timeout=timeout, allow_agent=False,
+                           look_for_keys=password is None)
+        entry = shared[key] = SharedTransport(key, client)
+    entry.refs += 1
+    return entry
+
+
+def shared_session_class():
+    """ the ncclient SSHSession subclass running on a shared connection """
+
+    if _SESSION_CLASS:
+        return _SESSION_CLASS[0]
+
+    from ncclient.transport.ssh import SSHSession
+
+    class SharedSSHSession(SSHSession):
+        """ NETCONF session on a channel of a shared connection """
+
+        _shared = None
+
+        def open(self, shared):
+            """ start the netconf subsystem on a new channel and say hello """
+
+            self._shared = shared
+            self._transport = shared.transport
+            self._connected = True
+            self._channel = shared.open_channel()
+            self._channel_id = self._channel.get_id()
+            self._channel.set_name('netconf-subsystem-%s' % self._channel_id)
+            self._channel.invoke_subsystem('netconf')
+            self._channel_name = self._channel.get_name()
+            self._post_connect()
+            if hasattr(self._device_handler, 'get_xml_parser'):
+                self.parser = self._device_handler.get_xml_parser(self)
+
+        def close(self):
+            """ close the channel, the connection stays up for the other
+            sessions on it """
+
+            closing = getattr(self, '_closing', None)
+            if closing is not None:
+                closing.set()
+            # the device ends the channel after close-session, the session
+            # thread only notices that, not a channel closed on this side
+            if self.is_alive() and self is not threading.current_thread():
+                self.join(CLOSE_TIMEOUT)
+            if self._channel:
+                self._channel.close()
+            self._channel = None
+            self._connected = False
+
+            shared, self._shared = self._shared, None
+            if shared:
+                shared.release()
+
+    _SESSION_CLASS.append(SharedSSHSession)
+    return SharedSSHSession
+
+
+def connect_netconf(shared, device_params, timeout=30):
+    """ NETCONF manager on a channel of a shared connection """
+
+    from ncclient import manager
+
+    device_handler = manager.make_device_handler(device_params)
+    session = shared_session_class()(device_handler)
+    try:
+        session.open(shared)
+    except Exception:
+        session.close()
+        raise
+    return manager.Manager(session, device_handler, timeout=timeout)
+
+
+def open_shell(shared, timeout):
+    """ interactive shell channel on a shared connection """
+
+    channel = shared.open_channel()
+    try:
+        channel.get_pty('vt100', 80, 24)
+        channel.invoke_shell()
+        channel.settimeout(timeout)
+    except Exception:
+        channel.close()
+        raise
+    return channel
@@ -0,0 +1,200 @@
+# This code is part of Ansible, but is an independent component.
+# This particular file snippet, and this file snippet only, is BSD licensed.
+# Modules you write using this snippet, which is embedded dynamically by Ansible
+# still belong to the author of the module, and may assign their own license
+# to the complete work.
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#    * Redistributions of source code must retain the above copyright
+#      notice, this list of conditions and the following disclaimer.
+#    * Redistributions in binary form must reproduce the above copyright notice,
+#      this list of conditions and the following disclaimer in the documentation
+#      and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE
+# USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+"""
+VLAN sets of CloudEngine modules.
+
+The device encodes a set of VLANs as a bitmap of 1024 hex digits, 4096
+bits with the most significant bit of the first digit standing for VLAN 0,
+in leaves such as trunkVlans, vlanList and ceVids, and in the vlan batch
+actions.  VlanSet keeps the set as one Python int in that bit order, so
+membership, set algebra and bitmap encoding are single int operations and
+a range such as 2-4094 is parsed without walking its VLANs.
+"""
+
+# bits of a bitmap
+VLAN_BITS = 4096
+VLAN_ALL = (1 << VLAN_BITS) - 1
+VLAN_MIN = 1
+VLAN_MAX = 4094
+
+INVALID_FORMAT = 'Format of vlanid is invalid.'
+INVALID_RANGE = 'Vlan id is not in the range from 1 to 4094.'
+
+
+def vlan_bit(vid):
+    """ bit of a VLAN id """
+
+    return 1 << (VLAN_BITS - 1 - vid)
+
+
+def to_vid(value):
+    """ VLAN id of an int or a string, ValueError unless it is 1 to 4094 """
+
+    value = str(value).strip()
+    if not value.isdigit():
+        raise ValueError(INVALID_FORMAT)
+    value = int(value)
+    if value < VLAN_MIN or value > VLAN_MAX:
+        raise ValueError(INVALID_RANGE)
+    return value
+
+
+class VlanSet(object):
+    """ set of VLAN ids backed by the bitmap of the device """
+
+    __slots__ = ('bits',)
+
+    def __init__(self, vlans=None, bits=0):
+
+        self.bits = bits
+        for vid in vlans or ():
+            self.bits |= vlan_bit(to_vid(vid))
+
+    @classmethod
+    def from_range(cls, vlan_range):
+        """ set of a range such as "2-10,20", ValueError when invalid """
+
+        bits = 0
+        for region in str(vlan_range).split(','):
+            bounds = region.split('-')
+            if len(bounds) > 2:
+                raise ValueError(INVALID_FORMAT)
+            start, end = to_vid(bounds[0]), to_vid(bounds[-1])
+            if start > end:
+                raise ValueError(INVALID_FORMAT)
+            bits |= ((1 << (end - start + 1)) - 1) << (VLAN_BITS - 1 - end)
+        return cls(bits=bits)
+
+    @classmethod
+    def from_bitmap(cls, bitmap):
+        """ set of a hex bitmap, shorter bitmaps hold the lowest VLANs """
+
+        if not bitmap:
+            return cls()
+        bitmap = bitmap.strip()
+        if len(bitmap) > VLAN_BITS // 4:
+            raise ValueError('Vlan bitmap is invalid.')
+        return cls(bits=int(bitmap, 16) << (VLAN_BITS - 4 * len(bitmap)))
+
+    def to_bitmap(self):
+        """ 1024 hex digit bitmap """
+
+        return '%01024x' % self.bits
+
+    def to_list(self):
+        """ ascending VLAN ids as strings """
+
+        if not self.bits:
+            return list()
+        digits = format(self.bits, '0%db' % VLAN_BITS)
+        return [str(vid) for vid, bit in enumerate(digits) if bit == '1']
+
+    def to_range(self, sep=',', dash='-'):
+        """ compact range such as "2-10,20", sep=' ', dash=' to ' gives
+        the CLI form """
+
+        regions = list()
+        start = prev = None
+        for vid in self:
+            if prev is not None and vid == prev + 1:
+                prev = vid
+                continue
+            if start is not None:
+                regions.append((start, prev))
+            start = prev = vid
+        if start is not None:
+            regions.append((start, prev))
+        return sep.join(str(low) if low == high else '%d%s%d' % (low, dash, high)
+                        for low, high in regions)
+
+    def complement(self):
+        """ every bit of the bitmap not in the set """
+
+        return VlanSet(bits=~self.bits & VLAN_ALL)
+
+    def add(self, vid):
+        """ add a VLAN """
+
+        self.bits |= vlan_bit(to_vid(vid))
+
+    def discard(self, vid):
+        """ remove a VLAN if present """
+
+        self.bits &= ~vlan_bit(to_vid(vid))
+
+    def union(self, other):
+        """ union """
+
+        return VlanSet(bits=self.bits | other.bits)
+
+    def intersection(self, other):
+        """ intersection """
+
+        return VlanSet(bits=self.bits & other.bits)
+
+    def difference(self, other):
+        """ difference """
+
+        return VlanSet(bits=self.bits & ~other.bits)
+
+    __or__ = union
+    __and__ = intersection
+    __sub__ = difference
+
+    def __contains__(self, vid):
+
+        try:
+            return bool(self.bits & vlan_bit(to_vid(vid)))
+        except ValueError:
+            return False
+
+    def __iter__(self):
+
+        for vid in self.to_list():
+            yield int(vid)
+
+    def __len__(self):
+
+        return bin(self.bits).count('1')
+
+    def __bool__(self):
+
+        return bool(self.bits)
+
+    __nonzero__ = __bool__
+
+    def __eq__(self, other):
+
+        return isinstance(other, VlanSet) and self.bits == other.bits
+
+    def __ne__(self, other):
+
+        return not self == other
+
+    def __repr__(self):
+
+        return 'VlanSet(%r)' % self.to_range()
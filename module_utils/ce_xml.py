@@ -0,0 +1,160 @@
+# This code is part of Ansible, but is an independent component.
+# This particular file snippet, and this file snippet only, is BSD licensed.
+# Modules you write using this snippet, which is embedded dynamically by Ansible
+# still belong to the author of the module, and may assign their own license
+# to the complete work.
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#    * Redistributions of source code must retain the above copyright
+#      notice, this list of conditions and the following disclaimer.
+#    * Redistributions in binary form must reproduce the above copyright notice,
+#      this list of conditions and the following disclaimer in the documentation
+#      and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE
+# USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+
+"""
+Streaming parser for NETCONF replies of CloudEngine switches.
+
+Modules used to strip line breaks and namespace declarations from the
+reply with str.replace and build the whole document with fromstring,
+which keeps several copies of large get replies in memory.  The
+functions here feed the reply to an incremental parser, match elements
+by their local names so no namespace handling is needed, hand every
+record found at the requested path to the caller as a dict and drop it
+again, so only one record is held at a time.
+
+Paths are relative to rpc-reply, e.g. "data/vlan/vlans/vlan".
+"""
+
+from io import BytesIO
+from xml.etree import ElementTree
+
+from ansible.module_utils.ce_perf import timed
+
+# characters fed to the parser per step
+CHUNK_SIZE = 65536
+
+
+def local_name(tag):
+    """ tag without namespace """
+
+    if tag[:1] == '{':
+        return tag.split('}', 1)[1]
+    return tag
+
+
+def to_record(elem):
+    """ element to dict of child name -> text, nested elements become
+        dicts and repeated elements lists """
+
+    record = dict()
+    for child in elem:
+        name = local_name(child.tag)
+        if len(child):
+            value = to_record(child)
+        else:
+            value = child.text
+        if name not in record:
+            record[name] = value
+        elif isinstance(record[name], list):
+            record[name].append(value)
+        else:
+            record[name] = [record[name], value]
+    return record
+
+
+def iter_events(xmlstr):
+    """ (event, element) pairs of the reply """
+
+    if hasattr(ElementTree, 'XMLPullParser'):
+        parser = ElementTree.XMLPullParser(events=('start', 'end'))
+        for pos in range(0, len(xmlstr), CHUNK_SIZE):
+            parser.feed(xmlstr[pos:pos + CHUNK_SIZE])
+            for event in parser.read_events():
+                yield event
+        parser.close()
+        for event in parser.read_events():
+            yield event
+    else:
+        if not isinstance(xmlstr, bytes):
+            xmlstr = xmlstr.encode('utf-8')
+        for event in ElementTree.iterparse(BytesIO(xmlstr),
+                                           events=('start', 'end')):
+            yield event
+
+
+def iter_records(xmlstr, *paths):
+    """ yield (path, record) for every element found at one of paths """
+
+    targets = dict()
+    containers = set()
+    for path in paths:
+        names = tuple(path.strip('/').split('/'))
+        targets[names] = path
+        for index in range(1, len(names)):
+            containers.add(names[:index])
+
+    names = list()
+    elems = list()
+    for event, elem in iter_events(xmlstr):
+        if event == 'start':
+            names.append(local_name(elem.tag))
+            elems.append(elem)
+            continue
+
+        # names[0] is rpc-reply, paths start below it
+        current = tuple(names[1:])
+        if current in targets:
+            yield targets[current], to_record(elem)
+
+        keep = current in containers or not current
+        if not keep:
+            for index in range(1, len(current)):
+                if current[:index] in targets:
+                    keep = True
+                    break
+        if not keep:
+            elem.clear()
+            elems[-2].remove(elem)
+        names.pop()
+        elems.pop()
+
+
+def find_records(xmlstr, path):
+    """ list of records found at path """
+
+    with timed('xml', 'parse') as timer:
+        timer.received = len(xmlstr)
+        return [record for _, record in iter_records(xmlstr, path)]
+
+
+def find_record(xmlstr, path):
+    """ first record found at path, None if there is none """
+
+    for _, record in iter_records(xmlstr, path):
+        return record
+    return None
+
+
+def group_records(xmlstr, *paths):
+    """ dict of path -> list of records, one pass for all paths """
+
+    result = dict((path, list()) for path in paths)
+    with timed('xml', 'parse') as timer:
+        timer.received = len(xmlstr)
+        for path, record in iter_records(xmlstr, *paths):
+            result[path].append(record)
+    return result
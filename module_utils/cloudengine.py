@@ -31,14 +31,24 @@ from ansible.module_utils.basic import json, get_exception
 from ansible.module_utils.network import NetworkError
 from ansible.module_utils.network import add_argument,\
     register_transport, to_list
-from ansible.module_utils.shell import CliBase, ShellError
-
-try:
-    from ncclient import manager
-    HAS_NCCLIENT = True
-except ImportError:
-    HAS_NCCLIENT = False
-    pass
+from ansible.module_utils.shell import CliBase, Shell, ShellError
+from ansible.module_utils.ce_cache import cache_enabled, get_cache_path,\
+    parse_commit_id, read_cache, write_cache, parse_filters, filter_config
+from ansible.module_utils.ce_config_tree import ConfigTree
+from ansible.module_utils.ce_broker import BrokerError, broker_enabled,\
+    get_broker_netconf
+from ansible.module_utils.ce_governor import acquire_slot, retry_connect,\
+    retry_contention
+from ansible.module_utils.ce_lazy import has_module, loaded
+from ansible.module_utils.ce_perf import payload_size, perf_rpc, timed
+from ansible.module_utils.ce_replay import RecordingManager, RecordingShell,\
+    ReplayManager, ReplayShell, fixture_active, get_fixture,\
+    record_enabled, replay_enabled
+from ansible.module_utils.ce_ssh_mux import connect_netconf,\
+    get_shared_transport, mux_enabled, open_shell
+
+# ncclient is imported when the first NETCONF session is opened
+HAS_NCCLIENT = has_module('ncclient')
 
 
 add_argument('use_ssl', dict(default=False, type='bool'))
@@ -57,14 +67,24 @@ class CeConfigMixin(object):
     def get_config(self, include_defaults=False, include_all=False, regular="", **kwargs):
         """ get_config """
 
-        cmd = 'display current-configuration '
-        if include_all:
-            cmd += ' all'
-        if include_defaults:
-            cmd += ' include-default'
-        if regular:
-            cmd += ' ' + regular
-        cfg = self.execute([cmd])[0]
+        cfg = None
+        filters = None
+        if cache_enabled() and not fixture_active():
+            filters = parse_filters(regular)
+        if filters is not None:
+            cfg = self.get_cached_config(include_defaults, include_all)
+            if cfg is not None:
+                cfg = filter_config(cfg, filters)
+
+        if cfg is None:
+            cmd = 'display current-configuration '
+            if include_all:
+                cmd += ' all'
+            if include_defaults:
+                cmd += ' include-default'
+            if regular:
+                cmd += ' ' + regular
+            cfg = self.execute([cmd])[0]
         if not include_defaults:
             return cfg
 
@@ -81,28 +101,92 @@ class CeConfigMixin(object):
             cfg = '\n'.join(cmds)
         return cfg
 
+    def get_cached_config(self, include_defaults=False, include_all=False):
+        """ unfiltered running configuration, served from the host cache
+            while the latest commit id is unchanged """
+
+        cache_params = getattr(self, 'cache_params', None)
+        if not cache_params:
+            return None
+
+        variant = 'all' if include_all else 'current'
+        if include_defaults:
+            variant += '-default'
+        configs = self.__dict__.setdefault('configs', dict())
+        if variant in configs:
+            return configs[variant]
+
+        commit_id = getattr(self, 'commit_id', None)
+        if commit_id is None:
+            commit_id = parse_commit_id(
+                self.execute(['display configuration commit list 1'])[0])
+            if commit_id is None:
+                return None
+            self.commit_id = commit_id
+
+        path = get_cache_path(cache_params[0], cache_params[1], variant)
+        cfg = read_cache(path, commit_id)
+        if cfg is None:
+            cmd = 'display current-configuration '
+            if include_all:
+                cmd += ' all'
+            if include_defaults:
+                cmd += ' include-default'
+            cfg = self.execute([cmd])[0]
+            write_cache(path, commit_id, cfg)
+        configs[variant] = cfg
+        return cfg
+
+    def get_config_tree(self, include_defaults=False, include_all=False):
+        """ running configuration parsed into an indexed tree """
+
+        variant = (include_defaults, include_all)
+        trees = self.__dict__.setdefault('trees', dict())
+        if variant not in trees:
+            trees[variant] = ConfigTree(self.get_config(
+                include_defaults=include_defaults, include_all=include_all))
+        return trees[variant]
+
+    def invalidate_config(self):
+        """ forget the cached commit id after a configuration change """
+
+        self.commit_id = None
+        self.configs = dict()
+        self.trees = dict()
+
     def load_config(self, config):
-        """ load_config """
+        """ load config with a two-stage commit labelled as checkpoint, the
+        id of the commit is read in the same exchange """
 
         checkpoint = 'ansible_%s' % int(time.time())
+        commands = ['system-view']
+        commands.extend(to_list(config))
+        commands.extend(['commit label %s' % checkpoint, 'return',
+                         'display configuration commit list 1'])
+        self.invalidate_config()
         try:
-            self.execute(['system-view immediately',
-                          'commit label %s' % checkpoint], output='text')
-        except TypeError:
-            self.execute(['system-view immediately',
-                          'commit label %s' % checkpoint])
-        except Exception:
+            responses = self.execute(commands)
+        except NetworkError:
+            self.abort_config()
             raise
 
+        # the latest commit is the checkpoint unless nothing was changed
+        self.last_checkpoint = None
+        match = re.search(r'^\s*\d+\s+(\d{10})\s+%s\s' % checkpoint,
+                          responses[-1] or '', re.M)
+        if match is not None:
+            self.last_checkpoint = match.group(1)
+        # the commit is also the key of the running configuration cache
+        self.commit_id = parse_commit_id(responses[-1])
+        return responses[1:-3]
+
+    def abort_config(self):
+        """ discard uncommitted configuration and return to user view """
+
         try:
-            try:
-                self.configure(config)
-            except (NetworkError, Exception):
-                self.load_checkpoint(checkpoint)
-                self.clear_checkpoint(checkpoint)
-                raise
-        finally:
-            self.clear_checkpoint(checkpoint)
+            self.execute(['abort'])
+        except NetworkError:
+            pass
 
     def save_config(self, **kwargs):
         """ save_config """
@@ -112,37 +196,6 @@ class CeConfigMixin(object):
         except TypeError:
             self.execute(['return', 'save'])
 
-    def load_checkpoint(self, checkpoint):
-        """ load_checkpoint """
-
-        try:
-            self.execute(
-                ['return', 'rollback configuration to '
-                           'label %s' % checkpoint], output='text')
-        except TypeError:
-            self.execute(
-                ['return', 'rollback configuration to'
-                           ' label %s' % checkpoint])
-        pass
-
-    def clear_checkpoint(self, checkpoint):
-        """ clear checkpoint """
-
-        # get commit id and clear it
-        responses = self.execute(
-            'display configuration commit list '
-            'label | include %s' % checkpoint)
-        match = re.match(
-            r'[\r\n]?\d+\s+(\d{10})\s+ansible.*', responses[0])
-        if match is not None:
-            try:
-                self.execute(['return',
-                              'clear configuration commit %s '
-                              'label' % match.group(1)], output='text')
-            except TypeError:
-                self.execute(['return',
-                              'clear configuration commit %s '
-                              'label' % match.group(1)])
 
 class Netconf(object):
     """ Netconf """
@@ -153,34 +206,204 @@ class Netconf(object):
             raise Exception("the ncclient library is required")
 
         self.mc = None
+        self.slot = None
+        self.target = 'running'
 
         host = kwargs["host"]
         port = kwargs["port"]
         username = kwargs["username"]
         password = kwargs["password"]
+        self.host = host
+
+        if replay_enabled():
+            with timed('netconf', 'connect', host):
+                self.mc = ReplayManager(get_fixture())
+            return
 
-        self.mc = manager.connect(host=host, port=port,
-                                  username=username,
-                                  password=password,
-                                  unknown_host_cb=ce_unknown_host_cb,
-                                  allow_agent=False,
-                                  look_for_keys=False,
-                                  hostkey_verify=False,
-                                  device_params={'name': 'huawei'},
-                                  timeout=30)
+        # queue for a session slot of the device, the slot is held
+        # until the session is closed
+        self.slot = acquire_slot(host, port)
+        try:
+            self.mc = retry_connect(lambda: self.connect(host, port, username,
+                                                         password),
+                                    host, port or 830)
+        except Exception:
+            self.release_slot()
+            raise
+        if record_enabled():
+            self.mc = RecordingManager(self.mc, host)
+
+    def connect(self, host, port, username, password):
+        """ open the NETCONF session """
+
+        if mux_enabled():
+            shared = get_shared_transport(host, port or 830, username,
+                                          password)
+            with timed('netconf', 'connect', host):
+                return connect_netconf(shared, {'name': 'huawei'}, timeout=30)
+
+        from ncclient import manager
+        with timed('netconf', 'connect', host):
+            return manager.connect(host=host, port=port,
+                                   username=username,
+                                   password=password,
+                                   unknown_host_cb=ce_unknown_host_cb,
+                                   allow_agent=False,
+                                   look_for_keys=False,
+                                   hostkey_verify=False,
+                                   device_params={'name': 'huawei'},
+                                   timeout=30)
+
+    def concurrent(self):
+        """ whether RPCs may be sent from several threads at once, an
+        ncclient session matches replies to requests by message-id while
+        fixtures are recorded and replayed in request order """
+
+        manager = loaded('ncclient.manager')
+        return manager is not None and isinstance(self.mc, manager.Manager)
+
+    def release_slot(self):
+        """ give the session slot of the device back """
+
+        slot, self.slot = self.slot, None
+        if slot:
+            slot.release()
+
+    def close(self):
+        """ close the session and give its slot back """
+
+        mc, self.mc = self.mc, None
+        try:
+            if mc:
+                mc.close_session()
+        finally:
+            self.release_slot()
 
     def __del__(self):
 
-        self.mc.close_session()
+        self.close()
 
+    @retry_contention
+    @perf_rpc('edit-config')
     def set_config(self, **kwargs):
         """ set_config """
 
         confstr = kwargs["config"]
-        con_obj = self.mc.edit_config(target='running', config=confstr)
+        target = kwargs.get("target", self.target)
+        con_obj = self.mc.edit_config(target=target, config=confstr)
+
+        return con_obj
+
+    @retry_contention
+    @perf_rpc('lock')
+    def lock(self, **kwargs):
+        """ lock a datastore """
+
+        target = kwargs.get("target", "candidate")
+        con_obj = self.mc.lock(target=target)
+
+        return con_obj
+
+    @retry_contention
+    @perf_rpc('unlock')
+    def unlock(self, **kwargs):
+        """ unlock a datastore """
+
+        target = kwargs.get("target", "candidate")
+        con_obj = self.mc.unlock(target=target)
+
+        return con_obj
+
+    @retry_contention
+    @perf_rpc('validate')
+    def validate(self, **kwargs):
+        """ validate a datastore """
+
+        source = kwargs.get("source", "candidate")
+        con_obj = self.mc.validate(source=source)
+
+        return con_obj
+
+    @retry_contention
+    @perf_rpc('commit')
+    def commit(self, **kwargs):
+        """ commit the candidate datastore, a confirmed commit is rolled
+        back by the device unless confirmed before the timeout """
+
+        args = dict()
+        if kwargs.get("confirmed"):
+            args["confirmed"] = True
+            if kwargs.get("timeout"):
+                args["timeout"] = str(kwargs["timeout"])
+            if kwargs.get("persist"):
+                args["persist"] = kwargs["persist"]
+        if kwargs.get("persist_id"):
+            args["persist_id"] = kwargs["persist_id"]
+        con_obj = self.mc.commit(**args)
+
+        return con_obj
+
+    @retry_contention
+    @perf_rpc('discard-changes')
+    def discard_changes(self, **kwargs):
+        """ discard uncommitted candidate changes """
+
+        con_obj = self.mc.discard_changes()
+
+        return con_obj
+
+    def start_transaction(self, **kwargs):
+        """ stage following set_config calls in the locked candidate,
+        stays on running when the device has no usable candidate """
+
+        if self.target == 'candidate':
+            return True
+        if ':candidate' not in self.mc.server_capabilities:
+            return False
+
+        from ncclient.operations.rpc import RPCError
+
+        # the lock is refused while the candidate holds foreign changes
+        try:
+            self.lock(target='candidate', retry=False)
+        except RPCError:
+            return False
+
+        self.target = 'candidate'
+        return True
+
+    def commit_transaction(self, **kwargs):
+        """ commit the staged changes once """
+
+        if self.target != 'candidate':
+            return None
+
+        from ncclient.operations.rpc import RPCError
+        try:
+            con_obj = self.commit(**kwargs)
+        except RPCError:
+            self.abort_transaction()
+            raise
+
+        self.target = 'running'
+        self.unlock(target='candidate')
 
         return con_obj
 
+    def abort_transaction(self, **kwargs):
+        """ drop the staged changes """
+
+        if self.target != 'candidate':
+            return
+
+        self.target = 'running'
+        try:
+            self.discard_changes()
+        finally:
+            self.unlock(target='candidate')
+
+    @retry_contention
+    @perf_rpc('get')
     def get_config(self, **kwargs):
         """ get_config """
 
@@ -189,6 +412,8 @@ class Netconf(object):
 
         return con_obj
 
+    @retry_contention
+    @perf_rpc('execute-action')
     def execute_action(self, **kwargs):
         """huawei execute-action"""
 
@@ -197,6 +422,8 @@ class Netconf(object):
 
         return con_obj
 
+    @retry_contention
+    @perf_rpc('execute-cli')
     def execute_cli(self, **kwargs):
         """huawei execute-cli"""
 
@@ -206,9 +433,87 @@ class Netconf(object):
         return con_obj
 
 
+def strip_xml_wrapper(xmlstr, tag):
+    """ remove the outer <config> or <filter> element of a CE_NC_* template """
+
+    match = re.match(r'\s*<%s(?:\s[^>]*)?>(.*)</%s>\s*$' % (tag, tag),
+                     xmlstr, re.S)
+    if match:
+        return match.group(1)
+    return xmlstr
+
+
+def build_filter_xml(*filters):
+    """ merge several subtree filters into one get filter """
+
+    xmlstr = ''.join(strip_xml_wrapper(flt, 'filter') for flt in filters)
+    return '<filter type="subtree">' + xmlstr + '</filter>'
+
+
+class ConfigBatch(object):
+    """
+    Collects CE_NC_* config payloads and applies them in one edit-config.
+    """
+
+    def __init__(self):
+        self.items = list()
+
+    def __len__(self):
+        return len(self.items)
+
+    def add(self, name, xmlstr):
+        """ add a payload, with or without its <config> element """
+
+        self.items.append((name, strip_xml_wrapper(xmlstr, 'config')))
+
+    def names(self):
+        """ names of the queued payloads """
+
+        return [item[0] for item in self.items]
+
+    def to_xml(self):
+        """ single <config> payload """
+
+        return '<config>' + ''.join(item[1] for item in self.items) + '</config>'
+
+    def apply(self, netconf, target='running', **kwargs):
+        """ send the batch, committing once when the target is candidate,
+        kwargs are the confirmed commit options of Netconf.commit """
+
+        if target != 'candidate':
+            return netconf.set_config(config=self.to_xml(), target=target)
+
+        if not netconf.start_transaction():
+            raise NetworkError('candidate datastore is not available')
+        try:
+            con_obj = netconf.set_config(config=self.to_xml())
+        except Exception:
+            netconf.abort_transaction()
+            raise
+        if "<ok/>" not in con_obj.xml:
+            netconf.abort_transaction()
+            return con_obj
+
+        return netconf.commit_transaction(**kwargs)
+
+
+def get_config_tree(module, include_defaults=False, include_all=False):
+    """ running configuration of the module's CLI connection as ConfigTree """
+
+    return module.config.connection.get_config_tree(
+        include_defaults=include_defaults, include_all=include_all)
+
+
 def get_netconf(**kwargs):
     """ get_netconf """
 
+    if broker_enabled() and not fixture_active():
+        try:
+            return get_broker_netconf(Netconf, **kwargs)
+        except (BrokerError, OSError, IOError):
+            # fall back to a private session
+            pass
+
     return Netconf(**kwargs)
 
 
@@ -237,16 +542,74 @@ class Cli(CeConfigMixin, CliBase):
 
     NET_PASSWD_RE = re.compile(r"[\r\n]?password: $", re.I)
 
+    # SSH connection shared with the NETCONF session, see ce_ssh_mux
+    shared = None
+
     def connect(self, params, **kwargs):
         """ connect """
 
-        super(Cli, self).connect(params, kickstart=False, **kwargs)
-        self.shell.send('screen-length 0 temporary')
-        self.shell.send('mmi-mode enable')
+        host = params['host']
+        port = params.get('port') or 22
+        if mux_enabled() and not replay_enabled():
+            try:
+                self.shared = get_shared_transport(
+                    host, port, params['username'], params.get('password'),
+                    params.get('ssh_keyfile'), params['timeout'])
+            except Exception:
+                exc = get_exception()
+                raise NetworkError(msg='failed to connect to %s:%s'
+                                   % (host, port), exc=str(exc))
+
+        with timed('cli', 'connect', host):
+            if replay_enabled():
+                self.shell = ReplayShell(get_fixture())
+                self._connected = True
+            else:
+                if self.shared:
+                    self.open_shared_shell(params)
+                else:
+                    super(Cli, self).connect(params, kickstart=False, **kwargs)
+                if record_enabled():
+                    self.shell = RecordingShell(self.shell, host)
+            self.shell.send('screen-length 0 temporary')
+            self.shell.send('mmi-mode enable')
+        self.cache_params = (host, port)
+
+    def open_shared_shell(self, params):
+        """ CLI shell on a channel of the shared SSH connection """
+
+        try:
+            self.shell = Shell(kickstart=False,
+                               prompts_re=self.CLI_PROMPTS_RE,
+                               errors_re=self.CLI_ERRORS_RE)
+            self.shell.shell = open_shell(self.shared, params['timeout'])
+            self.shell.receive()
+        except Exception:
+            exc = get_exception()
+            shared, self.shared = self.shared, None
+            shared.release()
+            raise NetworkError(msg='failed to connect to %s:%s'
+                               % (params['host'], params.get('port') or 22),
+                               exc=str(exc))
+        self._connected = True
+
+    def disconnect(self):
+        """ disconnect """
+
+        try:
+            super(Cli, self).disconnect()
+        finally:
+            shared, self.shared = self.shared, None
+            if shared:
+                shared.release()
 
     def execute(self, commands):
         try:
-            return self.shell.send(commands)
+            with timed('cli', 'execute', self.cache_params[0]) as timer:
+                responses = self.shell.send(commands)
+                timer.sent = payload_size([str(cmd) for cmd in to_list(commands)])
+                timer.received = payload_size(responses)
+            return responses
         except ShellError:
             exc = get_exception()
             cmd = ""
@@ -263,6 +626,8 @@ class Cli(CeConfigMixin, CliBase):
         """ run_commands """
 
         cmds = list(prepare_commands(commands))
+        if [cmd for cmd in cmds if str(cmd).startswith('system-view')]:
+            self.invalidate_config()
         responses = self.execute(cmds)
         for index, cmd in enumerate(commands):
             raw = cmd.args.get('raw') or False
@@ -280,6 +645,7 @@ class Cli(CeConfigMixin, CliBase):
         """ configure """
 
         commands = prepare_config(commands)
+        self.invalidate_config()
         responses = self.execute(commands)
         responses.pop(0)
         return responses
@@ -287,6 +653,46 @@ class Cli(CeConfigMixin, CliBase):
 Cli = register_transport('cli', default=True)(Cli)
 
 
+class NetconfTransport(object):
+    """ transport of modules talking NETCONF only, no CLI session is
+    opened and the NETCONF session comes from get_netconf() """
+
+    def __init__(self):
+
+        self._connected = False
+        self.params = None
+
+    def connect(self, params, **kwargs):
+        """ connect """
+
+        self.params = params
+        self._connected = True
+
+    def authorize(self, params, **kwargs):
+        """ authorize """
+
+        pass
+
+    def disconnect(self):
+        """ disconnect """
+
+        self._connected = False
+
+    def run_commands(self, commands):
+        """ run_commands """
+
+        raise NetworkError(msg='CLI commands are not supported over the '
+                               'netconf transport', commands=commands)
+
+    def configure(self, commands, **kwargs):
+        """ configure """
+
+        raise NetworkError(msg='CLI commands are not supported over the '
+                               'netconf transport', commands=commands)
+
+NetconfTransport = register_transport('netconf')(NetconfTransport)
+
+
 def prepare_config(commands):
     """ prepare_config """
 
@@ -0,0 +1,538 @@
+#!/usr/bin/env python
+#
+# This file is part of Ansible
+#
+# Ansible is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Ansible is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Ansible.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+"""
+Benchmark of CloudEngine modules against the offline simulator.
+
+Every scenario seeds a simulated device with a number of objects (1, 100
+and 1000 by default), runs one library module against it the way Ansible
+does, in its own interpreter with the arguments in a file, and reports
+
+    rpcs    NETCONF RPCs and CLI command batches the module sent
+    wall    wall clock time of the module process
+    cpu     user and system CPU time of the module process
+    rss     peak resident set size of the module process
+    parse   time spent decoding replies, as reported by the perf block
+
+Times are the median of --repeat runs, each run gets a freshly seeded
+device.  A replay scenario records one run against the simulator and
+measures the runs replayed from that fixture, a second later so that the
+commit label of a config change differs from the recorded one.  --save writes the results as a baseline, --baseline compares
+against one and exits non-zero when the RPC count grows or a time or the
+RSS grows by more than --tolerance.
+
+--startup measures the startup of every library module instead, the time
+a fresh interpreter takes to import it and the transport libraries the
+import pulled in.  Saved as a baseline it is the startup budget of each
+module: a later run fails when a module starts slower than --tolerance
+allows or imports a transport library it did not import before.
+
+The interpreter given with --python must be able to import ansible with
+the module_utils of this repository installed, see INSTALLATION in
+README.md.
+
+    python utils/ce_benchmark.py --scales 1,100,1000 --save baseline.json
+    python utils/ce_benchmark.py --baseline baseline.json
+    python utils/ce_benchmark.py --startup --save startup.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from xml.etree import ElementTree
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import ce_simulator
+from ce_simulator import qname
+
+LIBRARY = os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), 'library')
+
+# libraries a module should only import once it opens a transport
+TRANSPORT_LIBRARIES = ('ncclient', 'lxml', 'paramiko', 'scp')
+
+# run by --python, imports a module without running it
+STARTUP_PROBE = """
+import json, sys, time
+start = time.time()
+sys.path.insert(0, sys.argv[1])
+__import__(sys.argv[2])
+elapsed = time.time() - start
+print(json.dumps(dict(startup=elapsed, imports=sorted(
+    name for name in sys.argv[3:] if name in sys.modules))))
+"""
+
+
+def sub(parent, tag, text=None):
+    """ add a vrp element """
+
+    elem = ElementTree.SubElement(parent, qname(tag))
+    if text is not None:
+        elem.text = text
+    return elem
+
+
+def seed_vlans(count):
+    """ vlans 2 .. count + 1 """
+
+    config = ElementTree.Element(qname('config', ce_simulator.NC_NS))
+    vlans = sub(sub(config, 'vlan'), 'vlans')
+    for vid in range(2, count + 2):
+        vlan = sub(vlans, 'vlan')
+        sub(vlan, 'vlanId', str(vid))
+        sub(vlan, 'vlanName', 'vlan%d' % vid)
+        sub(vlan, 'vlanDesc', '')
+    return config
+
+
+def seed_acl_rules(count):
+    """ advanced ACL 3000 with count rules """
+
+    config = ElementTree.Element(qname('config', ce_simulator.NC_NS))
+    group = sub(sub(sub(config, 'acl'), 'aclGroups'), 'aclGroup')
+    sub(group, 'aclNumOrName', '3000')
+    sub(group, 'aclType', 'Advance')
+    rules = sub(group, 'aclRuleAdv4s')
+    for index in range(1, count + 1):
+        rule = sub(rules, 'aclRuleAdv4')
+        for leaf, value in (('aclRuleName', 'rule%d' % index),
+                            ('aclRuleID', str(index * 5)),
+                            ('aclAction', 'Permit'),
+                            ('aclProtocol', '6'),
+                            ('aclSourceIp', '10.%d.%d.0' % (index // 256,
+                                                            index % 256)),
+                            ('aclSrcWild', '0.0.0.255'),
+                            ('aclDestIp', '0.0.0.0'),
+                            ('aclDestWild', '255.255.255.255'),
+                            ('aclFragType', 'fragmentSubseq'),
+                            ('vrfName', '_public_')):
+            sub(rule, leaf, value)
+    return config
+
+
+def seed_static_routes(count):
+    """ count IPv4 static routes in the public instance """
+
+    config = ElementTree.Element(qname('config', ce_simulator.NC_NS))
+    routes = sub(sub(sub(config, 'staticrt'), 'staticrtbase'), 'srRoutes')
+    for index in range(count):
+        route = sub(routes, 'srRoute')
+        for leaf, value in (('vrfName', '_public_'), ('afType', 'ipv4unicast'),
+                            ('topologyName', 'base'),
+                            ('prefix', '10.%d.%d.0' % (index // 256,
+                                                       index % 256)),
+                            ('maskLength', '24'), ('ifName', ''),
+                            ('destVrfName', '_public_'),
+                            ('nexthop', '192.168.0.1'), ('description', ''),
+                            ('preference', '60'), ('tag', '0')):
+            sub(route, leaf, value)
+    return config
+
+
+# name, module, seed data, number of interfaces, module arguments, replay
+SCENARIOS = [
+    dict(name='vlan-range', module='ce_vlan', seed=seed_vlans,
+         args=lambda count: dict(vlan_range='2-%d' % (count + 1),
+                                 state='present')),
+    dict(name='vlan-create', module='ce_vlan', seed=seed_vlans,
+         args=lambda count: dict(vlan_id=str(count + 2), name='bench',
+                                 description='bench', state='present')),
+    dict(name='vlan-aggregate', module='ce_vlan', seed=seed_vlans,
+         args=lambda count: dict(aggregate=[
+             dict(vlan_id=vid, name='bench%d' % vid, description='bench')
+             for vid in range(2, count + 2)])),
+    dict(name='interface-type', module='ce_interface',
+         interfaces=lambda count: count,
+         args=lambda count: dict(interface_type='10ge', admin_state='up',
+                                 state='present')),
+    dict(name='interface-aggregate', module='ce_interface',
+         interfaces=lambda count: count,
+         args=lambda count: dict(aggregate=[
+             dict(interface='10GE1/0/%d' % index, description='bench%d' % index,
+                  admin_state='down' if index % 2 else 'up')
+             for index in range(1, count + 1)])),
+    dict(name='switchport-aggregate', module='ce_switchport',
+         interfaces=lambda count: count,
+         args=lambda count: dict(aggregate=[
+             dict(interface='10GE1/0/%d' % index, mode='trunk',
+                  native_vlan=str(index % 4094 + 1), trunk_vlans='100-199')
+             if index % 4 == 0 else
+             dict(interface='10GE1/0/%d' % index, mode='access',
+                  access_vlan=str(index % 4094 + 1))
+             for index in range(1, count + 1)])),
+    dict(name='acl-advance-rule', module='ce_acl_advance',
+         seed=seed_acl_rules,
+         args=lambda count: dict(acl_name='3000', rule_name='bench',
+                                 rule_id=str((count + 1) * 5),
+                                 rule_action='permit', protocol='tcp',
+                                 source_ip='192.168.0.0',
+                                 src_mask='24', state='present')),
+    dict(name='static-route', module='ce_static_route',
+         seed=seed_static_routes,
+         args=lambda count: dict(prefix='172.16.0.0', mask='24', aftype='v4',
+                                 next_hop='192.168.0.1', state='present')),
+    dict(name='facts-interfaces', module='ce_facts',
+         interfaces=lambda count: count,
+         args=lambda count: dict(gather_subset=['interfaces'])),
+    dict(name='facts-netconf', module='ce_facts',
+         interfaces=lambda count: count,
+         args=lambda count: dict(gather_subset=['all'],
+                                 transport='netconf')),
+    dict(name='config-replay', module='ce_config', seed=seed_vlans,
+         replay=True,
+         args=lambda count: dict(lines=['sysname bench%d' % count])),
+]
+
+
+def free_port():
+    """ a free local TCP port """
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(('127.0.0.1', 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+def start_simulator(scenario, count):
+    """ one simulated device seeded for a scenario, served in a thread """
+
+    interfaces = scenario.get('interfaces', lambda count: 48)(count)
+    options = ce_simulator.parse_args(['--port', str(free_port()),
+                                       '--interfaces', str(interfaces)])
+    simulator = ce_simulator.Simulator(options)
+    if scenario.get('seed'):
+        simulator.seed_xml = scenario['seed'](count)
+    listeners = simulator.listen()
+    thread = threading.Thread(target=simulator.serve, args=(listeners,))
+    thread.daemon = True
+    thread.start()
+    return simulator
+
+
+def run_module(python, module, args, env):
+    """ run a module once, returns its result and resource usage """
+
+    argsfile = tempfile.NamedTemporaryFile(mode='w', suffix='.json',
+                                           delete=False)
+    json.dump(dict(ANSIBLE_MODULE_ARGS=args), argsfile)
+    argsfile.close()
+    errfile = tempfile.TemporaryFile()
+
+    try:
+        start = time.time()
+        pid = os.fork()
+        if not pid:
+            os.dup2(errfile.fileno(), 2)
+            outfd = os.open(argsfile.name + '.out',
+                            os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            os.dup2(outfd, 1)
+            try:
+                os.execve(python, [python, os.path.join(LIBRARY, module + '.py'),
+                                   argsfile.name], env)
+            finally:
+                os._exit(127)
+        status, usage = os.wait4(pid, 0)[1:]
+        wall = time.time() - start
+
+        with open(argsfile.name + '.out') as fhandle:
+            output = fhandle.read()
+        errfile.seek(0)
+        error = errfile.read().decode('utf-8', 'replace')
+    finally:
+        errfile.close()
+        for path in (argsfile.name, argsfile.name + '.out'):
+            if os.path.exists(path):
+                os.unlink(path)
+
+    result = None
+    for line in reversed(output.splitlines()):
+        try:
+            result = json.loads(line)
+            break
+        except ValueError:
+            continue
+    if result is None:
+        result = dict(failed=True, msg='no module result (exit status %d): %s'
+                      % (status, (error or output).strip()[-500:]))
+
+    return result, dict(wall=wall, cpu=usage.ru_utime + usage.ru_stime,
+                        rss=usage.ru_maxrss)
+
+
+def rpc_count(perf):
+    """ RPCs and command batches of a perf block """
+
+    return sum(stat['count'] for key, stat in perf.get('ops', dict()).items()
+               if not key.endswith('.connect') and
+               not key.startswith(('xml.', 'governor.')))
+
+
+def median(values):
+    """ median """
+
+    values = sorted(values)
+    return values[len(values) // 2]
+
+
+def run_scenario(scenario, count, options):
+    """ metrics of one scenario at one scale """
+
+    simulator = start_simulator(scenario, count)
+    env = dict(os.environ)
+    env.update(ANSIBLE_CE_PERF='1', ANSIBLE_CE_CONFIG_CACHE='0')
+    for name in ('ANSIBLE_CE_PERSIST_TIMEOUT', 'ANSIBLE_CE_PERF_LOG',
+                 'ANSIBLE_CE_RECORD', 'ANSIBLE_CE_REPLAY'):
+        env.pop(name, None)
+
+    args = dict(host=simulator.options.address, port=simulator.options.port,
+                username='admin', password='admin')
+    args.update(scenario['args'](count))
+
+    fixture = None
+    if scenario.get('replay'):
+        fixture = tempfile.NamedTemporaryFile(suffix='.jsonl', delete=False)
+        fixture.close()
+        simulator.reset()
+        simulator.device(0)
+        result = run_module(options.python, scenario['module'], args,
+                            dict(env, ANSIBLE_CE_RECORD=fixture.name))[0]
+        if result.get('failed') or not result.get('changed'):
+            os.unlink(fixture.name)
+            return dict(error=result.get('msg', 'recorded run changed nothing'))
+        env['ANSIBLE_CE_REPLAY'] = fixture.name
+        time.sleep(1)
+
+    try:
+        runs = measure_runs(simulator, scenario, args, env, options)
+    finally:
+        if fixture is not None:
+            os.unlink(fixture.name)
+    if isinstance(runs, dict):
+        return runs
+
+    return dict(rpcs=max(run['rpcs'] for run in runs),
+                wall=round(median([run['wall'] for run in runs]), 4),
+                cpu=round(median([run['cpu'] for run in runs]), 4),
+                rss=max(run['rss'] for run in runs),
+                parse=round(median([run['parse'] for run in runs]), 4))
+
+
+def measure_runs(simulator, scenario, args, env, options):
+    """ usage of --repeat runs, or the error of the first failed run """
+
+    runs = list()
+    for _ in range(options.repeat):
+        simulator.reset()
+        simulator.device(0)
+        result, usage = run_module(options.python, scenario['module'], args,
+                                   env)
+        if result.get('failed'):
+            return dict(error=result.get('msg', 'module failed'))
+        if env.get('ANSIBLE_CE_REPLAY') and not result.get('changed'):
+            return dict(error='replayed run changed nothing')
+        perf = result.get('perf', dict())
+        usage.update(rpcs=rpc_count(perf), parse=perf.get('parse_time', 0.0))
+        runs.append(usage)
+    return runs
+
+
+def library_modules():
+    """ names of the library modules """
+
+    return sorted(name[:-3] for name in os.listdir(LIBRARY)
+                  if name.startswith('ce_') and name.endswith('.py'))
+
+
+def measure_startup(module, options):
+    """ import time and transport libraries of one module """
+
+    command = [options.python, '-c', STARTUP_PROBE, LIBRARY, module]
+    command.extend(TRANSPORT_LIBRARIES)
+    runs = list()
+    for _ in range(options.repeat):
+        try:
+            output = subprocess.check_output(command, stderr=subprocess.STDOUT)
+        except subprocess.CalledProcessError as exc:
+            error = exc.output.decode('utf-8', 'replace').strip()
+            return dict(error=error.splitlines()[-1] if error else
+                        'exit status %d' % exc.returncode)
+        runs.append(json.loads(output.decode('utf-8').splitlines()[-1]))
+
+    return dict(startup=round(median([run['startup'] for run in runs]), 4),
+                imports=runs[-1]['imports'])
+
+
+def compare_startup(key, metrics, base, tolerance):
+    """ regressions of a module startup against its budget """
+
+    regressions = list()
+    limit = max(base['startup'] * (1 + tolerance), base['startup'] + 0.02)
+    if metrics['startup'] > limit:
+        regressions.append('%s: startup %s > %s'
+                           % (key, metrics['startup'], base['startup']))
+    added = sorted(set(metrics['imports']) - set(base['imports']))
+    if added:
+        regressions.append('%s: imports %s'
+                           % (key, ', '.join(added)))
+    return regressions
+
+
+def compare(results, baseline, tolerance):
+    """ regressions of results against a baseline """
+
+    regressions = list()
+    for key, metrics in sorted(results.items()):
+        base = baseline.get(key)
+        if not base or 'error' in metrics or 'error' in base:
+            continue
+        if key.startswith('startup@'):
+            regressions.extend(compare_startup(key, metrics, base, tolerance))
+            continue
+        if metrics['rpcs'] > base['rpcs']:
+            regressions.append('%s: rpcs %d > %d'
+                               % (key, metrics['rpcs'], base['rpcs']))
+        for name in ('wall', 'cpu', 'rss', 'parse'):
+            # ignore noise on runs too short to measure
+            floor = 1024 if name == 'rss' else 0.05
+            limit = max(base[name] * (1 + tolerance), base[name] + floor)
+            if metrics[name] > limit:
+                regressions.append('%s: %s %s > %s'
+                                   % (key, name, metrics[name], base[name]))
+    return regressions
+
+
+def run_startup(options):
+    """ measure and print the startup of the library modules """
+
+    results = dict()
+    print('%-28s %9s  %s' % ('module', 'startup', 'imports'))
+    for module in options.module or library_modules():
+        key = 'startup@%s' % module
+        metrics = measure_startup(module, options)
+        results[key] = metrics
+        if 'error' in metrics:
+            print('%-28s  failed: %s' % (module, metrics['error']))
+            continue
+        print('%-28s %9.3f  %s' % (module, metrics['startup'],
+                                   ' '.join(metrics['imports'])))
+        sys.stdout.flush()
+    return results
+
+
+def run_scenarios(options):
+    """ run and print the scenarios """
+
+    if not ce_simulator.HAS_PARAMIKO:
+        sys.exit('paramiko is required, install it with `pip install paramiko`')
+
+    scales = [int(scale) for scale in options.scales.split(',')]
+    scenarios = [scenario for scenario in SCENARIOS
+                 if not options.scenario or scenario['name'] in options.scenario]
+
+    results = dict()
+    print('%-20s %6s %6s %9s %9s %9s %9s'
+          % ('scenario', 'scale', 'rpcs', 'wall', 'cpu', 'rss KB', 'parse'))
+    for scenario in scenarios:
+        for count in scales:
+            key = '%s@%d' % (scenario['name'], count)
+            metrics = run_scenario(scenario, count, options)
+            results[key] = metrics
+            if 'error' in metrics:
+                print('%-20s %6d  failed: %s'
+                      % (scenario['name'], count, metrics['error']))
+                continue
+            print('%-20s %6d %6d %9.3f %9.3f %9d %9.3f'
+                  % (scenario['name'], count, metrics['rpcs'],
+                     metrics['wall'], metrics['cpu'], metrics['rss'],
+                     metrics['parse']))
+            sys.stdout.flush()
+    return results
+
+
+def parse_args(argv=None):
+    """ command line options """
+
+    parser = argparse.ArgumentParser(description='Benchmark CloudEngine '
+                                     'modules against the offline simulator.')
+    parser.add_argument('--python', default=sys.executable,
+                        help='interpreter the modules run with')
+    parser.add_argument('--scales', default='1,100,1000',
+                        help='comma separated object counts')
+    parser.add_argument('--scenario', action='append',
+                        help='only run this scenario, may be repeated')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='runs per scenario and scale')
+    parser.add_argument('--baseline', help='baseline to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='allowed relative growth of times and RSS')
+    parser.add_argument('--save', help='write the results as baseline')
+    parser.add_argument('--list', action='store_true',
+                        help='list the scenarios and exit')
+    parser.add_argument('--startup', action='store_true',
+                        help='measure the startup of the library modules')
+    parser.add_argument('--module', action='append',
+                        help='only measure the startup of this module, '
+                        'may be repeated')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """ main """
+
+    options = parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    # modules drop their sessions without closing them
+    logging.getLogger('paramiko').setLevel(logging.CRITICAL)
+    if options.list:
+        for scenario in SCENARIOS:
+            print('%-20s %s' % (scenario['name'], scenario['module']))
+        return 0
+    if options.startup:
+        results = run_startup(options)
+    else:
+        results = run_scenarios(options)
+
+    if options.save:
+        with open(options.save, 'w') as fhandle:
+            json.dump(results, fhandle, indent=2, sort_keys=True)
+
+    status = 0
+    if [metrics for metrics in results.values() if 'error' in metrics]:
+        status = 1
+    if options.baseline:
+        with open(options.baseline) as fhandle:
+            regressions = compare(results, json.load(fhandle),
+                                  options.tolerance)
+        for regression in regressions:
+            print('REGRESSION %s' % regression)
+        if regressions:
+            status = 1
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,421 @@
+#!/usr/bin/env python3
+#
+# This file is part of Ansible
+#
+# Ansible is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Ansible is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Ansible.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+"""
+Run CloudEngine modules against a fleet of devices from one process.
+
+The library modules are imported once and their main() is run for every
+device in a pool of worker threads that an asyncio event loop feeds.  Each
+run gets its own module arguments and its own stdout, so the module
+classes (Vlan, Interface, StaticRoute, ...) run unchanged and return the
+same result as under Ansible, without a Python process, an ncclient and
+a paramiko import per device.
+
+    --workers       runs in progress at once over the whole fleet
+    --per-device    runs in progress at once on one device, 1 keeps the
+                    tasks of a device in order and stops them after the
+                    first failure the way a playbook does
+    --rate          runs started per second over the whole fleet
+    --timeout       seconds after which a run is reported failed
+
+Every run is written as one JSON line as soon as it completes, the counts
+are written to stderr at the end.  The exit status is 2 when a run failed.
+
+The inventory has one device per line, host or host:port, optionally
+followed by a JSON object of arguments for that device only:
+
+    10.1.1.1
+    10.1.1.2:22 {"description": "core-2"}
+
+    python3 utils/ce_fleet.py -i hosts.txt -m ce_vlan \\
+        -a '{"vlan_id": "100", "name": "web"}' -u admin -p secret
+
+--tasks runs several modules per device from a JSON list of objects with
+module and args keys instead.  The runner needs Python 3.5 or later with
+Ansible 2.2, NETCONF modules run unchanged, CLI modules need a CLI
+transport that runs on Python 3, see FLEET RUNNER in README.md for the
+supported combination.
+"""
+
+import argparse
+import asyncio
+import concurrent.futures
+import importlib.util
+import io
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+
+LIBRARY = os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), 'library')
+
+_local = threading.local()
+
+
+class TaskStdout(object):
+    """ stdout of the thread's current run, the real stdout otherwise """
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, data):
+        return (getattr(_local, 'stdout', None) or self.stream).write(data)
+
+    def flush(self):
+        (getattr(_local, 'stdout', None) or self.stream).flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+def task_params():
+    """ module arguments of the thread's current run """
+
+    return dict(_local.params)
+
+
+def track(cls, method):
+    """ remember the objects the thread's current run calls method on """
+
+    func = getattr(cls, method)
+
+    def wrapper(self, *args, **kwargs):
+        sessions = getattr(_local, 'sessions', None)
+        if sessions is not None:
+            sessions.append(self)
+        return func(self, *args, **kwargs)
+
+    setattr(cls, method, wrapper)
+
+
+def close_sessions(sessions):
+    """ close the connections a run left open """
+
+    for session in sessions:
+        try:
+            if getattr(session, 'mc', None) is not None:
+                session.close()
+                continue
+            connection = getattr(session, 'connection', None)
+            shell = getattr(connection, 'shell', None)
+            if shell is None or not connection._connected:
+                continue
+            connection.disconnect()
+            ssh = getattr(shell, 'ssh', None)
+            if ssh is not None:
+                ssh.close()
+        except Exception:
+            pass
+
+
+def serialize(cls, method, lock):
+    """ hold lock while method runs """
+
+    func = getattr(cls, method)
+
+    def wrapper(self, *args, **kwargs):
+        with lock:
+            return func(self, *args, **kwargs)
+
+    setattr(cls, method, wrapper)
+
+
+def install():
+    """ prepare ansible to run several modules at once in this process """
+
+    from ansible.module_utils import basic, cloudengine, ce_perf
+    from ansible.module_utils.network import NetworkModule
+
+    basic._load_params = task_params
+    sys.stdout = TaskStdout(sys.stdout)
+    track(NetworkModule, 'connect')
+    track(cloudengine.Netconf, '__init__')
+    # every session rewrites known_hosts when it adds the device key
+    try:
+        import paramiko
+        lock = threading.RLock()
+        serialize(paramiko.SSHClient, 'load_host_keys', lock)
+        serialize(paramiko.SSHClient, 'save_host_keys', lock)
+    except ImportError:
+        pass
+    # the counters are per process, they would mix up the devices
+    ce_perf.recorder.enabled = False
+
+
+def load_module(name):
+    """ main() of a library module, by name or by path """
+
+    path = name if name.endswith('.py') else os.path.join(LIBRARY,
+                                                          name + '.py')
+    module_name = 'ce_fleet_' + os.path.basename(path)[:-3]
+    if module_name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(module_name, path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        sys.modules[module_name] = module
+    return sys.modules[module_name].main
+
+
+def run_module(main, params):
+    """ run a module in this thread, returns its result """
+
+    _local.params = params
+    _local.stdout = io.StringIO()
+    _local.sessions = list()
+    status = 0
+    try:
+        main()
+    except SystemExit:
+        status = sys.exc_info()[1].code
+    except Exception:
+        return dict(failed=True, msg='module raised: %s'
+                    % traceback.format_exc().strip().splitlines()[-1],
+                    exception=traceback.format_exc())
+    finally:
+        output = _local.stdout.getvalue()
+        close_sessions(_local.sessions)
+        _local.stdout = None
+        _local.sessions = None
+
+    for line in reversed(output.splitlines()):
+        try:
+            return json.loads(line)
+        except ValueError:
+            continue
+    return dict(failed=True, msg='no module result (exit status %s): %s'
+                % (status, output.strip()[-500:]))
+
+
+class RateLimiter(object):
+    """ token bucket of rate runs per second """
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.tokens = self.burst
+        self.stamp = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        """ wait for a token """
+
+        if not self.rate:
+            return
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.burst,
+                                  self.tokens + (now - self.stamp) * self.rate)
+                self.stamp = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+def parse_inventory(path):
+    """ (host, port, args) of every inventory line """
+
+    devices = list()
+    with open(path) as fhandle:
+        for number, line in enumerate(fhandle, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            address, _, extra = line.partition(' ')
+            host, _, port = address.partition(':')
+            try:
+                args = json.loads(extra) if extra.strip() else dict()
+            except ValueError:
+                raise ValueError('%s:%d: invalid JSON arguments'
+                                 % (path, number))
+            devices.append((host, int(port) if port else None, args))
+    return devices
+
+
+class Fleet(object):
+    """ runs the tasks on every device and streams the results """
+
+    def __init__(self, options, devices, tasks, out):
+        self.options = options
+        self.devices = devices
+        self.tasks = tasks
+        self.out = out
+        self.counts = dict(ok=0, changed=0, failed=0, skipped=0)
+        self.failed_devices = set()
+
+    def params(self, host, port, extra, args):
+        """ module arguments of one run """
+
+        params = dict(host=host)
+        if port:
+            params['port'] = port
+        for name in ('username', 'password', 'transport'):
+            if getattr(self.options, name):
+                params[name] = getattr(self.options, name)
+        if self.options.check:
+            params['_ansible_check_mode'] = True
+        params.update(args)
+        params.update(extra)
+        return params
+
+    def emit(self, record):
+        """ write one result line """
+
+        self.counts[record['status']] += 1
+        self.out.write(json.dumps(record, sort_keys=True) + '\n')
+        self.out.flush()
+
+    async def run_one(self, executor, host, port, extra, index, task):
+        """ one task on one device """
+
+        device = '%s:%s' % (host, port or 22)
+        queued = time.monotonic()
+        record = dict(host=host, port=port, task=index, module=task['module'])
+        async with self.device_limits.setdefault(
+                device, asyncio.Semaphore(self.options.per_device)):
+            if self.options.per_device == 1 and device in self.failed_devices:
+                record.update(status='skipped', msg='device failed earlier')
+                self.emit(record)
+                return
+            async with self.workers:
+                await self.limiter.acquire()
+                start = time.monotonic()
+                params = self.params(host, port, extra, task.get('args', {}))
+                future = self.loop.run_in_executor(
+                    executor, run_module, load_module(task['module']), params)
+                try:
+                    result = await asyncio.wait_for(
+                        asyncio.shield(future), self.options.timeout or None)
+                except asyncio.TimeoutError:
+                    # the thread can not be stopped, it keeps its worker
+                    result = dict(failed=True, msg='timed out after %ss'
+                                  % self.options.timeout)
+
+        if result.get('failed'):
+            status = 'failed'
+            self.failed_devices.add(device)
+        else:
+            status = 'changed' if result.get('changed') else 'ok'
+        record.update(status=status, queued=round(start - queued, 3),
+                      elapsed=round(time.monotonic() - start, 3),
+                      result=result)
+        self.emit(record)
+
+    async def run(self):
+        """ run everything, returns the counts """
+
+        self.loop = asyncio.get_event_loop()
+        self.workers = asyncio.Semaphore(self.options.workers)
+        self.device_limits = dict()
+        self.limiter = RateLimiter(self.options.rate, self.options.burst)
+        executor = concurrent.futures.ThreadPoolExecutor(self.options.workers)
+        try:
+            jobs = [self.run_one(executor, host, port, extra, index, task)
+                    for host, port, extra in self.devices
+                    for index, task in enumerate(self.tasks)]
+            await asyncio.gather(*jobs)
+        finally:
+            executor.shutdown(wait=False)
+        return self.counts
+
+
+def parse_args(argv=None):
+    """ command line options """
+
+    parser = argparse.ArgumentParser(description='Run CloudEngine modules '
+                                     'against many devices from one process.')
+    parser.add_argument('-i', '--inventory', required=True,
+                        help='file of host[:port] [json-args] lines')
+    parser.add_argument('-m', '--module', help='library module to run')
+    parser.add_argument('-a', '--args', default='{}',
+                        help='module arguments as JSON object')
+    parser.add_argument('--tasks', help='JSON file with a list of '
+                        '{"module": ..., "args": {...}} to run in order')
+    parser.add_argument('-u', '--username',
+                        default=os.environ.get('ANSIBLE_NET_USERNAME'))
+    parser.add_argument('-p', '--password',
+                        default=os.environ.get('ANSIBLE_NET_PASSWORD'))
+    parser.add_argument('--transport', help='transport of the modules')
+    parser.add_argument('--check', action='store_true',
+                        help='run the modules in check mode')
+    parser.add_argument('--workers', type=int, default=64,
+                        help='runs in progress at once')
+    parser.add_argument('--per-device', type=int, default=1,
+                        help='runs in progress at once on one device')
+    parser.add_argument('--rate', type=float, default=0,
+                        help='runs started per second, 0 is unlimited')
+    parser.add_argument('--burst', type=int, default=1,
+                        help='runs that may start at once within --rate')
+    parser.add_argument('--timeout', type=float, default=0,
+                        help='seconds per run, 0 is unlimited')
+    parser.add_argument('-o', '--output',
+                        help='file for the result lines, default stdout')
+    options = parser.parse_args(argv)
+    if bool(options.module) == bool(options.tasks):
+        parser.error('one of --module or --tasks is required')
+    if options.workers < 1 or options.per_device < 1:
+        parser.error('--workers and --per-device must be at least 1')
+    return options
+
+
+def main(argv=None):
+    """ main """
+
+    options = parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    # modules drop their sessions without closing them
+    logging.getLogger('paramiko').setLevel(logging.CRITICAL)
+
+    if options.tasks:
+        with open(options.tasks) as fhandle:
+            tasks = json.load(fhandle)
+    else:
+        tasks = [dict(module=options.module, args=json.loads(options.args))]
+    devices = parse_inventory(options.inventory)
+
+    out = open(options.output, 'a') if options.output else sys.stdout
+    install()
+    for task in tasks:
+        load_module(task['module'])
+
+    start = time.monotonic()
+    fleet = Fleet(options, devices, tasks, out)
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        counts = loop.run_until_complete(fleet.run())
+    finally:
+        loop.close()
+        if out is not sys.stdout:
+            out.close()
+
+    sys.stderr.write('devices=%d ok=%d changed=%d failed=%d skipped=%d '
+                     'elapsed=%.1fs\n'
+                     % (len(devices), counts['ok'], counts['changed'],
+                        counts['failed'], counts['skipped'],
+                        time.monotonic() - start))
+    return 2 if counts['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
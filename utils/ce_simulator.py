@@ -0,0 +1,1472 @@
+#!/usr/bin/env python
+#
+# This file is part of Ansible
+#
+# Ansible is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Ansible is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Ansible.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+"""
+Offline CloudEngine simulator.
+
+Runs SSH servers on consecutive local ports, one simulated device per
+port.  Each device answers the netconf subsystem with the subset of
+NETCONF 1.0 the modules use (get, get-config, edit-config, lock, unlock,
+validate, commit, discard-changes and the Huawei execute-action and
+execute-cli) against an in-memory datastore, and opens a VRP like shell
+for CLI modules whose prompts match Cli.CLI_PROMPTS_RE.  The NETCONF
+datastore and the CLI running configuration are separate models, a
+change made through one is not visible through the other, but both bump
+the commit id shown by display configuration commit list.
+
+The datastore does not know the device schema.  An element below a
+container named after its plural (vlans/vlan, peers/peer, ...) is a list
+entry keyed by its first leaf unless LIST_KEYS names the keys, any other
+element is a container.
+
+    python utils/ce_simulator.py --port 10022 --count 1000
+
+then point the inventory at 127.0.0.1 with ansible_ssh_port 10022 and up.
+Any username and password are accepted unless --username is given.
+"""
+
+import argparse
+import copy
+import logging
+import re
+import select
+import socket
+import sys
+import threading
+import time
+from io import BytesIO
+from xml.etree import ElementTree
+
+try:
+    import paramiko
+    HAS_PARAMIKO = True
+except ImportError:
+    HAS_PARAMIKO = False
+
+
+NC_NS = 'urn:ietf:params:xml:ns:netconf:base:1.0'
+VRP_NS = 'http://www.huawei.com/netconf/vrp'
+HW_NS = 'http://www.huawei.com/netconf/capability/base/1.0'
+DELIMITER = b']]>]]>'
+
+CAPABILITIES = [
+    'urn:ietf:params:netconf:base:1.0',
+    'urn:ietf:params:netconf:capability:writable-running:1.0',
+    'urn:ietf:params:netconf:capability:candidate:1.0',
+    'urn:ietf:params:netconf:capability:confirmed-commit:1.0',
+    'urn:ietf:params:netconf:capability:validate:1.0',
+    'http://www.huawei.com/netconf/capability/execute-cli/1.0',
+    'http://www.huawei.com/netconf/capability/action/1.0',
+]
+
+# keys of list entries that are not identified by their first leaf
+LIST_KEYS = {
+    'srRoute': ('vrfName', 'afType', 'topologyName', 'prefix',
+                'maskLength', 'ifName', 'destVrfName', 'nexthop'),
+    'importRoute': ('importProtocol', 'importProcessId'),
+    'networkRoute': ('networkAddress', 'maskLen'),
+    'peerAF': ('remoteAddress',),
+    'ntpUCastCfg': ('addrFamily', 'ipv4Addr', 'ipv6Addr', 'type',
+                    'vpnName', 'ifName'),
+}
+
+# CLI lines opening a view in system view and inside another view
+TOP_VIEW_RE = re.compile(
+    r'^(interface|bgp|vlan \d+$|ospf|isis|evpn|bridge-domain|'
+    r'ip vpn-instance|aaa$|acl|route-policy|netstream record|'
+    r'hwtacacs-server template|radius-server template|user-interface|'
+    r'stp region-configuration|sflow collector \d+$)')
+SUB_VIEW_RE = re.compile(
+    r'^(ipv4-family|ipv6-family|l2vpn-family|area|'
+    r'authentication-scheme|authorization-scheme|accounting-scheme|domain|'
+    r'vpn-target-|vxlan vni)')
+
+CLI_ERROR = "Error: Unrecognized command found at '^' position."
+
+# value:mask edit of a VLAN bitmap leaf such as trunkVlans
+BITMAP_EDIT_RE = re.compile(r'^\s*([0-9a-fA-F]{1024}):([0-9a-fA-F]{1024})\s*$')
+
+# type part of an interface name, 10GE1/0/1, LoopBack0, Eth-Trunk10
+PHY_TYPE_RE = re.compile(r'^(\d+[xX]\d+GE|\d*GE|[A-Za-z][A-Za-z-]*?)(?=\d)')
+
+DISPLAY_VERSION = """Huawei Versatile Routing Platform Software
+VRP (R) software, Version 8.150 (CE6850EI V200R002C50SPC800)
+Copyright (C) 2012-2017 Huawei Technologies Co., Ltd.
+HUAWEI CE6850-48S6Q-HI uptime is 0 days, 1 hours, 0 minutes
+Patch Version: V200R002SPH001
+
+CE6850-48S6Q-HI(Master) 1 : uptime is  0 days, 1 hours, 0 minutes
+        StartupTime 2017/01/01   00:00:00
+Memory    Size    : 2048 M bytes
+Flash     Size    : 1024 M bytes
+CE6850-48S6Q-HI version information
+1. PCB    Version : CEM48S6QP04    VER A
+2. MAB    Version : 1
+3. Board  Type    : CE6850-48S6Q-HI
+4. CPLD1  Version : 102
+5. BIOS   Version : 383"""
+
+DISPLAY_MEMORY = """Memory utilization statistics at 2017-01-01 00:00:00+00:00
+System Total Memory: 2047 Mbytes
+Total Memory Used: 1025788 Kbytes
+Memory Using Percentage: 48%"""
+
+DISPLAY_DEVICE = """Device status:
+-------------------------------------------------------------------------------
+Slot  Card   Type                               Online   Power Register  Status   Role
+-------------------------------------------------------------------------------
+1     -      CE6850-48S6Q-HI                    Present  On    Registered Normal   Master
+      FAN1   FAN-40SB-F                         Present  On    Registered Normal   NA
+      PWR1   PAC-600WA-F                        Present  On    Registered Normal   NA
+-------------------------------------------------------------------------------"""
+
+DIR_FLASH = """Directory of flash:/
+
+  Idx  Attr     Size(Byte)  Date        Time       FileName
+    0  -rw-     80,458,468  Jan 01 2017 00:00:00   CE6850EI-V200R002C50SPC800.cc
+    1  -rw-          1,289  Jan 01 2017 00:00:00   vrpcfg.zip
+
+1,674,432 KB total (1,205,480 KB free)"""
+
+# devm and vfm state data of the board DISPLAY_* describe
+PHY_ENTITIES = (
+    (('entClass', 'mpuModule'), ('position', '1'),
+     ('entBoardType', 'CE6850-48S6Q-HI'), ('entStatus', 'Normal'),
+     ('entPcbVersion', 'CEM48S6QP04'), ('entMabVersion', '1'),
+     ('entCpld1Version', '102'), ('entBiosVersion', '383')),
+    (('entClass', 'fanModule'), ('position', 'FAN1'),
+     ('entBoardType', 'FAN-40SB-F'), ('entStatus', 'Normal')),
+    (('entClass', 'powerModule'), ('position', 'PWR1'),
+     ('entBoardType', 'PAC-600WA-F'), ('entStatus', 'Normal')),
+)
+
+MEMORY_INFO = (('osMemoryTotal', '2096128'), ('osMemoryUse', '1025788'),
+               ('osMemoryFree', '1070340'), ('osMemoryUsage', '48'))
+
+FILE_SYSTEM = (('fsName', 'flash:'), ('totalSize', '1674432'),
+               ('freeSize', '1205480'))
+
+INTERFACE_BRIEF_HEADER = """PHY: Physical
+*down: administratively down
+^down: standby
+(l): loopback
+(s): spoofing
+(E): E-Trunk down
+(b): BFD down
+(B): Bit-error down
+(e): ETHOAM down
+(d): Dampening Suppressed
+InUti/OutUti: input utility/output utility
+Interface                   PHY   Protocol  InUti OutUti   inErrors  outErrors"""
+
+IP_INTERFACE_BRIEF_HEADER = """*down: administratively down
+^down: standby
+(l): loopback
+(s): spoofing
+(E): E-Trunk down
+The number of interface that is UP in Physical is 1
+The number of interface that is DOWN in Physical is 0
+The number of interface that is UP in Protocol is 1
+The number of interface that is DOWN in Protocol is 0
+
+Interface                         IP Address/Mask    Physical Protocol VPN"""
+
+LLDP_NEIGHBOR_HEADER = """Local Intf       Neighbor Dev             Neighbor Intf             Exptime (sec)
+--------------------------------------------------------------------------------"""
+
+log = logging.getLogger('ce_simulator')
+
+
+def qname(tag, namespace=VRP_NS):
+    """ qualified ElementTree tag """
+
+    return '{%s}%s' % (namespace, tag)
+
+
+def local_name(tag):
+    """ tag without its namespace """
+
+    return tag.rsplit('}', 1)[-1]
+
+
+def leaf_text(elem):
+    """ stripped text of a leaf """
+
+    return (elem.text or '').strip()
+
+
+class SimError(Exception):
+    """ error returned to the client as rpc-error """
+
+    def __init__(self, tag, message, error_type='application'):
+        super(SimError, self).__init__(message)
+        self.tag = tag
+        self.message = message
+        self.error_type = error_type
+
+
+def is_list_entry(parent, elem):
+    """ whether elem is an entry of a list below parent """
+
+    name = local_name(elem.tag)
+    if name in LIST_KEYS:
+        return True
+    parent_name = local_name(parent.tag)
+    return parent_name in (name + 's', name + 'es', name + 'List')
+
+
+def entry_key(elem):
+    """ key leaves of a list entry as a tuple of (name, value) """
+
+    names = LIST_KEYS.get(local_name(elem.tag))
+    leaves = [child for child in elem if len(child) == 0]
+    if names is None:
+        leaves = leaves[:1]
+    else:
+        leaves = [child for child in leaves if local_name(child.tag) in names]
+    return tuple(sorted((local_name(child.tag), leaf_text(child))
+                        for child in leaves))
+
+
+def find_entry(parent, elem):
+    """ element of the datastore matching an edit or filter element """
+
+    if not is_list_entry(parent, elem):
+        return parent.find(elem.tag)
+
+    if len(elem) == 0:
+        for candidate in parent.findall(elem.tag):
+            if leaf_text(candidate) == leaf_text(elem):
+                return candidate
+        return None
+
+    key = entry_key(elem)
+    for candidate in parent.findall(elem.tag):
+        found = dict((local_name(child.tag), leaf_text(child))
+                     for child in candidate if len(child) == 0)
+        if all(found.get(name) == value for name, value in key):
+            return candidate
+    return None
+
+
+def merge_bitmap(old, edit):
+    """ bitmap leaf after a value:mask edit, None if edit is no such edit,
+    the bits set in mask are taken from value """
+
+    match = BITMAP_EDIT_RE.match(edit or '')
+    if not match:
+        return None
+    value, mask = match.group(1), match.group(2)
+    old = (old or '').strip()
+    bits = int(old, 16) if old and len(old) == len(value) else 0
+    bits = (bits & ~int(mask, 16)) | (int(value, 16) & int(mask, 16))
+    return '%0*x' % (len(value), bits)
+
+
+def sync_interfaces(root):
+    """ leaves the device derives: the ifPhyType of a created interface
+    from its name, isL2SwitchPort from l2Enable of its ethernetIf and the
+    ifPhyStatus state of every interface from its ifAdminStatus, the
+    simulated links are all up """
+
+    modes = dict()
+    for entry in root.iter(qname('ethernetIf')):
+        name = entry.find(qname('ifName'))
+        l2enable = entry.find(qname('l2Enable'))
+        if name is not None and l2enable is not None:
+            modes[leaf_text(name)] = str(leaf_text(l2enable) == 'enable').lower()
+    for iface in root.iter(qname('interface')):
+        name = iface.find(qname('ifName'))
+        if name is None:
+            continue
+        if iface.find(qname('ifPhyType')) is None:
+            match = PHY_TYPE_RE.match(leaf_text(name))
+            if match:
+                ElementTree.SubElement(iface, qname('ifPhyType')).text = \
+                    match.group(1)
+        switchport = iface.find(qname('isL2SwitchPort'))
+        if switchport is not None and leaf_text(name) in modes:
+            switchport.text = modes[leaf_text(name)]
+
+    ifm = root.find(qname('ifm'))
+    if ifm is None:
+        return
+    for iface in ifm.iter(qname('interface')):
+        admin = iface.find(qname('ifAdminStatus'))
+        dynamic = iface.find(qname('ifDynamicInfo'))
+        if dynamic is None:
+            dynamic = ElementTree.SubElement(iface, qname('ifDynamicInfo'))
+        status = dynamic.find(qname('ifPhyStatus'))
+        if status is None:
+            status = ElementTree.SubElement(dynamic, qname('ifPhyStatus'))
+        status.text = 'down' if admin is not None and \
+            leaf_text(admin) == 'down' else 'up'
+
+
+def edit_tree(parent, edit, default_op='merge'):
+    """ apply an edit-config element below a datastore element """
+
+    operation = edit.get('operation') or edit.get(qname('operation', NC_NS)) \
+        or default_op
+    existing = find_entry(parent, edit)
+
+    if operation in ('delete', 'remove'):
+        if existing is None:
+            if operation == 'delete':
+                raise SimError('data-missing', '%s does not exist.'
+                               % local_name(edit.tag))
+            return
+        parent.remove(existing)
+        return
+
+    if operation == 'create' and existing is not None and \
+            is_list_entry(parent, edit):
+        raise SimError('data-exists', '%s already exists.'
+                       % local_name(edit.tag))
+
+    if existing is None:
+        existing = ElementTree.SubElement(parent, edit.tag)
+    elif operation == 'replace':
+        for child in list(existing):
+            existing.remove(child)
+
+    if len(edit) == 0:
+        bitmap = merge_bitmap(existing.text, edit.text)
+        existing.text = edit.text if bitmap is None else bitmap
+        return
+
+    child_op = 'merge' if operation == 'create' else operation
+    for child in edit:
+        edit_tree(existing, child, child_op)
+
+
+def filter_tree(data, flt):
+    """ subtree filtering of RFC 6241, None when nothing is selected """
+
+    children = list(flt)
+    if not children:
+        return copy.deepcopy(data)
+
+    matches = [child for child in children
+               if len(child) == 0 and leaf_text(child)]
+    for match in matches:
+        found = data.find(match.tag)
+        if found is None or leaf_text(found) != leaf_text(match):
+            return None
+
+    selections = dict()
+    for child in children:
+        if child not in matches:
+            selections.setdefault(child.tag, list()).append(child)
+    if not selections:
+        return copy.deepcopy(data)
+
+    # replies keep the datastore order like the device keeps schema order
+    match_tags = set(match.tag for match in matches)
+    result = ElementTree.Element(data.tag)
+    for found in data:
+        if found.tag in match_tags:
+            result.append(copy.deepcopy(found))
+            continue
+        for child in selections.get(found.tag, ()):
+            selected = filter_tree(found, child)
+            if selected is not None:
+                result.append(selected)
+                break
+
+    if len(result) == len(matches):
+        return None
+    return result
+
+
+def vlan_bitmap_ids(bitmap):
+    """ VLAN ids of the hex bitmap used by the vlan batch actions """
+
+    vlans = list()
+    for index, digit in enumerate(bitmap.strip()):
+        bits = int(digit, 16)
+        for offset in range(4):
+            if bits & (0x8 >> offset):
+                vlans.append(index * 4 + offset)
+    return vlans
+
+
+class Datastore(object):
+    """ running and candidate datastores of one device """
+
+    def __init__(self, device):
+
+        self.device = device
+        self.running = ElementTree.Element(qname('data', NC_NS))
+        self.candidate = None
+        self.locks = dict()
+        self.confirmed = None
+
+    def get(self, flt, source='running'):
+        """ data element selected by a subtree filter """
+
+        root = self.candidate if source == 'candidate' else self.running
+        if root is None:
+            root = self.running
+        data = ElementTree.Element(qname('data', NC_NS))
+        if flt is None:
+            for child in root:
+                data.append(copy.deepcopy(child))
+            return data
+        for child in flt:
+            found = root.find(child.tag)
+            if found is None:
+                continue
+            selected = filter_tree(found, child)
+            if selected is not None:
+                data.append(selected)
+        return data
+
+    def edit(self, config, target='running', default_op='merge', session=0):
+        """ apply an edit-config to a datastore """
+
+        self.check_lock(target, session)
+        if target == 'candidate':
+            if self.candidate is None:
+                self.candidate = copy.deepcopy(self.running)
+            root = self.candidate
+        else:
+            root = self.running
+
+        # stop-on-error, edits made before a failing one are kept
+        try:
+            for child in config:
+                edit_tree(root, child, default_op)
+        finally:
+            sync_interfaces(root)
+            if target != 'candidate':
+                self.device.bump_commit()
+
+    def check_lock(self, target, session):
+        """ refuse to touch a datastore locked by another session """
+
+        owner = self.locks.get(target)
+        if owner is not None and owner != session:
+            raise SimError('lock-denied', 'The %s datastore is locked by '
+                           'session %s.' % (target, owner))
+
+    def lock(self, target, session):
+        """ lock a datastore """
+
+        if self.locks.get(target) not in (None, session):
+            raise SimError('lock-denied', 'Lock failed, lock is already '
+                           'held by session %s.' % self.locks[target])
+        if target == 'candidate' and self.candidate is not None:
+            raise SimError('lock-denied', 'The candidate has uncommitted '
+                           'changes.')
+        self.locks[target] = session
+
+    def unlock(self, target, session):
+        """ unlock a datastore """
+
+        if self.locks.get(target) != session:
+            raise SimError('operation-failed', 'The %s datastore is not '
+                           'locked by this session.' % target)
+        del self.locks[target]
+
+    def release(self, session):
+        """ drop the locks of a closed session, a confirmed commit without
+        persist is rolled back with the session that started it """
+
+        for target, owner in list(self.locks.items()):
+            if owner == session:
+                del self.locks[target]
+                if target == 'candidate':
+                    self.candidate = None
+
+        if self.confirmed is not None:
+            timer, backup, token, owner = self.confirmed
+            if not token and owner == session:
+                timer.cancel()
+                self.confirmed = None
+                self.running = backup
+                self.device.bump_commit()
+
+    def commit(self, confirmed=False, timeout=600, persist=None,
+               persist_id=None, session=None):
+        """ commit the candidate, a confirmed commit rolls back unless
+        confirmed in time """
+
+        if self.confirmed is not None:
+            timer, backup, token = self.confirmed[:3]
+            if token and persist_id != token and not confirmed:
+                raise SimError('invalid-value', 'The persist-id does not '
+                               'match the confirmed commit.')
+            timer.cancel()
+            self.confirmed = None
+            if not confirmed:
+                backup = None
+        else:
+            backup = copy.deepcopy(self.running)
+
+        if self.candidate is not None:
+            self.running = self.candidate
+            self.candidate = None
+            self.device.bump_commit()
+
+        if confirmed:
+            timer = threading.Timer(timeout, self.rollback, (backup,))
+            timer.daemon = True
+            timer.start()
+            self.confirmed = (timer, backup, persist, session)
+
+    def rollback(self, backup):
+        """ restore the datastore of an unconfirmed commit """
+
+        with self.device.lock:
+            if self.confirmed is None:
+                return
+            self.confirmed = None
+            self.running = backup
+            self.device.bump_commit()
+
+    def discard(self):
+        """ drop candidate changes """
+
+        self.candidate = None
+
+    def action(self, action):
+        """ Huawei execute-action, vlan batch actions change the datastore """
+
+        for child in action:
+            for batch in child:
+                name = local_name(batch.tag)
+                if name not in ('shVlanBatchCrt', 'shVlanBatchDel'):
+                    continue
+                vlans = batch.find(qname('vlans'))
+                if vlans is None or not leaf_text(vlans):
+                    raise SimError('invalid-value', 'vlans is missing.')
+                ids = vlan_bitmap_ids(leaf_text(vlans).split(':')[0])
+                self.vlan_batch(ids, name == 'shVlanBatchCrt')
+
+    def vlan_batch(self, ids, create):
+        """ create or delete vlans in one go """
+
+        root = self.running
+        vlan = root.find(qname('vlan'))
+        if vlan is None:
+            vlan = ElementTree.SubElement(root, qname('vlan'))
+        container = vlan.find(qname('vlans'))
+        if container is None:
+            container = ElementTree.SubElement(vlan, qname('vlans'))
+
+        existing = dict((leaf_text(entry.find(qname('vlanId'))), entry)
+                        for entry in container.findall(qname('vlan')))
+        for vid in ids:
+            if create and str(vid) not in existing:
+                entry = ElementTree.SubElement(container, qname('vlan'))
+                ElementTree.SubElement(entry, qname('vlanId')).text = str(vid)
+                ElementTree.SubElement(entry, qname('vlanName'))
+                ElementTree.SubElement(entry, qname('vlanDesc'))
+            elif not create and str(vid) in existing and vid != 1:
+                container.remove(existing[str(vid)])
+
+        self.device.bump_commit()
+
+
+class ConfigNode(object):
+    """ one line of the CLI running configuration """
+
+    def __init__(self, text):
+
+        self.text = text
+        self.children = list()
+
+    def find(self, text):
+        """ child with exactly this text """
+
+        for child in self.children:
+            if child.text == text:
+                return child
+        return None
+
+    def section(self, text):
+        """ child with this text, appended when missing """
+
+        node = self.find(text)
+        if node is None:
+            node = ConfigNode(text)
+            self.children.append(node)
+        return node
+
+    def set(self, text):
+        """ add a line, replacing a line that only differs in its last
+        word or a description """
+
+        node = self.find(text)
+        if node is not None:
+            return node
+        words = text.split()
+        for child in self.children:
+            if child.children:
+                continue
+            old = child.text.split()
+            if (len(words) > 1 and old[:-1] == words[:-1]) or \
+                    (words[0] == old[0] == 'description'):
+                child.text = text
+                return child
+        return self.section(text)
+
+    def undo(self, text):
+        """ remove the lines an undo command names """
+
+        self.children = [child for child in self.children
+                         if child.text != text and
+                         not child.text.startswith(text + ' ')]
+
+    def render(self, depth=0):
+        """ lines of this node and its children, indented """
+
+        lines = list()
+        for child in self.children:
+            lines.append(' ' * depth + child.text)
+            lines.extend(child.render(depth + 1))
+        return lines
+
+
+class Device(object):
+    """ state of one simulated device """
+
+    def __init__(self, name, interfaces=48, seed_xml=None, seed_config=None):
+
+        self.name = name
+        self.lock = threading.RLock()
+        self.commits = [1000000000]
+        self.labels = dict()
+        self.datastore = Datastore(self)
+        self.config = ConfigNode(None)
+        self.seed(interfaces)
+        if seed_xml is not None:
+            self.datastore.edit(seed_xml)
+        if seed_config:
+            self.load_config_text(seed_config)
+        self.commits = [1000000001]
+
+    def seed(self, interfaces):
+        """ default configuration of a freshly booted switch """
+
+        self.config.section('sysname %s' % self.name)
+        names = ['10GE1/0/%d' % index for index in range(1, interfaces + 1)]
+        for name in names:
+            self.config.section('interface %s' % name)
+
+        seed = ElementTree.Element(qname('config', NC_NS))
+        system = ElementTree.SubElement(seed, qname('system'))
+        info = ElementTree.SubElement(system, qname('systemInfo'))
+        ElementTree.SubElement(info, qname('sysName')).text = self.name
+
+        vlan = ElementTree.SubElement(seed, qname('vlan'))
+        vlans = ElementTree.SubElement(vlan, qname('vlans'))
+        entry = ElementTree.SubElement(vlans, qname('vlan'))
+        ElementTree.SubElement(entry, qname('vlanId')).text = '1'
+        ElementTree.SubElement(entry, qname('vlanName'))
+        ElementTree.SubElement(entry, qname('vlanDesc'))
+
+        ifm = ElementTree.SubElement(seed, qname('ifm'))
+        ifaces = ElementTree.SubElement(ifm, qname('interfaces'))
+        for index, name in enumerate(names):
+            iface = ElementTree.SubElement(ifaces, qname('interface'))
+            for leaf, value in (('ifName', name), ('ifPhyType', '10GE'),
+                                ('ifNumber', '1/0/%d' % (index + 1)),
+                                ('ifDescr', ''), ('isL2SwitchPort', 'true'),
+                                ('ifAdminStatus', 'up'), ('ifMtu', '1500'),
+                                ('l2SubIfFlag', 'false')):
+                ElementTree.SubElement(iface, qname(leaf)).text = value
+
+        # state data matching the display commands of the CLI
+        devm = ElementTree.SubElement(seed, qname('devm'))
+        entities = ElementTree.SubElement(devm, qname('phyEntitys'))
+        for leaves in PHY_ENTITIES:
+            entity = ElementTree.SubElement(entities, qname('phyEntity'))
+            for leaf, value in leaves:
+                ElementTree.SubElement(entity, qname(leaf)).text = value
+        memories = ElementTree.SubElement(devm, qname('memoryInfos'))
+        memory = ElementTree.SubElement(memories, qname('memoryInfo'))
+        for leaf, value in MEMORY_INFO:
+            ElementTree.SubElement(memory, qname(leaf)).text = value
+
+        vfm = ElementTree.SubElement(seed, qname('vfm'))
+        filesystems = ElementTree.SubElement(vfm, qname('fileSystems'))
+        filesystem = ElementTree.SubElement(filesystems, qname('fileSystem'))
+        for leaf, value in FILE_SYSTEM:
+            ElementTree.SubElement(filesystem, qname(leaf)).text = value
+
+        ethernet = ElementTree.SubElement(seed, qname('ethernet'))
+        ports = ElementTree.SubElement(ethernet, qname('ethernetIfs'))
+        for name in names:
+            port = ElementTree.SubElement(ports, qname('ethernetIf'))
+            ElementTree.SubElement(port, qname('ifName')).text = name
+            ElementTree.SubElement(port, qname('l2Enable')).text = 'enable'
+            attr = ElementTree.SubElement(port, qname('l2Attribute'))
+            for leaf, value in (('linkType', 'access'), ('pvid', '1'),
+                                ('trunkVlans', ''), ('untagVlans', '')):
+                ElementTree.SubElement(attr, qname(leaf)).text = value
+        self.datastore.edit(seed)
+
+    def switchports(self):
+        """ names of the interfaces running as layer 2 switch ports """
+
+        for iface in self.datastore.running.iter(qname('interface')):
+            name = iface.find(qname('ifName'))
+            switchport = iface.find(qname('isL2SwitchPort'))
+            if name is not None and switchport is not None and \
+                    leaf_text(switchport) == 'true':
+                yield leaf_text(name)
+
+    def load_config_text(self, text):
+        """ merge indented configuration text into the CLI configuration """
+
+        stack = [(-1, self.config)]
+        for line in text.splitlines():
+            stripped = line.strip()
+            if not stripped or stripped[0] in '#!' or stripped == 'return':
+                continue
+            depth = len(line) - len(line.lstrip(' '))
+            while stack[-1][0] >= depth:
+                stack.pop()
+            stack.append((depth, stack[-1][1].section(stripped)))
+
+    def bump_commit(self, label=None):
+        """ record a configuration commit """
+
+        self.commits.append(self.commits[-1] + 1)
+        if label:
+            self.labels[self.commits[-1]] = label
+        del self.commits[:-100]
+        for commit_id in [key for key in self.labels
+                          if key < self.commits[0]]:
+            del self.labels[commit_id]
+
+
+class CliSession(object):
+    """ VRP shell of one SSH channel """
+
+    def __init__(self, device):
+
+        self.device = device
+        self.system_view = False
+        self.view = list()
+        self.pending = list()
+
+    @property
+    def prompt(self):
+        """ prompt of the current view """
+
+        if not self.system_view:
+            return '<%s>' % self.device.name
+        mark = '*' if self.pending else '~'
+        if not self.view:
+            return '[%s%s]' % (mark, self.device.name)
+        words = self.view[0].split()
+        suffix = words[-1] if words[0] == 'interface' else words[0]
+        if len(self.view) > 1:
+            suffix += '-' + self.view[-1].split()[0]
+        return '[%s%s-%s]' % (mark, self.device.name, suffix)
+
+    def handle(self, line):
+        """ output of one command line """
+
+        line = line.strip()
+        if not line:
+            return ''
+        if line.startswith('display '):
+            return self.display(line)
+        if line in ('screen-length 0 temporary', 'mmi-mode enable'):
+            return ''
+        if line == 'dir':
+            return DIR_FLASH
+        if line.startswith('clear configuration commit'):
+            return ''
+
+        if not self.system_view:
+            if line.startswith('system-view'):
+                self.system_view = True
+                return ''
+            if line in ('quit', 'return'):
+                return ''
+            return CLI_ERROR
+
+        if line == 'return':
+            self.system_view = False
+            self.view = list()
+            return ''
+        if line == 'quit':
+            if self.view:
+                self.view.pop()
+            else:
+                self.system_view = False
+            return ''
+        if line == 'abort':
+            self.pending = list()
+            self.view = list()
+            self.system_view = False
+            return ''
+        if line.startswith('commit'):
+            words = line.split()
+            label = words[2] if words[1:2] == ['label'] and \
+                len(words) > 2 else None
+            return self.commit(label)
+
+        if TOP_VIEW_RE.match(line):
+            self.view = [line]
+        elif line.startswith('undo ') and TOP_VIEW_RE.match(line[5:]):
+            self.view = list()
+        elif self.view and SUB_VIEW_RE.match(line):
+            self.view = self.view[:1] + [line]
+        self.pending.append((tuple(self.view), line))
+        return ''
+
+    def commit(self, label=None):
+        """ apply the pending lines to the running configuration """
+
+        if not self.pending:
+            return ''
+        with self.device.lock:
+            for view, line in self.pending:
+                node = self.device.config
+                opens = bool(view) and view[-1] == line
+                for text in view[:-1] if opens else view:
+                    node = node.section(text)
+                if line.startswith('undo '):
+                    node.undo(line[5:])
+                elif opens:
+                    node.section(line)
+                else:
+                    node.set(line)
+            self.device.bump_commit(label)
+        self.pending = list()
+        return ''
+
+    def running_config(self):
+        """ display current-configuration text """
+
+        lines = ['!Software Version V200R002C50SPC800',
+                 '!Last configuration was updated at 2017-01-01 00:00:00+00:00']
+        with self.device.lock:
+            for node in self.device.config.children:
+                lines.append('#')
+                lines.append(node.text)
+                lines.extend(node.render(1))
+        lines.extend(['#', 'return'])
+        return lines
+
+    def display(self, line):
+        """ output of display commands """
+
+        command, _, filters = line.partition('|')
+        command = ' '.join(command.split())
+
+        if command == 'display version':
+            return DISPLAY_VERSION
+        if command == 'display memory':
+            return DISPLAY_MEMORY
+        if command == 'display device':
+            return DISPLAY_DEVICE
+        if command.startswith('display configuration commit list'):
+            return self.commit_list(command)
+        if command == 'display interface brief':
+            return self.interface_brief(INTERFACE_BRIEF_HEADER,
+                                        '%-28s up    up        0.01%%  '
+                                        '0.01%%          0          0')
+        if command == 'display ip interface brief':
+            return self.interface_brief(IP_INTERFACE_BRIEF_HEADER,
+                                        '%-34s unassigned         up       '
+                                        'up       --', layer3=True)
+        if command == 'display lldp neighbor brief':
+            return LLDP_NEIGHBOR_HEADER
+        if not command.startswith('display current-configuration'):
+            return CLI_ERROR
+
+        lines = self.running_config()
+        scope = command[len('display current-configuration'):].split()
+        scope = [word for word in scope
+                 if word not in ('all', 'include-default')]
+        if scope[:2] == ['configuration', 'system']:
+            lines = [text for text in lines
+                     if not text.startswith(' ') and
+                     not TOP_VIEW_RE.match(text)]
+        elif scope[:1] == ['interface']:
+            lines = self.sections(lines, '^interface %s$'
+                                  % re.escape(''.join(scope[1:])))
+        elif scope:
+            lines = self.sections(lines, '^%s' % ' '.join(scope[1:]))
+
+        for flt in filters.split('|') if filters else list():
+            lines = self.filter(lines, flt.strip())
+        return '\n'.join(lines)
+
+    @staticmethod
+    def sections(lines, regex):
+        """ top level sections whose header matches regex """
+
+        result = list()
+        keep = False
+        for text in lines:
+            if not text.startswith(' '):
+                keep = re.search(regex, text) is not None
+            if keep:
+                result.append(text)
+        return result
+
+    def filter(self, lines, flt):
+        """ apply one display filter """
+
+        match = re.match(r'^(section\s+)?(include|exclude|begin)\s+(.*)$', flt)
+        if not match:
+            return lines
+        section, kind, regex = match.groups()
+        if section:
+            if kind == 'exclude':
+                keep = set(self.sections(lines, regex))
+                return [text for text in lines if text not in keep]
+            return self.sections(lines, regex)
+        if kind == 'begin':
+            for index, text in enumerate(lines):
+                if re.search(regex, text):
+                    return lines[index:]
+            return list()
+        found = [text for text in lines if re.search(regex, text)]
+        if kind == 'exclude':
+            return [text for text in lines if text not in found]
+        return found
+
+    def commit_list(self, command):
+        """ display configuration commit list [count] """
+
+        words = command.split()
+        count = int(words[-1]) if words[-1].isdigit() else 100
+        lines = ['Configuration commit list:',
+                 '-' * 78,
+                 'No.   CommitId        Label                User           '
+                 'Date & Time',
+                 '-' * 78]
+        with self.device.lock:
+            commits = list(reversed(self.device.commits))[:count]
+        for index, commit_id in enumerate(commits):
+            lines.append('%-5d %-15d %-20s %-14s 2017-01-01 00:00:00'
+                         % (index + 1, commit_id,
+                            self.device.labels.get(commit_id, '-'), 'admin'))
+        lines.append('-' * 78)
+        return '\n'.join(lines)
+
+    def interface_brief(self, header, row, layer3=False):
+        """ display interface brief style tables, layer3 leaves out the
+        switch ports """
+
+        with self.device.lock:
+            names = [node.text.split(None, 1)[1]
+                     for node in self.device.config.children
+                     if node.text.startswith('interface ')]
+            if layer3:
+                switchports = set(self.device.switchports())
+                names = [name for name in names if name not in switchports]
+        return '\n'.join([header] + [row % name for name in names])
+
+
+def rpc_reply(message_id, body):
+    """ serialized rpc-reply """
+
+    return ('<?xml version="1.0" encoding="UTF-8"?>'
+            '<rpc-reply message-id="%s" xmlns="%s">%s</rpc-reply>'
+            % (message_id, NC_NS, body)).encode('utf-8')
+
+
+def rpc_error(message_id, error):
+    """ serialized rpc-error reply """
+
+    body = ('<rpc-error><error-type>%s</error-type><error-tag>%s</error-tag>'
+            '<error-severity>error</error-severity>'
+            '<error-message>%s</error-message></rpc-error>'
+            % (error.error_type, error.tag, escape(error.message)))
+    return rpc_reply(message_id, body)
+
+
+def escape(text):
+    """ escape text for XML content """
+
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+
+EMPTY_LEAF_RE = re.compile(r'<([^\s<>/]+)\s*/>')
+
+
+def indent(elem, level=0):
+    """ pretty print in place the way the device does, empty leaves are
+    written as <leaf></leaf> """
+
+    if not len(elem):
+        if elem.text is None:
+            elem.text = ''
+        return
+    pad = '\n' + '  ' * (level + 1)
+    elem.text = pad
+    for child in elem:
+        indent(child, level + 1)
+        child.tail = pad
+    elem[-1].tail = '\n' + '  ' * level
+
+
+def serialize(data):
+    """ serialize a data element, vrp is the default namespace below it """
+
+    indent(data)
+    parts = [data.text]
+    for child in data:
+        buf = BytesIO()
+        try:
+            ElementTree.ElementTree(child).write(buf, encoding='utf-8',
+                                                 default_namespace=VRP_NS,
+                                                 xml_declaration=False)
+        except ValueError:
+            buf = BytesIO(ElementTree.tostring(child, encoding='utf-8'))
+        parts.append(buf.getvalue().decode('utf-8'))
+    # ElementTree shortens empty leaves to <leaf />
+    return '<data>%s</data>' % EMPTY_LEAF_RE.sub(r'<\1></\1>', ''.join(parts))
+
+
+def datastore_name(elem):
+    """ running or candidate out of a source or target element """
+
+    if elem is None or not len(elem):
+        return 'running'
+    return local_name(elem[0].tag)
+
+
+class NetconfSession(object):
+    """ NETCONF 1.0 server side of one SSH channel """
+
+    counter = [0]
+
+    def __init__(self, device, channel, latency=0.0):
+
+        self.device = device
+        self.channel = channel
+        self.latency = latency
+        self.counter[0] += 1
+        self.session_id = self.counter[0]
+        self.buffer = b''
+
+    def run(self):
+        """ exchange hellos and serve RPCs until the client leaves """
+
+        try:
+            self.send(self.hello())
+            if self.receive() is None:
+                return
+            while True:
+                message = self.receive()
+                if message is None:
+                    break
+                reply, close = self.dispatch(message)
+                if self.latency:
+                    time.sleep(self.latency)
+                self.send(reply)
+                if close:
+                    break
+        except (socket.error, EOFError):
+            pass
+        finally:
+            with self.device.lock:
+                self.device.datastore.release(self.session_id)
+            self.channel.close()
+
+    def hello(self):
+        """ server hello """
+
+        caps = ''.join('<capability>%s</capability>' % cap
+                       for cap in CAPABILITIES)
+        return ('<?xml version="1.0" encoding="UTF-8"?>'
+                '<hello xmlns="%s"><capabilities>%s</capabilities>'
+                '<session-id>%d</session-id></hello>'
+                % (NC_NS, caps, self.session_id)).encode('utf-8')
+
+    def send(self, data):
+        """ send a framed message """
+
+        self.channel.sendall(data + DELIMITER)
+
+    def receive(self):
+        """ next framed message, None at end of file """
+
+        while DELIMITER not in self.buffer:
+            chunk = self.channel.recv(65536)
+            if not chunk:
+                return None
+            self.buffer += chunk
+        message, self.buffer = self.buffer.split(DELIMITER, 1)
+        return message
+
+    def dispatch(self, message):
+        """ reply to one rpc and whether the session ends """
+
+        try:
+            rpc = ElementTree.fromstring(message)
+        except ElementTree.ParseError:
+            error = SimError('malformed-message', 'Malformed message.', 'rpc')
+            return rpc_error('', error), False
+
+        message_id = rpc.get('message-id', '')
+        if not len(rpc):
+            error = SimError('missing-element', 'Missing operation.', 'rpc')
+            return rpc_error(message_id, error), False
+
+        operation = rpc[0]
+        name = local_name(operation.tag)
+        handler = getattr(self, 'rpc_' + name.replace('-', '_'), None)
+        if handler is None:
+            error = SimError('operation-not-supported',
+                             'Operation %s is not supported.' % name)
+            return rpc_error(message_id, error), False
+
+        try:
+            with self.device.lock:
+                body = handler(operation)
+        except SimError:
+            return rpc_error(message_id, sys.exc_info()[1]), False
+        return rpc_reply(message_id, body or '<ok/>'), \
+            name in ('close-session', 'kill-session')
+
+    def child(self, operation, name):
+        """ child of an operation by local name """
+
+        for elem in operation:
+            if local_name(elem.tag) == name:
+                return elem
+        return None
+
+    def rpc_get(self, operation):
+        """ get """
+
+        data = self.device.datastore.get(self.child(operation, 'filter'))
+        if not len(data):
+            return '<data/>'
+        return serialize(data)
+
+    def rpc_get_config(self, operation):
+        """ get-config """
+
+        source = datastore_name(self.child(operation, 'source'))
+        data = self.device.datastore.get(self.child(operation, 'filter'),
+                                         source)
+        if not len(data):
+            return '<data/>'
+        return serialize(data)
+
+    def rpc_edit_config(self, operation):
+        """ edit-config """
+
+        target = datastore_name(self.child(operation, 'target'))
+        default = self.child(operation, 'default-operation')
+        config = self.child(operation, 'config')
+        if config is None:
+            raise SimError('missing-element', 'Missing config.', 'protocol')
+        self.device.datastore.edit(
+            config, target,
+            leaf_text(default) if default is not None else 'merge',
+            self.session_id)
+
+    def rpc_lock(self, operation):
+        """ lock """
+
+        target = datastore_name(self.child(operation, 'target'))
+        self.device.datastore.lock(target, self.session_id)
+
+    def rpc_unlock(self, operation):
+        """ unlock """
+
+        target = datastore_name(self.child(operation, 'target'))
+        self.device.datastore.unlock(target, self.session_id)
+
+    def rpc_validate(self, operation):
+        """ validate, the datastore holds no constraints to check """
+
+        return None
+
+    def rpc_commit(self, operation):
+        """ commit, optionally confirmed """
+
+        timeout = self.child(operation, 'confirm-timeout')
+        persist = self.child(operation, 'persist')
+        persist_id = self.child(operation, 'persist-id')
+        self.device.datastore.commit(
+            confirmed=self.child(operation, 'confirmed') is not None,
+            timeout=int(leaf_text(timeout)) if timeout is not None else 600,
+            persist=leaf_text(persist) if persist is not None else None,
+            persist_id=leaf_text(persist_id) if persist_id is not None
+            else None, session=self.session_id)
+
+    def rpc_discard_changes(self, operation):
+        """ discard-changes """
+
+        self.device.datastore.discard()
+
+    def rpc_close_session(self, operation):
+        """ close-session """
+
+        return None
+
+    def rpc_kill_session(self, operation):
+        """ kill-session """
+
+        return None
+
+    def rpc_execute_action(self, operation):
+        """ Huawei execute-action """
+
+        action = self.child(operation, 'action')
+        if action is None:
+            raise SimError('missing-element', 'Missing action.', 'protocol')
+        self.device.datastore.action(action)
+
+    def rpc_execute_cli(self, operation):
+        """ Huawei execute-cli, each cmdline runs in a fresh shell """
+
+        shell = CliSession(self.device)
+        shell.system_view = False
+        output = list()
+        for cmd in operation.iter():
+            if local_name(cmd.tag) != 'cmdline':
+                continue
+            text = shell.handle(leaf_text(cmd))
+            if text.startswith('Error:'):
+                raise SimError('operation-failed', text)
+            output.append('<cmd><cmdline>%s</cmdline><output>%s</output></cmd>'
+                          % (escape(leaf_text(cmd)), escape(text)))
+        shell.commit()
+        return '<cli xmlns="%s">%s</cli>' % (HW_NS, ''.join(output))
+
+
+def run_shell(device, channel, latency=0.0):
+    """ serve a VRP shell on a channel """
+
+    shell = CliSession(device)
+    buf = b''
+    try:
+        channel.sendall(('Info: The max number of VTY users is 21.\r\n'
+                         '%s' % shell.prompt).encode('utf-8'))
+        while True:
+            chunk = channel.recv(4096)
+            if not chunk:
+                break
+            buf += chunk
+            while True:
+                match = re.search(b'\r\n|\r|\n', buf)
+                if not match:
+                    break
+                line = buf[:match.start()].decode('utf-8', 'replace')
+                buf = buf[match.end():]
+                output = shell.handle(line)
+                if latency:
+                    time.sleep(latency)
+                response = line + '\r\n'
+                if output:
+                    response += output.replace('\n', '\r\n') + '\r\n'
+                response += shell.prompt
+                channel.sendall(response.encode('utf-8'))
+    except (socket.error, EOFError):
+        pass
+    finally:
+        channel.close()
+
+
+if HAS_PARAMIKO:
+
+    class SimServer(paramiko.ServerInterface):
+        """ SSH server side of one connection """
+
+        def __init__(self, device, options):
+
+            self.device = device
+            self.options = options
+
+        def get_allowed_auths(self, username):
+            return 'password'
+
+        def check_auth_password(self, username, password):
+            if self.options.username is None or \
+                    (username == self.options.username and
+                     password == self.options.password):
+                return paramiko.AUTH_SUCCESSFUL
+            return paramiko.AUTH_FAILED
+
+        def check_channel_request(self, kind, chanid):
+            if kind == 'session':
+                return paramiko.OPEN_SUCCEEDED
+            return paramiko.OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED
+
+        def check_channel_pty_request(self, channel, term, width, height,
+                                      pixelwidth, pixelheight, modes):
+            return True
+
+        def check_channel_shell_request(self, channel):
+            start_thread(run_shell, self.device, channel,
+                         self.options.latency / 1000.0)
+            return True
+
+        def check_channel_subsystem_request(self, channel, name):
+            if name != 'netconf':
+                return False
+            session = NetconfSession(self.device, channel,
+                                     self.options.latency / 1000.0)
+            start_thread(session.run)
+            return True
+
+
+def start_thread(target, *args):
+    """ start a daemon thread """
+
+    thread = threading.Thread(target=target, args=args)
+    thread.daemon = True
+    thread.start()
+    return thread
+
+
+class Simulator(object):
+    """ listening sockets and devices, created on first connect """
+
+    def __init__(self, options):
+
+        self.options = options
+        self.devices = dict()
+        self.lock = threading.Lock()
+        self.host_key = None
+        self.seed_xml = None
+        self.seed_config = None
+        if options.seed_xml:
+            self.seed_xml = ElementTree.parse(options.seed_xml).getroot()
+        if options.seed_config:
+            with open(options.seed_config) as fhandle:
+                self.seed_config = fhandle.read()
+
+    def device(self, index):
+        """ device behind a port, created on first use """
+
+        with self.lock:
+            if index not in self.devices:
+                self.devices[index] = Device(
+                    '%s%04d' % (self.options.prefix, index + 1),
+                    self.options.interfaces, self.seed_xml, self.seed_config)
+            return self.devices[index]
+
+    def accept(self, sock, index):
+        """ hand an accepted connection to paramiko """
+
+        transport = paramiko.Transport(sock)
+        transport.add_server_key(self.host_key)
+        try:
+            transport.start_server(server=SimServer(self.device(index),
+                                                    self.options))
+        except (paramiko.SSHException, EOFError, socket.error):
+            transport.close()
+
+    def reset(self):
+        """ forget device state, devices are seeded again on connect """
+
+        with self.lock:
+            self.devices.clear()
+
+    def listen(self):
+        """ bind the device ports, returns the listening sockets """
+
+        if self.options.host_key:
+            self.host_key = paramiko.RSAKey(filename=self.options.host_key)
+        else:
+            self.host_key = paramiko.RSAKey.generate(2048)
+
+        listeners = dict()
+        for index in range(self.options.count):
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            sock.bind((self.options.address, self.options.port + index))
+            sock.listen(64)
+            listeners[sock.fileno()] = (sock, index)
+        return listeners
+
+    def serve(self, listeners=None):
+        """ accept connections on every device port, never returns """
+
+        if listeners is None:
+            listeners = self.listen()
+        log.info('simulating %d devices on %s:%d-%d', self.options.count,
+                 self.options.address, self.options.port,
+                 self.options.port + self.options.count - 1)
+
+        poller = select.poll()
+        for fileno in listeners:
+            poller.register(fileno, select.POLLIN)
+        while True:
+            for fileno, _ in poller.poll():
+                sock, index = listeners[fileno]
+                try:
+                    conn = sock.accept()[0]
+                except socket.error:
+                    continue
+                start_thread(self.accept, conn, index)
+
+
+def parse_args(argv=None):
+    """ command line options """
+
+    parser = argparse.ArgumentParser(description='Offline CloudEngine '
+                                     'NETCONF and CLI simulator.')
+    parser.add_argument('--address', default='127.0.0.1',
+                        help='address to listen on')
+    parser.add_argument('--port', type=int, default=10022,
+                        help='port of the first device')
+    parser.add_argument('--count', type=int, default=1,
+                        help='number of devices, one port each')
+    parser.add_argument('--prefix', default='CE',
+                        help='sysname prefix of the devices')
+    parser.add_argument('--interfaces', type=int, default=48,
+                        help='10GE interfaces per device')
+    parser.add_argument('--seed-xml',
+                        help='edit-config <config> document merged into '
+                        'every running datastore')
+    parser.add_argument('--seed-config',
+                        help='CLI configuration text loaded into every device')
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='milliseconds added to every RPC and command')
+    parser.add_argument('--username', help='only accept this username')
+    parser.add_argument('--password', help='password for --username')
+    parser.add_argument('--host-key', help='RSA host key file')
+    parser.add_argument('--verbose', action='store_true')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """ main """
+
+    options = parse_args(argv)
+    logging.basicConfig(level=logging.DEBUG if options.verbose
+                        else logging.INFO)
+    if not HAS_PARAMIKO:
+        sys.exit('paramiko is required, install it with `pip install paramiko`')
+
+    try:
+        Simulator(options).serve()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()